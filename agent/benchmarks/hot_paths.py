@@ -0,0 +1,271 @@
+"""Throughput benchmarks for the policy, audit and coordinator hot paths.
+
+Runs each case against synthetic engagements, audit logs and agent fleets
+of several sizes, reports operations per second (best of ``--repeat`` runs)
+and compares them with a stored baseline. A case slower than the baseline
+by more than ``--tolerance`` is reported as a regression and makes the
+script exit non-zero.
+
+Baselines are machine-specific: record one on the hardware you compare on
+(e.g. a Pi 4) with ``--save-baseline``. ``--quick`` runs smaller cases
+under the same names, so quick results are only compared with (or merged
+into) a baseline that was also recorded with ``--quick``.
+
+Usage:
+    python benchmarks/hot_paths.py [--filter policy] [--quick]
+    python benchmarks/hot_paths.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import logging
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import structlog
+
+from kynee_agent.audit.writer import AuditLogWriter
+from kynee_agent.core import Agent, AgentCoordinator
+from kynee_agent.models.engagement import Engagement, Scope
+from kynee_agent.policy.engine import PolicyEngine
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+
+SCOPE_SIZES = (10, 1_000, 10_000)
+LOG_SIZES = (1_000, 10_000, 50_000)
+AGENT_COUNTS = (1, 16, 128)
+
+METHOD = "network-scanning"
+
+
+def make_engagement(scope_size: int, seed: int = 1) -> Engagement:
+    """Engagement whose scope holds ``scope_size`` random /24 ranges."""
+    rng = random.Random(seed)
+    ranges = ["192.168.1.0/24"] + [
+        str(ipaddress.IPv4Network((rng.getrandbits(24) << 8, 24))) for _ in range(scope_size - 1)
+    ]
+    return Engagement(
+        engagement_id=f"bench-{scope_size}",
+        client_name="Benchmark",
+        start_time=datetime.utcnow() - timedelta(hours=1),
+        end_time=datetime.utcnow() + timedelta(hours=23),
+        scope=Scope(ip_ranges=ranges),
+        authorized_methods=[METHOD],
+        # Effectively unlimited: the benchmark measures validation, not throttling
+        rate_limits={METHOD: 10**9},
+    )
+
+
+def make_targets(engagement: Engagement, count: int, seed: int = 2) -> list[dict[str, str]]:
+    """In-scope targets spread across the engagement's ranges."""
+    rng = random.Random(seed)
+    networks = [ipaddress.IPv4Network(cidr) for cidr in engagement.scope.ip_ranges]
+    targets = []
+    for _ in range(count):
+        network = rng.choice(networks)
+        targets.append({"ip": str(network[rng.randrange(1, network.num_addresses - 1)])})
+    return targets
+
+
+def best_rate(run: Callable[[], int], repeat: int) -> float:
+    """Best operations per second over ``repeat`` runs; ``run`` returns its op count."""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops = run()
+        elapsed = time.perf_counter() - start
+        best = max(best, ops / elapsed if elapsed else float("inf"))
+    return best
+
+
+def bench_policy(repeat: int, scale: float) -> dict[str, float]:
+    """PolicyEngine.validate_scan_request for growing scopes."""
+    results = {}
+    for scope_size in SCOPE_SIZES:
+        engagement = make_engagement(scope_size)
+        engine = PolicyEngine(engagement)
+        targets = make_targets(engagement, max(100, int(20_000 * scale)))
+
+        def run(engine: PolicyEngine = engine, targets: list = targets) -> int:
+            for target in targets:
+                engine.validate_scan_request(METHOD, target)
+            return len(targets)
+
+        results[f"policy.validate_scan_request[scope={scope_size}]"] = best_rate(run, repeat)
+    return results
+
+
+def bench_audit(repeat: int, scale: float) -> dict[str, float]:
+    """AuditLogWriter.log_event and verify_integrity for growing logs."""
+    results = {}
+    entries = max(100, int(20_000 * scale))
+    details = {"scan_id": "scan-0001", "target": {"ip": "192.168.1.50"}}
+
+    for group_commit in (False, True):
+        with tempfile.TemporaryDirectory() as tmpdir:
+
+            def run(tmpdir: str = tmpdir, group_commit: bool = group_commit) -> int:
+                writer = AuditLogWriter(
+                    str(Path(tmpdir) / f"audit-{time.perf_counter_ns()}.log"),
+                    group_commit=group_commit,
+                )
+                for _ in range(entries):
+                    writer.log_event("scan_started", "agent-1", "scan", "success", details)
+                writer.close()
+                return entries
+
+            name = "group_commit" if group_commit else "direct"
+            results[f"audit.log_event[{name}]"] = best_rate(run, repeat)
+
+    for log_size in LOG_SIZES:
+        size = max(100, int(log_size * scale))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            writer = AuditLogWriter(str(Path(tmpdir) / "audit.log"), group_commit=True)
+            for _ in range(size):
+                writer.log_event("scan_started", "agent-1", "scan", "success", details)
+            writer.flush()
+
+            def run(writer: AuditLogWriter = writer, size: int = size) -> int:
+                writer.verify_integrity()
+                return size
+
+            results[f"audit.verify_integrity[entries={log_size}]"] = best_rate(run, repeat)
+            writer.close()
+    return results
+
+
+def bench_coordinator(repeat: int, scale: float) -> dict[str, float]:
+    """AgentCoordinator.execute_coordinated_scan across fleets of agents."""
+    results = {}
+    scans = max(50, int(2_000 * scale))
+
+    for agent_count in AGENT_COUNTS:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engagement = make_engagement(100)
+            targets = make_targets(engagement, scans)
+
+            async def run_scans(
+                tmpdir: str = tmpdir,
+                engagement: Engagement = engagement,
+                agent_count: int = agent_count,
+                targets: list = targets,
+            ) -> int:
+                coordinator = AgentCoordinator(engagement, str(Path(tmpdir) / "audit.log"))
+                for i in range(agent_count):
+                    await coordinator.register_agent(Agent(agent_id=f"pi-{i:03d}"))
+                await coordinator.start()
+                await asyncio.gather(
+                    *(
+                        coordinator.execute_coordinated_scan(
+                            agent_id=None,
+                            scan_id=f"scan-{time.perf_counter_ns()}-{i}",
+                            method=METHOD,
+                            target=target,
+                        )
+                        for i, target in enumerate(targets)
+                    )
+                )
+                await coordinator.stop()
+                return len(targets)
+
+            def run(run_scans: Callable[[], Awaitable[int]] = run_scans) -> int:
+                return asyncio.run(run_scans())
+
+            name = f"coordinator.execute_coordinated_scan[agents={agent_count}]"
+            results[name] = best_rate(run, repeat)
+    return results
+
+
+SUITES = {
+    "policy": bench_policy,
+    "audit": bench_audit,
+    "coordinator": bench_coordinator,
+}
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Print results against the baseline; return names of regressed cases."""
+    regressions = []
+    print(f"{'case':<58} {'ops/s':>12} {'baseline':>12} {'change':>8}")
+    for name, rate in results.items():
+        base = baseline.get(name)
+        if base:
+            change = rate / base - 1
+            flag = " REGRESSION" if change < -tolerance else ""
+            if flag:
+                regressions.append(name)
+            print(f"{name:<58} {rate:>12,.0f} {base:>12,.0f} {change:>+7.0%}{flag}")
+        else:
+            print(f"{name:<58} {rate:>12,.0f} {'-':>12} {'':>8}")
+    return regressions
+
+
+def main() -> int:
+    """Run the selected suites, compare with the baseline and optionally save it."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", choices=sorted(SUITES), action="append")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="Run at 10%% of the default sizes")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+
+    # Measure the code paths, not log rendering
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL))
+
+    scale = 0.1 if args.quick else 1.0
+    results: dict[str, float] = {}
+    for name in args.filter or SUITES:
+        results.update(SUITES[name](args.repeat, scale))
+
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baseline = stored.get("results", {})
+    if baseline and stored.get("quick", False) != args.quick:
+        recorded = "with" if stored.get("quick", False) else "without"
+        print(
+            f"baseline {args.baseline} was recorded {recorded} --quick; not comparing",
+            file=sys.stderr,
+        )
+        baseline = {}
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.save_baseline:
+        stored_results = {**baseline, **results}
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "machine": platform.machine(),
+                    "python": platform.python_version(),
+                    "recorded_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                    "quick": args.quick,
+                    "results": {k: round(v, 1) for k, v in sorted(stored_results.items())},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Micro-benchmark for PolicyEngine IP scope lookups.
+
+Compares the compiled :class:`IPRangeIndex` against the previous approach of
+parsing every CIDR with ``ipaddress.ip_network`` on each lookup.
+
+Usage:
+    python benchmarks/scope_index.py [--lookups N]
+"""
+
+import argparse
+import ipaddress
+import random
+import time
+from functools import partial
+
+from kynee_agent.policy.scope_index import IPRangeIndex
+
+RANGE_COUNTS = (10, 1_000, 100_000)
+
+
+def make_ranges(count: int, seed: int = 1) -> list[str]:
+    """Generate ``count`` random, mostly disjoint /24 ranges."""
+    rng = random.Random(seed)
+    return [str(ipaddress.IPv4Network((rng.getrandbits(24) << 8, 24))) for _ in range(count)]
+
+
+def make_addresses(count: int, seed: int = 2) -> list[str]:
+    """Generate ``count`` random IPv4 address strings."""
+    rng = random.Random(seed)
+    return [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(count)]
+
+
+def linear_lookup(ip_str: str, ip_ranges: list[str]) -> bool:
+    """Baseline: parse every CIDR per lookup (pre-index behaviour)."""
+    ip = ipaddress.ip_address(ip_str)
+    for cidr in ip_ranges:
+        if ip in ipaddress.ip_network(cidr, strict=False):
+            return True
+    return False
+
+
+def rate(func, addresses: list[str]) -> float:
+    """Return lookups per second for ``func`` over ``addresses``."""
+    start = time.perf_counter()
+    for address in addresses:
+        func(address)
+    elapsed = time.perf_counter() - start
+    return len(addresses) / elapsed if elapsed else float("inf")
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument(
+        "--linear-budget",
+        type=int,
+        default=200_000,
+        help="CIDR parses to spend on the (slow) per-call parsing baseline",
+    )
+    args = parser.parse_args()
+
+    addresses = make_addresses(args.lookups)
+
+    print(f"{'ranges':>8} {'compile ms':>11} {'index lookups/s':>16} {'linear lookups/s':>17}")
+    for count in RANGE_COUNTS:
+        ranges = make_ranges(count)
+
+        start = time.perf_counter()
+        index = IPRangeIndex(ranges)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        index_rate = rate(index.__contains__, addresses)
+        linear_rate = rate(
+            partial(linear_lookup, ip_ranges=ranges),
+            addresses[: max(1, args.linear_budget // count)],
+        )
+
+        print(f"{count:>8} {compile_ms:>11.1f} {index_rate:>16,.0f} {linear_rate:>17,.0f}")
+
+
+if __name__ == "__main__":
+    main()
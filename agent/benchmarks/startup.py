@@ -0,0 +1,97 @@
+"""Cold-start benchmark for the kynee-agent CLI.
+
+Runs ``kynee-agent --version`` and ``kynee-agent status`` in fresh
+interpreters and reports the best wall time over ``--runs`` runs, minus the
+time to start a bare interpreter. Exits non-zero when a command exceeds its
+budget, and lists the slowest imports (``-X importtime``) to show what to
+defer.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--budget-version MS] [--budget-status MS]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+AGENT_ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = {
+    "version": ["-m", "kynee_agent.cli.main", "--version"],
+    "status": ["-m", "kynee_agent.cli.main", "status"],
+}
+
+# Overhead budgets (ms above a bare interpreter) on a development machine;
+# scale with --scale on slower hardware (a Pi Zero is roughly 10x).
+DEFAULT_BUDGETS_MS = {"version": 100.0, "status": 250.0}
+
+
+def best_time(args: list[str], runs: int) -> float:
+    """Best wall time in seconds of ``python <args>`` over ``runs`` runs."""
+    env = {**os.environ, "PYTHONPATH": str(AGENT_ROOT)}
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], env=env, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def slowest_imports(args: list[str], count: int = 8) -> list[tuple[int, str]]:
+    """Top-level cumulative import times (µs) for ``python <args>``."""
+    env = {**os.environ, "PYTHONPATH": str(AGENT_ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], env=env, capture_output=True, text=True
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only direct imports of the entry module, not their children
+        if name.startswith("   "):
+            continue
+        timings.append((int(cumulative), name.strip()))
+    return sorted(timings, reverse=True)[:count]
+
+
+def main() -> int:
+    """Measure startup, print a table and check budgets."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-version", type=float, default=DEFAULT_BUDGETS_MS["version"])
+    parser.add_argument("--budget-status", type=float, default=DEFAULT_BUDGETS_MS["status"])
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply budgets")
+    args = parser.parse_args()
+
+    budgets = {
+        "version": args.budget_version * args.scale,
+        "status": args.budget_status * args.scale,
+    }
+    interpreter = best_time(["-c", "pass"], args.runs)
+    print(f"bare interpreter: {interpreter * 1000:.1f} ms")
+    print(f"{'command':<10} {'total ms':>10} {'overhead ms':>12} {'budget ms':>10}")
+
+    over_budget = []
+    for name, command in COMMANDS.items():
+        total = best_time(command, args.runs)
+        overhead = (total - interpreter) * 1000
+        flag = ""
+        if overhead > budgets[name]:
+            over_budget.append(name)
+            flag = " OVER BUDGET"
+        print(f"{name:<10} {total * 1000:>10.1f} {overhead:>12.1f} {budgets[name]:>10.0f}{flag}")
+
+    for name in over_budget:
+        print(f"\nslowest imports for '{name}':")
+        for micros, module in slowest_imports(COMMANDS[name]):
+            print(f"  {micros / 1000:>8.1f} ms  {module}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
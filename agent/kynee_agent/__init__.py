@@ -1,8 +1,23 @@
 """KYNEĒ Agent - Autonomous penetration testing agent for Raspberry Pi."""
 
+from importlib import import_module
+
 __version__ = "0.1.0-dev"
 __author__ = "KYNEĒ Contributors"
 __license__ = "Apache-2.0"
 
 # Version info
 VERSION = __version__
+
+# Subpackages load on first attribute access (``kynee_agent.core``) so
+# that importing the package, e.g. for ``--version``, stays cheap.
+_SUBMODULES = frozenset(
+    {"audit", "cli", "collectors", "core", "metrics", "models", "policy", "transport"}
+)
+
+
+def __getattr__(name: str) -> object:
+    """Import subpackages on first access."""
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return import_module(f".{name}", __name__)
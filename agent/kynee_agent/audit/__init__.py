@@ -1,5 +1,7 @@
 """Audit logging."""
 
+from .async_sink import AsyncAuditSink
+from .reader import AuditLogReader
 from .writer import AuditLogWriter
 
-__all__ = ["AuditLogWriter"]
+__all__ = ["AsyncAuditSink", "AuditLogReader", "AuditLogWriter"]
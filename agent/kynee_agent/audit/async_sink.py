@@ -0,0 +1,297 @@
+"""Asyncio-native, non-blocking front end for the audit log."""
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import structlog
+
+from kynee_agent.audit.writer import AuditLogWriter
+from kynee_agent.core.exceptions import AuditLogError
+from kynee_agent.metrics import AUDIT_QUEUE_DEPTH
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class _AuditRecord:
+    """One queued audit call and the future awaiting its chain hash."""
+
+    call: Callable[..., str]
+    kwargs: dict[str, Any]
+    future: "asyncio.Future[str]"
+
+
+class AsyncAuditSink:
+    """
+    Bounded queue in front of an ``AuditLogWriter``.
+
+    Coroutines enqueue audit calls and return immediately; a drain task moves
+    them in batches to a dedicated single writer thread, which performs the
+    hashing and file I/O off the event loop. The queue is bounded, so when
+    the disk falls behind producers await free space (backpressure) rather
+    than growing memory without limit.
+
+    Entries are written strictly in submission order. Each enqueue returns a
+    future resolving to the entry's chain hash for callers that need it.
+    ``await flush()`` is the durability point. ``start()`` and ``close()``
+    own the drain task and writer thread; submitting to a sink that is not
+    started raises ``AuditLogError``.
+
+    The sink fails closed: once a write fails, entries still queued are
+    not written, and every later submit or flush raises ``AuditLogError``,
+    so callers cannot carry on unaudited.
+    """
+
+    def __init__(
+        self,
+        writer: AuditLogWriter,
+        max_queue_size: int = 1024,
+        max_batch_size: int = 256,
+    ):
+        """
+        Initialize audit sink.
+
+        Args:
+            writer: Underlying synchronous audit log writer
+            max_queue_size: Queued entries before producers block
+            max_batch_size: Maximum entries handed to the writer thread at once
+        """
+        self.writer = writer
+        self.max_queue_size = max(1, max_queue_size)
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._queue: Optional[asyncio.Queue[_AuditRecord]] = None
+        self._backlog: deque[_AuditRecord] = deque()
+        self._write_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._drain_task: Optional[asyncio.Task[None]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._failure: Optional[BaseException] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the drain task is active."""
+        return self._drain_task is not None and not self._drain_task.done()
+
+    @property
+    def failed(self) -> bool:
+        """Whether a write failed, closing the sink to new entries."""
+        return self._failure is not None
+
+    @property
+    def pending(self) -> int:
+        """Entries accepted but not yet written."""
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return queued + len(self._backlog)
+
+    async def start(self) -> None:
+        """Start the drain task and writer thread (idempotent)."""
+        if self.running:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kynee-audit")
+        self._drain_task = asyncio.create_task(self._drain_loop(), name="kynee-audit-drain")
+
+        logger.debug("audit_sink_started", max_queue_size=self.max_queue_size)
+
+    async def close(self) -> None:
+        """
+        Write every accepted entry, then stop the drain task and thread.
+
+        Raises:
+            AuditLogError: If a write failed (the sink is stopped regardless)
+        """
+        if not self.running:
+            return
+
+        try:
+            await self.flush()
+        finally:
+            assert self._drain_task is not None
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            self._drain_task = None
+
+            # A producer may have slipped in while the drain task was stopping
+            self._move_queue_to_backlog()
+            self._write_backlog()
+
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+            logger.debug("audit_sink_closed")
+        self._raise_if_failed()
+
+    async def flush(self) -> None:
+        """
+        Wait until every entry accepted so far has been written.
+
+        Raises:
+            AuditLogError: If a write failed
+        """
+        if not self.running:
+            self._raise_if_failed()
+            return
+
+        self._move_queue_to_backlog()
+        await self._loop_ref().run_in_executor(self._executor, self._write_backlog)
+        self._raise_if_failed()
+        await asyncio.to_thread(self.writer.flush)
+
+    def flush_sync(self) -> None:
+        """
+        Write pending entries from the calling thread.
+
+        Blocks until done; meant for synchronous readers that must observe
+        everything already submitted, not for hot paths.
+        """
+        self._move_queue_to_backlog()
+        self._write_backlog()
+        self._raise_if_failed()
+        self.writer.flush()
+
+    async def log_event(
+        self,
+        event_type: str,
+        actor: str,
+        action: str,
+        result: str,
+        details: Optional[dict[str, Any]] = None,
+    ) -> "asyncio.Future[str]":
+        """Queue an audit event (see ``AuditLogWriter.log_event``)."""
+        return await self._submit(
+            self.writer.log_event,
+            event_type=event_type,
+            actor=actor,
+            action=action,
+            result=result,
+            details=details,
+        )
+
+    async def log_scan_started(
+        self,
+        agent_id: str,
+        scan_id: str,
+        method: str,
+        target: dict[str, Any],
+    ) -> "asyncio.Future[str]":
+        """Queue a scan start event."""
+        return await self._submit(
+            self.writer.log_scan_started,
+            agent_id=agent_id,
+            scan_id=scan_id,
+            method=method,
+            target=target,
+        )
+
+    async def log_scan_completed(
+        self,
+        agent_id: str,
+        scan_id: str,
+        findings_count: int,
+        status: str = "success",
+    ) -> "asyncio.Future[str]":
+        """Queue a scan completion event."""
+        return await self._submit(
+            self.writer.log_scan_completed,
+            agent_id=agent_id,
+            scan_id=scan_id,
+            findings_count=findings_count,
+            status=status,
+        )
+
+    async def _submit(self, call: Callable[..., str], **kwargs: Any) -> "asyncio.Future[str]":
+        """Enqueue one call, waiting for queue space if the sink is saturated."""
+        if not self.running:
+            raise AuditLogError("Audit sink is not started")
+        self._raise_if_failed()
+        assert self._queue is not None
+
+        future: asyncio.Future[str] = self._loop_ref().create_future()
+        await self._queue.put(_AuditRecord(call=call, kwargs=kwargs, future=future))
+        AUDIT_QUEUE_DEPTH.set(self.pending)
+        return future
+
+    async def _drain_loop(self) -> None:
+        """Hand queued entries to the writer thread in batches."""
+        assert self._queue is not None
+        while True:
+            record = await self._queue.get()
+            self._backlog.append(record)
+            self._move_queue_to_backlog(self.max_batch_size - 1)
+            await self._loop_ref().run_in_executor(self._executor, self._write_backlog)
+
+    def _move_queue_to_backlog(self, limit: Optional[int] = None) -> None:
+        """Move up to ``limit`` queued entries (all if None) to the backlog."""
+        if self._queue is None:
+            return
+        moved = 0
+        while limit is None or moved < limit:
+            try:
+                self._backlog.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+            moved += 1
+
+    def _write_backlog(self) -> None:
+        """Write backlog entries in order; the lock serializes concurrent drains."""
+        with self._write_lock:
+            AUDIT_QUEUE_DEPTH.set(self.pending)
+            while self._backlog:
+                record = self._backlog.popleft()
+                if self._failure is not None:
+                    # Fail closed: nothing is written after a failed entry
+                    self._resolve(record.future, None, self._failure)
+                    continue
+                try:
+                    entry_hash = record.call(**record.kwargs)
+                except Exception as e:
+                    logger.error("audit_sink_write_failed", error=str(e))
+                    self._failure = e
+                    self._resolve(record.future, None, e)
+                else:
+                    self._resolve(record.future, entry_hash, None)
+
+    def _raise_if_failed(self) -> None:
+        """Raise if a write has failed."""
+        if self._failure is not None:
+            raise AuditLogError(f"Audit log write failed: {self._failure}") from self._failure
+
+    def _resolve(
+        self,
+        future: "asyncio.Future[str]",
+        entry_hash: Optional[str],
+        error: Optional[BaseException],
+    ) -> None:
+        """Complete a record's future on its event loop."""
+
+        def _set() -> None:
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+                # The failure also surfaces from submit and flush; don't warn
+                # about futures nobody awaits
+                future.exception()
+            else:
+                future.set_result(entry_hash)  # type: ignore[arg-type]
+
+        loop = future.get_loop()
+        if loop.is_closed():
+            return
+        loop.call_soon_threadsafe(_set)
+
+    def _loop_ref(self) -> asyncio.AbstractEventLoop:
+        """Event loop the sink was started on."""
+        assert self._loop is not None
+        return self._loop
@@ -0,0 +1,316 @@
+"""Audit log checkpoints, sidecar index and span verification."""
+
+import hashlib
+import hmac
+import json
+import os
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+GENESIS_HASH = "0" * 64
+
+# Writer output is canonical JSON (sorted keys, compact separators), so the
+# top-level previous_hash is the last occurrence of this marker in a line:
+# only string fields (result, timestamp) sort after it, and any quote inside
+# them is escaped.
+_PREVIOUS_HASH_MARKER = b'"previous_hash":"'
+_CHECKPOINT_MARKER = b'"event_type":"checkpoint"'
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    Position of a chain-anchored record in the log.
+
+    ``offset`` is the byte offset just past the record's line, ``length``
+    the line's size including its newline, ``lines`` the number of physical
+    lines up to and including it, ``hash`` the record's chain hash and
+    ``timestamp`` its entry timestamp (used as a sparse time index).
+    """
+
+    sequence: int
+    lines: int
+    offset: int
+    length: int
+    hash: str
+    timestamp: str = ""
+
+
+class CheckpointIndex:
+    """
+    Sidecar files that let verification skip already-verified work.
+
+    ``<log>.idx`` holds one JSON line per checkpoint record written into the
+    log (plus, for a log that predates the index, one for its last entry at
+    the time it was first opened); ``<log>.verified`` holds the position up
+    to which the chain was last verified. Neither is trusted blindly: spans are always re-anchored
+    against the hashes in the log itself.
+    """
+
+    def __init__(self, log_path: Path):
+        """
+        Initialize checkpoint index.
+
+        Args:
+            log_path: Path to the audit log the index describes
+        """
+        self.index_path = log_path.with_name(log_path.name + ".idx")
+        self.verified_path = log_path.with_name(log_path.name + ".verified")
+
+    def load(self, max_offset: Optional[int] = None) -> list[Checkpoint]:
+        """
+        Load checkpoints, skipping any beyond ``max_offset``.
+
+        Entries past the end of the log, unreadable lines and entries that
+        do not advance both sequence and offset are ignored; later valid
+        entries are still returned.
+        """
+        if not self.index_path.exists():
+            return []
+
+        checkpoints: list[Checkpoint] = []
+        with open(self.index_path, "r") as f:
+            for line in f:
+                try:
+                    checkpoint = Checkpoint(**json.loads(line))
+                except (json.JSONDecodeError, TypeError):
+                    continue
+                if max_offset is not None and checkpoint.offset > max_offset:
+                    continue
+                if checkpoints and (
+                    checkpoint.sequence <= checkpoints[-1].sequence
+                    or checkpoint.offset <= checkpoints[-1].offset
+                ):
+                    continue
+                checkpoints.append(checkpoint)
+        return checkpoints
+
+    def repair(self, log_path: Path, genesis_hash: str = GENESIS_HASH) -> list[Checkpoint]:
+        """
+        Drop trailing entries that no longer anchor into the log.
+
+        Walks back from the newest entry until one's line still has its
+        recorded hash; entries after it (past EOF, or describing records
+        lost in a crash) are removed from the sidecar. Entries are only
+        indexed once their record is durable, so everything before the
+        first valid entry was checked by an earlier repair.
+
+        Returns:
+            The remaining checkpoints
+        """
+        if not self.index_path.exists():
+            return []
+
+        size = log_path.stat().st_size if log_path.exists() else 0
+        checkpoints = self.load(max_offset=size)
+        while checkpoints and not anchor_matches(log_path, checkpoints[-1], genesis_hash):
+            checkpoints.pop()
+
+        with open(self.index_path, "r") as f:
+            indexed = sum(1 for _ in f)
+        if len(checkpoints) != indexed:
+            self._rewrite(checkpoints)
+            logger.warning(
+                "audit_checkpoint_index_repaired",
+                kept=len(checkpoints),
+                dropped=indexed - len(checkpoints),
+            )
+        return checkpoints
+
+    def last(self, max_offset: Optional[int] = None) -> Optional[Checkpoint]:
+        """Most recent checkpoint within ``max_offset``."""
+        checkpoints = self.load(max_offset)
+        return checkpoints[-1] if checkpoints else None
+
+    def append(self, checkpoint: Checkpoint) -> None:
+        """Record a new checkpoint; its record must already be durable in the log."""
+        with open(self.index_path, "a") as f:
+            f.write(json.dumps(asdict(checkpoint), separators=(",", ":")) + "\n")
+
+    def _rewrite(self, checkpoints: list[Checkpoint]) -> None:
+        """Atomically replace the index with ``checkpoints``."""
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            for checkpoint in checkpoints:
+                f.write(json.dumps(asdict(checkpoint), separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    def load_verified(self) -> Optional[Checkpoint]:
+        """Position the chain was last verified up to, if recorded."""
+        try:
+            with open(self.verified_path, "r") as f:
+                return Checkpoint(**json.load(f))
+        except (OSError, json.JSONDecodeError, TypeError):
+            return None
+
+    def save_verified(self, checkpoint: Checkpoint) -> None:
+        """Atomically record the verified position."""
+        tmp_path = self.verified_path.with_name(self.verified_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(checkpoint), f, separators=(",", ":"))
+        os.replace(tmp_path, self.verified_path)
+
+
+def sign_checkpoint(key: bytes, sequence: int, anchor: str) -> str:
+    """HMAC-SHA256 signature binding a checkpoint sequence to its anchor hash."""
+    return hmac.new(key, f"{sequence}:{anchor}".encode(), hashlib.sha256).hexdigest()
+
+
+def anchor_matches(
+    log_path: Path,
+    checkpoint: Checkpoint,
+    genesis_hash: str = GENESIS_HASH,
+) -> bool:
+    """Check that the line ending at ``checkpoint.offset`` has its recorded hash."""
+    if checkpoint.offset == 0:
+        return checkpoint.hash == genesis_hash
+    if checkpoint.length <= 0 or checkpoint.length > checkpoint.offset:
+        return False
+
+    with open(log_path, "rb") as f:
+        f.seek(checkpoint.offset - checkpoint.length)
+        raw = f.read(checkpoint.length)
+
+    if not raw.endswith(b"\n"):
+        return False
+    try:
+        return _hash_line(raw[:-1])[1] == checkpoint.hash
+    except ValueError:
+        # Not a whole record: the offset points into the middle of a line
+        return False
+
+
+def verify_span(
+    log_path: Path | str,
+    start: int,
+    end: int,
+    previous_hash: str,
+    first_line: int = 1,
+    checkpoint_key: Optional[bytes] = None,
+) -> Checkpoint:
+    """
+    Verify the hash chain over bytes ``[start, end)`` of the log.
+
+    ``start`` must be at a line boundary and ``previous_hash`` the chain hash
+    of the record just before it. Module-level so it can run in worker
+    processes.
+
+    Returns:
+        Checkpoint describing the last line of the span (sequence 0)
+
+    Raises:
+        ValueError: If tampering detected
+    """
+    with open(log_path, "rb") as f:
+        f.seek(start)
+        verified = verify_lines(
+            _read_until(f, end - start), previous_hash, first_line, checkpoint_key
+        )
+
+    return Checkpoint(
+        sequence=0,
+        lines=verified.lines,
+        offset=start + verified.offset,
+        length=verified.length,
+        hash=verified.hash,
+    )
+
+
+def verify_lines(
+    lines: Iterable[bytes],
+    previous_hash: str,
+    first_line: int = 1,
+    checkpoint_key: Optional[bytes] = None,
+) -> Checkpoint:
+    """
+    Verify the hash chain over an iterable of raw log lines.
+
+    Lines are hashed as written, which for writer output equals hashing the
+    canonical re-serialization; lines not in canonical form fall back to
+    ``json.loads``/``json.dumps``.
+
+    Returns:
+        Checkpoint with the final hash, line count and bytes consumed
+
+    Raises:
+        ValueError: If tampering detected
+    """
+    line_num = first_line - 1
+    offset = 0
+    length = 0
+
+    for line in lines:
+        line_num += 1
+        offset += len(line)
+        length = len(line)
+
+        raw = line.rstrip(b"\r\n")
+        if not raw.strip():
+            continue
+
+        stored_previous, computed_hash = _hash_line(raw, line_num)
+
+        # Verify hash chain
+        if stored_previous != previous_hash:
+            raise ValueError(
+                f"Line {line_num}: Chain broken. "
+                f"Expected previous_hash={previous_hash}, "
+                f"got {stored_previous}"
+            )
+
+        if checkpoint_key is not None and _CHECKPOINT_MARKER in raw:
+            _verify_checkpoint_signature(raw, line_num, checkpoint_key)
+
+        previous_hash = computed_hash
+
+    return Checkpoint(sequence=0, lines=line_num, offset=offset, length=length, hash=previous_hash)
+
+
+def _read_until(f: IO[bytes], limit: int) -> Iterator[bytes]:
+    """Yield lines from ``f`` until ``limit`` bytes have been consumed."""
+    consumed = 0
+    while consumed < limit:
+        line = f.readline()
+        if not line:
+            return
+        consumed += len(line)
+        yield line
+
+
+def _hash_line(raw: bytes, line_num: int = 0) -> tuple[Optional[str], str]:
+    """Return ``(previous_hash, entry_hash)`` for one log line."""
+    marker = raw.rfind(_PREVIOUS_HASH_MARKER)
+    if marker != -1 and raw[:1] == b"{" and raw[-1:] == b"}":
+        start = marker + len(_PREVIOUS_HASH_MARKER)
+        if raw[start + 64 : start + 65] == b'"':
+            return raw[start : start + 64].decode(), hashlib.sha256(raw).hexdigest()
+
+    try:
+        entry = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Line {line_num}: Invalid JSON - {e}") from e
+
+    entry_json = json.dumps(entry, separators=(",", ":"), sort_keys=True)
+    return entry.get("previous_hash"), hashlib.sha256(entry_json.encode()).hexdigest()
+
+
+def _verify_checkpoint_signature(raw: bytes, line_num: int, key: bytes) -> None:
+    """Check a checkpoint record's anchor and HMAC signature."""
+    entry = json.loads(raw)
+    details = entry.get("details", {})
+    anchor = details.get("anchor")
+
+    if anchor != entry.get("previous_hash"):
+        raise ValueError(f"Line {line_num}: Checkpoint anchor does not match chain")
+
+    expected = sign_checkpoint(key, details.get("sequence", 0), anchor)
+    if not hmac.compare_digest(expected, details.get("signature", "")):
+        raise ValueError(f"Line {line_num}: Checkpoint signature invalid")
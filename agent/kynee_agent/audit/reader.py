@@ -0,0 +1,431 @@
+"""Streaming, indexed queries over the audit log."""
+
+import bisect
+import json
+import os
+from collections.abc import Iterator
+from contextlib import ExitStack
+from datetime import datetime
+from datetime import timezone
+from itertools import chain
+from pathlib import Path
+from typing import IO, Any, Optional
+
+import structlog
+
+from kynee_agent.audit.checkpoint import CheckpointIndex
+from kynee_agent.audit.segments import Segment
+from kynee_agent.audit.segments import SegmentManifest
+
+logger = structlog.get_logger(__name__)
+
+# Block size for reading the log backwards from EOF
+_TAIL_BLOCK_SIZE = 64 * 1024
+# Length of a writer timestamp: YYYY-MM-DDTHH:MM:SS.ffffffZ
+_TIMESTAMP_LENGTH = 27
+
+
+class AuditLogReader:
+    """
+    Generator-based reader over a hash-chained audit log.
+
+    Entries are parsed lazily, one line at a time, forwards or backwards
+    from EOF, so fetching the last N entries costs O(N) regardless of log
+    size. Two sidecar indexes bound the bytes a filtered query touches:
+
+    - the writer's checkpoint index (``<log>.idx``) doubles as a sparse
+      timestamp -> byte offset index for ``since``/``until`` queries
+    - ``<log>.scans`` maps ``scan_id`` to the byte offsets of its entries;
+      the reader keeps it up to date incrementally, indexing only lines
+      appended since its last update
+
+    Sealed segments of a rotated log (see ``SegmentManifest``) are read
+    transparently before the active file; segments whose time span misses a
+    ``since``/``until`` range are skipped without being opened. They have no
+    scan index, so ``scan_id`` queries stream them with a raw-bytes
+    pre-filter.
+
+    Time-range pruning assumes entry timestamps never decrease, which holds
+    for a single writer.
+    """
+
+    def __init__(self, log_path: Path | str):
+        """
+        Initialize audit log reader.
+
+        Args:
+            log_path: Path to audit log file
+        """
+        self.log_path = Path(log_path)
+        self.checkpoints = CheckpointIndex(self.log_path)
+        self.segments = SegmentManifest(self.log_path)
+        self.scan_index_path = self.log_path.with_name(self.log_path.name + ".scans")
+
+        self._scan_offsets: dict[str, list[int]] = {}
+        self._scan_covered = -1
+
+    def iter_entries(
+        self,
+        event_type: Optional[str] = None,
+        actor: Optional[str] = None,
+        since: Optional[datetime | str] = None,
+        until: Optional[datetime | str] = None,
+        scan_id: Optional[str] = None,
+        reverse: bool = False,
+        include_checkpoints: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yield entries matching all given filters.
+
+        Checkpoint records are chain bookkeeping written by the writer, not
+        audited events, so they are left out unless ``include_checkpoints``
+        is set or ``event_type="checkpoint"`` asks for them.
+
+        Args:
+            event_type: Only entries of this event type
+            actor: Only entries by this actor
+            since: Only entries at or after this time (UTC)
+            until: Only entries at or before this time (UTC)
+            scan_id: Only entries whose details carry this scan_id
+            reverse: Yield newest first
+            include_checkpoints: Also yield checkpoint records
+
+        Yields:
+            Parsed audit entries
+        """
+        since_key = _timestamp_key(since)
+        until_key = _timestamp_key(until)
+        prefilters = [
+            p
+            for p in (_field_marker("event_type", event_type), _field_marker("actor", actor))
+            if p is not None
+        ]
+        skip_checkpoints = not include_checkpoints and event_type != "checkpoint"
+
+        with ExitStack() as stack:
+            lines = self._candidate_lines(stack, prefilters, since_key, until_key, scan_id, reverse)
+            for raw in lines:
+                if not raw.strip() or any(p not in raw for p in prefilters):
+                    continue
+
+                entry = json.loads(raw)
+                position = _time_position(entry, since_key, until_key)
+                if position:
+                    # Timestamps never decrease, so leaving the range ends the scan
+                    if (position > 0) != reverse:
+                        return
+                    continue
+                if _entry_matches(entry, event_type, actor, scan_id, skip_checkpoints):
+                    yield entry
+
+    def _candidate_lines(
+        self,
+        stack: ExitStack,
+        prefilters: list[bytes],
+        since: Optional[str],
+        until: Optional[str],
+        scan_id: Optional[str],
+        reverse: bool,
+    ) -> Iterator[bytes]:
+        """Lines of the segments overlapping the time range and the active log, in order."""
+        segments = [
+            segment
+            for segment in self.segments.load()
+            if (
+                since is None
+                or not segment.last_timestamp
+                or _normalize_timestamp(segment.last_timestamp) >= since
+            )
+            and (until is None or _normalize_timestamp(segment.first_timestamp) <= until)
+        ]
+        segment_prefilters = list(prefilters)
+        if scan_id is not None:
+            segment_prefilters.append(_field_marker("scan_id", scan_id))  # type: ignore[arg-type]
+
+        if self.log_path.exists():
+            f = stack.enter_context(open(self.log_path, "rb"))
+            active = self._active_lines(f, since, until, scan_id, reverse)
+        else:
+            active = iter(())
+
+        if reverse:
+            return chain(
+                active,
+                *(self._segment_lines_reversed(s, segment_prefilters) for s in reversed(segments)),
+            )
+        return chain(
+            *(self._segment_lines(s, segment_prefilters) for s in segments),
+            active,
+        )
+
+    def reset(self) -> None:
+        """Forget cached index state (after the active log was rotated)."""
+        self._scan_offsets.clear()
+        self._scan_covered = -1
+
+    def _active_lines(
+        self,
+        f: IO[bytes],
+        since: Optional[str],
+        until: Optional[str],
+        scan_id: Optional[str],
+        reverse: bool,
+    ) -> Iterator[bytes]:
+        """Candidate lines of the active log, using the sidecar indexes."""
+        size = f.seek(0, os.SEEK_END)
+        start, end = self._time_bounds(since, until, size)
+
+        if scan_id is not None:
+            offsets = self._offsets_for_scan(scan_id, f, size)
+            lo = bisect.bisect_left(offsets, start)
+            hi = bisect.bisect_left(offsets, end)
+            return self._lines_at(f, offsets[lo:hi], reverse)
+        if reverse:
+            return self._lines_reversed(f, start, end)
+        return self._lines_forward(f, start, end)
+
+    def _segment_lines(self, segment: Segment, prefilters: list[bytes]) -> Iterator[bytes]:
+        """Lines of a sealed segment passing the raw pre-filters, oldest first."""
+        for line in self.segments.iter_lines(segment):
+            if all(p in line for p in prefilters):
+                yield line
+
+    def _segment_lines_reversed(
+        self,
+        segment: Segment,
+        prefilters: list[bytes],
+    ) -> Iterator[bytes]:
+        """Lines of a sealed segment, newest first (compressed data is read forward)."""
+        yield from reversed(list(self._segment_lines(segment, prefilters)))
+
+    def tail(self, count: int, **filters: Any) -> list[dict[str, Any]]:
+        """
+        Return the last ``count`` matching entries, oldest first.
+
+        Args:
+            count: Maximum number of entries
+            **filters: Filters accepted by ``iter_entries``
+
+        Returns:
+            List of audit entries
+        """
+        entries = []
+        for entry in self.iter_entries(reverse=True, **filters):
+            entries.append(entry)
+            if len(entries) >= count:
+                break
+        entries.reverse()
+        return entries
+
+    def _time_bounds(
+        self,
+        since: Optional[str],
+        until: Optional[str],
+        size: int,
+    ) -> tuple[int, int]:
+        """Narrow ``[0, size)`` to the checkpoint spans that can match."""
+        start, end = 0, size
+        if since is None and until is None:
+            return start, end
+
+        for checkpoint in self.checkpoints.load(max_offset=size):
+            if not checkpoint.timestamp:
+                continue
+            timestamp = _normalize_timestamp(checkpoint.timestamp)
+            if since is not None and timestamp < since:
+                start = checkpoint.offset
+            if until is not None and timestamp > until:
+                end = checkpoint.offset
+                break
+        return start, end
+
+    def _offsets_for_scan(self, scan_id: str, f: IO[bytes], size: int) -> list[int]:
+        """Byte offsets of entries for ``scan_id``, updating the index first."""
+        self._update_scan_index(f, size)
+        return self._scan_offsets.get(scan_id, [])
+
+    def _update_scan_index(self, f: IO[bytes], size: int) -> None:
+        """Index scan_ids of lines appended since the last update."""
+        if self._scan_covered < 0:
+            self._load_scan_index()
+        if self._scan_covered > size:
+            # Log was truncated (e.g. torn tail quarantined); rebuild
+            self._scan_offsets.clear()
+            self._scan_covered = 0
+            self.scan_index_path.unlink(missing_ok=True)
+        if self._scan_covered == size:
+            return
+
+        added = []
+        offset = self._scan_covered
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            if b'"scan_id"' in line:
+                scan_id = json.loads(line).get("details", {}).get("scan_id")
+                if isinstance(scan_id, str):
+                    self._scan_offsets.setdefault(scan_id, []).append(offset)
+                    added.append(f"{scan_id}\t{offset}\n")
+            offset += len(line)
+
+        self._scan_covered = offset
+        with open(self.scan_index_path, "a") as idx:
+            idx.write("".join(added) + f"#{offset}\n")
+
+        logger.debug("audit_scan_index_updated", indexed=len(added), covered=offset)
+
+    def _load_scan_index(self) -> None:
+        """Load the scan index sidecar; lines after the last marker are dropped."""
+        self._scan_offsets.clear()
+        self._scan_covered = 0
+        if not self.scan_index_path.exists():
+            return
+
+        staged: list[tuple[str, int]] = []
+        with open(self.scan_index_path, "r") as idx:
+            for line in idx:
+                line = line.rstrip("\n")
+                if line.startswith("#"):
+                    for scan_id, offset in staged:
+                        self._scan_offsets.setdefault(scan_id, []).append(offset)
+                    staged.clear()
+                    self._scan_covered = int(line[1:])
+                elif "\t" in line:
+                    scan_id, _, offset = line.rpartition("\t")
+                    staged.append((scan_id, int(offset)))
+
+    @staticmethod
+    def _lines_forward(f: IO[bytes], start: int, end: int) -> Iterator[bytes]:
+        """Yield complete lines in ``[start, end)``."""
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                return
+            offset += len(line)
+            yield line
+
+    @staticmethod
+    def _lines_reversed(f: IO[bytes], start: int, end: int) -> Iterator[bytes]:
+        """Yield complete lines in ``[start, end)``, last first."""
+        for offset, raw, terminated in _reverse_lines(f, end=end):
+            if offset < start:
+                return
+            if terminated:
+                yield raw
+
+    @staticmethod
+    def _lines_at(f: IO[bytes], offsets: list[int], reverse: bool) -> Iterator[bytes]:
+        """Yield the lines starting at each offset."""
+        for offset in reversed(offsets) if reverse else offsets:
+            f.seek(offset)
+            yield f.readline()
+
+
+def _timestamp_key(value: Optional[datetime | str]) -> Optional[str]:
+    """Normalize a time bound to the log's ISO 8601 'Z' timestamp format."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return _normalize_timestamp(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="microseconds") + "Z"
+
+
+def _normalize_timestamp(value: str) -> str:
+    """
+    Pad a stored 'Z' timestamp to microsecond precision.
+
+    Older logs wrote ``datetime.isoformat()`` output, which drops the
+    fraction on whole seconds (``...:05Z``); as a string that sorts after
+    every fractional timestamp of the same second.
+    """
+    if len(value) == _TIMESTAMP_LENGTH or not value.endswith("Z") or "T" not in value:
+        return value
+    base, _, fraction = value[:-1].partition(".")
+    return f"{base}.{fraction[:6].ljust(6, '0')}Z"
+
+
+def _time_position(entry: dict[str, Any], since: Optional[str], until: Optional[str]) -> int:
+    """-1 if ``entry`` is before ``since``, 1 if after ``until``, else 0."""
+    if since is None and until is None:
+        return 0
+    timestamp = _normalize_timestamp(entry.get("timestamp", ""))
+    if since is not None and timestamp < since:
+        return -1
+    if until is not None and timestamp > until:
+        return 1
+    return 0
+
+
+def _entry_matches(
+    entry: dict[str, Any],
+    event_type: Optional[str],
+    actor: Optional[str],
+    scan_id: Optional[str],
+    skip_checkpoints: bool,
+) -> bool:
+    """Whether a parsed entry passes the field filters of ``iter_entries``."""
+    if event_type is not None and entry.get("event_type") != event_type:
+        return False
+    if skip_checkpoints and entry.get("event_type") == "checkpoint":
+        return False
+    if actor is not None and entry.get("actor") != actor:
+        return False
+    return scan_id is None or entry.get("details", {}).get("scan_id") == scan_id
+
+
+def _field_marker(field: str, value: Optional[str]) -> Optional[bytes]:
+    """Raw-bytes form of ``"field":"value"`` for cheap pre-filtering."""
+    if value is None:
+        return None
+    return f'"{field}":{json.dumps(value)}'.encode()
+
+
+def _reverse_lines(
+    f: IO[bytes],
+    block_size: int = _TAIL_BLOCK_SIZE,
+    end: Optional[int] = None,
+) -> Iterator[tuple[int, bytes, bool]]:
+    """
+    Yield ``(offset, line, terminated)`` from the end of a binary file.
+
+    Lines are yielded last first, without their newline; only the first
+    one yielded can be unterminated (a torn final write). ``end`` limits
+    reading to bytes before that offset (EOF if None).
+    """
+    if end is None:
+        end = f.seek(0, os.SEEK_END)
+    pos = end
+    buf = b""
+    terminated = False
+
+    if end:
+        f.seek(end - 1)
+        terminated = f.read(1) == b"\n"
+        if terminated:
+            end -= 1
+            pos = end
+
+    while True:
+        newline = buf.rfind(b"\n")
+        while newline != -1:
+            line_start = pos + newline + 1
+            yield line_start, buf[newline + 1 :], terminated
+            terminated = True
+            buf = buf[:newline]
+            newline = buf.rfind(b"\n")
+
+        if pos == 0:
+            break
+
+        read = min(block_size, pos)
+        pos -= read
+        f.seek(pos)
+        buf = f.read(read) + buf
+
+    if buf:
+        yield 0, buf, terminated
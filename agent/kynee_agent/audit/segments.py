@@ -0,0 +1,197 @@
+"""Sealed audit log segments, their manifest and cold-storage compression."""
+
+import gzip
+import io
+import json
+import os
+from collections.abc import Iterator
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import replace
+from pathlib import Path
+from typing import IO, Optional
+
+import structlog
+
+from kynee_agent.audit.checkpoint import GENESIS_HASH
+from kynee_agent.audit.checkpoint import verify_lines
+
+try:  # Optional: better ratio and speed than gzip for cold segments
+    import zstandard
+except ImportError:  # pragma: no cover - exercised when zstandard is absent
+    zstandard = None
+
+logger = structlog.get_logger(__name__)
+
+_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+@dataclass(frozen=True)
+class Segment:
+    """
+    A sealed, read-only slice of the audit chain.
+
+    ``first_hash`` is the ``previous_hash`` of the segment's first entry (the
+    prior segment's ``last_hash``), so chain continuity across segments can
+    be checked from the manifest alone.
+    """
+
+    number: int
+    file: str
+    first_hash: str
+    last_hash: str
+    lines: int
+    first_timestamp: str = ""
+    last_timestamp: str = ""
+    codec: Optional[str] = None
+    verified: bool = False
+
+
+class SegmentManifest:
+    """
+    Append-only manifest (``<log>.segments``) of sealed segments.
+
+    Each state change appends a full record; the last record for a segment
+    number wins, so updates never rewrite the file.
+    """
+
+    def __init__(self, log_path: Path):
+        """
+        Initialize segment manifest.
+
+        Args:
+            log_path: Path to the active audit log
+        """
+        self.log_path = log_path
+        self.manifest_path = log_path.with_name(log_path.name + ".segments")
+
+    def load(self) -> list[Segment]:
+        """Sealed segments, oldest first."""
+        if not self.manifest_path.exists():
+            return []
+
+        segments: dict[int, Segment] = {}
+        with open(self.manifest_path, "r") as f:
+            for line in f:
+                try:
+                    segment = Segment(**json.loads(line))
+                except (json.JSONDecodeError, TypeError):
+                    continue
+                segments[segment.number] = segment
+        return [segments[n] for n in sorted(segments)]
+
+    def last(self) -> Optional[Segment]:
+        """Most recently sealed segment."""
+        segments = self.load()
+        return segments[-1] if segments else None
+
+    def append(self, segment: Segment) -> None:
+        """Record a new segment or a state change of an existing one."""
+        with open(self.manifest_path, "a") as f:
+            f.write(json.dumps(asdict(segment), separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def segment_path(self, segment: Segment) -> Path:
+        """Current on-disk path of a segment (compressed once sealing finishes)."""
+        plain = self.log_path.with_name(segment.file)
+        # Check compressed copies first: the manifest may lag a background seal
+        for suffix in _SUFFIXES.values():
+            compressed = plain.with_name(plain.name + suffix)
+            if compressed.exists():
+                return compressed
+        return plain
+
+    def open_segment(self, segment: Segment) -> IO[bytes]:
+        """Open a segment for binary line reading, decompressing transparently."""
+        path = self.segment_path(segment)
+        if path.suffix == ".gz":
+            return gzip.open(path, "rb")  # type: ignore[return-value]
+        if path.suffix == ".zst":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read .zst audit segments")
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")))
+        return open(path, "rb")
+
+    def iter_lines(self, segment: Segment) -> Iterator[bytes]:
+        """Yield a segment's raw lines, oldest first."""
+        with self.open_segment(segment) as f:
+            yield from f
+
+    def seal(
+        self,
+        segment: Segment,
+        codec: Optional[str],
+        checkpoint_key: Optional[bytes] = None,
+    ) -> Segment:
+        """
+        Verify and (optionally) compress a freshly rotated segment.
+
+        Compression writes to a temporary file that is renamed into place
+        before the plain file is removed, so readers always find a complete
+        copy. Runs on a background thread, and is safe to rerun on a segment
+        whose seal was interrupted: a compressed copy already renamed into
+        place is kept rather than compressed again.
+        """
+        verified = verify_lines(
+            self.iter_lines(segment), segment.first_hash, checkpoint_key=checkpoint_key
+        )
+        if verified.hash != segment.last_hash:
+            raise ValueError(f"Segment {segment.file}: final hash mismatch")
+
+        sealed = replace(segment, verified=True)
+        plain = self.log_path.with_name(segment.file)
+        current = self.segment_path(segment)
+        if current != plain:
+            # An interrupted seal already renamed its compressed copy into place
+            sealed = replace(sealed, codec=_codec_for(current))
+        elif codec is not None:
+            target = plain.with_name(plain.name + _SUFFIXES[codec])
+            tmp = target.with_name(target.name + ".tmp")
+            _compress(plain, tmp, codec)
+            os.replace(tmp, target)
+            sealed = replace(sealed, codec=codec)
+
+        self.append(sealed)
+        if sealed.codec is not None:
+            plain.unlink(missing_ok=True)
+
+        logger.info("audit_segment_sealed", segment=segment.file, codec=sealed.codec)
+        return sealed
+
+
+def resolve_codec(compression: Optional[str]) -> Optional[str]:
+    """Validate a compression setting, falling back to gzip without zstandard."""
+    if compression is None:
+        return None
+    if compression not in _SUFFIXES:
+        raise ValueError(f"Unsupported segment compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        logger.warning("zstandard_unavailable_using_gzip")
+        return "gzip"
+    return compression
+
+
+def _codec_for(path: Path) -> str:
+    """Codec of a compressed segment file, from its suffix."""
+    return next(codec for codec, suffix in _SUFFIXES.items() if path.name.endswith(suffix))
+
+
+def genesis_for(segments: list[Segment]) -> str:
+    """Chain hash the active segment continues from."""
+    return segments[-1].last_hash if segments else GENESIS_HASH
+
+
+def _compress(source: Path, target: Path, codec: str) -> None:
+    """Stream-compress ``source`` into ``target`` and fsync it."""
+    with open(source, "rb") as src, open(target, "wb") as raw:
+        if codec == "zstd":
+            with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as dst:
+                while chunk := src.read(1 << 20):
+                    dst.write(chunk)
+        else:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as dst:
+                while chunk := src.read(1 << 20):
+                    dst.write(chunk)
+        raw.flush()
+        os.fsync(raw.fileno())
@@ -1,15 +1,41 @@
 """Hash-chained append-only audit logger."""
 
+import atexit
 import hashlib
 import json
+import os
+import threading
+import time
+import weakref
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import IO, Any, Optional
 
 import structlog
 
+from kynee_agent.audit.checkpoint import GENESIS_HASH
+from kynee_agent.audit.checkpoint import Checkpoint
+from kynee_agent.audit.checkpoint import CheckpointIndex
+from kynee_agent.audit.checkpoint import anchor_matches
+from kynee_agent.audit.checkpoint import sign_checkpoint
+from kynee_agent.audit.checkpoint import verify_lines
+from kynee_agent.audit.checkpoint import verify_span
+from kynee_agent.audit.reader import AuditLogReader
+from kynee_agent.audit.reader import _reverse_lines
+from kynee_agent.audit.segments import Segment
+from kynee_agent.audit.segments import SegmentManifest
+from kynee_agent.audit.segments import genesis_for
+from kynee_agent.audit.segments import resolve_codec
+from kynee_agent.metrics import AUDIT_WRITE_SECONDS
+
 logger = structlog.get_logger(__name__)
 
+# Lines counted at startup in a log without checkpoints before it is
+# treated as predating the index (when checkpoints are off)
+_UNINDEXED_SCAN_LINES = 1000
+
 
 class AuditLogWriter:
     """
@@ -28,22 +54,110 @@ class AuditLogWriter:
     - Cryptographic chaining with SHA256
     - JSON output for downstream analysis
     - Tamper-evident log integrity verification
+
+    By default every event opens the log, appends one line and closes it.
+    With ``group_commit=True`` the writer keeps the file open and buffers
+    entries from concurrent callers, writing (and optionally fsyncing) them
+    together once ``flush_max_entries`` are pending or the oldest pending
+    entry is ``flush_interval`` seconds old. Hashes are still computed and
+    returned synchronously under a lock, so chain order always matches file
+    order. Call ``flush()`` for an explicit durability point and ``close()``
+    when done.
+
+    Every ``checkpoint_interval`` entries a ``checkpoint`` record anchoring
+    the current chain hash (HMAC-signed when ``checkpoint_key`` is set) is
+    appended and, once that record is on disk, its byte offset recorded in
+    a ``.idx`` sidecar. This lets ``verify_incremental()`` check only
+    entries added since the last verification and ``verify_range()`` check
+    spans between checkpoints in parallel worker processes.
+
+    With ``segment_max_bytes`` or ``segment_max_age`` set, the active log is
+    rotated into numbered sealed segments (``<log>.000001``, ...) listed in
+    a ``.segments`` manifest. The chain continues across segments: the new
+    active log's first ``previous_hash`` is the sealed segment's final hash.
+    Sealed segments are verified and compressed on a background thread;
+    reads and full verification span all segments transparently.
     """
 
-    def __init__(self, log_path: Path | str):
+    def __init__(
+        self,
+        log_path: Path | str,
+        group_commit: bool = False,
+        flush_max_entries: int = 64,
+        flush_interval: float = 0.05,
+        fsync: bool = True,
+        checkpoint_interval: int = 1000,
+        checkpoint_key: Optional[bytes] = None,
+        segment_max_bytes: int = 0,
+        segment_max_age: float = 0.0,
+        compression: Optional[str] = "gzip",
+    ):
         """
         Initialize audit log writer.
 
         Args:
             log_path: Path to audit log file
+            group_commit: Buffer entries and write them in batches
+            flush_max_entries: Pending entries that trigger a group commit
+            flush_interval: Maximum seconds an entry may stay buffered
+            fsync: fsync the log on every group commit
+            checkpoint_interval: Entries between checkpoint records (0 = off)
+            checkpoint_key: HMAC key for signing checkpoint records
+            segment_max_bytes: Rotate once the active log reaches this size (0 = off)
+            segment_max_age: Rotate once the active log is this many seconds old (0 = off)
+            compression: Codec for sealed segments ('gzip', 'zstd' or None)
         """
         self.log_path = Path(log_path)
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
-        self.previous_hash = "0" * 64  # Initial hash (all zeros)
+        self.previous_hash = GENESIS_HASH  # Initial hash (all zeros)
+
+        self.group_commit = group_commit
+        self.flush_max_entries = max(1, flush_max_entries)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.checkpoint_interval = max(0, checkpoint_interval)
+        self.checkpoint_key = checkpoint_key
+        self.checkpoints = CheckpointIndex(self.log_path)
+        self.segments = SegmentManifest(self.log_path)
+        self.reader = AuditLogReader(self.log_path)
+        self.segment_max_bytes = max(0, segment_max_bytes)
+        self.segment_max_age = max(0.0, segment_max_age)
+        self.compression = resolve_codec(compression)
+
+        self._lock = threading.RLock()
+        self._pending: list[str] = []
+        self._pending_since = 0.0
+        self._file: Optional[IO[str]] = None
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._sealers: list[threading.Thread] = []
 
         # Load existing log to determine last hash
+        self._recover_rotation()
+        self._reseal_interrupted()
+        self._genesis_hash = genesis_for(self.segments.load())
+        self.previous_hash = self._genesis_hash
         if self.log_path.exists():
             self._reload_last_hash()
+        self._load_position()
+
+        if self.group_commit:
+            self._flusher = threading.Thread(
+                target=_flush_periodically,
+                args=(weakref.ref(self), self._closed, self.flush_interval),
+                name="kynee-audit-flush",
+                daemon=True,
+            )
+            self._flusher.start()
+            atexit.register(_close_at_exit, weakref.ref(self))
+
+    def __enter__(self) -> "AuditLogWriter":
+        """Use writer as a context manager (closes on exit)."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Flush and close on context exit."""
+        self.close()
 
     def log_event(
         self,
@@ -66,21 +180,41 @@ class AuditLogWriter:
         Returns:
             SHA256 hash of this entry (for verification)
         """
-        timestamp = datetime.utcnow().isoformat() + "Z"
-
         # Build entry
-        entry = {
-            "timestamp": timestamp,
+        entry: dict[str, Any] = {
             "event_type": event_type,
             "actor": actor,
             "action": action,
             "result": result,
-            "previous_hash": self.previous_hash,
         }
 
         if details:
             entry["details"] = details
 
+        with AUDIT_WRITE_SECONDS.time(), self._lock:
+            entry_hash = self._append(entry)
+            if self.checkpoint_interval and self._since_checkpoint >= self.checkpoint_interval:
+                self._write_checkpoint()
+            if self._rotation_due():
+                self._rotate()
+
+        logger.info(
+            "audit_logged",
+            event_type=event_type,
+            result=result,
+            entry_hash=entry_hash[:16],
+        )
+
+        return entry_hash
+
+    def _append(self, entry: dict[str, Any]) -> str:
+        """Chain, serialize and write one entry. Caller must hold the lock."""
+        # Timestamp and chain to the current tail under the lock so
+        # concurrent callers get correctly ordered entries
+        entry["timestamp"] = datetime.utcnow().isoformat(timespec="microseconds") + "Z"
+        entry["previous_hash"] = self.previous_hash
+        self._last_timestamp = entry["timestamp"]
+
         # Serialize deterministically for hashing
         entry_json = json.dumps(entry, separators=(",", ":"), sort_keys=True)
 
@@ -90,18 +224,263 @@ class AuditLogWriter:
         # Update previous hash for next entry
         self.previous_hash = entry_hash
 
-        # Append to log (append mode ensures atomicity)
-        with open(self.log_path, "a") as f:
-            f.write(entry_json + "\n")
+        line = entry_json + "\n"
+        if self.group_commit and not self._closed.is_set():
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append(line)
+            if len(self._pending) >= self.flush_max_entries:
+                self._write_pending()
+        else:
+            # Append to log (append mode ensures atomicity)
+            with open(self.log_path, "a") as f:
+                f.write(line)
+
+        # Serialized JSON is ASCII, so characters equal bytes
+        if not self._first_timestamp:
+            self._first_timestamp = entry["timestamp"]
+        self._offset += len(line)
+        self._lines += 1
+        self._since_checkpoint += 1
+        self._last_length = len(line)
 
-        logger.info(
-            "audit_logged",
-            event_type=event_type,
-            result=result,
-            entry_hash=entry_hash[:16],
+        return entry_hash
+
+    def _write_checkpoint(self) -> None:
+        """Append a checkpoint record and index it. Caller must hold the lock."""
+        sequence = self._sequence + 1
+        details: dict[str, Any] = {
+            "sequence": sequence,
+            "lines": self._lines,
+            "anchor": self.previous_hash,
+        }
+        if self.checkpoint_key is not None:
+            details["signature"] = sign_checkpoint(
+                self.checkpoint_key, sequence, self.previous_hash
+            )
+
+        checkpoint_hash = self._append(
+            {
+                "event_type": "checkpoint",
+                "actor": "system",
+                "action": "checkpoint",
+                "result": "success",
+                "details": details,
+            }
         )
 
-        return entry_hash
+        # Indexed only once the record is durable: an index entry for a
+        # buffered record lost in a crash would point at unrelated bytes
+        self._unindexed.append(
+            Checkpoint(
+                sequence=sequence,
+                lines=self._lines,
+                offset=self._offset,
+                length=self._last_length,
+                hash=checkpoint_hash,
+                timestamp=self._last_timestamp,
+            )
+        )
+        if not self._pending:
+            # Written directly: sync it now rather than at the next group commit
+            self._sync_log()
+            self._index_checkpoints()
+        self._sequence = sequence
+        self._since_checkpoint = 0
+
+        logger.debug("audit_checkpoint", sequence=sequence, lines=self._lines)
+
+    def _sync_log(self) -> None:
+        """fsync the log file (if ``fsync`` is enabled). Caller must hold the lock."""
+        if not self.fsync or not self.log_path.exists():
+            return
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            return
+        with open(self.log_path, "rb") as f:
+            os.fsync(f.fileno())
+
+    def _index_checkpoints(self) -> None:
+        """Index checkpoints whose records are now in the log. Caller must hold the lock."""
+        for checkpoint in self._unindexed:
+            self.checkpoints.append(checkpoint)
+        self._unindexed.clear()
+
+    def _load_position(self) -> None:
+        """
+        Restore offset and line counters from the last indexed checkpoint.
+
+        Only lines written since that checkpoint are counted. A log with
+        no checkpoint is counted from the start up to one checkpoint
+        interval; a longer one predates the index, so its tail is found by
+        seeking back from EOF and its last line is indexed, making later
+        starts just as cheap. Line numbers in such a log count from that
+        line.
+        """
+        self._unindexed = []
+        size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        repaired = self.checkpoints.repair(self.log_path, self._genesis_hash)
+        last = repaired[-1] if repaired else None
+
+        self._sequence = last.sequence if last else 0
+        self._lines = last.lines if last else 0
+        self._offset = size
+        self._last_length = 0
+        self._last_timestamp = ""
+        self._first_timestamp = ""
+        self._since_checkpoint = 0
+        self._opened_at = time.monotonic()
+
+        if size == 0:
+            return
+
+        with open(self.log_path, "rb") as f:
+            first = f.readline()
+        if first.endswith(b"\n"):
+            self._first_timestamp = json.loads(first).get("timestamp", "")
+
+        limit = None if last else self.checkpoint_interval or _UNINDEXED_SCAN_LINES
+        with open(self.log_path, "rb") as f:
+            f.seek(last.offset if last else 0)
+            for line in f:
+                if limit is not None and self._since_checkpoint >= limit:
+                    self._load_tail_position()
+                    return
+                self._lines += 1
+                self._since_checkpoint += 1
+                self._last_length = len(line)
+
+    def _load_tail_position(self) -> None:
+        """
+        Position an unindexed log from its last line and index that line.
+
+        Only the ``.idx`` sidecar is written: opening a log, for instance
+        just to verify it, must not append records to it.
+        """
+        self._lines = 0
+        self._since_checkpoint = 0
+        with open(self.log_path, "rb") as f:
+            for offset, raw, terminated in _reverse_lines(f):
+                if terminated and raw.strip():
+                    self._last_length = self._offset - offset
+                    self._last_timestamp = json.loads(raw).get("timestamp", "")
+                    break
+
+        logger.info("audit_log_unindexed", size=self._offset)
+        if self.checkpoint_interval and self._last_length:
+            self._sequence += 1
+            self.checkpoints.append(
+                Checkpoint(
+                    sequence=self._sequence,
+                    lines=0,
+                    offset=self._offset,
+                    length=self._last_length,
+                    hash=self.previous_hash,
+                    timestamp=self._last_timestamp,
+                )
+            )
+
+    def _rotation_due(self) -> bool:
+        """Whether the active log has reached a rotation threshold."""
+        if self._lines == 0:
+            return False
+        if self.segment_max_bytes and self._offset >= self.segment_max_bytes:
+            return True
+        if self.segment_max_age and time.monotonic() - self._opened_at >= self.segment_max_age:
+            return True
+        return False
+
+    def _rotate(self) -> None:
+        """Seal the active log as the next segment. Caller must hold the lock."""
+        self._write_pending()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        previous = self.segments.last()
+        number = previous.number + 1 if previous else 1
+        segment = Segment(
+            number=number,
+            file=f"{self.log_path.name}.{number:06d}",
+            first_hash=self._genesis_hash,
+            last_hash=self.previous_hash,
+            lines=self._lines,
+            first_timestamp=self._first_timestamp,
+            last_timestamp=self._last_timestamp,
+        )
+
+        # Manifest first: a crash before the rename is completed on restart
+        self.segments.append(segment)
+        os.replace(self.log_path, self.log_path.with_name(segment.file))
+        self._discard_sidecars()
+
+        self._genesis_hash = self.previous_hash
+        self._load_position()
+
+        self._start_sealer(segment)
+        logger.info("audit_log_rotated", segment=segment.file, lines=segment.lines)
+
+    def _start_sealer(self, segment: Segment) -> None:
+        """Verify and compress a segment on a background thread."""
+        sealer = threading.Thread(
+            target=self._seal_segment,
+            args=(segment,),
+            name=f"kynee-audit-seal-{segment.number}",
+            daemon=True,
+        )
+        self._sealers = [t for t in self._sealers if t.is_alive()]
+        self._sealers.append(sealer)
+        sealer.start()
+
+    def _seal_segment(self, segment: Segment) -> None:
+        """Background verification and compression of a rotated segment."""
+        try:
+            self.segments.seal(segment, self.compression, self.checkpoint_key)
+        except Exception as e:
+            logger.error("audit_segment_seal_failed", segment=segment.file, error=str(e))
+
+    def _recover_rotation(self) -> None:
+        """Finish a rotation interrupted between manifest append and rename."""
+        last = self.segments.last()
+        if last is None or not self.log_path.exists():
+            return
+        if self.segments.segment_path(last).exists():
+            return
+
+        os.replace(self.log_path, self.log_path.with_name(last.file))
+        self._discard_sidecars()
+        logger.warning("audit_rotation_recovered", segment=last.file)
+
+    def _reseal_interrupted(self) -> None:
+        """
+        Finish seals a crash or exit cut short.
+
+        Sealing runs on daemon threads, so a segment can be left unverified
+        and uncompressed, or sealed with its plain copy still on disk.
+        """
+        for segment in self.segments.load():
+            plain = self.log_path.with_name(segment.file)
+            if not segment.verified:
+                logger.warning("audit_segment_reseal", segment=segment.file)
+                self._start_sealer(segment)
+            elif self.segments.segment_path(segment) != plain:
+                plain.unlink(missing_ok=True)
+
+    def _discard_sidecars(self) -> None:
+        """Drop per-file sidecars that described the rotated-away active log."""
+        for path in (
+            self.checkpoints.index_path,
+            self.checkpoints.verified_path,
+            self.reader.scan_index_path,
+        ):
+            path.unlink(missing_ok=True)
+        self.reader.reset()
+
+    def wait_for_seals(self, timeout: Optional[float] = None) -> None:
+        """Block until background segment sealing has finished."""
+        for sealer in list(self._sealers):
+            sealer.join(timeout)
 
     def log_scan_started(
         self,
@@ -178,6 +557,48 @@ class AuditLogWriter:
             },
         )
 
+    def flush(self) -> None:
+        """Write any buffered entries to disk (no-op outside group commit)."""
+        with self._lock:
+            self._write_pending()
+
+    def close(self) -> None:
+        """Flush buffered entries, stop the flusher and close the log file."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        with self._lock:
+            self._write_pending()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=1.0)
+        self.wait_for_seals()
+
+    def _flush_if_due(self) -> None:
+        """Group-commit pending entries if the oldest is past the interval."""
+        with self._lock:
+            if self._pending and time.monotonic() - self._pending_since >= self.flush_interval:
+                self._write_pending()
+
+    def _write_pending(self) -> None:
+        """Write buffered entries in one batch. Caller must hold the lock."""
+        if not self._pending:
+            return
+
+        if self._file is None:
+            self._file = open(self.log_path, "a")
+
+        self._file.write("".join(self._pending))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        logger.debug("audit_group_commit", entries=len(self._pending))
+        self._pending.clear()
+        self._index_checkpoints()
+
     def verify_integrity(self) -> bool:
         """
         Verify audit log integrity by rehashing all entries.
@@ -188,66 +609,242 @@ class AuditLogWriter:
         Raises:
             ValueError: If tampering detected
         """
+        self.flush()
+
+        genesis_hash = self._verify_segments()
+
         if not self.log_path.exists():
             logger.info("audit_log_empty")
             return True
 
-        previous_hash = "0" * 64
+        verified = verify_span(
+            self.log_path,
+            0,
+            self.log_path.stat().st_size,
+            genesis_hash,
+            checkpoint_key=self.checkpoint_key,
+        )
+        self.checkpoints.save_verified(verified)
 
-        with open(self.log_path, "r") as f:
-            for line_num, line in enumerate(f, 1):
-                if not line.strip():
-                    continue
+        logger.info("audit_log_verified", entry_count=verified.lines)
+        self.previous_hash = verified.hash
+        return True
 
-                try:
-                    entry = json.loads(line)
-                except json.JSONDecodeError as e:
-                    raise ValueError(
-                        f"Line {line_num}: Invalid JSON - {e}"
-                    ) from e
+    def _verify_segments(self) -> str:
+        """
+        Verify every sealed segment in order.
 
-                # Verify hash chain
-                if entry.get("previous_hash") != previous_hash:
-                    raise ValueError(
-                        f"Line {line_num}: Chain broken. "
-                        f"Expected previous_hash={previous_hash}, "
-                        f"got {entry.get('previous_hash')}"
-                    )
+        Returns:
+            Chain hash the active log must continue from
+
+        Raises:
+            ValueError: If a segment is tampered with or the chain is broken
+        """
+        previous_hash = GENESIS_HASH
+        for segment in self.segments.load():
+            if segment.first_hash != previous_hash:
+                raise ValueError(f"Segment {segment.file}: Chain broken between segments")
+            try:
+                verified = verify_lines(
+                    self.segments.iter_lines(segment),
+                    previous_hash,
+                    checkpoint_key=self.checkpoint_key,
+                )
+            except ValueError as e:
+                raise ValueError(f"Segment {segment.file}: {e}") from e
+            if verified.hash != segment.last_hash:
+                raise ValueError(f"Segment {segment.file}: final hash mismatch")
+            previous_hash = verified.hash
+        return previous_hash
+
+    def verify_incremental(self) -> bool:
+        """
+        Verify only entries appended since the last successful verification.
+
+        Falls back to a full verification when there is no recorded verified
+        position, or when the record at that position no longer has its
+        recorded hash (the log was truncated or rewritten).
+
+        Returns:
+            True if log integrity verified
+
+        Raises:
+            ValueError: If tampering detected
+        """
+        self.flush()
+
+        if not self.log_path.exists():
+            logger.info("audit_log_empty")
+            return True
+
+        size = self.log_path.stat().st_size
+        resume = self.checkpoints.load_verified()
+        if (
+            resume is None
+            or resume.offset > size
+            or not anchor_matches(self.log_path, resume, self._genesis_hash)
+        ):
+            return self.verify_integrity()
+
+        verified = verify_span(
+            self.log_path,
+            resume.offset,
+            size,
+            resume.hash,
+            first_line=resume.lines + 1,
+            checkpoint_key=self.checkpoint_key,
+        )
+        if verified.offset == resume.offset:
+            verified = resume
+        self.checkpoints.save_verified(verified)
+
+        logger.info(
+            "audit_log_verified_incremental",
+            entry_count=verified.lines,
+            new_entries=verified.lines - resume.lines,
+        )
+        return True
+
+    def verify_range(
+        self,
+        start_sequence: int = 0,
+        end_sequence: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> bool:
+        """
+        Verify the spans between checkpoints, in parallel worker processes.
+
+        Each span is verified independently from the chain hash of the
+        checkpoint opening it and must end on the hash recorded for the
+        checkpoint closing it, so spans can be checked concurrently.
+
+        Args:
+            start_sequence: Checkpoint to start from (0 = start of log)
+            end_sequence: Checkpoint to stop at (None = end of log)
+            workers: Worker processes (None = CPU count, 1 = in-process)
 
-                # Rehash entry (without the entry-specific hash field)
-                entry_copy = entry.copy()
-                entry_hash_stored = entry_copy.pop("_entry_hash", None)
+        Returns:
+            True if the range verified
 
-                entry_json = json.dumps(entry_copy, separators=(",", ":"), sort_keys=True)
-                computed_hash = hashlib.sha256(entry_json.encode()).hexdigest()
+        Raises:
+            ValueError: If tampering detected or a checkpoint is unknown
+        """
+        self.flush()
+
+        if not self.log_path.exists():
+            logger.info("audit_log_empty")
+            return True
 
-                # We don't have entry_hash in the log, so update chain
-                previous_hash = computed_hash
+        size = self.log_path.stat().st_size
+        boundaries = [Checkpoint(sequence=0, lines=0, offset=0, length=0, hash=self._genesis_hash)]
+        boundaries.extend(self.checkpoints.load(max_offset=size))
+        sequences = [b.sequence for b in boundaries]
+
+        if start_sequence not in sequences:
+            raise ValueError(f"Unknown checkpoint {start_sequence}")
+        if end_sequence is not None and end_sequence not in sequences:
+            raise ValueError(f"Unknown checkpoint {end_sequence}")
+
+        first = sequences.index(start_sequence)
+        last = sequences.index(end_sequence) if end_sequence is not None else None
+        selected = boundaries[first : last + 1 if last is not None else None]
+
+        # (start boundary, expected end boundary or None for EOF)
+        spans: list[tuple[Checkpoint, Optional[Checkpoint]]] = list(zip(selected, selected[1:]))
+        if last is None:
+            spans.append((selected[-1], None))
+
+        args = [
+            (
+                str(self.log_path),
+                start.offset,
+                end.offset if end is not None else size,
+                start.hash,
+                start.lines + 1,
+                self.checkpoint_key,
+            )
+            for start, end in spans
+        ]
+
+        if workers == 1 or len(args) <= 1:
+            results = [verify_span(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(verify_span, *zip(*args)))
+
+        for (_, end), result in zip(spans, results):
+            if end is not None and result.hash != end.hash:
+                raise ValueError(
+                    f"Checkpoint {end.sequence}: hash mismatch. "
+                    f"Expected {end.hash}, got {result.hash}"
+                )
 
-        logger.info("audit_log_verified", entry_count=line_num)
-        self.previous_hash = previous_hash
+        logger.info(
+            "audit_log_range_verified",
+            start_sequence=start_sequence,
+            end_sequence=end_sequence,
+            spans=len(spans),
+        )
         return True
 
     def _reload_last_hash(self) -> None:
-        """Reload the previous_hash from last log entry."""
-        try:
-            with open(self.log_path, "r") as f:
-                lines = f.readlines()
+        """
+        Reload the previous_hash from last log entry.
 
-            if lines:
-                last_line = lines[-1].strip()
-                if last_line:
-                    entry = json.loads(last_line)
+        Reads backwards from EOF in fixed-size blocks, so startup cost does
+        not depend on log size. A final line without a trailing newline is
+        a record torn by a crash mid-write: it is moved to a ``.torn``
+        quarantine file and the log is truncated back to the last complete
+        record before the chain resumes.
+        """
+        try:
+            with open(self.log_path, "rb") as f:
+                torn_offset: Optional[int] = None
+                for offset, raw, terminated in _reverse_lines(f):
+                    if not terminated:
+                        if raw.strip():
+                            torn_offset = offset
+                        continue
+                    if not raw.strip():
+                        continue
+
+                    entry = json.loads(raw)
                     # Hash of the last entry becomes the new previous_hash
                     entry_json = json.dumps(entry, separators=(",", ":"), sort_keys=True)
                     self.previous_hash = hashlib.sha256(entry_json.encode()).hexdigest()
+                    break
+
+            if torn_offset is not None:
+                self._quarantine_tail(torn_offset)
         except Exception as e:
             logger.warning("failed_to_reload_last_hash", error=str(e))
-            self.previous_hash = "0" * 64
+            self.previous_hash = self._genesis_hash
+
+    def _quarantine_tail(self, offset: int) -> None:
+        """Move bytes from ``offset`` to EOF into the quarantine file and truncate."""
+        quarantine_path = self.log_path.with_name(self.log_path.name + ".torn")
+
+        with open(self.log_path, "rb+") as f:
+            f.seek(offset)
+            torn = f.read()
+            with open(quarantine_path, "ab") as q:
+                q.write(torn + b"\n")
+                q.flush()
+                os.fsync(q.fileno())
+            f.truncate(offset)
+            f.flush()
+            os.fsync(f.fileno())
+
+        logger.warning(
+            "audit_log_torn_tail_quarantined",
+            offset=offset,
+            size=len(torn),
+            quarantine_path=str(quarantine_path),
+        )
 
     def get_entries(self, count: Optional[int] = None) -> list[dict[str, Any]]:
         """
-        Get recent audit entries.
+        Get recent audit entries, leaving out checkpoint records.
 
         Args:
             count: Number of recent entries to return (None = all)
@@ -255,16 +852,42 @@ class AuditLogWriter:
         Returns:
             List of audit entries
         """
-        if not self.log_path.exists():
-            return []
-
-        entries = []
-        with open(self.log_path, "r") as f:
-            for line in f:
-                if line.strip():
-                    entries.append(json.loads(line))
+        self.flush()
 
         if count:
-            return entries[-count:]
+            return self.reader.tail(count)
+
+        return list(self.reader.iter_entries())
+
+    def iter_entries(self, **filters: Any) -> Iterator[dict[str, Any]]:
+        """
+        Stream entries matching ``filters`` (see ``AuditLogReader.iter_entries``).
+
+        Buffered entries are flushed first so they are visible to the query.
+        """
+        self.flush()
+        return self.reader.iter_entries(**filters)
+
+
+def _flush_periodically(
+    writer_ref: "weakref.ref[AuditLogWriter]",
+    closed: threading.Event,
+    interval: float,
+) -> None:
+    """Background loop enforcing the group-commit latency bound."""
+    while not closed.wait(interval):
+        writer = writer_ref()
+        if writer is None:
+            return
+        try:
+            writer._flush_if_due()
+        except Exception as e:
+            logger.error("audit_flush_failed", error=str(e))
+        del writer
+
 
-        return entries
+def _close_at_exit(writer_ref: "weakref.ref[AuditLogWriter]") -> None:
+    """Flush a still-open group-commit writer at interpreter exit."""
+    writer = writer_ref()
+    if writer is not None:
+        writer.close()
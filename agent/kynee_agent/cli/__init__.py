@@ -1,5 +1,6 @@
 """Command-line interface for KYNEĒ Agent."""
 
 from .main import main
+from .main import run
 
-__all__ = ["main"]
+__all__ = ["main", "run"]
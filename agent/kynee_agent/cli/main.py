@@ -1,16 +1,30 @@
-"""Main CLI entry point."""
+"""Main CLI entry point.
+
+Imports are kept to the minimum needed for argument parsing; command
+handlers import what they use, so ``--version`` and ``status`` (polled by
+health checks) start quickly.
+"""
 
 import argparse
-import asyncio
+import json
 import sys
 from pathlib import Path
-
-import structlog
+from typing import Any
 
 from kynee_agent import __version__
-from kynee_agent.core import Agent
+from kynee_agent import metrics
+
+
+class _LazyLogger:
+    """structlog logger that imports structlog on first use."""
+
+    def __getattr__(self, name: str) -> Any:
+        import structlog
+
+        return getattr(structlog.get_logger(__name__), name)
 
-logger = structlog.get_logger(__name__)
+
+logger = _LazyLogger()
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -43,6 +57,23 @@ def create_parser() -> argparse.ArgumentParser:
         type=str,
         help="Path to configuration file",
     )
+    start_parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record hot-path metrics and write snapshots for 'stats'",
+    )
+    start_parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        default=metrics.DEFAULT_SNAPSHOT_PATH,
+        help="Where metrics snapshots are written",
+    )
+    start_parser.add_argument(
+        "--state-file",
+        type=Path,
+        help="Persistent agent state database (default: $KYNEE_STATE_FILE or "
+        "/var/lib/kynee/state.db)",
+    )
 
     # Enroll command
     enroll_parser = subparsers.add_parser("enroll", help="Enroll agent with console")
@@ -69,25 +100,71 @@ def create_parser() -> argparse.ArgumentParser:
         type=str,
         help="Path to configuration file",
     )
+    status_parser.add_argument(
+        "--state-file",
+        type=Path,
+        help="State database written by 'start' (default: $KYNEE_STATE_FILE or "
+        "/var/lib/kynee/state.db)",
+    )
+
+    # Stats command
+    stats_parser = subparsers.add_parser("stats", help="Show hot-path metrics")
+    stats_parser.add_argument(
+        "--file",
+        "-f",
+        type=Path,
+        default=metrics.DEFAULT_SNAPSHOT_PATH,
+        help="Metrics snapshot written by 'start --metrics'",
+    )
+    stats_parser.add_argument(
+        "--format",
+        choices=["summary", "prometheus", "json"],
+        default="summary",
+        help="Output format",
+    )
 
     return parser
 
 
+METRICS_DUMP_INTERVAL = 10
+STATE_HEARTBEAT_INTERVAL = 5
+
+
 async def cmd_start(args: argparse.Namespace) -> int:
     """Handle 'start' command."""
-    agent = Agent(config_path=args.config)
+    import asyncio
+
+    from kynee_agent.core.agent import Agent
+    from kynee_agent.core.state import DEFAULT_STATE_PATH
+    from kynee_agent.core.state import AgentStateStore
+
+    state_store = AgentStateStore(getattr(args, "state_file", None) or DEFAULT_STATE_PATH)
+    agent = Agent(config_path=args.config, state_store=state_store)
+    metrics_file = getattr(args, "metrics_file", None)
+    if getattr(args, "metrics", False):
+        metrics.REGISTRY.enabled = True
     try:
         await agent.start()
         # Keep running until interrupted
+        ticks = 0
         while True:
             await asyncio.sleep(1)
+            ticks += 1
+            if ticks % STATE_HEARTBEAT_INTERVAL == 0:
+                state_store.heartbeat()
+            if metrics.REGISTRY.enabled and ticks % METRICS_DUMP_INTERVAL == 0:
+                metrics.REGISTRY.dump(metrics_file)
     except KeyboardInterrupt:
         logger.info("shutdown_requested")
         await agent.stop()
+        if metrics.REGISTRY.enabled:
+            metrics.REGISTRY.dump(metrics_file)
         return 0
     except Exception as e:
         logger.error("startup_failed", error=str(e))
         return 1
+    finally:
+        state_store.close()
 
 
 async def cmd_enroll(args: argparse.Namespace) -> int:
@@ -102,23 +179,38 @@ async def cmd_enroll(args: argparse.Namespace) -> int:
 
 
 async def cmd_status(args: argparse.Namespace) -> int:
-    """Handle 'status' command."""
-    agent = Agent(config_path=args.config)
-    status = agent.get_status()
+    """Handle 'status' command (reads the daemon's state; starts nothing)."""
+    from kynee_agent.core.state import DEFAULT_STATE_PATH
+    from kynee_agent.core.state import read_status
+
+    path = getattr(args, "state_file", None) or DEFAULT_STATE_PATH
+    status = read_status(path)
+    if status is None:
+        status = {"agent_id": None, "state": "not_initialized", "state_file": str(path)}
     logger.info("agent_status", **status)
     return 0
 
 
-async def main(argv: list[str] | None = None) -> int:
-    """Main entry point."""
-    parser = create_parser()
-    args = parser.parse_args(argv)
+async def cmd_stats(args: argparse.Namespace) -> int:
+    """Handle 'stats' command."""
+    try:
+        snapshot = metrics.load_snapshot(args.file)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error("metrics_unavailable", path=str(args.file), error=str(e))
+        return 1
 
-    # Configure logging
-    if args.verbose:
-        level = "debug"
+    if args.format == "prometheus":
+        print(metrics.render_prometheus(snapshot), end="")
+    elif args.format == "json":
+        print(json.dumps(snapshot, indent=2))
     else:
-        level = "info"
+        print(json.dumps(metrics.summarize(snapshot), indent=2))
+    return 0
+
+
+def configure_logging() -> None:
+    """Configure structlog (deferred until a command actually runs)."""
+    import structlog
 
     structlog.configure(
         processors=[
@@ -137,10 +229,18 @@ async def main(argv: list[str] | None = None) -> int:
         cache_logger_on_first_use=True,
     )
 
+
+async def main(argv: list[str] | None = None) -> int:
+    """Main entry point."""
+    parser = create_parser()
+    args = parser.parse_args(argv)
+
     if not args.command:
         parser.print_help()
         return 0
 
+    configure_logging()
+
     try:
         if args.command == "start":
             return await cmd_start(args)
@@ -148,6 +248,8 @@ async def main(argv: list[str] | None = None) -> int:
             return await cmd_enroll(args)
         elif args.command == "status":
             return await cmd_status(args)
+        elif args.command == "stats":
+            return await cmd_stats(args)
         else:
             logger.error("unknown_command", command=args.command)
             return 1
@@ -156,5 +258,15 @@ async def main(argv: list[str] | None = None) -> int:
         return 1
 
 
+def run(argv: list[str] | None = None) -> int:
+    """Synchronous console-script entry point."""
+    # --version and --help exit here, before asyncio is even imported
+    create_parser().parse_args(argv)
+
+    import asyncio
+
+    return asyncio.run(main(argv))
+
+
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
+    sys.exit(run())
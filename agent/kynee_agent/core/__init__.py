@@ -1,12 +1,20 @@
-"""Core agent functionality."""
+"""Core agent functionality.
+
+``Agent``, ``ScanItem`` and ``AgentCoordinator`` are imported on first
+access: the coordinator pulls in the audit, policy and pydantic model
+stacks, which lightweight entry points such as ``kynee-agent status`` do
+not need.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-from .agent import Agent
-from .coordinator import AgentCoordinator
 from .exceptions import (
     AuditLogError,
     ConfigurationError,
     EngagementError,
     EnrollmentError,
+    HookTimeoutError,
     InvalidRoEError,
     KyneeException,
     OutOfScopeError,
@@ -17,19 +25,45 @@ from .exceptions import (
     UnauthorizedMethodError,
 )
 
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .agent import ScanItem
+    from .coordinator import AgentCoordinator
+    from .state import AgentStateStore
+
+_LAZY = {
+    "Agent": ".agent",
+    "ScanItem": ".agent",
+    "AgentCoordinator": ".coordinator",
+    "AgentStateStore": ".state",
+}
+
 __all__ = [
     "Agent",
     "AgentCoordinator",
+    "AgentStateStore",
     "AuditLogError",
     "ConfigurationError",
     "EngagementError",
     "EnrollmentError",
+    "HookTimeoutError",
     "InvalidRoEError",
     "KyneeException",
     "OutOfScopeError",
     "PolicyViolationError",
     "RateLimitExceededError",
+    "ScanItem",
     "TimeWindowViolationError",
     "TransportError",
     "UnauthorizedMethodError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import lazily exported classes on first access."""
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
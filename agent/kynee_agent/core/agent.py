@@ -1,14 +1,32 @@
 """Main KYNEĒ Agent class."""
 
 import asyncio
+import os
 import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import structlog
 
+if TYPE_CHECKING:
+    from kynee_agent.core.coordinator import AgentCoordinator
+    from kynee_agent.core.state import AgentStateStore
+
 logger = structlog.get_logger(__name__)
 
+ITEM_FINDING = "finding"
+ITEM_INVENTORY = "inventory"
+
+
+@dataclass(frozen=True)
+class ScanItem:
+    """One result produced by a running scan: a finding or an inventory item."""
+
+    kind: str
+    data: Any
+
 
 class Agent:
     """
@@ -27,18 +45,37 @@ class Agent:
         self,
         agent_id: Optional[str] = None,
         config_path: Optional[str] = None,
+        state_store: Optional["AgentStateStore"] = None,
     ) -> None:
         """
         Initialize KYNEĒ Agent.
 
         Args:
-            agent_id: Unique agent identifier (UUID). Generated if not provided.
+            agent_id: Unique agent identifier (UUID). Taken from the state
+                store, or generated, if not provided.
             config_path: Path to agent configuration file.
+            state_store: Persistent state (identity, job queue, counters)
+                that survives restarts.
         """
-        self.agent_id = agent_id or str(uuid.uuid4())
         self.config_path = config_path
-        self.created_at = datetime.utcnow()
+        self.state_store = state_store
         self.state = "initialized"
+        self.started_at: Optional[datetime] = None
+        # Jobs restored from the state store on start, until they are re-run
+        self.pending_jobs: list[dict[str, Any]] = []
+        # Set while registered; restored jobs are re-validated through it
+        self.coordinator: Optional["AgentCoordinator"] = None
+        self._resume_task: Optional[asyncio.Task[None]] = None
+
+        identity = state_store.identity() if state_store is not None else None
+        if identity is not None and agent_id in (None, identity["agent_id"]):
+            self.agent_id = identity["agent_id"]
+            self.created_at = identity["created_at"]
+        else:
+            self.agent_id = agent_id or str(uuid.uuid4())
+            self.created_at = datetime.utcnow()
+            if state_store is not None:
+                state_store.save_identity(self.agent_id, self.created_at)
 
         logger.info(
             "agent_initialized",
@@ -47,41 +84,198 @@ class Agent:
         )
 
     async def start(self) -> None:
-        """Start the agent daemon."""
+        """
+        Start the agent daemon.
+
+        Jobs that were accepted but not finished before a restart are
+        restored from the state store and re-run in the background, oldest
+        first, through the coordinator the agent is registered with. Register
+        the agent (and start the coordinator) before starting it.
+        """
         logger.info("agent_starting", agent_id=self.agent_id)
         self.state = "running"
+        self.started_at = datetime.utcnow()
+        store = self.state_store
+        if store is not None:
+            await asyncio.to_thread(store.set_state, self.state, pid=os.getpid())
+            self.pending_jobs = await asyncio.to_thread(store.pending_jobs)
+            if self.pending_jobs:
+                logger.info(
+                    "pending_jobs_restored", agent_id=self.agent_id, count=len(self.pending_jobs)
+                )
+                self._resume_task = asyncio.create_task(
+                    self._resume_pending_jobs(), name=f"kynee-resume-{self.agent_id}"
+                )
         # TODO: Load RoE, connect to console, start collectors
 
     async def stop(self) -> None:
-        """Stop the agent daemon gracefully."""
+        """Stop the agent daemon gracefully (restored jobs not yet re-run stay queued)."""
         logger.info("agent_stopping", agent_id=self.agent_id)
         self.state = "stopped"
+        if self._resume_task is not None:
+            self._resume_task.cancel()
+            try:
+                await self._resume_task
+            except asyncio.CancelledError:
+                pass
+            self._resume_task = None
+        if self.state_store is not None:
+            await asyncio.to_thread(self.state_store.set_state, self.state)
         # TODO: Flush audit logs, disconnect from console
 
+    async def _resume_pending_jobs(self) -> None:
+        """
+        Re-run restored jobs one at a time; a failure does not stop the rest.
+
+        Each job goes back through the coordinator, which validates it
+        against the RoE (a job whose engagement window has closed is
+        rejected) and audits it. Without a coordinator a job cannot be
+        validated, so it expires: it leaves the queue and counts as failed.
+        """
+        while self.pending_jobs:
+            job = self.pending_jobs[0]
+            coordinator = self.coordinator
+            try:
+                if coordinator is None or "method" not in job:
+                    logger.warning(
+                        "pending_job_expired",
+                        agent_id=self.agent_id,
+                        job_id=job.get("job_id"),
+                        reason="no coordinator" if coordinator is None else "no method",
+                    )
+                else:
+                    await coordinator.execute_coordinated_scan(
+                        agent_id=self.agent_id,
+                        scan_id=str(job.get("job_id")),
+                        method=job["method"],
+                        target=job.get("target", {}),
+                    )
+            except Exception as e:
+                logger.error(
+                    "pending_job_failed",
+                    agent_id=self.agent_id,
+                    job_id=job.get("job_id"),
+                    error=str(e),
+                )
+            if self.state_store is not None:
+                # No-op unless the job never reached execute_scan
+                await asyncio.to_thread(_discard_job, self.state_store, job)
+            self.pending_jobs.pop(0)
+
     async def execute_scan(self, job: dict[str, Any]) -> dict[str, Any]:
         """
         Execute a scanning job from console.
 
+        Collects ``stream_scan`` into lists; prefer the stream for large jobs.
+        With a state store, the job stays in the persistent queue until it
+        finishes, and the scan counters are updated (in a worker thread, so
+        SQLite commits do not block the event loop).
+
         Args:
             job: Job specification from console
 
         Returns:
-            Job result with findings
+            Job result with findings and inventory
         """
-        logger.info("scan_started", agent_id=self.agent_id, job_id=job.get("job_id"))
-        # TODO: Validate against RoE, run collectors, return findings
+        store = self.state_store
+        if store is not None:
+            await asyncio.to_thread(store.enqueue_job, job)
+
+        findings: list[Any] = []
+        inventory: list[Any] = []
+        try:
+            async for item in self.stream_scan(job):
+                if item.kind == ITEM_FINDING:
+                    findings.append(item.data)
+                elif item.kind == ITEM_INVENTORY:
+                    inventory.append(item.data)
+        except Exception:
+            if store is not None:
+                await asyncio.to_thread(_record_finished, store, job, {"scans_failed": 1})
+            raise
+        # A cancelled scan (daemon shutdown) stays queued for the next start
+
+        if store is not None:
+            counters = {
+                "scans_completed": 1,
+                "findings": len(findings),
+                "inventory_items": len(inventory),
+            }
+            await asyncio.to_thread(_record_finished, store, job, counters)
 
         return {
             "job_id": job.get("job_id"),
             "status": "pending",
-            "findings": [],
+            "findings": findings,
+            "inventory": inventory,
         }
 
+    async def stream_scan(self, job: dict[str, Any]) -> AsyncIterator[ScanItem]:
+        """
+        Execute a scanning job, yielding results as they are produced.
+
+        Args:
+            job: Job specification from console
+
+        Yields:
+            Findings and inventory items, in production order
+        """
+        logger.info("scan_started", agent_id=self.agent_id, job_id=job.get("job_id"))
+        # TODO: Validate against RoE, run collectors, yield their results
+        return
+        yield  # pragma: no cover - makes this an async generator
+
     def get_status(self) -> dict[str, Any]:
-        """Get current agent status for heartbeat."""
+        """Get current agent status for heartbeat (uptime counts from the last start)."""
+        now = datetime.utcnow()
         return {
             "agent_id": self.agent_id,
             "state": self.state,
-            "timestamp": datetime.utcnow().isoformat(),
-            "uptime_seconds": (datetime.utcnow() - self.created_at).total_seconds(),
+            "timestamp": now.isoformat(),
+            "uptime_seconds": (
+                (now - self.started_at).total_seconds() if self.started_at is not None else 0.0
+            ),
+            "cpu_load": _cpu_load(),
+            "memory_percent": _memory_percent(),
         }
+
+
+def _record_finished(
+    store: "AgentStateStore", job: dict[str, Any], counters: dict[str, int]
+) -> None:
+    """Remove a finished job from the persistent queue and add to the counters."""
+    store.complete_job(str(job.get("job_id")))
+    for name, amount in counters.items():
+        store.increment(name, amount)
+
+
+def _discard_job(store: "AgentStateStore", job: dict[str, Any]) -> None:
+    """Remove a job that did not run from the persistent queue, counting it as failed."""
+    if store.complete_job(str(job.get("job_id"))):
+        store.increment("scans_failed")
+
+
+def _cpu_load() -> float:
+    """One-minute load average per CPU (0.0 if unavailable)."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+def _memory_percent() -> float:
+    """Percentage of memory in use, from /proc/meminfo (0.0 if unavailable)."""
+    fields: dict[str, int] = {}
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                fields[name] = int(value.split()[0])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+    total = fields.get("MemTotal", 0)
+    available = fields.get("MemAvailable", fields.get("MemFree", 0))
+    if total <= 0:
+        return 0.0
+    return round(100.0 * (total - available) / total, 1)
@@ -1,17 +1,57 @@
 """Agent coordinator for managing multiple agents with policy enforcement."""
 
 import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Any, Callable, Optional
 
 import structlog
 
+from kynee_agent.audit.async_sink import AsyncAuditSink
 from kynee_agent.audit.writer import AuditLogWriter
+from kynee_agent.core.agent import ITEM_FINDING
+from kynee_agent.core.agent import ITEM_INVENTORY
 from kynee_agent.core.agent import Agent
+from kynee_agent.core.agent import ScanItem
+from kynee_agent.core.exceptions import PolicyViolationError
+from kynee_agent.core.hooks import HookExecutor
+from kynee_agent.core.result_store import MemoryResultStore
+from kynee_agent.core.result_store import ResultStore
+from kynee_agent.core.result_store import SQLiteResultStore
+from kynee_agent.core.scheduler import ScanJob
+from kynee_agent.core.scheduler import ScanScheduler
+from kynee_agent.core.selection import AgentSelector
+from kynee_agent.core.selection import LeastOutstandingSelector
+from kynee_agent.core.state import AgentStateStore
+from kynee_agent.metrics import FINDINGS_TOTAL
+from kynee_agent.metrics import POLICY_VALIDATION_SECONDS
+from kynee_agent.metrics import SCAN_REJECTIONS_TOTAL
+from kynee_agent.metrics import SCAN_STAGE_SECONDS
+from kynee_agent.metrics import SCANS_TOTAL
 from kynee_agent.models.engagement import Engagement
+from kynee_agent.policy.batch import BatchValidationResult
 from kynee_agent.policy.engine import PolicyEngine
 
 logger = structlog.get_logger(__name__)
 
+BROADCAST_OK = "ok"
+BROADCAST_TIMEOUT = "timeout"
+BROADCAST_ERROR = "error"
+
+
+@dataclass(frozen=True)
+class BroadcastResponse:
+    """One agent's outcome in a broadcast."""
+
+    agent_id: str
+    status: str
+    result: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
 
 class AgentCoordinator:
     """
@@ -29,6 +69,14 @@ class AgentCoordinator:
         self,
         engagement: Engagement,
         audit_log_path: str,
+        audit_queue_size: int = 1024,
+        max_concurrent_scans: int = 16,
+        per_agent_concurrency: int = 1,
+        result_store: Optional[ResultStore] = None,
+        result_store_path: Optional[str] = None,
+        agent_selector: Optional[AgentSelector] = None,
+        hook_executor: Optional[HookExecutor] = None,
+        state_store: Optional[AgentStateStore] = None,
     ):
         """
         Initialize coordinator.
@@ -36,12 +84,42 @@ class AgentCoordinator:
         Args:
             engagement: Engagement with RoE to enforce
             audit_log_path: Path to centralized audit log
+            audit_queue_size: Audit entries buffered before callers block
+            max_concurrent_scans: Scheduler cap on scans running fleet-wide
+            per_agent_concurrency: Scheduler cap on scans running per agent
+            result_store: Where scan results are kept (default: bounded
+                in-memory LRU)
+            result_store_path: SQLite database that results evicted from the
+                default in-memory store spill to (None = no disk tier)
+            agent_selector: Strategy choosing agents for scans submitted
+                without one (default: fewest outstanding scans)
+            hook_executor: Executor for hooks and broadcast callbacks
+                (default: 8 threads, 60 s timeout per call)
+            state_store: Persistent store that keeps rate-limit grants across
+                restarts and crashes (restored on start, saved as grants are
+                taken while running)
         """
         self.engagement = engagement
         self.agents: dict[str, Agent] = {}
         self.policy_engine = PolicyEngine(engagement)
         self.audit_log = AuditLogWriter(audit_log_path)
-        self.scan_results: dict[str, Any] = {}
+        self.audit_sink = AsyncAuditSink(self.audit_log, max_queue_size=audit_queue_size)
+        if result_store is None:
+            result_store = MemoryResultStore(
+                spill=SQLiteResultStore(result_store_path) if result_store_path else None
+            )
+        self.scan_results: ResultStore = result_store
+        self.scheduler = ScanScheduler(
+            self,
+            max_concurrency=max_concurrent_scans,
+            per_agent_concurrency=per_agent_concurrency,
+        )
+        self.agent_selector = agent_selector or LeastOutstandingSelector()
+        self._outstanding: dict[str, int] = {}
+        self.hooks = hook_executor or HookExecutor()
+        self.state_store = state_store
+        self._grants_taken: Optional[asyncio.Event] = None
+        self._grant_saver: Optional[asyncio.Task[None]] = None
         self.running = False
 
         logger.info(
@@ -67,8 +145,10 @@ class AgentCoordinator:
             raise ValueError(f"Agent {agent.agent_id} already registered")
 
         self.agents[agent.agent_id] = agent
+        agent.coordinator = self
 
-        self.audit_log.log_event(
+        await self._audit(
+            "log_event",
             event_type="agent_registered",
             actor="system",
             action="agent_registered",
@@ -79,6 +159,8 @@ class AgentCoordinator:
             },
         )
 
+        self.scheduler.notify()
+
         logger.info(
             "agent_registered",
             agent_id=agent.agent_id,
@@ -100,9 +182,10 @@ class AgentCoordinator:
         if agent_id not in self.agents:
             return False
 
-        del self.agents[agent_id]
+        self.agents.pop(agent_id).coordinator = None
 
-        self.audit_log.log_event(
+        await self._audit(
+            "log_event",
             event_type="agent_unregistered",
             actor="system",
             action="agent_unregistered",
@@ -123,31 +206,113 @@ class AgentCoordinator:
         """Get all registered agents."""
         return self.agents.copy()
 
+    def select_agent(
+        self,
+        target: dict[str, Any],
+        candidates: Optional[Iterable[str]] = None,
+    ) -> str:
+        """
+        Choose an agent for a target with the configured selection strategy.
+
+        Args:
+            target: Target specification
+            candidates: Agent IDs to choose from (default: all registered)
+
+        Returns:
+            ID of the chosen agent
+
+        Raises:
+            ValueError: If no candidate agent is registered
+        """
+        if candidates is None:
+            agents = self.agents
+        else:
+            agents = {a: self.agents[a] for a in candidates if a in self.agents}
+        if not agents:
+            raise ValueError("No agents registered")
+        return self.agent_selector.select(agents, target, self.agent_load())
+
+    def agent_load(self) -> dict[str, int]:
+        """Scans running per agent, whether executed directly or scheduled."""
+        load = dict(self._outstanding)
+        for agent_id, running in self.scheduler.running_per_agent.items():
+            load[agent_id] = load.get(agent_id, 0) + running
+        return load
+
     async def execute_coordinated_scan(
         self,
-        agent_id: str,
+        agent_id: Optional[str],
         scan_id: str,
         method: str,
         target: dict[str, Any],
         pre_scan_hook: Optional[Callable[[Agent, str, dict], Any]] = None,
         post_scan_hook: Optional[Callable[[Agent, str, dict, Any], Any]] = None,
+        on_batch: Optional[Callable[[str, list[ScanItem]], Any]] = None,
+        batch_size: int = 100,
     ) -> dict[str, Any]:
         """
         Execute a scan through coordinator with policy enforcement.
 
+        With ``on_batch``, the agent's result stream is consumed incrementally:
+        items are forwarded as ``on_batch(scan_id, items)`` every
+        ``batch_size`` items and only their counts are kept, so the full
+        findings list is never held in memory.
+
         Args:
-            agent_id: ID of agent to execute scan
+            agent_id: ID of agent to execute scan (None = chosen by
+                ``agent_selector``)
             scan_id: Unique scan identifier
             method: Scanning method
             target: Target specification
             pre_scan_hook: Optional callback before scan
             post_scan_hook: Optional callback after scan
+            on_batch: Optional consumer of streamed result batches
+            batch_size: Items per forwarded batch
 
         Returns:
-            Scan result dict
+            Scan result dict (counts only when streamed)
 
         Raises:
             PolicyViolationError: If policy validation fails
+            ValueError: If the agent is not registered
+        """
+        if agent_id is None:
+            agent_id = self.select_agent(target)
+
+        self._outstanding[agent_id] = self._outstanding.get(agent_id, 0) + 1
+        try:
+            return await self._execute_scan(
+                agent_id,
+                scan_id,
+                method,
+                target,
+                pre_scan_hook,
+                post_scan_hook,
+                on_batch,
+                batch_size,
+            )
+        finally:
+            self._outstanding[agent_id] -= 1
+            if not self._outstanding[agent_id]:
+                del self._outstanding[agent_id]
+
+    async def _execute_scan(
+        self,
+        agent_id: str,
+        scan_id: str,
+        method: str,
+        target: dict[str, Any],
+        pre_scan_hook: Optional[Callable[[Agent, str, dict], Any]] = None,
+        post_scan_hook: Optional[Callable[[Agent, str, dict, Any], Any]] = None,
+        on_batch: Optional[Callable[[str, list[ScanItem]], Any]] = None,
+        batch_size: int = 100,
+        rate_limit_charged: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Run a scan on a known agent (load accounting is the caller's).
+
+        ``rate_limit_charged`` means the caller already took the scan's
+        rate-limit grant (the scheduler does so at dispatch).
         """
         agent = self.get_agent(agent_id)
         if not agent:
@@ -155,16 +320,19 @@ class AgentCoordinator:
 
         try:
             # Validate against policies
-            self.policy_engine.validate_scan_request(method, target)
+            with POLICY_VALIDATION_SECONDS.time():
+                self.policy_engine.validate_scan_request(
+                    method, target, charge_rate_limit=not rate_limit_charged
+                )
 
             # Pre-scan hook
             if pre_scan_hook:
-                await self._run_async_callback(
-                    pre_scan_hook, agent, scan_id, target
-                )
+                with SCAN_STAGE_SECONDS.time(stage="pre_hook"):
+                    await self._run_async_callback(pre_scan_hook, agent, scan_id, target)
 
             # Log scan start
-            self.audit_log.log_scan_started(
+            await self._audit(
+                "log_scan_started",
                 agent_id=agent_id,
                 scan_id=scan_id,
                 method=method,
@@ -184,17 +352,22 @@ class AgentCoordinator:
                 "method": method,
                 "target": target,
             }
-            result = await agent.execute_scan(job)
+            with SCAN_STAGE_SECONDS.time(stage="agent"):
+                if on_batch is None:
+                    result = await agent.execute_scan(job)
+                    findings_count = len(result.get("findings", []))
+                else:
+                    result = await self._stream_scan(agent, job, on_batch, batch_size)
+                    findings_count = result["findings_count"]
 
             # Post-scan hook
             if post_scan_hook:
-                await self._run_async_callback(
-                    post_scan_hook, agent, scan_id, target, result
-                )
+                with SCAN_STAGE_SECONDS.time(stage="post_hook"):
+                    await self._run_async_callback(post_scan_hook, agent, scan_id, target, result)
 
             # Log scan completion
-            findings_count = len(result.get("findings", []))
-            self.audit_log.log_scan_completed(
+            await self._audit(
+                "log_scan_completed",
                 agent_id=agent_id,
                 scan_id=scan_id,
                 findings_count=findings_count,
@@ -202,7 +375,10 @@ class AgentCoordinator:
             )
 
             # Store result
-            self.scan_results[scan_id] = result
+            # JSON sizing and any spill to disk happen off the event loop
+            await asyncio.to_thread(self.scan_results.put, scan_id, result)
+            SCANS_TOTAL.inc(status="success")
+            FINDINGS_TOTAL.inc(findings_count)
 
             logger.info(
                 "scan_completed",
@@ -214,6 +390,10 @@ class AgentCoordinator:
             return result
 
         except Exception as e:
+            SCANS_TOTAL.inc(status="failure")
+            if isinstance(e, PolicyViolationError):
+                SCAN_REJECTIONS_TOTAL.inc(reason=type(e).__name__)
+
             logger.error(
                 "scan_failed",
                 scan_id=scan_id,
@@ -221,7 +401,8 @@ class AgentCoordinator:
                 error=str(e),
             )
 
-            self.audit_log.log_event(
+            await self._audit(
+                "log_event",
                 event_type="scan_failed",
                 actor=agent_id,
                 action=f"scan_{method}",
@@ -234,10 +415,92 @@ class AgentCoordinator:
 
             raise
 
+    async def submit_scan(
+        self,
+        scan_id: str,
+        method: str,
+        target: dict[str, Any],
+        priority: int = 0,
+        agent_id: Optional[str] = None,
+        engagement_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        pre_scan_hook: Optional[Callable[[Agent, str, dict], Any]] = None,
+        post_scan_hook: Optional[Callable[[Agent, str, dict, Any], Any]] = None,
+        on_batch: Optional[Callable[[str, list[ScanItem]], Any]] = None,
+    ) -> ScanJob:
+        """
+        Queue a scan for the scheduler to dispatch to an idle agent.
+
+        Jobs are dispatched once the coordinator is started. See
+        ``ScanScheduler.submit`` for the arguments and
+        ``execute_coordinated_scan`` for ``on_batch``.
+
+        Returns:
+            The queued job; await it for the scan result
+        """
+        return await self.scheduler.submit(
+            scan_id=scan_id,
+            method=method,
+            target=target,
+            priority=priority,
+            agent_id=agent_id,
+            engagement_id=engagement_id,
+            timeout=timeout,
+            pre_scan_hook=pre_scan_hook,
+            post_scan_hook=post_scan_hook,
+            on_batch=on_batch,
+        )
+
+    def cancel_scan(self, scan_id: str) -> bool:
+        """Cancel a queued or running scheduled scan."""
+        return self.scheduler.cancel(scan_id)
+
+    async def validate_scan_batch(
+        self,
+        method: str,
+        targets: Optional[Iterable[dict[str, Any]]] = None,
+        cidr: Optional[str] = None,
+        actor: str = "system",
+    ) -> BatchValidationResult:
+        """
+        Validate many targets at once and record a single audit entry.
+
+        Args:
+            method: Scanning method
+            targets: Target specifications
+            cidr: CIDR range to expand into per-host targets
+            actor: Who requested the validation
+
+        Returns:
+            Targets partitioned into in-scope and out-of-scope
+
+        Raises:
+            ValueError: If ``cidr`` is invalid or too large to expand
+            PolicyViolationError: If batch-level policy validation fails
+        """
+        result = self.policy_engine.validate_scan_batch(method, targets=targets, cidr=cidr)
+
+        details = result.summary()
+        if cidr:
+            details["cidr"] = cidr
+
+        await self._audit(
+            "log_event",
+            event_type="scan_batch_validated",
+            actor=actor,
+            action=f"validate_{method}",
+            result="success" if result.all_in_scope else "partial",
+            details=details,
+        )
+
+        return result
+
     async def broadcast_to_agents(
         self,
         message: dict[str, Any],
         callback: Optional[Callable[[Agent, dict[str, Any]], Any]] = None,
+        max_in_flight: int = 32,
+        deadline: Optional[float] = None,
     ) -> dict[str, Any]:
         """
         Broadcast message to all agents.
@@ -245,55 +508,311 @@ class AgentCoordinator:
         Args:
             message: Message to broadcast
             callback: Optional callback for each agent response
+            max_in_flight: Agents contacted concurrently
+            deadline: Seconds before unanswered agents are reported as timed out
 
         Returns:
-            Dict mapping agent_id to response
+            Dict mapping agent_id to response (``{"error", "status"}`` for
+            agents that failed or timed out)
         """
-        tasks = []
-        for agent_id, agent in self.agents.items():
-            tasks.append(self._broadcast_to_agent(agent_id, agent, message, callback))
-
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-
         results = {}
-        for agent_id, response in zip(self.agents.keys(), responses):
-            if isinstance(response, Exception):
-                logger.error(
-                    "broadcast_failed",
-                    agent_id=agent_id,
-                    error=str(response),
-                )
-                results[agent_id] = {"error": str(response)}
+        async for response in self.stream_broadcast(
+            message, callback, max_in_flight=max_in_flight, deadline=deadline
+        ):
+            if response.status == BROADCAST_OK:
+                results[response.agent_id] = response.result
             else:
-                results[agent_id] = response
-
+                results[response.agent_id] = {
+                    "error": response.error,
+                    "status": response.status,
+                }
         return results
 
+    async def stream_broadcast(
+        self,
+        message: dict[str, Any],
+        callback: Optional[Callable[[Agent, dict[str, Any]], Any]] = None,
+        max_in_flight: int = 32,
+        deadline: Optional[float] = None,
+        agent_ids: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[BroadcastResponse]:
+        """
+        Broadcast a message, yielding each agent's response as it arrives.
+
+        The target agents are snapshotted when the broadcast starts, so
+        agents registered or removed meanwhile neither receive the message
+        nor disturb the results. At most ``max_in_flight`` agents are
+        contacted at once. When ``deadline`` passes, outstanding deliveries
+        are cancelled and reported with status ``timeout``; every target
+        gets exactly one response.
+
+        Args:
+            message: Message to broadcast
+            callback: Optional callback for each agent response
+            max_in_flight: Agents contacted concurrently
+            deadline: Seconds the whole broadcast may take (None = no limit)
+            agent_ids: Agents to target (default: all registered)
+
+        Yields:
+            Per-agent responses with status ok, timeout or error
+        """
+        ids = self.agents if agent_ids is None else dict.fromkeys(agent_ids)
+        targets = {a: self.agents[a] for a in ids if a in self.agents}
+
+        loop = asyncio.get_running_loop()
+        expires = None if deadline is None else loop.time() + deadline
+        slots = asyncio.Semaphore(max(1, max_in_flight))
+        arrived: asyncio.Queue[BroadcastResponse] = asyncio.Queue()
+
+        async def deliver(agent_id: str, agent: Agent) -> None:
+            async with slots:
+                started = loop.time()
+                try:
+                    result = await self._broadcast_to_agent(agent_id, agent, message, callback)
+                except Exception as e:
+                    response = BroadcastResponse(
+                        agent_id, BROADCAST_ERROR, error=str(e), elapsed=loop.time() - started
+                    )
+                else:
+                    response = BroadcastResponse(
+                        agent_id, BROADCAST_OK, result=result, elapsed=loop.time() - started
+                    )
+            arrived.put_nowait(response)
+
+        tasks = {
+            agent_id: asyncio.create_task(deliver(agent_id, agent))
+            for agent_id, agent in targets.items()
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                timeout = None if expires is None else expires - loop.time()
+                try:
+                    if timeout is not None and timeout <= 0:
+                        response = arrived.get_nowait()
+                    else:
+                        response = await asyncio.wait_for(arrived.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                pending.discard(response.agent_id)
+                yield response
+
+            for agent_id in tasks:
+                if agent_id in pending:
+                    tasks[agent_id].cancel()
+                    logger.warning("broadcast_agent_timeout", agent_id=agent_id)
+                    yield BroadcastResponse(
+                        agent_id, BROADCAST_TIMEOUT, error="broadcast deadline exceeded"
+                    )
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
     async def start(self) -> None:
         """Start coordinator (begin managing agents)."""
         self.running = True
+        if self.state_store is not None:
+            limiter = self.policy_engine.rate_limiter
+            restored = await asyncio.to_thread(self.state_store.restore_rate_limits, limiter)
+            logger.info("rate_limits_restored", grants=restored)
+            self._grants_taken = asyncio.Event()
+            limiter.on_grant = self._grants_taken.set
+            self._grant_saver = asyncio.create_task(
+                self._save_rate_limits_loop(), name="kynee-rate-limit-saver"
+            )
+        await self.audit_sink.start()
+        await self.scheduler.start()
         logger.info("coordinator_started", engagement_id=self.engagement.engagement_id)
 
     async def stop(self) -> None:
         """Stop coordinator (gracefully shut down agents)."""
         self.running = False
 
+        # Stop dispatching; queued jobs are cancelled, running ones finish
+        await self.scheduler.stop()
+
         # Stop all agents
         tasks = [agent.stop() for agent in self.agents.values()]
         await asyncio.gather(*tasks, return_exceptions=True)
 
+        await asyncio.to_thread(self.scan_results.close)
+        if self._grant_saver is not None:
+            self._grant_saver.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._grant_saver
+            self._grant_saver = None
+            self.policy_engine.rate_limiter.on_grant = None
+        if self.state_store is not None:
+            await self._save_rate_limits()
+        # Don't let a hook that ignored its timeout block shutdown
+        self.hooks.shutdown(wait=False)
+
+        # Drain the audit pipeline so no entry is lost on shutdown
+        try:
+            await self.audit_sink.close()
+        finally:
+            self.audit_log.close()
+
         logger.info("coordinator_stopped", engagement_id=self.engagement.engagement_id)
 
+    async def _save_rate_limits_loop(self) -> None:
+        """Persist rate-limit grants as they are taken, so a crash does not reset them."""
+        assert self._grants_taken is not None
+        while True:
+            await self._grants_taken.wait()
+            # Grants taken while saving set the event again; bursts coalesce
+            self._grants_taken.clear()
+            try:
+                await self._save_rate_limits()
+            except Exception as e:
+                logger.error("rate_limits_save_failed", error=str(e))
+
+    async def _save_rate_limits(self) -> None:
+        """Save current grants; exported on the loop, written off it."""
+        assert self.state_store is not None
+        grants = self.policy_engine.rate_limiter.export_grants()
+        await asyncio.to_thread(self.state_store.save_rate_grants, grants)
+
     def get_scan_result(self, scan_id: str) -> Optional[dict[str, Any]]:
-        """Get cached scan result."""
+        """
+        Get scan result (from memory, or the result store's disk tier).
+
+        A miss in memory reads the disk tier in the calling thread; from a
+        coroutine, prefer ``aget_scan_result``.
+        """
         return self.scan_results.get(scan_id)
 
-    def get_audit_entries(self, count: Optional[int] = None) -> list[dict[str, Any]]:
-        """Get recent audit entries."""
-        return self.audit_log.get_entries(count)
+    async def aget_scan_result(self, scan_id: str) -> Optional[dict[str, Any]]:
+        """Async ``get_scan_result``: the lookup runs off the event loop."""
+        return await asyncio.to_thread(self.scan_results.get, scan_id)
+
+    def get_audit_entries(
+        self,
+        count: Optional[int] = None,
+        event_type: Optional[str] = None,
+        actor: Optional[str] = None,
+        scan_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get recent audit entries (including any still queued).
+
+        Queued entries are written from the calling thread first, and the
+        log is read there too; from a coroutine, ``aget_audit_entries``
+        does both without blocking the event loop.
+
+        Args:
+            count: Number of most recent matching entries (None = all)
+            event_type: Only entries of this event type
+            actor: Only entries by this actor
+            scan_id: Only entries for this scan
+            since: Only entries at or after this time (UTC)
+            until: Only entries at or before this time (UTC)
+
+        Returns:
+            Matching audit entries, oldest first
+        """
+        self.audit_sink.flush_sync()
+        return self._read_audit_entries(count, event_type, actor, scan_id, since, until)
+
+    async def aget_audit_entries(
+        self,
+        count: Optional[int] = None,
+        event_type: Optional[str] = None,
+        actor: Optional[str] = None,
+        scan_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> list[dict[str, Any]]:
+        """Async ``get_audit_entries``: flushes and reads off the event loop."""
+        await self.audit_sink.flush()
+        return await asyncio.to_thread(
+            self._read_audit_entries, count, event_type, actor, scan_id, since, until
+        )
+
+    def _read_audit_entries(
+        self,
+        count: Optional[int],
+        event_type: Optional[str],
+        actor: Optional[str],
+        scan_id: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime],
+    ) -> list[dict[str, Any]]:
+        """Read matching entries from the audit log (see ``get_audit_entries``)."""
+        filters = {
+            "event_type": event_type,
+            "actor": actor,
+            "scan_id": scan_id,
+            "since": since,
+            "until": until,
+        }
+        if count:
+            return self.audit_log.reader.tail(count, **filters)
+        return list(self.audit_log.iter_entries(**filters))
+
+    async def _stream_scan(
+        self,
+        agent: Agent,
+        job: dict[str, Any],
+        on_batch: Callable[[str, list[ScanItem]], Any],
+        batch_size: int,
+    ) -> dict[str, Any]:
+        """Forward an agent's result stream in batches, keeping only counts."""
+        scan_id = job["job_id"]
+        batch_size = max(1, batch_size)
+        counts = {ITEM_FINDING: 0, ITEM_INVENTORY: 0}
+        batch: list[ScanItem] = []
+
+        async with contextlib.aclosing(self._iter_scan(agent, job)) as stream:
+            async for item in stream:
+                counts[item.kind] = counts.get(item.kind, 0) + 1
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    # Awaiting the consumer before pulling more applies backpressure
+                    await self._run_async_callback(on_batch, scan_id, batch)
+                    batch = []
+                    logger.debug(
+                        "scan_progress",
+                        scan_id=scan_id,
+                        findings_count=counts[ITEM_FINDING],
+                        inventory_count=counts[ITEM_INVENTORY],
+                    )
+
+        if batch:
+            await self._run_async_callback(on_batch, scan_id, batch)
+
+        return {
+            "job_id": scan_id,
+            "status": "completed",
+            "streamed": True,
+            "findings_count": counts[ITEM_FINDING],
+            "inventory_count": counts[ITEM_INVENTORY],
+        }
 
     @staticmethod
+    async def _iter_scan(agent: Agent, job: dict[str, Any]) -> AsyncIterator[ScanItem]:
+        """Agent's result stream; agents that only override execute_scan are adapted."""
+        agent_type = type(agent)
+        if (
+            agent_type.stream_scan is Agent.stream_scan
+            and agent_type.execute_scan is not Agent.execute_scan
+        ):
+            result = await agent.execute_scan(job)
+            for finding in result.get("findings", []):
+                yield ScanItem(ITEM_FINDING, finding)
+            for item in result.get("inventory", []):
+                yield ScanItem(ITEM_INVENTORY, item)
+            return
+
+        async with contextlib.aclosing(agent.stream_scan(job)) as stream:
+            async for item in stream:
+                yield item
+
     async def _broadcast_to_agent(
+        self,
         agent_id: str,
         agent: Agent,
         message: dict[str, Any],
@@ -302,7 +821,7 @@ class AgentCoordinator:
         """Helper to broadcast to single agent."""
         try:
             if callback:
-                result = await asyncio.to_thread(callback, agent, message)
+                result = await self.hooks.run(callback, agent, message)
             else:
                 result = {"agent_id": agent_id, "message_received": True}
             return result
@@ -310,14 +829,24 @@ class AgentCoordinator:
             logger.error("broadcast_agent_error", agent_id=agent_id, error=str(e))
             raise
 
-    @staticmethod
+    async def _audit(self, call: str, **kwargs: Any) -> None:
+        """
+        Record an audit entry (``call`` names an ``AuditLogWriter`` method).
+
+        Entries go through the async sink once the coordinator is started;
+        before that they are written directly, off the event loop, so the
+        sink's thread and drain task only exist between start and stop.
+        """
+        if self.audit_sink.running:
+            await getattr(self.audit_sink, call)(**kwargs)
+        else:
+            await asyncio.to_thread(getattr(self.audit_log, call), **kwargs)
+
     async def _run_async_callback(
+        self,
         callback: Callable,
         *args: Any,
         **kwargs: Any,
     ) -> Any:
-        """Run callback, handling both sync and async functions."""
-        if asyncio.iscoroutinefunction(callback):
-            return await callback(*args, **kwargs)
-        else:
-            return await asyncio.to_thread(callback, *args, **kwargs)
+        """Run callback (sync or async) on the hook executor."""
+        return await self.hooks.run(callback, *args, **kwargs)
@@ -71,3 +71,9 @@ class EnrollmentError(TransportError):
     """Raised when device enrollment fails."""
 
     pass
+
+
+class HookTimeoutError(KyneeException):
+    """Raised when a coordinator hook exceeds its timeout."""
+
+    pass
@@ -0,0 +1,211 @@
+"""Bounded executor for coordinator hooks and callbacks."""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+import structlog
+
+from kynee_agent.core.exceptions import HookTimeoutError
+
+logger = structlog.get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_OPTIONS_ATTR = "__kynee_hook__"
+
+
+@dataclass(frozen=True)
+class HookOptions:
+    """How a hook is executed; attached to hooks by the ``hook`` decorator."""
+
+    cpu_bound: bool = False
+    timeout: Optional[float] = None
+
+
+def hook(*, cpu_bound: bool = False, timeout: Optional[float] = None) -> Callable[[F], F]:
+    """
+    Declare execution options for a hook or callback.
+
+    CPU-bound hooks run in a process pool so they neither hold the GIL
+    against the event loop nor tie up hook threads; they and their
+    arguments must be picklable (module-level functions).
+
+    Args:
+        cpu_bound: Route the hook to the process pool
+        timeout: Seconds the hook may take (overrides the executor default)
+    """
+
+    def decorate(func: F) -> F:
+        setattr(func, _OPTIONS_ATTR, HookOptions(cpu_bound=cpu_bound, timeout=timeout))
+        return func
+
+    return decorate
+
+
+@dataclass
+class HookStats:
+    """Latency and outcome counters for one hook."""
+
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Mean call latency, including time waiting for a slot."""
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Stats as a plain dict."""
+        return {**asdict(self), "mean_seconds": self.mean_seconds}
+
+
+class HookExecutor:
+    """
+    Runs coordinator hooks off the event loop with bounded resources.
+
+    Synchronous hooks run on a dedicated thread pool (``max_workers``), or
+    on a process pool when declared ``@hook(cpu_bound=True)``; coroutine
+    hooks run on the event loop. At most ``max_concurrency`` hooks run at
+    once, and each call is bounded by a timeout (its own, or the executor
+    default) that covers waiting for a slot as well as running.
+
+    A thread cannot be interrupted, so a timed-out synchronous hook keeps
+    its slot until it actually returns; the caller gets
+    ``HookTimeoutError`` immediately, and the slot limit stops hung hooks
+    from piling up threads.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = 60.0,
+        process_workers: Optional[int] = None,
+    ):
+        """
+        Initialize hook executor.
+
+        Args:
+            max_workers: Threads for synchronous hooks
+            max_concurrency: Hooks running at once (default: max_workers)
+            timeout: Default seconds per hook call (None = unbounded)
+            process_workers: Processes for CPU-bound hooks (default: CPU count)
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_concurrency = max(1, max_concurrency or self.max_workers)
+        self.timeout = timeout
+        self.process_workers = max(1, process_workers or os.cpu_count() or 1)
+        self.metrics: dict[str, HookStats] = {}
+
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    async def run(self, callback: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a hook and return its result.
+
+        Raises:
+            HookTimeoutError: If the hook exceeds its timeout
+        """
+        options = getattr(callback, _OPTIONS_ATTR, None) or HookOptions()
+        timeout = options.timeout if options.timeout is not None else self.timeout
+        name = _hook_name(callback)
+        stats = self.metrics.setdefault(name, HookStats())
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(self._call(callback, options, args, kwargs), timeout)
+        except asyncio.TimeoutError as e:
+            stats.timeouts += 1
+            logger.warning("hook_timed_out", hook=name, timeout=timeout)
+            raise HookTimeoutError(f"Hook {name} exceeded {timeout}s") from e
+        except Exception:
+            stats.failures += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.calls += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pools (they are recreated on next use)."""
+        with self._pool_lock:
+            threads, self._threads = self._threads, None
+            processes, self._processes = self._processes, None
+        if threads is not None:
+            threads.shutdown(wait=wait, cancel_futures=True)
+        if processes is not None:
+            processes.shutdown(wait=wait, cancel_futures=True)
+
+    async def _call(
+        self,
+        callback: Callable[..., Any],
+        options: HookOptions,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        """Run a hook within a concurrency slot."""
+        await self._slots.acquire()
+
+        if asyncio.iscoroutinefunction(callback):
+            try:
+                return await callback(*args, **kwargs)
+            finally:
+                self._slots.release()
+
+        loop = asyncio.get_running_loop()
+        try:
+            pool = self._pool(options.cpu_bound)
+            future = pool.submit(functools.partial(callback, *args, **kwargs))
+        except BaseException:
+            self._slots.release()
+            raise
+
+        # Release only when the work really ends, even if the caller timed out
+        future.add_done_callback(lambda _: _call_soon(loop, self._slots.release))
+        return await asyncio.wrap_future(future)
+
+    def _pool(self, cpu_bound: bool) -> Executor:
+        """Worker pool for a hook, created on first use."""
+        with self._pool_lock:
+            if cpu_bound:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="kynee-hook"
+                )
+            return self._threads
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], Any]) -> None:
+    """Schedule ``callback`` on ``loop`` from any thread, unless it has closed."""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass
+
+
+def _hook_name(callback: Callable[..., Any]) -> str:
+    """Metrics key for a hook."""
+    if isinstance(callback, functools.partial):
+        callback = callback.func
+    module = getattr(callback, "__module__", None) or ""
+    name = getattr(callback, "__qualname__", None) or type(callback).__name__
+    return f"{module}.{name}" if module else name
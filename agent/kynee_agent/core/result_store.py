@@ -0,0 +1,370 @@
+"""Bounded scan result storage for the agent coordinator."""
+
+import abc
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class ResultStoreMetrics:
+    """Counters for a result store tier."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    spills: int = 0
+    promotions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Metrics as a plain dict."""
+        return asdict(self)
+
+
+class ResultStore(abc.ABC):
+    """
+    Keyed storage for scan results.
+
+    Subclasses implement ``get``/``put``/``delete``/``keys``/``__len__``;
+    the mapping helpers let a store stand in for the plain dict the
+    coordinator used to keep results in. Implementations must be
+    thread-safe: the coordinator stores results from a worker thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize store metrics."""
+        self.metrics = ResultStoreMetrics()
+
+    @abc.abstractmethod
+    def get(self, scan_id: str) -> Optional[dict[str, Any]]:
+        """Get a result, or None if unknown."""
+
+    @abc.abstractmethod
+    def put(self, scan_id: str, result: dict[str, Any]) -> None:
+        """Store a result, replacing any previous one."""
+
+    @abc.abstractmethod
+    def delete(self, scan_id: str) -> bool:
+        """Remove a result. Returns True if it existed."""
+
+    @abc.abstractmethod
+    def keys(self) -> list[str]:
+        """All stored scan IDs."""
+
+    def close(self) -> None:
+        """Release resources (the store may be reused afterwards)."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of stored results."""
+
+    def __contains__(self, scan_id: object) -> bool:
+        """Whether a result is stored for ``scan_id``."""
+        return isinstance(scan_id, str) and self.get(scan_id) is not None
+
+    def __getitem__(self, scan_id: str) -> dict[str, Any]:
+        """Get a result, raising KeyError if unknown."""
+        result = self.get(scan_id)
+        if result is None:
+            raise KeyError(scan_id)
+        return result
+
+    def __setitem__(self, scan_id: str, result: dict[str, Any]) -> None:
+        """Store a result."""
+        self.put(scan_id, result)
+
+
+class MemoryResultStore(ResultStore):
+    """
+    In-memory LRU tier with entry, byte and age budgets.
+
+    Results are kept in least-recently-used order. When a ``put`` exceeds
+    ``max_entries`` or ``max_bytes`` (estimated from the JSON size), the
+    least recently used results are evicted; results not accessed for
+    ``ttl`` seconds are evicted on the next lookup. Evicted results are written to the
+    ``spill`` store if one is configured, and ``get`` falls through to it
+    on a memory miss, promoting the result back into memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        spill: Optional[ResultStore] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize memory tier.
+
+        Args:
+            max_entries: Maximum results held in memory
+            max_bytes: Maximum estimated bytes held in memory
+            ttl: Idle seconds before a result leaves memory (None = no limit)
+            spill: Lower tier receiving evicted results
+            clock: Monotonic time source (injectable for tests)
+        """
+        super().__init__()
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl = ttl
+        self.spill = spill
+        self.clock = clock
+
+        # scan_id -> (result, size, stored_at)
+        self._entries: OrderedDict[str, tuple[dict[str, Any], int, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated bytes held in memory."""
+        return self._bytes
+
+    def get(self, scan_id: str) -> Optional[dict[str, Any]]:
+        """Get a result from memory, falling through to the spill tier."""
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(scan_id)
+            if entry is not None:
+                self._entries.move_to_end(scan_id)
+                self._entries[scan_id] = (entry[0], entry[1], self.clock())
+                self.metrics.hits += 1
+                return entry[0]
+
+            self.metrics.misses += 1
+            if self.spill is None:
+                return None
+
+            result = self.spill.get(scan_id)
+            if result is not None:
+                self.metrics.promotions += 1
+                self._insert(scan_id, result)
+            return result
+
+    def put(self, scan_id: str, result: dict[str, Any]) -> None:
+        """Store a result in memory, evicting to stay within budget."""
+        with self._lock:
+            self._insert(scan_id, result)
+
+    def delete(self, scan_id: str) -> bool:
+        """Remove a result from memory and the spill tier."""
+        with self._lock:
+            entry = self._entries.pop(scan_id, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+            spilled = self.spill.delete(scan_id) if self.spill is not None else False
+            return entry is not None or spilled
+
+    def close(self) -> None:
+        """Spill everything still in memory and close the spill tier."""
+        with self._lock:
+            if self.spill is not None:
+                while self._entries:
+                    self._evict_oldest()
+                self.spill.close()
+
+    def keys(self) -> list[str]:
+        """Scan IDs in memory or in the spill tier."""
+        with self._lock:
+            keys = list(self._entries)
+            if self.spill is not None:
+                in_memory = set(keys)
+                keys.extend(k for k in self.spill.keys() if k not in in_memory)
+            return keys
+
+    def __len__(self) -> int:
+        """Results in memory plus results only in the spill tier."""
+        with self._lock:
+            if self.spill is None:
+                return len(self._entries)
+            return len(self.keys())
+
+    def _insert(self, scan_id: str, result: dict[str, Any]) -> None:
+        """Insert or replace an entry and enforce budgets. Caller holds the lock."""
+        previous = self._entries.pop(scan_id, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+
+        size = _estimate_size(result)
+        self._entries[scan_id] = (result, size, self.clock())
+        self._bytes += size
+
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._evict_oldest()
+            self.metrics.evictions += 1
+
+    def _expire(self) -> None:
+        """Evict entries idle longer than the TTL. Caller holds the lock."""
+        if self.ttl is None:
+            return
+        cutoff = self.clock() - self.ttl
+        while self._entries:
+            stored_at = next(iter(self._entries.values()))[2]
+            if stored_at > cutoff:
+                break
+            self._evict_oldest()
+            self.metrics.expirations += 1
+
+    def _evict_oldest(self) -> None:
+        """Move the least recently used entry to the spill tier (or drop it)."""
+        scan_id, (result, size, _) = self._entries.popitem(last=False)
+        self._bytes -= size
+        if self.spill is not None:
+            self.spill.put(scan_id, result)
+            self.metrics.spills += 1
+        logger.debug("scan_result_evicted", scan_id=scan_id, spilled=self.spill is not None)
+
+
+class SQLiteResultStore(ResultStore):
+    """
+    On-disk result tier backed by SQLite in WAL mode.
+
+    Results are stored as JSON. The connection is opened lazily and
+    reopened after ``close()``, so the tier survives coordinator restarts.
+    When the stored JSON exceeds ``max_bytes``, the oldest results are
+    deleted (counted as evictions).
+    """
+
+    def __init__(self, path: Path | str, max_bytes: Optional[int] = 256 * 1024 * 1024):
+        """
+        Initialize SQLite tier.
+
+        Args:
+            path: Database file path
+            max_bytes: Maximum bytes of stored JSON (None = no limit)
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def disk_bytes(self) -> int:
+        """Bytes of JSON stored on disk (0 until the database is opened)."""
+        return self._bytes
+
+    def get(self, scan_id: str) -> Optional[dict[str, Any]]:
+        """Load a result from disk."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute("SELECT data FROM scan_results WHERE scan_id = ?", (scan_id,))
+                .fetchone()
+            )
+        if row is None:
+            self.metrics.misses += 1
+            return None
+        self.metrics.hits += 1
+        return json.loads(row[0])
+
+    def put(self, scan_id: str, result: dict[str, Any]) -> None:
+        """Write a result to disk."""
+        data = json.dumps(result, separators=(",", ":"), default=str)
+        with self._lock:
+            conn = self._connection()
+            self._bytes -= self._stored_size(conn, scan_id)
+            conn.execute(
+                "INSERT OR REPLACE INTO scan_results (scan_id, data, stored_at) VALUES (?, ?, ?)",
+                (scan_id, data, time.time()),
+            )
+            self._bytes += len(data)
+            self._enforce_cap(conn, keep=scan_id)
+            conn.commit()
+
+    def delete(self, scan_id: str) -> bool:
+        """Remove a result from disk."""
+        with self._lock:
+            conn = self._connection()
+            size = self._stored_size(conn, scan_id)
+            cursor = conn.execute("DELETE FROM scan_results WHERE scan_id = ?", (scan_id,))
+            conn.commit()
+            self._bytes -= size
+            return cursor.rowcount > 0
+
+    def keys(self) -> list[str]:
+        """All stored scan IDs."""
+        with self._lock:
+            rows = self._connection().execute("SELECT scan_id FROM scan_results").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        """Number of results on disk."""
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM scan_results").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use. Caller holds the lock."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS scan_results ("
+                "scan_id TEXT PRIMARY KEY, data TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS scan_results_stored_at ON scan_results (stored_at)"
+            )
+            self._conn.commit()
+            self._bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM scan_results"
+            ).fetchone()[0]
+        return self._conn
+
+    @staticmethod
+    def _stored_size(conn: sqlite3.Connection, scan_id: str) -> int:
+        """Size of the stored JSON for ``scan_id`` (0 if absent). Caller holds the lock."""
+        row = conn.execute(
+            "SELECT LENGTH(data) FROM scan_results WHERE scan_id = ?", (scan_id,)
+        ).fetchone()
+        return row[0] if row is not None else 0
+
+    def _enforce_cap(self, conn: sqlite3.Connection, keep: str) -> None:
+        """Delete the oldest results other than ``keep`` until within budget."""
+        dropped = 0
+        while self.max_bytes is not None and self._bytes > self.max_bytes:
+            row = conn.execute(
+                "SELECT scan_id, LENGTH(data) FROM scan_results WHERE scan_id != ? "
+                "ORDER BY stored_at LIMIT 1",
+                (keep,),
+            ).fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM scan_results WHERE scan_id = ?", (row[0],))
+            self._bytes -= row[1]
+            dropped += 1
+        if dropped:
+            self.metrics.evictions += dropped
+            logger.info("scan_results_pruned", dropped=dropped, disk_bytes=self._bytes)
+
+
+def _estimate_size(result: dict[str, Any]) -> int:
+    """Approximate memory cost of a result by its JSON size."""
+    try:
+        return len(json.dumps(result, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 1024
@@ -0,0 +1,511 @@
+"""Priority scan-job scheduler for the agent coordinator."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import structlog
+
+from kynee_agent.metrics import SCHEDULER_QUEUE_DEPTH
+
+if TYPE_CHECKING:
+    from kynee_agent.core.agent import Agent
+    from kynee_agent.core.agent import ScanItem
+    from kynee_agent.core.coordinator import AgentCoordinator
+
+logger = structlog.get_logger(__name__)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_TIMED_OUT = "timed_out"
+
+# Seconds before the dispatcher retries after an unexpected dispatch error
+_DISPATCH_RETRY_SECONDS = 1.0
+
+# Jobs within an engagement are queued per (method, pinned agent) lane
+_Lane = tuple[str, Optional[str]]
+
+
+@dataclass(eq=False)
+class ScanJob:
+    """
+    A queued scan request.
+
+    Jobs order by ``priority`` (lower runs first), then submission order.
+    ``future`` resolves to the scan result, or raises the scan's error.
+    """
+
+    priority: int
+    sequence: int
+    scan_id: str
+    method: str
+    target: dict[str, Any]
+    engagement_id: str
+    agent_id: Optional[str] = None
+    timeout: Optional[float] = None
+    pre_scan_hook: Optional[Callable[["Agent", str, dict], Any]] = None
+    post_scan_hook: Optional[Callable[["Agent", str, dict, Any], Any]] = None
+    on_batch: Optional[Callable[[str, list["ScanItem"]], Any]] = None
+    state: str = JOB_PENDING
+    assigned_agent: Optional[str] = None
+    submitted_at: float = field(default_factory=time.monotonic)
+    future: "asyncio.Future[dict[str, Any]]" = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future(),
+        repr=False,
+    )
+
+    def __lt__(self, other: "ScanJob") -> bool:
+        """Heap order: priority, then submission order."""
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+    def __await__(self) -> Any:
+        """Await the job's result directly."""
+        return self.future.__await__()
+
+
+class ScanScheduler:
+    """
+    Dispatches queued scan jobs to idle agents.
+
+    Jobs wait in priority heaps per engagement, one per lane: the jobs of
+    one method pinned to one agent (or unpinned). Each dispatch round picks
+    the runnable job with the highest priority, breaking ties in favour of
+    the engagement served least recently, so a flood of jobs from one
+    engagement cannot starve another at the same priority.
+
+    A job runs when the global ``max_concurrency`` and its agent's
+    ``per_agent_concurrency`` caps allow. Unpinned jobs go to the idle agent
+    chosen by the coordinator's ``agent_selector``. Jobs whose method is at
+    its RoE rate limit stay queued (other jobs are dispatched past them)
+    until capacity frees, so the fleet runs at the maximum policy-permitted
+    rate without jobs failing on ``RateLimitExceededError``: a job's
+    rate-limit grant is taken when it is dispatched, not when its scan
+    starts running.
+
+    Every job in a lane is blocked or runnable together, so a round only
+    looks at lane heads: the cost of a round grows with the number of
+    lanes, not with the number of blocked jobs. Cancelled jobs are left in
+    their heap as tombstones and discarded when they reach the head, so
+    cancelling and dispatching stay O(log n).
+    """
+
+    def __init__(
+        self,
+        coordinator: "AgentCoordinator",
+        max_concurrency: int = 16,
+        per_agent_concurrency: int = 1,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            coordinator: Coordinator that executes dispatched scans
+            max_concurrency: Maximum scans running across all agents
+            per_agent_concurrency: Maximum scans running on any one agent
+        """
+        self.coordinator = coordinator
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_agent_concurrency = max(1, per_agent_concurrency)
+
+        self._queues: dict[str, dict[_Lane, list[ScanJob]]] = {}
+        self._queued = 0
+        self._last_served: dict[str, int] = {}
+        self._jobs: dict[str, ScanJob] = {}
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._running_per_agent: dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._rounds = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        # One timer wakes the dispatcher when rate-limit capacity frees
+        self._retry_timer: Optional[asyncio.TimerHandle] = None
+        self._dispatcher: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the dispatcher is active."""
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    @property
+    def running_per_agent(self) -> dict[str, int]:
+        """Scheduled scans currently running on each agent."""
+        return {agent_id: n for agent_id, n in self._running_per_agent.items() if n}
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting to be dispatched."""
+        return self._queued
+
+    @property
+    def active_jobs(self) -> int:
+        """Jobs currently running."""
+        return len(self._tasks)
+
+    async def start(self) -> None:
+        """Start dispatching (idempotent)."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch_loop(), name="kynee-scheduler")
+        self._wakeup.set()
+        logger.info("scheduler_started", max_concurrency=self.max_concurrency)
+
+    async def stop(self, cancel_running: bool = False) -> None:
+        """
+        Stop dispatching and cancel queued jobs.
+
+        Args:
+            cancel_running: Also cancel running jobs instead of waiting for them
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        self._schedule_retry(None)
+
+        for lanes in self._queues.values():
+            for queue in lanes.values():
+                for job in queue:
+                    if job.state == JOB_PENDING:
+                        self._finish(job, JOB_CANCELLED, error=asyncio.CancelledError())
+        self._queues.clear()
+        self._queued = 0
+
+        tasks = list(self._tasks.values())
+        if cancel_running:
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        logger.info("scheduler_stopped")
+
+    async def submit(
+        self,
+        scan_id: str,
+        method: str,
+        target: dict[str, Any],
+        priority: int = 0,
+        agent_id: Optional[str] = None,
+        engagement_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        pre_scan_hook: Optional[Callable[["Agent", str, dict], Any]] = None,
+        post_scan_hook: Optional[Callable[["Agent", str, dict, Any], Any]] = None,
+        on_batch: Optional[Callable[[str, list["ScanItem"]], Any]] = None,
+    ) -> ScanJob:
+        """
+        Queue a scan job.
+
+        Args:
+            scan_id: Unique scan identifier
+            method: Scanning method
+            target: Target specification
+            priority: Lower values run first
+            agent_id: Pin the job to this agent (None = any idle agent)
+            engagement_id: Fair-sharing group (default: coordinator engagement)
+            timeout: Seconds the scan may run before it is cancelled
+            pre_scan_hook: Optional callback before scan
+            post_scan_hook: Optional callback after scan
+            on_batch: Optional consumer of streamed result batches
+
+        Returns:
+            The queued job; await it (or ``job.future``) for the result
+
+        Raises:
+            ValueError: If a job with this scan_id is already queued or running
+        """
+        if scan_id in self._jobs:
+            raise ValueError(f"Scan {scan_id} already scheduled")
+
+        job = ScanJob(
+            priority=priority,
+            sequence=next(self._sequence),
+            scan_id=scan_id,
+            method=method,
+            target=target,
+            engagement_id=engagement_id or self.coordinator.engagement.engagement_id,
+            agent_id=agent_id,
+            timeout=timeout,
+            pre_scan_hook=pre_scan_hook,
+            post_scan_hook=post_scan_hook,
+            on_batch=on_batch,
+        )
+        self._jobs[scan_id] = job
+        self._enqueue(job)
+
+        logger.debug("scan_job_submitted", scan_id=scan_id, priority=priority)
+        return job
+
+    def cancel(self, scan_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            True if the job existed and was cancelled
+        """
+        job = self._jobs.get(scan_id)
+        if job is None:
+            return False
+
+        if job.state == JOB_PENDING:
+            # Left in the heap; _pending_head discards it when it surfaces
+            self._queued -= 1
+            self._finish(job, JOB_CANCELLED, error=asyncio.CancelledError())
+        else:
+            self._tasks[scan_id].cancel()
+
+        logger.info("scan_job_cancel_requested", scan_id=scan_id)
+        return True
+
+    def get_job(self, scan_id: str) -> Optional[ScanJob]:
+        """Get a queued or running job by scan ID."""
+        return self._jobs.get(scan_id)
+
+    def notify(self) -> None:
+        """Wake the dispatcher (e.g. after an agent was registered)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _enqueue(self, job: ScanJob) -> None:
+        """Put a job (back) on its engagement's queue."""
+        job.state = JOB_PENDING
+        lanes = self._queues.setdefault(job.engagement_id, {})
+        heapq.heappush(lanes.setdefault((job.method, job.agent_id), []), job)
+        self._queued += 1
+        SCHEDULER_QUEUE_DEPTH.set(self.queue_depth)
+        self.notify()
+
+    async def _dispatch_loop(self) -> None:
+        """Dispatch jobs whenever capacity, agents or rate limits allow."""
+        assert self._wakeup is not None
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            try:
+                retry_after = self._dispatch_ready()
+            except Exception as e:
+                # Queued jobs stay queued; keep the dispatcher alive and try again
+                logger.error("scheduler_dispatch_failed", error=str(e), exc_info=True)
+                retry_after = _DISPATCH_RETRY_SECONDS
+            SCHEDULER_QUEUE_DEPTH.set(self.queue_depth)
+            self._schedule_retry(retry_after)
+
+    def _schedule_retry(self, delay: Optional[float]) -> None:
+        """(Re)arm the single retry timer, or disarm it when ``delay`` is None."""
+        if self._retry_timer is not None:
+            self._retry_timer.cancel()
+            self._retry_timer = None
+        if delay is not None:
+            self._retry_timer = asyncio.get_running_loop().call_later(delay, self.notify)
+
+    def _dispatch_ready(self) -> Optional[float]:
+        """
+        Start every job that can run now.
+
+        Returns:
+            Seconds until a rate-limited job may become runnable, if any
+        """
+        retry_after: Optional[float] = None
+        while len(self._tasks) < self.max_concurrency:
+            job, agent_id, delay = self._next_job()
+            if delay is not None:
+                retry_after = delay if retry_after is None else min(retry_after, delay)
+            if job is None or agent_id is None:
+                break
+            self._start(job, agent_id)
+        return retry_after
+
+    def _next_job(self) -> tuple[Optional[ScanJob], Optional[str], Optional[float]]:
+        """
+        Pick the next job and agent under priority, fairness and limits.
+
+        The chosen job is removed from its queue and its rate-limit grant
+        taken, so it can be started without further checks.
+        """
+        idle = self._idle_agents()
+        if not idle:
+            return None, None, None
+
+        retry_after: Optional[float] = None
+        delays: dict[str, float] = {}
+        best: Optional[tuple[tuple[int, int, int], list[ScanJob]]] = None
+        for engagement_id, lanes in list(self._queues.items()):
+            served = self._last_served.get(engagement_id, -1)
+            for lane, queue in list(lanes.items()):
+                head, delay = self._runnable_head(lane, queue, idle, delays)
+                if delay is not None:
+                    retry_after = delay if retry_after is None else min(retry_after, delay)
+                if not queue:
+                    del lanes[lane]
+                if head is not None:
+                    rank = (head.priority, served, head.sequence)
+                    if best is None or rank < best[0]:
+                        best = (rank, queue)
+            if not lanes:
+                del self._queues[engagement_id]
+
+        if best is None:
+            return None, None, retry_after
+        # Pick the agent first: if selection fails, the job stays queued
+        job = best[1][0]
+        agent_id = job.agent_id or self._pick_agent(job, idle)
+        heapq.heappop(best[1])
+        # Capacity was just seen free and nothing ran since, so this is granted
+        self.coordinator.policy_engine.check_rate_limit(job.method)
+        return job, agent_id, retry_after
+
+    def _runnable_head(
+        self,
+        lane: _Lane,
+        queue: list[ScanJob],
+        idle: list[str],
+        delays: dict[str, float],
+    ) -> tuple[Optional[ScanJob], Optional[float]]:
+        """
+        Best pending job of a lane if it can run now, without popping it.
+
+        Jobs pinned to an agent that is not registered are failed and
+        removed. ``delays`` caches the wait of rate-limited methods for the
+        current round; taking a grant never frees capacity.
+
+        Returns:
+            ``(job, retry_after)``; job is None if the lane is empty or blocked
+        """
+        method, agent_id = lane
+        head = self._pending_head(queue)
+        if head is None:
+            return None, None
+        if agent_id is not None and agent_id not in self.coordinator.agents:
+            self._reject_unknown_agent(queue)
+            return None, None
+        if agent_id is not None and agent_id not in idle:
+            return None, None
+
+        delay = delays.get(method)
+        if delay is None:
+            delay = delays[method] = self.coordinator.policy_engine.rate_limit_delay(method)
+        if delay > 0:
+            return None, delay
+        return head, None
+
+    @staticmethod
+    def _pending_head(queue: list[ScanJob]) -> Optional[ScanJob]:
+        """Discard cancelled jobs at the head of a heap and return the best pending one."""
+        while queue and queue[0].state != JOB_PENDING:
+            heapq.heappop(queue)
+        return queue[0] if queue else None
+
+    def _idle_agents(self) -> list[str]:
+        """Registered agents below the per-agent concurrency cap."""
+        return [
+            agent_id
+            for agent_id in self.coordinator.agents
+            if self._running_per_agent.get(agent_id, 0) < self.per_agent_concurrency
+        ]
+
+    def _pick_agent(self, job: ScanJob, idle: list[str]) -> str:
+        """Choose an idle agent with the coordinator's selection strategy."""
+        return self.coordinator.select_agent(job.target, candidates=idle)
+
+    def _reject_unknown_agent(self, queue: list[ScanJob]) -> None:
+        """Fail and empty a lane whose jobs are pinned to an agent that is not registered."""
+        for job in queue:
+            if job.state == JOB_PENDING:
+                self._queued -= 1
+                error = ValueError(f"Agent {job.agent_id} not registered")
+                self._finish(job, JOB_FAILED, error=error)
+        queue.clear()
+
+    def _start(self, job: ScanJob, agent_id: str) -> None:
+        """Run a job taken off its queue by ``_next_job`` on ``agent_id``."""
+        self._queued -= 1
+        self._last_served[job.engagement_id] = next(self._rounds)
+
+        job.state = JOB_RUNNING
+        job.assigned_agent = agent_id
+        self._running_per_agent[agent_id] = self._running_per_agent.get(agent_id, 0) + 1
+        self._tasks[job.scan_id] = asyncio.create_task(
+            self._run(job, agent_id), name=f"kynee-scan-{job.scan_id}"
+        )
+
+        logger.debug(
+            "scan_job_dispatched",
+            scan_id=job.scan_id,
+            agent_id=agent_id,
+            wait_seconds=round(time.monotonic() - job.submitted_at, 3),
+        )
+
+    async def _run(self, job: ScanJob, agent_id: str) -> None:
+        """Execute one job through the coordinator and settle its future."""
+        try:
+            # The scheduler accounts for this scan's load itself
+            scan = self.coordinator._execute_scan(
+                agent_id=agent_id,
+                scan_id=job.scan_id,
+                method=job.method,
+                target=job.target,
+                pre_scan_hook=job.pre_scan_hook,
+                post_scan_hook=job.post_scan_hook,
+                on_batch=job.on_batch,
+                rate_limit_charged=True,
+            )
+            result = await asyncio.wait_for(scan, job.timeout)
+        except asyncio.TimeoutError as e:
+            self._finish(job, JOB_TIMED_OUT, error=e)
+            await self._audit_aborted(job, agent_id, "timeout")
+        except asyncio.CancelledError as e:
+            self._finish(job, JOB_CANCELLED, error=e)
+            await self._audit_aborted(job, agent_id, "cancelled")
+        except Exception as e:
+            self._finish(job, JOB_FAILED, error=e)
+        else:
+            self._finish(job, JOB_COMPLETED, result=result)
+        finally:
+            # Even if auditing the abort fails, the agent's slot must come back
+            self._release(job, agent_id)
+
+    def _release(self, job: ScanJob, agent_id: str) -> None:
+        """Free the job's concurrency slots and wake the dispatcher."""
+        self._tasks.pop(job.scan_id, None)
+        self._running_per_agent[agent_id] -= 1
+        self.notify()
+
+    def _finish(
+        self,
+        job: ScanJob,
+        state: str,
+        result: Optional[dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record a job's final state and settle its future."""
+        job.state = state
+        self._jobs.pop(job.scan_id, None)
+        if job.future.done():
+            return
+        if state == JOB_CANCELLED:
+            job.future.cancel()
+        elif error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)  # type: ignore[arg-type]
+
+    async def _audit_aborted(self, job: ScanJob, agent_id: str, reason: str) -> None:
+        """Record a timed-out or cancelled scan in the audit log."""
+        await self.coordinator._audit(
+            "log_event",
+            event_type="scan_aborted",
+            actor=agent_id,
+            action=f"scan_{job.method}",
+            result=reason,
+            details={"scan_id": job.scan_id},
+        )
+        logger.warning("scan_aborted", scan_id=job.scan_id, agent_id=agent_id, reason=reason)
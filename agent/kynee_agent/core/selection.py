@@ -0,0 +1,216 @@
+"""Agent selection strategies for scans submitted without an agent."""
+
+import abc
+import bisect
+import hashlib
+import ipaddress
+import math
+import time
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import structlog
+
+if TYPE_CHECKING:
+    from kynee_agent.core.agent import Agent
+
+logger = structlog.get_logger(__name__)
+
+
+class AgentSelector(abc.ABC):
+    """
+    Chooses which agent runs a scan.
+
+    ``select`` receives the candidate agents (in registration order), the
+    scan target and the number of scans outstanding on each agent, and
+    returns one candidate's ID.
+    """
+
+    @abc.abstractmethod
+    def select(
+        self,
+        agents: Mapping[str, "Agent"],
+        target: dict[str, Any],
+        outstanding: Mapping[str, int],
+    ) -> str:
+        """
+        Pick an agent for ``target``.
+
+        Args:
+            agents: Candidate agents by ID (never empty)
+            target: Target specification
+            outstanding: Scans queued or running per agent ID
+
+        Returns:
+            ID of the chosen agent
+        """
+
+
+class LeastOutstandingSelector(AgentSelector):
+    """Pick the agent with the fewest outstanding scans (earliest registered on ties)."""
+
+    def select(
+        self,
+        agents: Mapping[str, "Agent"],
+        target: dict[str, Any],
+        outstanding: Mapping[str, int],
+    ) -> str:
+        """Pick the least loaded agent."""
+        return min(agents, key=lambda agent_id: outstanding.get(agent_id, 0))
+
+
+class LoadWeightedSelector(AgentSelector):
+    """
+    Pick the agent with the lowest outstanding scans weighted by host load.
+
+    An agent's score is ``(outstanding + 1) * (1 + cpu_load) *
+    (1 + memory_percent / 100)`` from ``Agent.get_status()``, so a Pi that
+    is already busy with other work receives fewer scans. Statuses are
+    cached for ``status_ttl`` seconds to keep ``get_status`` off the hot
+    path.
+    """
+
+    def __init__(
+        self,
+        status_ttl: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize load-weighted selector.
+
+        Args:
+            status_ttl: Seconds an agent status is reused
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.status_ttl = status_ttl
+        self.clock = clock
+        self._statuses: dict[str, tuple[float, float]] = {}
+
+    def select(
+        self,
+        agents: Mapping[str, "Agent"],
+        target: dict[str, Any],
+        outstanding: Mapping[str, int],
+    ) -> str:
+        """Pick the agent with the lowest weighted load."""
+        return min(
+            agents,
+            key=lambda agent_id: (outstanding.get(agent_id, 0) + 1)
+            * self._weight(agent_id, agents[agent_id]),
+        )
+
+    def _weight(self, agent_id: str, agent: "Agent") -> float:
+        """Host load multiplier for an agent, from a cached status."""
+        now = self.clock()
+        cached = self._statuses.get(agent_id)
+        if cached is not None and now - cached[0] < self.status_ttl:
+            return cached[1]
+
+        try:
+            status = agent.get_status()
+            cpu_load = float(status.get("cpu_load") or 0.0)
+            memory_percent = float(status.get("memory_percent") or 0.0)
+        except Exception as e:
+            logger.warning("agent_status_unavailable", agent_id=agent_id, error=str(e))
+            cpu_load = memory_percent = 0.0
+
+        weight = (1 + max(0.0, cpu_load)) * (1 + max(0.0, memory_percent) / 100)
+        self._statuses[agent_id] = (now, weight)
+        return weight
+
+
+class ConsistentHashSelector(AgentSelector):
+    """
+    Map target subnets to agents on a consistent-hash ring.
+
+    Targets in the same ``/prefix_length`` subnet (``/prefix_length_v6`` for
+    IPv6) go to the same agent, so per-network state such as ARP tables and
+    service caches is reused, and adding or removing an agent only moves the
+    subnets adjacent to it on the ring. Loads are bounded: an agent with more
+    than ``load_factor`` times the fleet's average outstanding scans is
+    skipped in favour of the next agent on the ring. Targets without an IP
+    address use ``fallback``.
+    """
+
+    def __init__(
+        self,
+        prefix_length: int = 24,
+        prefix_length_v6: int = 64,
+        replicas: int = 64,
+        load_factor: float = 1.25,
+        fallback: Optional[AgentSelector] = None,
+    ):
+        """
+        Initialize consistent-hash selector.
+
+        Args:
+            prefix_length: IPv4 prefix grouping targets onto one agent
+            prefix_length_v6: IPv6 prefix grouping targets onto one agent
+            replicas: Ring points per agent (more = more even spread)
+            load_factor: Maximum load relative to the fleet average
+            fallback: Strategy for targets without an IP address
+        """
+        self.prefix_length = prefix_length
+        self.prefix_length_v6 = prefix_length_v6
+        self.replicas = max(1, replicas)
+        self.load_factor = max(1.0, load_factor)
+        self.fallback = fallback or LeastOutstandingSelector()
+
+        # Ring points for every agent ever seen; agents that are not
+        # candidates are skipped during lookup, which is equivalent to a
+        # ring built from the candidates alone.
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        self._known: set[str] = set()
+
+    def select(
+        self,
+        agents: Mapping[str, "Agent"],
+        target: dict[str, Any],
+        outstanding: Mapping[str, int],
+    ) -> str:
+        """Pick the ring owner of the target's subnet, within the load bound."""
+        key = self.subnet_key(target)
+        if key is None:
+            return self.fallback.select(agents, target, outstanding)
+
+        for agent_id in agents:
+            if agent_id not in self._known:
+                self._add(agent_id)
+
+        total = sum(outstanding.get(agent_id, 0) for agent_id in agents)
+        bound = math.ceil(self.load_factor * (total + 1) / len(agents))
+
+        start = bisect.bisect(self._points, _hash(key))
+        for i in range(len(self._points)):
+            agent_id = self._owners[(start + i) % len(self._points)]
+            if agent_id in agents and outstanding.get(agent_id, 0) < bound:
+                return agent_id
+
+        return self.fallback.select(agents, target, outstanding)
+
+    def subnet_key(self, target: dict[str, Any]) -> Optional[str]:
+        """Subnet the target belongs to, or None if it has no IP address."""
+        address = target.get("ip")
+        if not address:
+            return None
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return None
+        prefix = self.prefix_length if ip.version == 4 else self.prefix_length_v6
+        return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+    def _add(self, agent_id: str) -> None:
+        """Place an agent's points on the ring."""
+        for replica in range(self.replicas):
+            point = _hash(f"{agent_id}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, agent_id)
+        self._known.add(agent_id)
+
+
+def _hash(key: str) -> int:
+    """Stable 64-bit ring position for a key."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
@@ -0,0 +1,315 @@
+"""Persistent local state for the agent daemon.
+
+The state database (SQLite in WAL mode) holds the agent's identity, its
+pending job queue, lifetime counters and rate-limit grants. The daemon
+writes it as it runs; ``kynee-agent status`` reads it directly with
+``read_status``, so answering status neither constructs an ``Agent`` nor
+needs the daemon to respond. The module only uses the standard library to
+keep that path fast.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Hashable, Optional
+
+if TYPE_CHECKING:
+    from kynee_agent.policy.rate_limiter import SlidingWindowRateLimiter
+
+DEFAULT_STATE_PATH = Path(os.environ.get("KYNEE_STATE_FILE", "/var/lib/kynee/state.db"))
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    "seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL UNIQUE, "
+    "job TEXT NOT NULL, enqueued_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS rate_grants (key TEXT NOT NULL, granted_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS rate_grants_key ON rate_grants (key, granted_at)",
+)
+
+
+class AgentStateStore:
+    """
+    Crash-safe agent state backed by SQLite in WAL mode.
+
+    Every update is committed immediately, so a restarted daemon sees
+    exactly what the previous one last wrote. The connection is opened
+    lazily and reopened after ``close()``. With ``read_only`` the database
+    is opened without write access and never created.
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_STATE_PATH, read_only: bool = False):
+        """
+        Initialize state store.
+
+        Args:
+            path: Database file path
+            read_only: Open for reading only (used by ``kynee-agent status``)
+        """
+        self.path = Path(path)
+        self.read_only = read_only
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    # Identity and lifecycle
+
+    def identity(self) -> Optional[dict[str, Any]]:
+        """Stored ``agent_id`` and ``created_at``, or None for a fresh store."""
+        meta = self._meta()
+        if "agent_id" not in meta:
+            return None
+        return {
+            "agent_id": meta["agent_id"],
+            "created_at": datetime.fromisoformat(meta["created_at"]),
+        }
+
+    def save_identity(self, agent_id: str, created_at: datetime) -> None:
+        """Persist the agent's identity."""
+        self._set_meta(agent_id=agent_id, created_at=created_at.isoformat())
+
+    def set_state(self, state: str, pid: Optional[int] = None) -> None:
+        """
+        Record a lifecycle transition.
+
+        Args:
+            state: New agent state
+            pid: Daemon process ID (recorded with its start time when given)
+        """
+        now = datetime.utcnow().isoformat()
+        values = {"state": state, "updated_at": now}
+        if pid is not None:
+            values.update(pid=str(pid), started_at=now)
+        self._set_meta(**values)
+
+    def heartbeat(self) -> None:
+        """Mark the state as current (lets readers spot a hung daemon)."""
+        self._set_meta(updated_at=datetime.utcnow().isoformat())
+
+    # Job queue
+
+    def enqueue_job(self, job: dict[str, Any]) -> None:
+        """Add a job to the pending queue (updating one with the same ID in place)."""
+        data = json.dumps(job, separators=(",", ":"), default=str)
+        with self._lock:
+            conn = self._connection()
+            # An upsert keeps a re-run job's place in the queue
+            conn.execute(
+                "INSERT INTO jobs (job_id, job, enqueued_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET job = excluded.job",
+                (str(job.get("job_id")), data, time.time()),
+            )
+            conn.commit()
+
+    def complete_job(self, job_id: str) -> bool:
+        """Remove a job from the pending queue. Returns True if it was queued."""
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute("DELETE FROM jobs WHERE job_id = ?", (str(job_id),))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def pending_jobs(self) -> list[dict[str, Any]]:
+        """Queued jobs, oldest first."""
+        with self._lock:
+            rows = self._connection().execute("SELECT job FROM jobs ORDER BY seq").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    # Counters
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Add ``amount`` to a lifetime counter."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, amount),
+            )
+            conn.commit()
+
+    def counters(self) -> dict[str, int]:
+        """All lifetime counters."""
+        with self._lock:
+            rows = self._connection().execute("SELECT name, value FROM counters").fetchall()
+        return dict(rows)
+
+    # Rate limits
+
+    def save_rate_limits(self, limiter: "SlidingWindowRateLimiter") -> int:
+        """
+        Replace the stored rate-limit grants with the limiter's current ones.
+
+        Returns:
+            Number of grants saved
+        """
+        return self.save_rate_grants(limiter.export_grants())
+
+    def save_rate_grants(self, grants: dict[Hashable, list[float]]) -> int:
+        """
+        Replace the stored rate-limit grants with exported ones.
+
+        Takes ``SlidingWindowRateLimiter.export_grants()`` output, so a
+        limiter used on the event loop can be exported there and saved from
+        a worker thread.
+
+        Returns:
+            Number of grants saved
+        """
+        now = time.time()
+        rows = [
+            (json.dumps(_encode_key(key)), now - age)
+            for key, ages in grants.items()
+            for age in ages
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM rate_grants")
+                conn.executemany("INSERT INTO rate_grants (key, granted_at) VALUES (?, ?)", rows)
+        return len(rows)
+
+    def restore_rate_limits(self, limiter: "SlidingWindowRateLimiter") -> int:
+        """
+        Load stored grants still inside the limiter's window into it.
+
+        Returns:
+            Number of grants restored
+        """
+        now = time.time()
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT key, granted_at FROM rate_grants WHERE granted_at > ? "
+                    "ORDER BY granted_at",
+                    (now - limiter.window_seconds,),
+                )
+                .fetchall()
+            )
+        grants: dict[Hashable, list[float]] = {}
+        for key, granted_at in rows:
+            grants.setdefault(_decode_key(json.loads(key)), []).append(now - granted_at)
+        limiter.import_grants(grants)
+        return len(rows)
+
+    # Status
+
+    def status(self) -> dict[str, Any]:
+        """
+        Daemon status from stored state, in the shape of ``Agent.get_status``.
+
+        ``daemon_alive`` tells whether the recorded daemon process still
+        exists; uptime is only counted while it does.
+        """
+        meta = self._meta()
+        with self._lock:
+            pending = self._connection().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        counters = self.counters()
+
+        pid = int(meta["pid"]) if "pid" in meta else None
+        state = meta.get("state", "initialized")
+        alive = state == "running" and pid is not None and _process_alive(pid)
+        uptime = 0.0
+        if alive and "started_at" in meta:
+            started_at = datetime.fromisoformat(meta["started_at"])
+            uptime = (datetime.utcnow() - started_at).total_seconds()
+
+        return {
+            "agent_id": meta.get("agent_id"),
+            "state": state,
+            "timestamp": datetime.utcnow().isoformat(),
+            "uptime_seconds": uptime,
+            "pid": pid,
+            "daemon_alive": alive,
+            "created_at": meta.get("created_at"),
+            "started_at": meta.get("started_at"),
+            "updated_at": meta.get("updated_at"),
+            "pending_jobs": pending,
+            "counters": counters,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _meta(self) -> dict[str, str]:
+        """All identity and lifecycle values."""
+        with self._lock:
+            rows = self._connection().execute("SELECT key, value FROM meta").fetchall()
+        return dict(rows)
+
+    def _set_meta(self, **values: str) -> None:
+        """Upsert identity and lifecycle values in one transaction."""
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", values.items()
+            )
+            conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use. Caller holds the lock."""
+        if self._conn is None:
+            if self.read_only:
+                self._conn = sqlite3.connect(
+                    f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+                )
+                return self._conn
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+        return self._conn
+
+
+def read_status(path: Path | str = DEFAULT_STATE_PATH) -> Optional[dict[str, Any]]:
+    """
+    Read daemon status from a state database without modifying it.
+
+    Returns:
+        Status dict, or None if no agent has written state at ``path``
+    """
+    if not Path(path).exists():
+        return None
+    store = AgentStateStore(path, read_only=True)
+    try:
+        return store.status()
+    except sqlite3.OperationalError:
+        # Database exists but its schema has not been created yet
+        return None
+    finally:
+        store.close()
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with ``pid`` exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _encode_key(key: Hashable) -> Any:
+    """JSON-compatible form of a rate limiter key (tuples become lists)."""
+    return list(key) if isinstance(key, tuple) else key
+
+
+def _decode_key(value: Any) -> Hashable:
+    """Rate limiter key from its JSON form."""
+    return tuple(value) if isinstance(value, list) else value
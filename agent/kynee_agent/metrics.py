@@ -0,0 +1,402 @@
+"""In-process hot-path metrics with Prometheus text export."""
+
+import abc
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+DEFAULT_SNAPSHOT_PATH = Path(os.environ.get("KYNEE_METRICS_FILE", "/var/lib/kynee/metrics.json"))
+
+
+class _NullTimer:
+    """Timer handed out while metrics are disabled."""
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Context manager observing elapsed seconds into a histogram."""
+
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: "Histogram", labels: dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+
+
+class _Metric(abc.ABC):
+    """Base for labelled metrics registered with a ``MetricsRegistry``."""
+
+    kind = ""
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+    ):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """Label values in declaration order."""
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def reset(self) -> None:
+        """Clear recorded values."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the count (no-op while metrics are disabled)."""
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def reset(self) -> None:
+        """Clear recorded values."""
+        with self._lock:
+            self.values.clear()
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the value (no-op while metrics are disabled)."""
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = value
+
+    def reset(self) -> None:
+        """Clear recorded values."""
+        with self._lock:
+            self.values.clear()
+
+
+class Histogram(_Metric):
+    """Distribution of observations over cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts incl. +Inf, sum)
+        self.values: dict[tuple[str, ...], tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation (no-op while metrics are disabled)."""
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = ([0] * (len(self.buckets) + 1), 0.0)
+            entry[0][index] += 1
+            self.values[key] = (entry[0], entry[1] + value)
+
+    def time(self, **labels: str) -> Any:
+        """Context manager timing its block into this histogram."""
+        if not self.registry.enabled:
+            return _NULL_TIMER
+        return _Timer(self, labels)
+
+    def reset(self) -> None:
+        """Clear recorded values."""
+        with self._lock:
+            self.values.clear()
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics that can be snapshotted or rendered for Prometheus.
+
+    While ``enabled`` is False every recording call returns after a single
+    attribute check, so instrumentation can stay on hot paths.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Initialize registry.
+
+        Args:
+            enabled: Whether metrics are recorded
+        """
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Register (or return the existing) counter."""
+        return self._register(Counter, name, documentation, labelnames)  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Register (or return the existing) gauge."""
+        return self._register(Gauge, name, documentation, labelnames)  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Register (or return the existing) histogram."""
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(self, name, documentation, labelnames, buckets=buckets)
+        return self._metrics[name]  # type: ignore[return-value]
+
+    def reset(self) -> None:
+        """Clear every metric's values."""
+        for metric in self._metrics.values():
+            metric.reset()
+        self.started_at = time.time()
+
+    def snapshot(self) -> dict[str, Any]:
+        """All metric values as JSON-serializable data."""
+        metrics = []
+        for metric in self._metrics.values():
+            with metric._lock:
+                samples = []
+                for key, value in metric.values.items():
+                    labels = dict(zip(metric.labelnames, key))
+                    if isinstance(metric, Histogram):
+                        counts, total = value  # type: ignore[misc]
+                        samples.append({"labels": labels, "counts": list(counts), "sum": total})
+                    else:
+                        samples.append({"labels": labels, "value": value})
+            entry: dict[str, Any] = {
+                "name": metric.name,
+                "type": metric.kind,
+                "help": metric.documentation,
+                "samples": samples,
+            }
+            if isinstance(metric, Histogram):
+                entry["buckets"] = list(metric.buckets)
+            metrics.append(entry)
+
+        return {"started_at": self.started_at, "timestamp": time.time(), "metrics": metrics}
+
+    def render(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        return render_prometheus(self.snapshot())
+
+    def dump(self, path: Optional[Path] = None) -> Path:
+        """Atomically write a snapshot for ``kynee-agent stats`` to read."""
+        path = Path(path or DEFAULT_SNAPSHOT_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        return path
+
+    def _register(
+        self,
+        cls: type[_Metric],
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str],
+    ) -> _Metric:
+        """Create a metric unless one with this name exists."""
+        if name not in self._metrics:
+            self._metrics[name] = cls(self, name, documentation, labelnames)
+        return self._metrics[name]
+
+
+def render_prometheus(
+    snapshot: dict[str, Any], extra_labels: Optional[dict[str, str]] = None
+) -> str:
+    """
+    Render a registry snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot: Output of ``MetricsRegistry.snapshot()``
+        extra_labels: Labels added to every sample (e.g. agent_id)
+    """
+    extra = extra_labels or {}
+    lines = []
+    for metric in snapshot.get("metrics", []):
+        name = metric["name"]
+        lines.append(f"# HELP {name} {metric.get('help', '')}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for sample in metric["samples"]:
+            labels = {**extra, **sample["labels"]}
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(sample['value'])}")
+                continue
+
+            cumulative = 0
+            bounds = [*metric["buckets"], float("inf")]
+            for bound, count in zip(bounds, sample["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(sample['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def summarize(snapshot: dict[str, Any]) -> dict[str, Any]:
+    """
+    Rates and latency percentiles from a snapshot, for human display.
+
+    Counter rates are averages since the registry started; percentiles are
+    bucket upper bounds.
+    """
+    uptime = max(snapshot.get("timestamp", 0.0) - snapshot.get("started_at", 0.0), 1e-9)
+    summary: dict[str, Any] = {
+        "uptime_seconds": round(uptime, 3),
+        "counters": {},
+        "gauges": {},
+        "histograms": {},
+    }
+
+    for metric in snapshot.get("metrics", []):
+        for sample in metric["samples"]:
+            key = metric["name"] + _format_labels(sample["labels"])
+            if metric["type"] == "counter":
+                summary["counters"][key] = {
+                    "total": sample["value"],
+                    "per_second": round(sample["value"] / uptime, 3),
+                }
+            elif metric["type"] == "gauge":
+                summary["gauges"][key] = sample["value"]
+            else:
+                count = sum(sample["counts"])
+                summary["histograms"][key] = {
+                    "count": count,
+                    "mean_seconds": sample["sum"] / count if count else 0.0,
+                    "p50_seconds": _quantile(metric["buckets"], sample["counts"], 0.5),
+                    "p95_seconds": _quantile(metric["buckets"], sample["counts"], 0.95),
+                    "p99_seconds": _quantile(metric["buckets"], sample["counts"], 0.99),
+                }
+    return summary
+
+
+def load_snapshot(path: Optional[Path] = None) -> dict[str, Any]:
+    """Read a snapshot written by ``MetricsRegistry.dump``."""
+    with open(path or DEFAULT_SNAPSHOT_PATH, "r") as f:
+        return json.load(f)
+
+
+def _quantile(buckets: list[float], counts: list[int], q: float) -> Optional[float]:
+    """Upper bound of the bucket holding quantile ``q`` (None if in +Inf)."""
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank = q * total
+    cumulative = 0
+    for bound, count in zip(buckets, counts):
+        cumulative += count
+        if cumulative >= rank:
+            return bound
+    return None
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Prometheus label set, e.g. ``{stage="agent"}``."""
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{_escape(str(value))}"' for key, value in labels.items() if value != ""
+    )
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Number without a trailing ``.0`` for integral values."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry(enabled=os.environ.get("KYNEE_METRICS", "").lower() in ("1", "true"))
+
+# Scan pipeline metrics
+POLICY_VALIDATION_SECONDS = REGISTRY.histogram(
+    "kynee_policy_validation_seconds", "Time spent validating scan requests against the RoE"
+)
+AUDIT_WRITE_SECONDS = REGISTRY.histogram(
+    "kynee_audit_write_seconds", "Time spent writing one audit entry, including lock wait"
+)
+SCAN_STAGE_SECONDS = REGISTRY.histogram(
+    "kynee_scan_stage_seconds", "Time spent in each stage of a coordinated scan", ["stage"]
+)
+SCANS_TOTAL = REGISTRY.counter("kynee_scans_total", "Coordinated scans finished", ["status"])
+FINDINGS_TOTAL = REGISTRY.counter("kynee_findings_total", "Findings produced by scans")
+SCAN_REJECTIONS_TOTAL = REGISTRY.counter(
+    "kynee_scan_rejections_total", "Scans rejected by policy", ["reason"]
+)
+SCHEDULER_QUEUE_DEPTH = REGISTRY.gauge(
+    "kynee_scheduler_queue_depth", "Scan jobs waiting to be dispatched"
+)
+AUDIT_QUEUE_DEPTH = REGISTRY.gauge(
+    "kynee_audit_queue_depth", "Audit entries accepted but not yet written"
+)
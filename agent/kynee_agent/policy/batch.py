@@ -0,0 +1,53 @@
+"""Batch scope validation results."""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+# Reason codes for targets rejected by batch validation
+REASON_INVALID_IP = "invalid_ip"
+REASON_IP_OUT_OF_SCOPE = "ip_out_of_scope"
+REASON_HOSTNAME_OUT_OF_SCOPE = "hostname_out_of_scope"
+REASON_SSID_OUT_OF_SCOPE = "ssid_out_of_scope"
+REASON_MAC_OUT_OF_SCOPE = "mac_out_of_scope"
+
+
+@dataclass
+class RejectedTarget:
+    """A target rejected by batch validation."""
+
+    target: dict[str, Any]
+    reason: str
+
+
+@dataclass
+class BatchValidationResult:
+    """Partitioned outcome of validating many targets for one method."""
+
+    method: str
+    in_scope: list[dict[str, Any]] = field(default_factory=list)
+    out_of_scope: list[RejectedTarget] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        """Number of targets validated."""
+        return len(self.in_scope) + len(self.out_of_scope)
+
+    @property
+    def all_in_scope(self) -> bool:
+        """True if no target was rejected."""
+        return not self.out_of_scope
+
+    def reason_counts(self) -> dict[str, int]:
+        """Count rejected targets per reason code."""
+        return dict(Counter(rejected.reason for rejected in self.out_of_scope))
+
+    def summary(self) -> dict[str, Any]:
+        """Compact summary suitable for a single log/audit record."""
+        return {
+            "method": self.method,
+            "total": self.total,
+            "in_scope": len(self.in_scope),
+            "out_of_scope": len(self.out_of_scope),
+            "reasons": self.reason_counts(),
+        }
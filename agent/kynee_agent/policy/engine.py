@@ -1,6 +1,7 @@
 """Policy enforcement engine for Rules of Engagement."""
 
 import ipaddress
+from collections.abc import Iterable
 from datetime import datetime
 from typing import Any, Optional
 
@@ -12,10 +13,24 @@ from kynee_agent.core.exceptions import (
     TimeWindowViolationError,
     UnauthorizedMethodError,
 )
-from kynee_agent.models.engagement import Engagement, Scope
+from kynee_agent.models.engagement import Engagement
+from kynee_agent.policy.batch import (
+    REASON_HOSTNAME_OUT_OF_SCOPE,
+    REASON_INVALID_IP,
+    REASON_IP_OUT_OF_SCOPE,
+    REASON_MAC_OUT_OF_SCOPE,
+    REASON_SSID_OUT_OF_SCOPE,
+    BatchValidationResult,
+    RejectedTarget,
+)
+from kynee_agent.policy.rate_limiter import SlidingWindowRateLimiter
+from kynee_agent.policy.scope_index import HostnameIndex, IPRangeIndex, MacAddressIndex
 
 logger = structlog.get_logger(__name__)
 
+# Largest CIDR ``validate_scan_batch`` expands into targets (a /16)
+MAX_BATCH_CIDR_HOSTS = 65_536
+
 
 class PolicyEngine:
     """
@@ -24,19 +39,40 @@ class PolicyEngine:
     Responsibilities:
     - Validate targets are in scope (CIDR, hostnames, SSIDs)
     - Check time windows (engagement active period)
-    - Enforce rate limits (scans/hour per method)
+    - Enforce rate limits (sliding-window scans/hour per method)
     - Authorize methods (network-scanning, credential-testing, etc.)
     """
 
-    def __init__(self, engagement: Engagement):
+    def __init__(
+        self,
+        engagement: Engagement,
+        rate_limiter: Optional[SlidingWindowRateLimiter] = None,
+    ):
         """
         Initialize policy engine.
 
         Args:
             engagement: Engagement with RoE to enforce
+            rate_limiter: Limiter for per-hour method limits (default: 1h window)
         """
         self.engagement = engagement
-        self.method_counters: dict[str, int] = {}
+        self.rate_limiter = (
+            rate_limiter if rate_limiter is not None else SlidingWindowRateLimiter(3600.0)
+        )
+        self.compile_scope()
+
+    def compile_scope(self) -> None:
+        """
+        Compile the engagement scope into lookup structures.
+
+        Called on construction. Call again if ``engagement.scope`` is
+        modified after the engine has been created.
+        """
+        scope = self.engagement.scope
+        self._ip_index = IPRangeIndex(scope.ip_ranges)
+        self._hostname_index = HostnameIndex(scope.hostnames)
+        self._ssids = frozenset(scope.ssids)
+        self._mac_index = MacAddressIndex(scope.mac_addresses)
 
     def validate_target_in_scope(
         self,
@@ -64,31 +100,27 @@ class PolicyEngine:
 
         # Check IP address
         if ip_address:
-            if not self._check_ip_in_scope(ip_address, scope.ip_ranges):
+            if scope.ip_ranges and ip_address not in self._ip_index:
                 logger.warning(
                     "out_of_scope_ip",
                     ip=ip_address,
                     engagement_id=self.engagement.engagement_id,
                 )
-                raise OutOfScopeError(
-                    f"IP address {ip_address} not in authorized scope"
-                )
+                raise OutOfScopeError(f"IP address {ip_address} not in authorized scope")
 
         # Check hostname
         if hostname:
-            if hostname not in scope.hostnames and scope.hostnames:
+            if scope.hostnames and hostname not in self._hostname_index:
                 logger.warning(
                     "out_of_scope_hostname",
                     hostname=hostname,
                     engagement_id=self.engagement.engagement_id,
                 )
-                raise OutOfScopeError(
-                    f"Hostname {hostname} not in authorized scope"
-                )
+                raise OutOfScopeError(f"Hostname {hostname} not in authorized scope")
 
         # Check SSID
         if ssid:
-            if ssid not in scope.ssids and scope.ssids:
+            if scope.ssids and ssid not in self._ssids:
                 logger.warning(
                     "out_of_scope_ssid",
                     ssid=ssid,
@@ -98,15 +130,13 @@ class PolicyEngine:
 
         # Check MAC address
         if mac_address:
-            if mac_address not in scope.mac_addresses and scope.mac_addresses:
+            if scope.mac_addresses and mac_address not in self._mac_index:
                 logger.warning(
                     "out_of_scope_mac",
                     mac=mac_address,
                     engagement_id=self.engagement.engagement_id,
                 )
-                raise OutOfScopeError(
-                    f"MAC address {mac_address} not in authorized scope"
-                )
+                raise OutOfScopeError(f"MAC address {mac_address} not in authorized scope")
 
         return True
 
@@ -165,19 +195,37 @@ class PolicyEngine:
                 method=method,
                 engagement_id=self.engagement.engagement_id,
             )
-            raise UnauthorizedMethodError(
-                f"Method '{method}' not authorized in engagement"
-            )
+            raise UnauthorizedMethodError(f"Method '{method}' not authorized in engagement")
 
         return True
 
-    def check_rate_limit(self, method: str, max_per_hour: int = 10) -> bool:
+    def check_rate_limit(
+        self,
+        method: str,
+        max_per_hour: int = 10,
+        agent_id: Optional[str] = None,
+        subnet: Optional[str] = None,
+        count: int = 1,
+        partition_limit: Optional[int] = None,
+    ) -> bool:
         """
-        Check if method call would exceed rate limit.
+        Check if method call would exceed rate limit, and count it if not.
+
+        Calls are counted in a sliding one-hour window, so capacity frees up
+        as earlier calls age out. The engagement-wide limit for ``method``
+        always applies; passing ``agent_id`` and/or ``subnet`` additionally
+        limits that partition, so partitions share the engagement allowance
+        rather than each getting their own.
 
         Args:
             method: Method being called
             max_per_hour: Maximum calls allowed per hour
+            agent_id: Optional agent to partition the limit by
+            subnet: Optional target subnet to partition the limit by
+                (see ``rate_limiter.subnet_key``)
+            count: Calls to charge at once; all or none are granted
+            partition_limit: Maximum calls per hour within the partition
+                (default: the method limit)
 
         Returns:
             True if within rate limit
@@ -185,30 +233,116 @@ class PolicyEngine:
         Raises:
             RateLimitExceededError: If rate limit exceeded
         """
-        # Get configured limit or use default
-        configured_limit = self.engagement.rate_limits.get(method, max_per_hour)
+        claims = self._rate_limit_claims(method, max_per_hour, agent_id, subnet, partition_limit)
 
-        current_count = self.method_counters.get(method, 0)
-        if current_count >= configured_limit:
+        if not self.rate_limiter.try_acquire_all(claims, count):
+            key, limit = next(
+                (key, limit)
+                for key, limit in claims
+                if self.rate_limiter.count(key) + count > limit
+            )
+            current_count = self.rate_limiter.count(key)
+            retry_after = self.rate_limiter.time_until_available_all(claims)
             logger.warning(
                 "rate_limit_exceeded",
                 method=method,
+                agent_id=key[1],
+                subnet=key[2],
                 count=current_count,
-                limit=configured_limit,
+                requested=count,
+                limit=limit,
+                retry_after=round(retry_after, 3),
                 engagement_id=self.engagement.engagement_id,
             )
             raise RateLimitExceededError(
                 f"Rate limit exceeded for method '{method}': "
-                f"{current_count}/{configured_limit}"
+                f"{current_count}/{limit} (retry in {retry_after:.0f}s)"
             )
 
-        self.method_counters[method] = current_count + 1
         return True
 
+    async def acquire_rate_limit(
+        self,
+        method: str,
+        max_per_hour: int = 10,
+        agent_id: Optional[str] = None,
+        subnet: Optional[str] = None,
+        timeout: Optional[float] = None,
+        partition_limit: Optional[int] = None,
+    ) -> None:
+        """
+        Wait for rate-limit capacity instead of raising.
+
+        Lets callers pace scans at the maximum rate the RoE permits.
+
+        Args:
+            method: Method being called
+            max_per_hour: Maximum calls allowed per hour
+            agent_id: Optional agent to partition the limit by
+            subnet: Optional target subnet to partition the limit by
+            timeout: Maximum seconds to wait (None = wait indefinitely)
+            partition_limit: Maximum calls per hour within the partition
+
+        Raises:
+            asyncio.TimeoutError: If capacity is not available within timeout
+        """
+        await self.rate_limiter.acquire_all(
+            self._rate_limit_claims(method, max_per_hour, agent_id, subnet, partition_limit),
+            timeout=timeout,
+        )
+
+    def rate_limit_delay(
+        self,
+        method: str,
+        max_per_hour: int = 10,
+        agent_id: Optional[str] = None,
+        subnet: Optional[str] = None,
+        partition_limit: Optional[int] = None,
+    ) -> float:
+        """
+        Seconds until ``method`` has rate-limit capacity, without consuming it.
+
+        Returns 0.0 if a call would be permitted now.
+        """
+        return self.rate_limiter.time_until_available_all(
+            self._rate_limit_claims(method, max_per_hour, agent_id, subnet, partition_limit)
+        )
+
+    def _configured_rate_limit(self, method: str, default: int) -> int:
+        """Get the RoE limit for method, or default if not configured."""
+        return self.engagement.rate_limits.get(method, default)
+
+    def _rate_limit_claims(
+        self,
+        method: str,
+        max_per_hour: int,
+        agent_id: Optional[str],
+        subnet: Optional[str],
+        partition_limit: Optional[int],
+    ) -> list[tuple[tuple[str, Optional[str], Optional[str]], int]]:
+        """``(key, limit)`` pairs a call must fit: the method, then its partition."""
+        limit = self._configured_rate_limit(method, max_per_hour)
+        claims = [(self._rate_limit_key(method, None, None), limit)]
+        if agent_id is not None or subnet is not None:
+            claims.append(
+                (self._rate_limit_key(method, agent_id, subnet), partition_limit or limit)
+            )
+        return claims
+
+    @staticmethod
+    def _rate_limit_key(
+        method: str,
+        agent_id: Optional[str],
+        subnet: Optional[str],
+    ) -> tuple[str, Optional[str], Optional[str]]:
+        """Build the rate limiter key for a method partition."""
+        return (method, agent_id, subnet)
+
     def validate_scan_request(
         self,
         method: str,
         target: dict[str, Any],
+        charge_rate_limit: bool = True,
     ) -> bool:
         """
         Comprehensive validation for a scan request.
@@ -216,6 +350,8 @@ class PolicyEngine:
         Args:
             method: Method being used
             target: Target information dict with 'ip', 'hostname', 'ssid', 'mac'
+            charge_rate_limit: Count the request against the rate limit; pass
+                False if its grant was already taken with ``check_rate_limit``
 
         Returns:
             True if request is valid
@@ -230,7 +366,8 @@ class PolicyEngine:
         self.validate_method_authorized(method)
 
         # Check rate limit
-        self.check_rate_limit(method)
+        if charge_rate_limit:
+            self.check_rate_limit(method)
 
         # Check target in scope
         self.validate_target_in_scope(
@@ -248,11 +385,163 @@ class PolicyEngine:
 
         return True
 
+    def validate_scan_batch(
+        self,
+        method: str,
+        targets: Optional[Iterable[dict[str, Any]]] = None,
+        cidr: Optional[str] = None,
+        max_cidr_hosts: int = MAX_BATCH_CIDR_HOSTS,
+    ) -> BatchValidationResult:
+        """
+        Validate many targets for one method in a single pass.
+
+        Time window and method authorization are checked once for the whole
+        batch and raise exactly as in ``validate_scan_request``. Per-target
+        scope failures do not raise; they are returned as rejected targets
+        with a reason code. IP membership is evaluated with vectorized
+        integer comparisons (see ``IPRangeIndex.contains_many``).
+
+        The rate limit is charged one call per in-scope target, as if each
+        had gone through ``validate_scan_request``. It is all-or-nothing: if
+        the method lacks capacity for every in-scope target, nothing is
+        charged and ``RateLimitExceededError`` is raised.
+
+        Args:
+            method: Method being used
+            targets: Target dicts with 'ip', 'hostname', 'ssid', 'mac'
+            cidr: CIDR range to expand into one ``{"ip": ...}`` target per host
+            max_cidr_hosts: Largest ``cidr`` (in hosts) that will be expanded
+
+        Returns:
+            Targets partitioned into in-scope and out-of-scope
+
+        Raises:
+            ValueError: If ``cidr`` is invalid or has more than ``max_cidr_hosts`` hosts
+            Various PolicyViolationError subclasses if batch-level checks fail
+        """
+        # Parse everything before any check that has side effects
+        target_list = list(targets or ())
+        addresses = [self._parse_ip(target.get("ip")) for target in target_list]
+        if cidr:
+            network = ipaddress.ip_network(cidr, strict=False)
+            hosts = self._host_range(network)
+            # len() overflows for large IPv6 ranges
+            host_count = hosts.stop - hosts.start
+            if host_count > max_cidr_hosts:
+                raise ValueError(
+                    f"CIDR {cidr} has {host_count} hosts; batches expand at most {max_cidr_hosts}"
+                )
+            address_class = ipaddress.IPv4Address if network.version == 4 else ipaddress.IPv6Address
+            for value in hosts:
+                target_list.append({"ip": str(address_class(value))})
+                addresses.append((network.version, value))
+
+        self.validate_time_window()
+        self.validate_method_authorized(method)
+
+        reasons = self._ip_rejection_reasons(addresses)
+        result = BatchValidationResult(method=method)
+        for target, reason in zip(target_list, reasons):
+            if reason is None:
+                reason = self._scope_rejection_reason(
+                    hostname=target.get("hostname"),
+                    ssid=target.get("ssid"),
+                    mac_address=target.get("mac"),
+                )
+            if reason is None:
+                result.in_scope.append(target)
+            else:
+                result.out_of_scope.append(RejectedTarget(target=target, reason=reason))
+
+        if result.in_scope:
+            self.check_rate_limit(method, count=len(result.in_scope))
+
+        logger.info(
+            "scan_batch_validated",
+            engagement_id=self.engagement.engagement_id,
+            **result.summary(),
+        )
+
+        return result
+
+    def _ip_rejection_reasons(
+        self, addresses: list[Optional[tuple[int, int]]]
+    ) -> list[Optional[str]]:
+        """Reason code per parsed address (None if in scope or absent)."""
+        reasons: list[Optional[str]] = [None] * len(addresses)
+        if not self.engagement.scope.ip_ranges:
+            return reasons
+
+        positions: dict[int, list[int]] = {4: [], 6: []}
+        values: dict[int, list[int]] = {4: [], 6: []}
+        for i, address in enumerate(addresses):
+            if address is None:
+                continue
+            version, value = address
+            if version == 0:
+                reasons[i] = REASON_INVALID_IP
+            else:
+                positions[version].append(i)
+                values[version].append(value)
+
+        for version in (4, 6):
+            flags = self._ip_index.contains_many(values[version], version)
+            for i, hit in zip(positions[version], flags):
+                if not hit:
+                    reasons[i] = REASON_IP_OUT_OF_SCOPE
+        return reasons
+
+    def _scope_rejection_reason(
+        self,
+        hostname: Optional[str] = None,
+        ssid: Optional[str] = None,
+        mac_address: Optional[str] = None,
+    ) -> Optional[str]:
+        """Return the reason code for a non-IP scope failure, or None."""
+        scope = self.engagement.scope
+
+        if hostname and scope.hostnames and hostname not in self._hostname_index:
+            return REASON_HOSTNAME_OUT_OF_SCOPE
+        if ssid and scope.ssids and ssid not in self._ssids:
+            return REASON_SSID_OUT_OF_SCOPE
+        if mac_address and scope.mac_addresses and mac_address not in self._mac_index:
+            return REASON_MAC_OUT_OF_SCOPE
+        return None
+
+    @staticmethod
+    def _parse_ip(ip_str: Optional[str]) -> Optional[tuple[int, int]]:
+        """
+        Parse an IP string to ``(version, int)``.
+
+        Returns None if no IP was given and ``(0, 0)`` if it is invalid.
+        """
+        if not ip_str:
+            return None
+        try:
+            ip = ipaddress.ip_address(ip_str)
+        except ValueError:
+            return (0, 0)
+        return (ip.version, int(ip))
+
+    @staticmethod
+    def _host_range(network: ipaddress.IPv4Network | ipaddress.IPv6Network) -> range:
+        """Integer range of usable hosts, matching ``network.hosts()``."""
+        first = int(network.network_address)
+        last = int(network.broadcast_address)
+        if network.version == 4 and network.prefixlen < 31:
+            return range(first + 1, last)
+        if network.version == 6 and network.prefixlen < 127:
+            return range(first + 1, last + 1)
+        return range(first, last + 1)
+
     @staticmethod
     def _check_ip_in_scope(ip_str: str, ip_ranges: list[str]) -> bool:
         """
         Check if IP is in any of the allowed CIDR ranges.
 
+        Compiles ``ip_ranges`` on every call; engine instances use the index
+        built by :meth:`compile_scope` instead.
+
         Args:
             ip_str: IP address to check
             ip_ranges: List of CIDR ranges
@@ -264,12 +553,4 @@ class PolicyEngine:
             # No IP range restriction
             return True
 
-        try:
-            ip = ipaddress.ip_address(ip_str)
-            for cidr in ip_ranges:
-                if ip in ipaddress.ip_network(cidr, strict=False):
-                    return True
-            return False
-        except ValueError as e:
-            logger.error("invalid_ip_or_cidr", ip=ip_str, ranges=ip_ranges, error=str(e))
-            return False
+        return ip_str in IPRangeIndex(ip_ranges)
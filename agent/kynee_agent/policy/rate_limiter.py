@@ -0,0 +1,238 @@
+"""Sliding-window rate limiting for RoE method limits."""
+
+import asyncio
+import ipaddress
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Callable, Hashable, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class SlidingWindowRateLimiter:
+    """
+    Exact sliding-window limiter keyed by arbitrary hashable keys.
+
+    Each key keeps a deque of grant timestamps from a monotonic clock. A
+    request is allowed while fewer than ``limit`` grants fall inside the last
+    ``window_seconds``; expired timestamps are dropped from the left as they
+    age out, so checks are O(1) amortized and memory per key is bounded by
+    its limit. Keys whose grants have all expired are removed, so the
+    number of keys tracks recent activity. Unlike a token bucket this never
+    permits a burst above the limit within any window, which is what an RoE
+    "N per hour" clause means.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+        on_grant: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize rate limiter.
+
+        Args:
+            window_seconds: Length of the sliding window
+            clock: Monotonic time source (injectable for tests)
+            on_grant: Called after grants are recorded (e.g. to persist them)
+        """
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.on_grant = on_grant
+        self._grants: dict[Hashable, deque[float]] = {}
+        self._last_prune = clock()
+
+    def try_acquire(self, key: Hashable, limit: int, count: int = 1) -> bool:
+        """
+        Record ``count`` grants for ``key`` if capacity is available.
+
+        Args:
+            key: Limiter key (e.g. method, or (method, subnet))
+            limit: Maximum grants per window for this key
+            count: Grants to record; all or none are recorded
+
+        Returns:
+            True if granted, False if the key lacks capacity for ``count``
+        """
+        return self.try_acquire_all([(key, limit)], count)
+
+    def try_acquire_all(self, claims: Iterable[tuple[Hashable, int]], count: int = 1) -> bool:
+        """
+        Record ``count`` grants under every key, or none if any key lacks capacity.
+
+        Args:
+            claims: ``(key, limit)`` pairs that must all have capacity
+            count: Grants to record per key
+
+        Returns:
+            True if granted under every key
+        """
+        now = self.clock()
+        if now - self._last_prune >= self.window_seconds:
+            self._prune(now)
+        claims = list(claims)
+        for key, limit in claims:
+            if len(self._expire(key, now) or ()) + count > limit:
+                return False
+        for key, _ in claims:
+            self._grants.setdefault(key, deque()).extend([now] * count)
+        if self.on_grant is not None:
+            self.on_grant()
+        return True
+
+    def count(self, key: Hashable) -> int:
+        """Number of grants for ``key`` inside the current window."""
+        return len(self._expire(key, self.clock()) or ())
+
+    def time_until_available(self, key: Hashable, limit: int) -> float:
+        """
+        Seconds until ``key`` has capacity for one more grant.
+
+        Returns 0.0 if a grant would succeed now.
+        """
+        now = self.clock()
+        grants = self._expire(key, now) or ()
+        if len(grants) < limit:
+            return 0.0
+        if limit <= 0:
+            return float("inf")
+        # The grant that must expire is the one `limit` places from the end
+        return max(0.0, grants[-limit] + self.window_seconds - now)
+
+    def time_until_available_all(self, claims: Iterable[tuple[Hashable, int]]) -> float:
+        """Seconds until every ``(key, limit)`` claim has capacity for one more grant."""
+        return max((self.time_until_available(key, limit) for key, limit in claims), default=0.0)
+
+    async def acquire(
+        self,
+        key: Hashable,
+        limit: int,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Wait until ``key`` has capacity, then record a grant.
+
+        Args:
+            key: Limiter key
+            limit: Maximum grants per window for this key
+            timeout: Maximum seconds to wait (None = wait indefinitely)
+
+        Raises:
+            asyncio.TimeoutError: If capacity is not available within timeout
+            ValueError: If ``limit`` is not positive (would wait forever)
+        """
+        await self.acquire_all([(key, limit)], timeout=timeout)
+
+    async def acquire_all(
+        self,
+        claims: Iterable[tuple[Hashable, int]],
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Wait until every ``(key, limit)`` claim has capacity, then grant them together.
+
+        Raises:
+            asyncio.TimeoutError: If capacity is not available within timeout
+            ValueError: If a limit is not positive (would wait forever)
+        """
+        claims = list(claims)
+        for key, limit in claims:
+            if limit <= 0:
+                raise ValueError(
+                    f"Rate limit for {key!r} is {limit}; capacity will never be available"
+                )
+
+        deadline = None if timeout is None else self.clock() + timeout
+        while not self.try_acquire_all(claims):
+            wait = self.time_until_available_all(claims)
+            keys = ", ".join(repr(key) for key, _ in claims)
+            if deadline is not None:
+                remaining = deadline - self.clock()
+                if wait > remaining:
+                    raise asyncio.TimeoutError(f"Rate limit capacity for {keys} not available")
+            logger.debug("rate_limit_waiting", key=keys, wait_seconds=round(wait, 3))
+            await asyncio.sleep(wait)
+
+    def export_grants(self) -> dict[Hashable, list[float]]:
+        """
+        Grants still inside the window, as ages in seconds (oldest first).
+
+        Ages rather than clock readings, since a monotonic clock does not
+        survive a restart; see ``import_grants``.
+        """
+        now = self.clock()
+        exported = {}
+        for key in list(self._grants):
+            grants = self._expire(key, now)
+            if grants:
+                exported[key] = [now - granted for granted in grants]
+        return exported
+
+    def import_grants(self, grants: dict[Hashable, Iterable[float]]) -> None:
+        """Add grants given as ages in seconds, e.g. saved before a restart."""
+        now = self.clock()
+        cutoff = now - self.window_seconds
+        for key, ages in grants.items():
+            merged = sorted([*(self._expire(key, now) or ()), *(now - age for age in ages)])
+            live = deque(t for t in merged if t > cutoff)
+            if live:
+                self._grants[key] = live
+
+    def reset(self, key: Optional[Hashable] = None) -> None:
+        """Forget grants for ``key`` (or all keys if None)."""
+        if key is None:
+            self._grants.clear()
+        else:
+            self._grants.pop(key, None)
+
+    def __len__(self) -> int:
+        """Number of keys holding grants (expired keys are removed as they are seen)."""
+        return len(self._grants)
+
+    def _prune(self, now: float) -> None:
+        """Expire every key, removing those left empty (once per window)."""
+        for key in list(self._grants):
+            self._expire(key, now)
+        self._last_prune = now
+
+    def _expire(self, key: Hashable, now: float) -> Optional[deque[float]]:
+        """
+        Drop grants older than the window and return the key's deque.
+
+        Never creates a deque; a key whose grants have all expired is
+        removed and None is returned, so idle keys do not accumulate.
+        """
+        grants = self._grants.get(key)
+        if grants is None:
+            return None
+        cutoff = now - self.window_seconds
+        while grants and grants[0] <= cutoff:
+            grants.popleft()
+        if not grants:
+            del self._grants[key]
+            return None
+        return grants
+
+
+def subnet_key(ip_str: str, ipv4_prefix: int = 24, ipv6_prefix: int = 64) -> str:
+    """
+    Map an address to its enclosing subnet for per-subnet rate limiting.
+
+    Args:
+        ip_str: IP address
+        ipv4_prefix: Prefix length used to group IPv4 addresses
+        ipv6_prefix: Prefix length used to group IPv6 addresses
+
+    Returns:
+        Subnet in CIDR notation, or the input unchanged if it is not an IP
+    """
+    try:
+        ip = ipaddress.ip_address(ip_str)
+    except ValueError:
+        return ip_str
+    prefix = ipv4_prefix if ip.version == 4 else ipv6_prefix
+    return str(ipaddress.ip_network((ip, prefix), strict=False))
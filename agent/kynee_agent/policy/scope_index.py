@@ -0,0 +1,287 @@
+"""Compiled lookup structures for engagement scope checks."""
+
+import ipaddress
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional, Union
+
+import structlog
+
+try:  # Optional: vectorized batch lookups
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+logger = structlog.get_logger(__name__)
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+
+class IPRangeIndex:
+    """
+    Sorted integer interval table for CIDR membership checks.
+
+    CIDR strings are parsed once at construction, converted to inclusive
+    ``(first, last)`` integer ranges, and overlapping or adjacent ranges are
+    merged. A lookup is then a single ``bisect`` over a flat list of range
+    starts, independent of how the scope was written.
+
+    IPv4 and IPv6 ranges are kept in separate tables so integer values from
+    the two address families never compare against each other.
+    """
+
+    __slots__ = ("_starts4", "_ends4", "_starts6", "_ends6", "_range_count", "_np_tables4")
+
+    def __init__(self, cidrs: Iterable[str]):
+        """
+        Compile CIDR ranges into interval tables.
+
+        Args:
+            cidrs: CIDR ranges (or bare addresses) to index. Invalid entries
+                are logged and skipped.
+        """
+        v4: list[tuple[int, int]] = []
+        v6: list[tuple[int, int]] = []
+        range_count = 0
+
+        for cidr in cidrs:
+            try:
+                network = ipaddress.ip_network(cidr, strict=False)
+            except ValueError as e:
+                logger.error("invalid_cidr", cidr=cidr, error=str(e))
+                continue
+
+            first = int(network.network_address)
+            last = int(network.broadcast_address)
+            if network.version == 4:
+                v4.append((first, last))
+            else:
+                v6.append((first, last))
+            range_count += 1
+
+        self._starts4, self._ends4 = self._merge(v4)
+        self._starts6, self._ends6 = self._merge(v6)
+        self._range_count = range_count
+        self._np_tables4: Optional[tuple[Any, Any]] = None
+
+    def __len__(self) -> int:
+        """Number of valid CIDR ranges the index was compiled from."""
+        return self._range_count
+
+    def __contains__(self, ip: object) -> bool:
+        """Check membership of an address string or ``ipaddress`` object."""
+        if isinstance(ip, str):
+            try:
+                ip = ipaddress.ip_address(ip)
+            except ValueError:
+                return False
+        if not isinstance(ip, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+            return False
+        return self.contains_int(int(ip), ip.version)
+
+    def contains_int(self, value: int, version: int = 4) -> bool:
+        """
+        Check membership of an integer address.
+
+        Args:
+            value: Address as an integer
+            version: IP version (4 or 6) the integer belongs to
+
+        Returns:
+            True if the address falls inside any indexed range
+        """
+        if version == 4:
+            starts, ends = self._starts4, self._ends4
+        else:
+            starts, ends = self._starts6, self._ends6
+
+        i = bisect_right(starts, value) - 1
+        return i >= 0 and value <= ends[i]
+
+    def contains_many(self, values: Sequence[int], version: int = 4) -> list[bool]:
+        """
+        Check membership of many integer addresses at once.
+
+        IPv4 lookups are vectorized with NumPy ``searchsorted`` when NumPy is
+        installed; otherwise (and always for IPv6, which does not fit in a
+        NumPy integer) each value is bisected in turn.
+
+        Args:
+            values: Addresses as integers, all of the same IP version
+            version: IP version (4 or 6) of ``values``
+
+        Returns:
+            Membership flags in the same order as ``values``
+        """
+        if version == 4 and np is not None and len(values) > 0:
+            if not self._starts4:
+                return [False] * len(values)
+            if self._np_tables4 is None:
+                self._np_tables4 = (
+                    np.asarray(self._starts4, dtype=np.int64),
+                    np.asarray(self._ends4, dtype=np.int64),
+                )
+            starts, ends = self._np_tables4
+            addrs = np.asarray(values, dtype=np.int64)
+            idx = np.searchsorted(starts, addrs, side="right") - 1
+            hits = (idx >= 0) & (addrs <= ends[np.maximum(idx, 0)])
+            return hits.tolist()
+
+        return [self.contains_int(value, version) for value in values]
+
+    @property
+    def intervals4(self) -> tuple[list[int], list[int]]:
+        """Merged IPv4 ``(starts, ends)`` tables (inclusive bounds)."""
+        return self._starts4, self._ends4
+
+    @property
+    def intervals6(self) -> tuple[list[int], list[int]]:
+        """Merged IPv6 ``(starts, ends)`` tables (inclusive bounds)."""
+        return self._starts6, self._ends6
+
+    @staticmethod
+    def _merge(ranges: list[tuple[int, int]]) -> tuple[list[int], list[int]]:
+        """Sort and merge overlapping/adjacent inclusive ranges."""
+        starts: list[int] = []
+        ends: list[int] = []
+
+        for first, last in sorted(ranges):
+            if ends and first <= ends[-1] + 1:
+                if last > ends[-1]:
+                    ends[-1] = last
+            else:
+                starts.append(first)
+                ends.append(last)
+
+        return starts, ends
+
+
+_WILDCARD = "*"
+
+
+def normalize_hostname(hostname: str) -> str:
+    """Case-fold a hostname and strip any trailing root dot."""
+    return hostname.strip().rstrip(".").lower()
+
+
+class HostnameIndex:
+    """
+    Hostname scope lookups with wildcard suffix support.
+
+    Exact hostnames are held in a frozenset. Wildcard entries such as
+    ``*.corp.example`` are stored in a trie keyed by reversed labels
+    (``example`` -> ``corp``), so a lookup walks at most one node per label
+    of the candidate hostname no matter how many wildcards are in scope.
+    A wildcard matches any name with at least one extra label, so
+    ``*.corp.example`` matches ``a.corp.example`` and ``a.b.corp.example``
+    but not ``corp.example`` itself. Matching is case-insensitive.
+    """
+
+    __slots__ = ("_exact", "_suffix_trie", "_size")
+
+    def __init__(self, hostnames: Iterable[str]):
+        """
+        Compile hostnames and wildcard suffixes.
+
+        Args:
+            hostnames: Hostnames or ``*.suffix`` wildcards
+        """
+        exact: set[str] = set()
+        trie: dict[str, Any] = {}
+        size = 0
+
+        for raw in hostnames:
+            hostname = normalize_hostname(raw)
+            if not hostname:
+                continue
+            size += 1
+            if hostname == _WILDCARD or hostname.startswith(_WILDCARD + "."):
+                node = trie
+                for label in reversed(hostname.split(".")[1:]):
+                    node = node.setdefault(label, {})
+                node[_WILDCARD] = True
+            else:
+                exact.add(hostname)
+
+        self._exact = frozenset(exact)
+        self._suffix_trie = trie
+        self._size = size
+
+    def __len__(self) -> int:
+        """Number of hostnames and wildcards the index was compiled from."""
+        return self._size
+
+    def __contains__(self, hostname: object) -> bool:
+        """Check whether a hostname is in scope."""
+        if not isinstance(hostname, str):
+            return False
+        name = normalize_hostname(hostname)
+        if name in self._exact:
+            return True
+        if not self._suffix_trie:
+            return False
+
+        labels = name.split(".")
+        node = self._suffix_trie
+        # Walk from the TLD; a wildcard at depth d needs at least d+1 labels
+        for depth in range(len(labels) - 1, -1, -1):
+            if _WILDCARD in node:
+                return True
+            child = node.get(labels[depth])
+            if child is None:
+                return False
+            node = child
+        return False
+
+
+def mac_to_int(mac: str) -> Optional[int]:
+    """
+    Parse a MAC address to a 48-bit integer.
+
+    Accepts colon, dash and dot separated forms (``aa:bb:..``,
+    ``aa-bb-..``, ``aabb.ccdd.eeff``) as well as bare hex, in any case.
+
+    Returns:
+        Integer value, or None if the string is not a MAC address
+    """
+    digits = mac.strip().replace(":", "").replace("-", "").replace(".", "")
+    if len(digits) != 12:
+        return None
+    try:
+        return int(digits, 16)
+    except ValueError:
+        return None
+
+
+class MacAddressIndex:
+    """MAC address scope lookups on normalized 48-bit integers."""
+
+    __slots__ = ("_macs",)
+
+    def __init__(self, mac_addresses: Iterable[str]):
+        """
+        Compile MAC addresses.
+
+        Args:
+            mac_addresses: MAC addresses in any common notation. Invalid
+                entries are logged and skipped.
+        """
+        macs: set[int] = set()
+        for mac in mac_addresses:
+            value = mac_to_int(mac)
+            if value is None:
+                logger.error("invalid_mac_address", mac=mac)
+                continue
+            macs.add(value)
+        self._macs = frozenset(macs)
+
+    def __len__(self) -> int:
+        """Number of distinct MAC addresses in the index."""
+        return len(self._macs)
+
+    def __contains__(self, mac: object) -> bool:
+        """Check whether a MAC address (any notation) is in scope."""
+        if not isinstance(mac, str):
+            return False
+        value = mac_to_int(mac)
+        return value is not None and value in self._macs
@@ -2,7 +2,7 @@
 
 import pytest
 
-from kynee_agent.core import Agent
+from kynee_agent.core import Agent, ScanItem
 
 
 class TestAgent:
@@ -53,3 +53,16 @@ class TestAgent:
         assert result["job_id"] == "job-001"
         assert "status" in result
         assert "findings" in result
+
+    @pytest.mark.asyncio
+    async def test_execute_scan_collects_stream(self) -> None:
+        """execute_scan should gather everything stream_scan yields."""
+
+        class StreamingAgent(Agent):
+            async def stream_scan(self, job):
+                yield ScanItem("finding", {"title": "open port"})
+                yield ScanItem("inventory", {"host": "10.0.0.5"})
+
+        result = await StreamingAgent().execute_scan({"job_id": "job-002"})
+        assert result["findings"] == [{"title": "open port"}]
+        assert result["inventory"] == [{"host": "10.0.0.5"}]
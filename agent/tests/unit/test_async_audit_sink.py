@@ -0,0 +1,138 @@
+"""Unit tests for AsyncAuditSink."""
+
+import asyncio
+
+import pytest
+
+from kynee_agent.audit import AsyncAuditSink
+from kynee_agent.audit import AuditLogWriter
+from kynee_agent.core.exceptions import AuditLogError
+
+
+@pytest.mark.asyncio
+async def test_log_event_returns_chain_hash(temp_dir):
+    """Awaiting the returned future should yield the entry's chain hash."""
+    writer = AuditLogWriter(temp_dir / "audit.log")
+    sink = AsyncAuditSink(writer)
+    await sink.start()
+
+    future = await sink.log_event("event1", "actor", "action", "success")
+    entry_hash = await future
+
+    assert entry_hash == writer.previous_hash
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_all_entries_in_order(temp_dir):
+    """flush() should leave every submitted entry on disk, in order."""
+    writer = AuditLogWriter(temp_dir / "audit.log")
+    sink = AsyncAuditSink(writer, max_queue_size=4, max_batch_size=3)
+    await sink.start()
+
+    for i in range(20):
+        await sink.log_event(f"event-{i}", "actor", "action", "success")
+    await sink.flush()
+
+    entries = writer.get_entries()
+    assert [e["event_type"] for e in entries] == [f"event-{i}" for i in range(20)]
+    assert sink.pending == 0
+    assert writer.verify_integrity() is True
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_backpressure_blocks_when_queue_full(temp_dir):
+    """Producers should wait for space once the queue is full."""
+    writer = AuditLogWriter(temp_dir / "audit.log")
+    sink = AsyncAuditSink(writer, max_queue_size=1)
+    await sink.start()
+
+    # Stall the writer thread so the queue cannot drain
+    sink._write_lock.acquire()
+    try:
+        await sink.log_event("event1", "actor", "action", "success")
+        await asyncio.sleep(0.01)
+        await sink.log_event("event2", "actor", "action", "success")
+
+        blocked = asyncio.create_task(sink.log_event("event3", "actor", "action", "success"))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+    finally:
+        sink._write_lock.release()
+
+    await blocked
+    await sink.close()
+    assert len(writer.get_entries()) == 3
+
+
+@pytest.mark.asyncio
+async def test_close_drains_queue(temp_dir):
+    """close() should write every accepted entry before stopping."""
+    writer = AuditLogWriter(temp_dir / "audit.log")
+    sink = AsyncAuditSink(writer)
+    await sink.start()
+
+    for i in range(50):
+        await sink.log_event(f"event-{i}", "actor", "action", "success")
+    await sink.close()
+
+    assert sink.running is False
+    assert len(writer.get_entries()) == 50
+
+
+@pytest.mark.asyncio
+async def test_flush_sync_from_loop_thread(temp_dir):
+    """flush_sync() should make queued entries visible to synchronous readers."""
+    writer = AuditLogWriter(temp_dir / "audit.log")
+    sink = AsyncAuditSink(writer)
+    await sink.start()
+
+    await sink.log_scan_started("agent-1", "scan-1", "network-scanning", {"ip": "10.0.0.1"})
+    sink.flush_sync()
+
+    assert writer.get_entries()[0]["event_type"] == "scan_started"
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_submit_requires_start(temp_dir):
+    """A sink that was never started should refuse entries instead of starting itself."""
+    sink = AsyncAuditSink(AuditLogWriter(temp_dir / "audit.log"))
+
+    with pytest.raises(AuditLogError, match="not started"):
+        await sink.log_event("event1", "actor", "action", "success")
+    assert sink.running is False
+
+
+@pytest.mark.asyncio
+async def test_write_failure_fails_closed(temp_dir):
+    """After a failed write, later entries should be refused, not silently dropped."""
+    writer = AuditLogWriter(temp_dir / "audit.log")
+    sink = AsyncAuditSink(writer)
+    await sink.start()
+    log_event = writer.log_event
+    failures = [OSError("disk full")]
+
+    def flaky_log_event(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return log_event(*args, **kwargs)
+
+    writer.log_event = flaky_log_event
+    first = await sink.log_event("event1", "actor", "action", "success")
+    second = await sink.log_event("event2", "actor", "action", "success")
+
+    with pytest.raises(AuditLogError, match="disk full"):
+        await sink.flush()
+    assert sink.failed is True
+    with pytest.raises(OSError):
+        await second
+    with pytest.raises(AuditLogError):
+        await sink.log_event("event3", "actor", "action", "success")
+    assert first.done()
+    with pytest.raises(AuditLogError):
+        await sink.close()
+
+    assert sink.running is False
+    assert writer.get_entries() == []
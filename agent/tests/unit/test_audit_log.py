@@ -1,12 +1,17 @@
 """Unit tests for AuditLogWriter."""
 
+import gzip
 import hashlib
 import json
+from datetime import datetime
 from pathlib import Path
 
 import pytest
 
 from kynee_agent.audit.writer import AuditLogWriter
+from kynee_agent.audit.reader import AuditLogReader
+from kynee_agent.audit.reader import _reverse_lines
+from kynee_agent.audit.segments import Segment
 
 
 class TestAuditLogWriter:
@@ -293,3 +298,550 @@ class TestAuditLogWriter:
             lines = f.readlines()
 
         assert len(lines) == 3
+
+
+class TestAuditLogGroupCommit:
+    """Test buffered group-commit mode."""
+
+    def test_entries_buffered_until_threshold(self, temp_dir):
+        """Entries should be written once flush_max_entries are pending."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, group_commit=True, flush_max_entries=3, flush_interval=60)
+
+        writer.log_event("event1", "actor", "action", "success")
+        writer.log_event("event2", "actor", "action", "success")
+        assert not log_path.exists() or log_path.read_text() == ""
+
+        writer.log_event("event3", "actor", "action", "success")
+        assert len(log_path.read_text().splitlines()) == 3
+        writer.close()
+
+    def test_latency_threshold_flushes(self, temp_dir):
+        """Pending entries should be flushed after flush_interval."""
+        import time
+
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(
+            log_path, group_commit=True, flush_max_entries=100, flush_interval=0.02
+        )
+
+        writer.log_event("event1", "actor", "action", "success")
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            if log_path.exists() and log_path.read_text():
+                break
+            time.sleep(0.01)
+
+        assert len(log_path.read_text().splitlines()) == 1
+        writer.close()
+
+    def test_concurrent_writers_keep_chain_order(self, temp_dir):
+        """Concurrent callers should produce a verifiable chain."""
+        import threading
+
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, group_commit=True, flush_max_entries=16, fsync=False)
+        hashes = []
+        hashes_lock = threading.Lock()
+
+        def worker(n):
+            for i in range(50):
+                h = writer.log_event(f"event-{n}-{i}", f"actor-{n}", "action", "success")
+                with hashes_lock:
+                    hashes.append(h)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.close()
+
+        lines = log_path.read_text().splitlines()
+        assert len(lines) == 200
+        assert AuditLogWriter(log_path).verify_integrity() is True
+        # Returned hashes are exactly the chain hashes in the file
+        file_hashes = {hashlib.sha256(line.encode()).hexdigest() for line in lines}
+        assert set(hashes) == file_hashes
+
+    def test_close_flushes_and_reload_continues_chain(self, temp_dir):
+        """Closing should flush, and a new writer should continue the chain."""
+        log_path = temp_dir / "audit.log"
+        with AuditLogWriter(log_path, group_commit=True, flush_interval=60) as writer:
+            last_hash = writer.log_event("event1", "actor", "action", "success")
+
+        writer2 = AuditLogWriter(log_path)
+        assert writer2.previous_hash == last_hash
+        writer2.log_event("event2", "actor", "action", "success")
+        assert writer2.verify_integrity() is True
+
+    def test_reads_see_buffered_entries(self, temp_dir):
+        """get_entries should include entries still in the buffer."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, group_commit=True, flush_interval=60)
+
+        writer.log_event("event1", "actor", "action", "success")
+
+        assert [e["event_type"] for e in writer.get_entries()] == ["event1"]
+        writer.close()
+
+
+class TestAuditLogTailRecovery:
+    """Test tail-seek reload of the last hash."""
+
+    def test_reverse_lines_across_blocks(self, temp_dir):
+        """Reverse iteration should reassemble lines split across blocks."""
+        log_path = temp_dir / "lines.log"
+        lines = [f"line-{i}-" + "x" * i for i in range(40)]
+        log_path.write_bytes(("\n".join(lines) + "\n").encode())
+
+        with open(log_path, "rb") as f:
+            result = list(_reverse_lines(f, block_size=7))
+
+        assert [raw.decode() for _, raw, _ in result] == lines[::-1]
+        assert all(terminated for _, _, terminated in result)
+        data = log_path.read_bytes()
+        for offset, raw, _ in result:
+            assert data[offset : offset + len(raw)] == raw
+
+    def test_reload_matches_last_entry_hash(self, temp_dir):
+        """Reload should pick up the hash of the last complete entry."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path)
+        for i in range(100):
+            last_hash = writer.log_event(f"event{i}", "actor", "action", "success")
+
+        assert AuditLogWriter(log_path).previous_hash == last_hash
+
+    def test_torn_tail_is_quarantined(self, temp_dir):
+        """A partial final record should be moved aside and the log truncated."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path)
+        writer.log_event("event1", "actor", "action", "success")
+        last_hash = writer.log_event("event2", "actor", "action", "success")
+        intact = log_path.read_bytes()
+
+        with open(log_path, "ab") as f:
+            f.write(b'{"action":"act')
+
+        writer2 = AuditLogWriter(log_path)
+
+        assert writer2.previous_hash == last_hash
+        assert log_path.read_bytes() == intact
+        torn_path = temp_dir / "audit.log.torn"
+        assert torn_path.read_bytes() == b'{"action":"act\n'
+
+        writer2.log_event("event3", "actor", "action", "success")
+        assert writer2.verify_integrity() is True
+
+
+class TestAuditLogCheckpoints:
+    """Test checkpoint records and incremental/range verification."""
+
+    def _write(self, writer, count, start=0):
+        for i in range(start, start + count):
+            writer.log_event(f"event{i}", "actor", "action", "success")
+
+    def test_checkpoint_records_and_index(self, temp_dir):
+        """A checkpoint should be appended and indexed every N entries."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, checkpoint_interval=5)
+        self._write(writer, 12)
+
+        entries = list(writer.iter_entries(include_checkpoints=True))
+        checkpoints = [e for e in entries if e["event_type"] == "checkpoint"]
+        assert len(entries) == 14
+        assert [c["details"]["sequence"] for c in checkpoints] == [1, 2]
+
+        index = writer.checkpoints.load()
+        assert [c.lines for c in index] == [6, 12]
+        assert index[0].offset == len(b"".join(log_path.read_bytes().splitlines(True)[:6]))
+        assert writer.verify_integrity() is True
+
+    def test_queries_leave_out_checkpoints(self, temp_dir):
+        """Checkpoint records should only be returned when asked for."""
+        writer = AuditLogWriter(temp_dir / "audit.log", checkpoint_interval=5)
+        self._write(writer, 12)
+
+        assert [e["event_type"] for e in writer.get_entries()] == [f"event{i}" for i in range(12)]
+        assert writer.get_entries(1)[0]["event_type"] == "event11"
+        checkpoints = list(writer.iter_entries(event_type="checkpoint"))
+        assert [c["details"]["sequence"] for c in checkpoints] == [1, 2]
+
+    def test_checkpoint_position_survives_reload(self, temp_dir):
+        """A reopened writer should keep the checkpoint cadence."""
+        log_path = temp_dir / "audit.log"
+        self._write(AuditLogWriter(log_path, checkpoint_interval=5), 7)
+        writer = AuditLogWriter(log_path, checkpoint_interval=5)
+        self._write(writer, 5, start=7)
+
+        assert [c.sequence for c in writer.checkpoints.load()] == [1, 2]
+        assert writer.verify_range(workers=1) is True
+
+    def test_crash_before_checkpoint_commit_keeps_index_consistent(self, temp_dir):
+        """A checkpoint lost with the group-commit buffer must not stay indexed."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(
+            log_path, group_commit=True, flush_max_entries=1000, checkpoint_interval=5
+        )
+        self._write(writer, 3)
+        writer.flush()
+        self._write(writer, 4, start=3)
+        # Simulated crash: the buffered entries, checkpoint 1 included, never reach disk
+        writer._pending.clear()
+        writer.close()
+        assert writer.checkpoints.load() == []
+
+        writer = AuditLogWriter(log_path, checkpoint_interval=5)
+        self._write(writer, 8, start=7)
+
+        assert [c.sequence for c in writer.checkpoints.load()] == [1, 2]
+        assert writer.verify_range(workers=1) is True
+        assert writer.verify_integrity() is True
+
+    def test_unindexed_log_starts_from_tail(self, temp_dir):
+        """A log that predates the index is positioned from EOF and indexed, not appended to."""
+        log_path = temp_dir / "audit.log"
+        self._write(AuditLogWriter(log_path, checkpoint_interval=0), 50)
+        legacy = log_path.read_bytes()
+
+        writer = AuditLogWriter(log_path, checkpoint_interval=10)
+
+        assert log_path.read_bytes() == legacy
+        [initial] = writer.checkpoints.load()
+        assert initial.offset == len(legacy)
+        assert initial.hash == writer.previous_hash
+
+        self._write(writer, 5, start=50)
+        reopened = AuditLogWriter(log_path, checkpoint_interval=10)
+        assert reopened._since_checkpoint == 5
+        assert reopened._offset == log_path.stat().st_size
+        assert reopened.verify_range(workers=1) is True
+        assert reopened.verify_integrity() is True
+
+    def test_stale_index_entries_are_dropped_on_startup(self, temp_dir):
+        """Index entries that no longer anchor into the log are removed."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, checkpoint_interval=5)
+        self._write(writer, 6)
+        [checkpoint] = writer.checkpoints.load()
+        size = log_path.stat().st_size
+        with open(writer.checkpoints.index_path, "a") as f:
+            f.write('{"sequence":2,"lines":99,"offset":%d,"length":10,"hash":"x"}\n' % (size + 50))
+            f.write('{"sequence":2,"lines":7,"offset":%d,"length":10,"hash":"x"}\n' % size)
+
+        reopened = AuditLogWriter(log_path, checkpoint_interval=5)
+
+        assert reopened.checkpoints.load() == [checkpoint]
+        assert len(reopened.checkpoints.index_path.read_text().splitlines()) == 1
+        self._write(reopened, 5, start=6)
+        assert [c.sequence for c in reopened.checkpoints.load()] == [1, 2]
+        assert reopened.verify_range(workers=1) is True
+
+    def test_verify_incremental_checks_only_new_entries(self, temp_dir):
+        """Incremental verification should resume from the verified position."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, checkpoint_interval=0)
+        self._write(writer, 5)
+        assert writer.verify_integrity() is True
+
+        # Tamper with an already-verified entry; incremental trusts the prefix
+        # as long as the anchor record is intact
+        lines = log_path.read_bytes().splitlines(True)
+        lines[1] = lines[1].replace(b"event1", b"eventX")
+        log_path.write_bytes(b"".join(lines))
+
+        self._write(writer, 3, start=5)
+        assert writer.verify_incremental() is True
+        assert writer.checkpoints.load_verified().lines == 8
+        with pytest.raises(ValueError, match="Chain broken"):
+            writer.verify_integrity()
+
+    def test_verify_incremental_detects_new_tampering(self, temp_dir):
+        """Tampering after the verified position should be detected."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, checkpoint_interval=0)
+        self._write(writer, 3)
+        writer.verify_integrity()
+        self._write(writer, 3, start=3)
+
+        lines = log_path.read_bytes().splitlines(True)
+        lines[3] = lines[3].replace(b"event3", b"eventX")
+        log_path.write_bytes(b"".join(lines))
+
+        with pytest.raises(ValueError, match="Line 5: Chain broken"):
+            writer.verify_incremental()
+
+    def test_verify_range_parallel(self, temp_dir):
+        """Spans between checkpoints should verify in worker processes."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, checkpoint_interval=10)
+        self._write(writer, 45)
+
+        assert writer.verify_range(workers=2) is True
+        assert writer.verify_range(start_sequence=1, end_sequence=3, workers=2) is True
+
+        with pytest.raises(ValueError, match="Unknown checkpoint"):
+            writer.verify_range(start_sequence=9)
+
+    def test_verify_range_detects_tampering(self, temp_dir):
+        """A modified entry inside a span should fail range verification."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, checkpoint_interval=10)
+        self._write(writer, 30)
+
+        lines = log_path.read_bytes().splitlines(True)
+        lines[14] = lines[14].replace(b'"actor":"actor"', b'"actor":"rogue"')
+        log_path.write_bytes(b"".join(lines))
+
+        with pytest.raises(ValueError):
+            writer.verify_range(workers=1)
+
+    def test_signed_checkpoints(self, temp_dir):
+        """Checkpoint signatures should verify with the right key only."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, checkpoint_interval=3, checkpoint_key=b"secret")
+        self._write(writer, 7)
+
+        assert writer.verify_integrity() is True
+
+        other = AuditLogWriter(log_path, checkpoint_interval=3, checkpoint_key=b"wrong")
+        with pytest.raises(ValueError, match="signature invalid"):
+            other.verify_integrity()
+
+
+class TestAuditLogReader:
+    """Test streaming, filtered queries."""
+
+    def _populate(self, writer):
+        for i in range(30):
+            scan_id = f"scan-{i % 3}"
+            writer.log_scan_started(
+                f"agent-{i % 2}", scan_id, "network-scanning", {"ip": "10.0.0.1"}
+            )
+            writer.log_scan_completed(f"agent-{i % 2}", scan_id, findings_count=i)
+
+    def test_tail_returns_last_entries_in_order(self, temp_dir):
+        """tail() should return the newest entries, oldest first."""
+        writer = AuditLogWriter(temp_dir / "audit.log", checkpoint_interval=0)
+        self._populate(writer)
+
+        entries = writer.reader.tail(3)
+        assert [e["event_type"] for e in entries] == [
+            "scan_completed",
+            "scan_started",
+            "scan_completed",
+        ]
+        assert entries[-1]["details"]["findings_count"] == 29
+
+    def test_filter_by_event_type_and_actor(self, temp_dir):
+        """Filters should combine."""
+        writer = AuditLogWriter(temp_dir / "audit.log")
+        self._populate(writer)
+
+        entries = list(writer.iter_entries(event_type="scan_completed", actor="agent-1"))
+        assert len(entries) == 15
+        assert all(e["actor"] == "agent-1" for e in entries)
+
+    def test_filter_by_scan_id_uses_index(self, temp_dir):
+        """scan_id queries should build and reuse the scan index."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, checkpoint_interval=7)
+        self._populate(writer)
+
+        entries = list(writer.iter_entries(scan_id="scan-1"))
+        assert len(entries) == 20
+        assert all(e["details"]["scan_id"] == "scan-1" for e in entries)
+        assert (temp_dir / "audit.log.scans").exists()
+
+        # New entries are picked up incrementally, also by a fresh reader
+        writer.log_scan_started("agent-9", "scan-1", "network-scanning", {"ip": "10.0.0.2"})
+        fresh = AuditLogWriter(log_path, checkpoint_interval=7)
+        newest = list(fresh.iter_entries(scan_id="scan-1", reverse=True))
+        assert len(newest) == 21
+        assert newest[0]["actor"] == "agent-9"
+
+    def test_filter_by_time_range(self, temp_dir):
+        """since/until should bound results using the checkpoint time index."""
+        writer = AuditLogWriter(temp_dir / "audit.log", checkpoint_interval=5)
+        self._populate(writer)
+
+        all_entries = writer.get_entries()
+        middle = all_entries[len(all_entries) // 2]["timestamp"]
+
+        after = list(writer.iter_entries(since=middle))
+        before = list(writer.iter_entries(until=middle, reverse=True))
+
+        assert after and all(e["timestamp"] >= middle for e in after)
+        assert before and all(e["timestamp"] <= middle for e in before)
+        assert len(after) + len(before) >= len(all_entries)
+
+    def test_time_range_with_whole_second_timestamps(self, temp_dir):
+        """Legacy timestamps without a fraction should compare by time."""
+        log_path = temp_dir / "audit.log"
+        timestamps = [
+            "2026-01-01T00:00:00.500000Z",
+            "2026-01-01T00:00:01Z",
+            "2026-01-01T00:00:01.250000Z",
+            "2026-01-01T00:00:01.5Z",
+            "2026-01-01T00:00:02Z",
+        ]
+        log_path.write_text(
+            "".join(
+                json.dumps({"event_type": f"event{i}", "timestamp": ts}) + "\n"
+                for i, ts in enumerate(timestamps)
+            )
+        )
+        reader = AuditLogReader(log_path)
+
+        def events(**filters):
+            return [e["event_type"] for e in reader.iter_entries(**filters)]
+
+        assert events(since="2026-01-01T00:00:01Z") == ["event1", "event2", "event3", "event4"]
+        assert events(until=datetime(2026, 1, 1, 0, 0, 1)) == ["event0", "event1"]
+        assert events(
+            since=datetime(2026, 1, 1, 0, 0, 1, 300000), until="2026-01-01T00:00:02Z"
+        ) == [
+            "event3",
+            "event4",
+        ]
+        assert events(since="2026-01-01T00:00:01.25Z", reverse=True) == [
+            "event4",
+            "event3",
+            "event2",
+        ]
+
+    def test_reader_ignores_torn_tail(self, temp_dir):
+        """A partial final line should not be yielded."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path)
+        writer.log_event("event1", "actor", "action", "success")
+        with open(log_path, "ab") as f:
+            f.write(b'{"partial":')
+
+        assert [e["event_type"] for e in writer.reader.tail(5)] == ["event1"]
+        assert len(list(writer.reader.iter_entries())) == 1
+
+
+class TestAuditLogSegments:
+    """Test segment rotation and compressed cold segments."""
+
+    def _write(self, writer, count, start=0):
+        hashes = []
+        for i in range(start, start + count):
+            hashes.append(
+                writer.log_scan_started(
+                    "agent-1", f"scan-{i}", "network-scanning", {"ip": "10.0.0.1"}
+                )
+            )
+        return hashes
+
+    def test_rotation_by_size_chains_segments(self, temp_dir):
+        """Each segment should continue the chain from the previous one."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, segment_max_bytes=2048, checkpoint_interval=0)
+        self._write(writer, 40)
+        writer.wait_for_seals()
+
+        segments = writer.segments.load()
+        assert len(segments) >= 2
+        for prior, segment in zip(segments, segments[1:]):
+            assert segment.first_hash == prior.last_hash
+        assert all(s.verified and s.codec == "gzip" for s in segments)
+        assert all(writer.segments.segment_path(s).suffix == ".gz" for s in segments)
+
+        first_active = json.loads(log_path.read_text().splitlines()[0])
+        assert first_active["previous_hash"] == segments[-1].last_hash
+        assert writer.verify_integrity() is True
+
+    def test_reader_spans_segments(self, temp_dir):
+        """Queries should see sealed and active entries in order."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, segment_max_bytes=2048)
+        self._write(writer, 40)
+        writer.wait_for_seals()
+
+        entries = writer.get_entries()
+        assert [e["details"]["scan_id"] for e in entries] == [f"scan-{i}" for i in range(40)]
+        assert [e["details"]["scan_id"] for e in writer.get_entries(3)] == [
+            "scan-37",
+            "scan-38",
+            "scan-39",
+        ]
+        assert len(list(writer.iter_entries(scan_id="scan-2"))) == 1
+        assert len(list(writer.iter_entries(scan_id="scan-39", reverse=True))) == 1
+
+    def test_reopen_continues_from_last_segment(self, temp_dir):
+        """A writer reopened right after rotation should chain to the last segment."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, segment_max_bytes=1, compression=None)
+        last_hash = self._write(writer, 1)[-1]
+        writer.wait_for_seals()
+        assert not log_path.exists()
+
+        writer2 = AuditLogWriter(log_path, segment_max_bytes=0)
+        assert writer2.previous_hash == last_hash
+        self._write(writer2, 2, start=1)
+        assert writer2.verify_integrity() is True
+
+    def test_tampered_segment_detected(self, temp_dir):
+        """Modifying a sealed segment should fail full verification."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, segment_max_bytes=2048, compression=None)
+        self._write(writer, 30)
+        writer.wait_for_seals()
+
+        segment = writer.segments.load()[0]
+        path = writer.segments.segment_path(segment)
+        path.write_bytes(path.read_bytes().replace(b"scan-1", b"scan-X", 1))
+
+        with pytest.raises(ValueError, match="Segment"):
+            writer.verify_integrity()
+
+    def test_interrupted_seal_is_finished_on_open(self, temp_dir):
+        """Segments left unsealed by a crash should be sealed by the next writer."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, segment_max_bytes=2048)
+        writer._start_sealer = lambda segment: None  # the sealer thread never ran
+        self._write(writer, 30)
+        writer.close()
+
+        unsealed = writer.segments.load()
+        assert unsealed and not any(s.verified for s in unsealed)
+
+        # Also a seal cut short after its compressed copy was renamed into place
+        plain = temp_dir / unsealed[0].file
+        gzip_path = plain.with_name(plain.name + ".gz")
+        gzip_path.write_bytes(gzip.compress(plain.read_bytes()))
+
+        reopened = AuditLogWriter(log_path, segment_max_bytes=2048)
+        reopened.wait_for_seals()
+
+        segments = reopened.segments.load()
+        assert all(s.verified and s.codec == "gzip" for s in segments)
+        assert not any((temp_dir / s.file).exists() for s in segments)
+        assert len(reopened.get_entries()) == 30
+        assert reopened.verify_integrity() is True
+
+    def test_interrupted_rotation_is_recovered(self, temp_dir):
+        """A manifest entry without its renamed file should be completed on start."""
+        log_path = temp_dir / "audit.log"
+        writer = AuditLogWriter(log_path, compression=None)
+        last_hash = self._write(writer, 3)[-1]
+
+        # Simulate a crash after the manifest append but before the rename
+        writer.segments.append(
+            Segment(
+                number=1,
+                file="audit.log.000001",
+                first_hash="0" * 64,
+                last_hash=last_hash,
+                lines=3,
+            )
+        )
+
+        writer2 = AuditLogWriter(log_path, compression=None)
+        assert (temp_dir / "audit.log.000001").exists()
+        assert writer2.previous_hash == last_hash
+        self._write(writer2, 1, start=3)
+        assert writer2.verify_integrity() is True
@@ -0,0 +1,50 @@
+"""Unit tests for CLI startup behaviour."""
+
+import subprocess
+import sys
+
+import pytest
+
+from kynee_agent.cli import run
+
+
+def _loaded_after(statement: str, modules: list[str]) -> list[str]:
+    """Modules from ``modules`` loaded after running ``statement`` in a fresh interpreter."""
+    code = f"import sys; {statement}; print(','.join(m for m in {modules!r} if m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return output.split(",") if output else []
+
+
+def test_cli_import_defers_heavy_modules():
+    """Importing the CLI should not load the coordinator, pydantic or structlog."""
+    heavy = ["kynee_agent.core.coordinator", "kynee_agent.models", "pydantic", "structlog"]
+
+    assert _loaded_after("import kynee_agent.cli.main", heavy) == []
+
+
+def test_core_exports_load_on_access():
+    """Lazily exported core classes should import on first access."""
+    loaded = _loaded_after(
+        "from kynee_agent.core import AgentCoordinator", ["kynee_agent.core.coordinator"]
+    )
+
+    assert loaded == ["kynee_agent.core.coordinator"]
+
+
+def test_unknown_core_attribute_raises():
+    """Missing names should still raise AttributeError."""
+    import kynee_agent.core
+
+    with pytest.raises(AttributeError):
+        kynee_agent.core.NoSuchThing  # noqa: B018
+
+
+def test_run_version_exits_before_event_loop(capsys):
+    """--version should be answered by the synchronous entry point."""
+    with pytest.raises(SystemExit) as exc:
+        run(["--version"])
+
+    assert exc.value.code == 0
+    assert "kynee-agent" in capsys.readouterr().out
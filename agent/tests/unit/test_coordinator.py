@@ -1,11 +1,27 @@
 """Unit tests for AgentCoordinator."""
 
 import asyncio
+import contextlib
 
 import pytest
 
-from kynee_agent.core import Agent, AgentCoordinator
-from kynee_agent.core.exceptions import OutOfScopeError
+from kynee_agent.core import Agent, AgentCoordinator, ScanItem
+from kynee_agent.core.exceptions import AuditLogError, OutOfScopeError
+
+
+class StreamingAgent(Agent):
+    """Agent streaming a fixed number of findings and inventory items."""
+
+    def __init__(self, findings: int, inventory: int, **kwargs):
+        super().__init__(**kwargs)
+        self.findings = findings
+        self.inventory = inventory
+
+    async def stream_scan(self, job):
+        for i in range(self.findings):
+            yield ScanItem("finding", {"title": f"finding-{i}"})
+        for i in range(self.inventory):
+            yield ScanItem("inventory", {"host": f"host-{i}"})
 
 
 @pytest.mark.asyncio
@@ -209,6 +225,20 @@ async def test_get_audit_entries(sample_engagement, sample_agent, temp_dir):
     assert any(e["event_type"] == "agent_registered" for e in entries)
 
 
+@pytest.mark.asyncio
+async def test_get_audit_entries_sees_queued_entries(sample_engagement, sample_agent, temp_dir):
+    """The sync and async accessors should both include entries still queued in the sink."""
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+    await coordinator.start()
+    await coordinator.register_agent(sample_agent)
+
+    assert [e["event_type"] for e in coordinator.get_audit_entries()] == ["agent_registered"]
+    await coordinator.unregister_agent(sample_agent.agent_id)
+    entries = await coordinator.aget_audit_entries(event_type="agent_unregistered")
+    assert len(entries) == 1
+    await coordinator.stop()
+
+
 @pytest.mark.asyncio
 async def test_pre_scan_hook(sample_engagement, sample_agent, temp_dir):
     """Should call pre-scan hook."""
@@ -259,3 +289,200 @@ async def test_post_scan_hook(sample_engagement, sample_agent, temp_dir):
     )
 
     assert hook_called is True
+
+
+@pytest.mark.asyncio
+async def test_validate_scan_batch_single_audit_entry(sample_engagement, temp_dir):
+    """Batch validation should write one summary audit entry."""
+    audit_path = temp_dir / "audit.log"
+    coordinator = AgentCoordinator(sample_engagement, str(audit_path))
+
+    result = await coordinator.validate_scan_batch("network-scanning", cidr="192.168.1.0/30")
+
+    entries = coordinator.get_audit_entries()
+    assert len(result.in_scope) == 2
+    assert len(entries) == 1
+    assert entries[0]["event_type"] == "scan_batch_validated"
+    assert entries[0]["details"]["in_scope"] == 2
+    assert entries[0]["details"]["cidr"] == "192.168.1.0/30"
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_audit_pipeline(sample_engagement, sample_agent, temp_dir):
+    """Stopping the coordinator should persist every queued audit entry."""
+    audit_path = temp_dir / "audit.log"
+    coordinator = AgentCoordinator(sample_engagement, str(audit_path))
+
+    await coordinator.start()
+    await coordinator.register_agent(sample_agent)
+    await coordinator.execute_coordinated_scan(
+        agent_id=sample_agent.agent_id,
+        scan_id="scan-001",
+        method="network-scanning",
+        target={"ip": "192.168.1.50"},
+    )
+    await coordinator.stop()
+
+    assert coordinator.audit_sink.running is False
+    event_types = [e["event_type"] for e in coordinator.audit_log.get_entries()]
+    assert event_types == ["agent_registered", "scan_started", "scan_completed"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_scan_forwards_batches(sample_engagement, temp_dir):
+    """Streamed scans should forward batches and keep only counts."""
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+    agent = StreamingAgent(findings=250, inventory=5, agent_id="streamer")
+    await coordinator.register_agent(agent)
+
+    batches = []
+    result = await coordinator.execute_coordinated_scan(
+        agent_id="streamer",
+        scan_id="scan-001",
+        method="network-scanning",
+        target={"ip": "192.168.1.50"},
+        on_batch=lambda scan_id, items: batches.append((scan_id, len(items))),
+        batch_size=100,
+    )
+
+    assert batches == [("scan-001", 100), ("scan-001", 100), ("scan-001", 55)]
+    assert result["findings_count"] == 250
+    assert result["inventory_count"] == 5
+    assert "findings" not in coordinator.get_scan_result("scan-001")
+    completed = await coordinator.aget_audit_entries(event_type="scan_completed")
+    assert completed[0]["details"]["findings_count"] == 250
+
+
+@pytest.mark.asyncio
+async def test_streamed_scan_adapts_execute_scan_agents(sample_engagement, temp_dir):
+    """Agents that only implement execute_scan should still stream."""
+
+    class LegacyAgent(Agent):
+        async def execute_scan(self, job):
+            return {"job_id": job["job_id"], "status": "done", "findings": [{"title": "a"}]}
+
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+    await coordinator.register_agent(LegacyAgent(agent_id="legacy"))
+
+    received = []
+
+    async def on_batch(scan_id, items):
+        received.extend(items)
+
+    result = await coordinator.execute_coordinated_scan(
+        agent_id="legacy",
+        scan_id="scan-001",
+        method="network-scanning",
+        target={"ip": "192.168.1.50"},
+        on_batch=on_batch,
+    )
+
+    assert received == [ScanItem("finding", {"title": "a"})]
+    assert result["findings_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_broadcast_limits_in_flight(sample_engagement, temp_dir):
+    """No more than max_in_flight agents should be contacted at once."""
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+    for i in range(10):
+        await coordinator.register_agent(Agent(agent_id=f"agent-{i}"))
+
+    in_flight = 0
+    peak = 0
+
+    async def callback(agent, message):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "ack"
+
+    responses = await coordinator.broadcast_to_agents({"type": "ping"}, callback, max_in_flight=3)
+
+    assert peak == 3
+    assert set(responses.values()) == {"ack"}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_deadline_returns_partial_results(sample_engagement, temp_dir):
+    """Agents that miss the deadline should be reported as timed out."""
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+    for agent_id in ("fast", "slow", "broken"):
+        await coordinator.register_agent(Agent(agent_id=agent_id))
+
+    async def callback(agent, message):
+        if agent.agent_id == "slow":
+            await asyncio.sleep(5)
+        if agent.agent_id == "broken":
+            raise RuntimeError("unreachable")
+        return "ack"
+
+    responses = [
+        r async for r in coordinator.stream_broadcast({"type": "ping"}, callback, deadline=0.1)
+    ]
+
+    statuses = {r.agent_id: r.status for r in responses}
+    assert statuses == {"fast": "ok", "broken": "error", "slow": "timeout"}
+    # Responses stream in arrival order; timeouts come last
+    assert responses[-1].agent_id == "slow"
+
+
+@pytest.mark.asyncio
+async def test_broadcast_targets_snapshot(sample_engagement, temp_dir):
+    """Agents registered mid-broadcast should not receive or skew it."""
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+    await coordinator.register_agent(Agent(agent_id="agent-1"))
+    await coordinator.register_agent(Agent(agent_id="agent-2"))
+
+    async def callback(agent, message):
+        if agent.agent_id == "agent-1":
+            await coordinator.register_agent(Agent(agent_id="agent-3"))
+        return agent.agent_id
+
+    responses = await coordinator.broadcast_to_agents({"type": "ping"}, callback)
+
+    assert responses == {"agent-1": "agent-1", "agent-2": "agent-2"}
+
+
+@pytest.mark.asyncio
+async def test_scans_refused_after_audit_failure(sample_engagement, temp_dir):
+    """Once the audit log cannot be written, no further scan should run."""
+    ran = []
+
+    class RecordingAgent(Agent):
+        async def execute_scan(self, job):
+            ran.append(job["job_id"])
+            return {"job_id": job["job_id"], "findings": []}
+
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+    await coordinator.register_agent(RecordingAgent(agent_id="agent-1"))
+    await coordinator.start()
+
+    def failing_log_scan_started(**kwargs):
+        raise OSError("disk full")
+
+    coordinator.audit_log.log_scan_started = failing_log_scan_started
+    # The write fails in the background; this scan may finish before it is seen
+    with contextlib.suppress(AuditLogError):
+        await coordinator.execute_coordinated_scan(
+            agent_id="agent-1",
+            scan_id="scan-1",
+            method="network-scanning",
+            target={"ip": "192.168.1.50"},
+        )
+    with pytest.raises(AuditLogError, match="disk full"):
+        await coordinator.audit_sink.flush()
+
+    with pytest.raises(AuditLogError):
+        await coordinator.execute_coordinated_scan(
+            agent_id="agent-1",
+            scan_id="scan-2",
+            method="network-scanning",
+            target={"ip": "192.168.1.50"},
+        )
+
+    assert "scan-2" not in ran
+    with pytest.raises(AuditLogError):
+        await coordinator.stop()
@@ -0,0 +1,139 @@
+"""Unit tests for the coordinator hook executor."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from kynee_agent.core import AgentCoordinator
+from kynee_agent.core.exceptions import HookTimeoutError
+from kynee_agent.core.hooks import HookExecutor
+from kynee_agent.core.hooks import hook
+
+
+@hook(cpu_bound=True)
+def _worker_pid() -> int:
+    """CPU-bound hook reporting which process ran it."""
+    return os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_runs_sync_and_async_hooks():
+    """Sync hooks run on hook threads, async hooks on the loop."""
+    executor = HookExecutor()
+
+    async def async_hook(value):
+        return value * 2
+
+    thread_name = await executor.run(lambda: threading.current_thread().name)
+    assert thread_name.startswith("kynee-hook")
+    assert await executor.run(async_hook, 21) == 42
+
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_raises_and_is_counted():
+    """A hook over its timeout should fail fast and be recorded."""
+    executor = HookExecutor(timeout=0.05)
+
+    def slow_hook():
+        time.sleep(0.3)
+
+    with pytest.raises(HookTimeoutError):
+        await executor.run(slow_hook)
+
+    stats = next(s for name, s in executor.metrics.items() if name.endswith("slow_hook"))
+    assert stats.calls == 1
+    assert stats.timeouts == 1
+    assert stats.max_seconds < 0.3
+
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_per_hook_timeout_overrides_default():
+    """@hook(timeout=...) should override the executor default."""
+    executor = HookExecutor(timeout=None)
+
+    @hook(timeout=0.05)
+    async def stuck():
+        await asyncio.sleep(1)
+
+    with pytest.raises(HookTimeoutError):
+        await executor.run(stuck)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    """No more than max_concurrency hooks should run at once."""
+    executor = HookExecutor(max_workers=8, max_concurrency=2)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def tracked():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    await asyncio.gather(*(executor.run(tracked) for _ in range(6)))
+
+    assert peak == 2
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failures_are_counted():
+    """Exceptions should propagate and be recorded."""
+    executor = HookExecutor()
+
+    def broken():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await executor.run(broken)
+
+    stats = next(s for name, s in executor.metrics.items() if name.endswith("broken"))
+    assert stats.as_dict()["failures"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cpu_bound_hook_runs_in_process_pool():
+    """Hooks declared CPU-bound should run in another process."""
+    executor = HookExecutor(process_workers=1)
+
+    assert await executor.run(_worker_pid) != os.getpid()
+
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_slow_post_scan_hook_fails_scan(sample_engagement, sample_agent, temp_dir):
+    """A post-scan hook over its timeout should fail the scan, not hang it."""
+    coordinator = AgentCoordinator(
+        sample_engagement,
+        str(temp_dir / "audit.log"),
+        hook_executor=HookExecutor(timeout=0.05),
+    )
+    await coordinator.register_agent(sample_agent)
+
+    with pytest.raises(HookTimeoutError):
+        await coordinator.execute_coordinated_scan(
+            agent_id=sample_agent.agent_id,
+            scan_id="scan-001",
+            method="network-scanning",
+            target={"ip": "192.168.1.50"},
+            post_scan_hook=lambda agent, scan_id, target, result: time.sleep(0.3),
+        )
+
+    failed = await coordinator.aget_audit_entries(event_type="scan_failed")
+    assert failed[0]["details"]["scan_id"] == "scan-001"
+    await coordinator.stop()
@@ -0,0 +1,133 @@
+"""Unit tests for hot-path metrics."""
+
+import json
+
+import pytest
+
+from kynee_agent import metrics
+from kynee_agent.cli.main import main
+from kynee_agent.core import AgentCoordinator
+from kynee_agent.core.exceptions import OutOfScopeError
+from kynee_agent.metrics import MetricsRegistry
+from kynee_agent.metrics import render_prometheus
+from kynee_agent.metrics import summarize
+
+
+@pytest.fixture
+def enabled_registry():
+    """Enable the global registry for one test."""
+    metrics.REGISTRY.reset()
+    metrics.REGISTRY.enabled = True
+    yield metrics.REGISTRY
+    metrics.REGISTRY.enabled = False
+    metrics.REGISTRY.reset()
+
+
+def test_disabled_registry_records_nothing():
+    """Recording calls should be no-ops while disabled."""
+    registry = MetricsRegistry(enabled=False)
+    counter = registry.counter("c_total", "test")
+    histogram = registry.histogram("h_seconds", "test")
+
+    counter.inc()
+    histogram.observe(0.1)
+    with histogram.time():
+        pass
+
+    assert counter.values == {}
+    assert histogram.values == {}
+
+
+def test_render_prometheus_text():
+    """Counters and histograms should render in exposition format."""
+    registry = MetricsRegistry(enabled=True)
+    registry.counter("scans_total", "Scans", ["status"]).inc(status="success")
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    text = render_prometheus(registry.snapshot(), extra_labels={"agent_id": "pi-1"})
+
+    assert "# TYPE scans_total counter" in text
+    assert 'scans_total{agent_id="pi-1",status="success"} 1' in text
+    assert 'latency_seconds_bucket{agent_id="pi-1",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{agent_id="pi-1",le="1"} 2' in text
+    assert 'latency_seconds_bucket{agent_id="pi-1",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{agent_id="pi-1"} 3' in text
+
+
+def test_summarize_percentiles_and_rates():
+    """Summaries should report bucket percentiles and per-second rates."""
+    registry = MetricsRegistry(enabled=True)
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.01, 0.1, 1.0))
+    for _ in range(90):
+        histogram.observe(0.005)
+    for _ in range(10):
+        histogram.observe(0.5)
+    registry.counter("scans_total", "Scans").inc(10)
+
+    snapshot = registry.snapshot()
+    snapshot["timestamp"] = snapshot["started_at"] + 5
+    summary = summarize(snapshot)
+
+    latency = summary["histograms"]["latency_seconds"]
+    assert latency["p50_seconds"] == 0.01
+    assert latency["p99_seconds"] == 1.0
+    assert summary["counters"]["scans_total"]["per_second"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_coordinated_scan_records_metrics(
+    enabled_registry, sample_engagement, sample_agent, temp_dir
+):
+    """Scans should record stage latencies, counts and rejections."""
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+    await coordinator.register_agent(sample_agent)
+
+    await coordinator.execute_coordinated_scan(
+        agent_id=sample_agent.agent_id,
+        scan_id="scan-001",
+        method="network-scanning",
+        target={"ip": "192.168.1.50"},
+    )
+    with pytest.raises(OutOfScopeError):
+        await coordinator.execute_coordinated_scan(
+            agent_id=sample_agent.agent_id,
+            scan_id="scan-002",
+            method="network-scanning",
+            target={"ip": "8.8.8.8"},
+        )
+    await coordinator.stop()
+
+    assert metrics.SCANS_TOTAL.values == {("success",): 1, ("failure",): 1}
+    assert metrics.SCAN_REJECTIONS_TOTAL.values == {("OutOfScopeError",): 1}
+    assert sum(metrics.POLICY_VALIDATION_SECONDS.values[()][0]) == 2
+    assert ("agent",) in metrics.SCAN_STAGE_SECONDS.values
+    assert sum(metrics.AUDIT_WRITE_SECONDS.values[()][0]) >= 3
+
+
+@pytest.mark.asyncio
+async def test_stats_command_reads_snapshot(enabled_registry, temp_dir, capsys):
+    """`kynee-agent stats` should render a dumped snapshot."""
+    metrics.SCANS_TOTAL.inc(status="success")
+    path = enabled_registry.dump(temp_dir / "metrics.json")
+
+    assert await main(["stats", "--file", str(path), "--format", "prometheus"]) == 0
+    assert 'kynee_scans_total{status="success"} 1' in capsys.readouterr().out
+
+    assert await main(["stats", "--file", str(path)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["counters"]['kynee_scans_total{status="success"}']["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stats_command_without_snapshot(temp_dir):
+    """A missing snapshot should fail cleanly."""
+    assert await main(["stats", "--file", str(temp_dir / "missing.json")]) == 1
+
+
+def test_metric_base_is_abstract():
+    """The metric base class should not be instantiable."""
+    with pytest.raises(TypeError):
+        metrics._Metric(MetricsRegistry(), "kynee_test", "Test metric")
@@ -8,6 +8,11 @@ from kynee_agent.core.exceptions import (
     TimeWindowViolationError,
     UnauthorizedMethodError,
 )
+from kynee_agent.policy.batch import (
+    REASON_HOSTNAME_OUT_OF_SCOPE,
+    REASON_INVALID_IP,
+    REASON_IP_OUT_OF_SCOPE,
+)
 from kynee_agent.policy.engine import PolicyEngine
 
 
@@ -190,3 +195,98 @@ class TestPolicyEngineIPAddressChecking:
     def test_invalid_ip_format(self):
         """Invalid IP should return False."""
         assert PolicyEngine._check_ip_in_scope("not-an-ip", ["192.168.1.0/24"]) is False
+
+
+class TestPolicyEngineBatchValidation:
+    """Test bulk target validation."""
+
+    def test_batch_partitions_targets(self, sample_engagement):
+        """Targets should be split into in-scope and rejected with reasons."""
+        engine = PolicyEngine(sample_engagement)
+
+        result = engine.validate_scan_batch(
+            "network-scanning",
+            targets=[
+                {"ip": "192.168.1.10"},
+                {"ip": "8.8.8.8"},
+                {"ip": "not-an-ip"},
+                {"ip": "10.1.2.3", "hostname": "unauthorized.com"},
+                {"hostname": "target.local"},
+            ],
+        )
+
+        assert result.total == 5
+        assert [t["ip"] for t in result.in_scope if "ip" in t] == ["192.168.1.10"]
+        assert result.reason_counts() == {
+            REASON_IP_OUT_OF_SCOPE: 1,
+            REASON_INVALID_IP: 1,
+            REASON_HOSTNAME_OUT_OF_SCOPE: 1,
+        }
+
+    def test_batch_cidr_expansion(self, sample_engagement):
+        """CIDR should expand to hosts and be checked against the scope."""
+        sample_engagement.scope.ip_ranges = ["192.168.1.0/25"]
+        sample_engagement.rate_limits["network-scanning"] = 1000
+        engine = PolicyEngine(sample_engagement)
+
+        result = engine.validate_scan_batch("network-scanning", cidr="192.168.1.0/24")
+
+        assert result.total == 254
+        assert len(result.in_scope) == 127
+        assert result.in_scope[0] == {"ip": "192.168.1.1"}
+        assert result.reason_counts() == {REASON_IP_OUT_OF_SCOPE: 127}
+
+    def test_batch_without_numpy(self, sample_engagement, monkeypatch):
+        """Pure-Python fallback should give the same partition."""
+        from kynee_agent.policy import scope_index
+
+        engine = PolicyEngine(sample_engagement)
+        targets = [{"ip": f"192.168.{i % 3}.5"} for i in range(30)]
+
+        sample_engagement.rate_limits["network-scanning"] = 1000
+        expected = engine.validate_scan_batch("network-scanning", targets=targets)
+        monkeypatch.setattr(scope_index, "np", None)
+        engine = PolicyEngine(sample_engagement)
+        actual = engine.validate_scan_batch("network-scanning", targets=targets)
+
+        assert actual.in_scope == expected.in_scope
+        assert actual.reason_counts() == expected.reason_counts()
+
+    def test_batch_checks_method_once(self, sample_engagement):
+        """Batch-level failures should still raise."""
+        engine = PolicyEngine(sample_engagement)
+
+        with pytest.raises(UnauthorizedMethodError):
+            engine.validate_scan_batch("unauthorized-method", targets=[{"ip": "192.168.1.1"}])
+
+    def test_batch_charges_rate_limit_per_in_scope_target(self, sample_engagement):
+        """A batch uses one call per in-scope target, all or nothing."""
+        engine = PolicyEngine(sample_engagement)
+        targets = [{"ip": f"192.168.1.{i}"} for i in range(1, 7)] + [{"ip": "8.8.8.8"}]
+
+        engine.validate_scan_batch("network-scanning", targets=targets)
+        assert engine.rate_limiter.count(("network-scanning", None, None)) == 6
+
+        with pytest.raises(RateLimitExceededError):
+            engine.validate_scan_batch("network-scanning", targets=targets)
+        assert engine.rate_limiter.count(("network-scanning", None, None)) == 6
+        assert engine.check_rate_limit("network-scanning") is True
+
+    def test_batch_rejects_oversized_cidr(self, sample_engagement):
+        """Large networks are refused before expansion."""
+        engine = PolicyEngine(sample_engagement)
+
+        with pytest.raises(ValueError, match="hosts"):
+            engine.validate_scan_batch("network-scanning", cidr="2001:db8::/64")
+        with pytest.raises(ValueError, match="hosts"):
+            engine.validate_scan_batch("network-scanning", cidr="10.0.0.0/8")
+
+    def test_batch_invalid_cidr_consumes_no_rate_limit(self, sample_engagement):
+        """Inputs are parsed before any rate-limit capacity is used."""
+        engine = PolicyEngine(sample_engagement)
+
+        with pytest.raises(ValueError):
+            engine.validate_scan_batch(
+                "network-scanning", targets=[{"ip": "192.168.1.1"}], cidr="not-a-cidr"
+            )
+        assert engine.rate_limiter.count(("network-scanning", None, None)) == 0
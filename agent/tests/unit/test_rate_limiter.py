@@ -0,0 +1,167 @@
+"""Unit tests for the sliding-window rate limiter."""
+
+import asyncio
+
+import pytest
+
+from kynee_agent.core.exceptions import RateLimitExceededError
+from kynee_agent.policy.engine import PolicyEngine
+from kynee_agent.policy.rate_limiter import SlidingWindowRateLimiter, subnet_key
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSlidingWindowRateLimiter:
+    """Test limiter window behaviour."""
+
+    def test_grants_up_to_limit(self):
+        """Limiter should grant exactly `limit` calls per window."""
+        limiter = SlidingWindowRateLimiter(window_seconds=60, clock=FakeClock())
+
+        assert all(limiter.try_acquire("scan", 3) for _ in range(3))
+        assert limiter.try_acquire("scan", 3) is False
+        assert limiter.count("scan") == 3
+
+    def test_capacity_recovers_as_window_slides(self):
+        """Grants should age out of the window."""
+        clock = FakeClock()
+        limiter = SlidingWindowRateLimiter(window_seconds=60, clock=clock)
+
+        limiter.try_acquire("scan", 2)
+        clock.now += 30
+        limiter.try_acquire("scan", 2)
+        assert limiter.try_acquire("scan", 2) is False
+
+        assert limiter.time_until_available("scan", 2) == pytest.approx(30)
+
+        clock.now += 30
+        assert limiter.try_acquire("scan", 2) is True
+        assert limiter.try_acquire("scan", 2) is False
+
+    def test_keys_are_independent(self):
+        """Different keys should have separate windows."""
+        limiter = SlidingWindowRateLimiter(window_seconds=60, clock=FakeClock())
+
+        limiter.try_acquire(("scan", "agent-1"), 1)
+        assert limiter.try_acquire(("scan", "agent-2"), 1) is True
+        assert limiter.try_acquire(("scan", "agent-1"), 1) is False
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_capacity(self):
+        """acquire() should wait rather than raise."""
+        limiter = SlidingWindowRateLimiter(window_seconds=0.05)
+
+        await limiter.acquire("scan", 1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await limiter.acquire("scan", 1)
+
+        assert loop.time() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout(self):
+        """acquire() should time out if capacity will not free up in time."""
+        limiter = SlidingWindowRateLimiter(window_seconds=60)
+        await limiter.acquire("scan", 1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await limiter.acquire("scan", 1, timeout=0.01)
+
+    def test_expired_keys_are_removed(self):
+        """Reads must not create keys, and keys with only expired grants are dropped."""
+        clock = FakeClock()
+        limiter = SlidingWindowRateLimiter(window_seconds=60, clock=clock)
+
+        assert limiter.count("never-used") == 0
+        assert limiter.time_until_available("never-used", 1) == 0.0
+        assert len(limiter) == 0
+
+        for i in range(100):
+            limiter.try_acquire(("scan", f"agent-{i}"), 1)
+        assert len(limiter) == 100
+
+        clock.now += 61
+        limiter.try_acquire("scan", 1)
+        assert len(limiter) == 1
+
+    def test_try_acquire_all_is_atomic(self):
+        """No key is charged unless every key has capacity."""
+        limiter = SlidingWindowRateLimiter(window_seconds=60, clock=FakeClock())
+        limiter.try_acquire("agent-1", 1)
+
+        assert limiter.try_acquire_all([("scan", 5), ("agent-1", 1)]) is False
+        assert limiter.count("scan") == 0
+
+    def test_subnet_key(self):
+        """Addresses should group by subnet."""
+        assert subnet_key("192.168.1.77") == "192.168.1.0/24"
+        assert subnet_key("2001:db8::1") == "2001:db8::/64"
+        assert subnet_key("target.local") == "target.local"
+
+
+class TestPolicyEngineSlidingRateLimit:
+    """Test PolicyEngine rate limiting over time."""
+
+    def test_limit_decays_over_time(self, sample_engagement):
+        """Limits should apply per hour, not per process lifetime."""
+        clock = FakeClock()
+        engine = PolicyEngine(
+            sample_engagement,
+            rate_limiter=SlidingWindowRateLimiter(window_seconds=3600, clock=clock),
+        )
+
+        for _ in range(5):
+            engine.check_rate_limit("wireless-enumeration")
+        with pytest.raises(RateLimitExceededError):
+            engine.check_rate_limit("wireless-enumeration")
+
+        clock.now += 3600
+        assert engine.check_rate_limit("wireless-enumeration") is True
+
+    def test_partitions_share_engagement_limit(self, sample_engagement):
+        """Agent partitions must not multiply the engagement-wide allowance."""
+        engine = PolicyEngine(sample_engagement)
+
+        for _ in range(3):
+            engine.check_rate_limit("wireless-enumeration", agent_id="agent-1")
+        for _ in range(2):
+            engine.check_rate_limit("wireless-enumeration", agent_id="agent-2")
+
+        with pytest.raises(RateLimitExceededError):
+            engine.check_rate_limit("wireless-enumeration", agent_id="agent-3")
+        with pytest.raises(RateLimitExceededError):
+            engine.check_rate_limit("wireless-enumeration")
+
+    def test_partition_limit_applies_within_engagement_limit(self, sample_engagement):
+        """A partition limit caps one agent while the method limit caps them all."""
+        engine = PolicyEngine(sample_engagement)
+
+        for _ in range(2):
+            engine.check_rate_limit("wireless-enumeration", agent_id="agent-1", partition_limit=2)
+        with pytest.raises(RateLimitExceededError):
+            engine.check_rate_limit("wireless-enumeration", agent_id="agent-1", partition_limit=2)
+
+        assert engine.check_rate_limit("wireless-enumeration", agent_id="agent-2") is True
+        assert engine.rate_limiter.count(("wireless-enumeration", None, None)) == 3
+        assert engine.rate_limit_delay("wireless-enumeration", agent_id="agent-1") == 0.0
+
+    @pytest.mark.asyncio
+    async def test_acquire_rate_limit(self, sample_engagement):
+        """acquire_rate_limit should pace calls at the configured limit."""
+        engine = PolicyEngine(
+            sample_engagement,
+            rate_limiter=SlidingWindowRateLimiter(window_seconds=0.05),
+        )
+
+        for _ in range(6):
+            await engine.acquire_rate_limit("wireless-enumeration", timeout=1)
+
+        assert engine.rate_limiter.count(("wireless-enumeration", None, None)) >= 1
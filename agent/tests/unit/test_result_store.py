@@ -0,0 +1,170 @@
+"""Unit tests for scan result stores."""
+
+import json
+
+import pytest
+
+from kynee_agent.core import AgentCoordinator
+from kynee_agent.core.result_store import MemoryResultStore
+from kynee_agent.core.result_store import ResultStore
+from kynee_agent.core.result_store import SQLiteResultStore
+
+
+def _result(scan_id, findings=0):
+    return {"job_id": scan_id, "status": "completed", "findings": ["x" * 100] * findings}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMemoryResultStore:
+    """Test the in-memory LRU tier."""
+
+    def test_lru_eviction_by_count(self):
+        """Least recently used results should be evicted first."""
+        store = MemoryResultStore(max_entries=2)
+        store.put("a", _result("a"))
+        store.put("b", _result("b"))
+        store.get("a")
+        store.put("c", _result("c"))
+
+        assert store.get("b") is None
+        assert store.get("a") is not None
+        assert store.metrics.evictions == 1
+
+    def test_eviction_by_bytes(self):
+        """Byte budget should bound memory use."""
+        store = MemoryResultStore(max_bytes=2000)
+        for i in range(10):
+            store.put(f"scan-{i}", _result(f"scan-{i}", findings=5))
+
+        assert store.memory_bytes <= 2000
+        assert len(store) < 10
+
+    def test_ttl_expiry(self):
+        """Idle results should expire."""
+        clock = FakeClock()
+        store = MemoryResultStore(ttl=10, clock=clock)
+        store.put("a", _result("a"))
+
+        clock.now = 5
+        assert store.get("a") is not None
+        clock.now = 14
+        assert store.get("a") is not None
+        clock.now = 30
+        assert store.get("a") is None
+        assert store.metrics.expirations == 1
+
+    def test_spill_and_fall_through(self, temp_dir):
+        """Evicted results should be readable from the disk tier."""
+        disk = SQLiteResultStore(temp_dir / "results.db")
+        store = MemoryResultStore(max_entries=2, spill=disk)
+        for i in range(5):
+            store.put(f"scan-{i}", _result(f"scan-{i}"))
+
+        assert store.metrics.spills == 3
+        assert store.get("scan-0") == _result("scan-0")
+        assert store.metrics.promotions == 1
+        assert len(store) == 5
+        assert "scan-4" in store
+
+    def test_close_persists_memory_tier(self, temp_dir):
+        """Closing should spill everything so a new store can read it."""
+        store = MemoryResultStore(spill=SQLiteResultStore(temp_dir / "results.db"))
+        store.put("scan-1", _result("scan-1"))
+        store.close()
+
+        reopened = MemoryResultStore(spill=SQLiteResultStore(temp_dir / "results.db"))
+        assert reopened.get("scan-1") == _result("scan-1")
+
+    def test_mapping_access(self):
+        """Stores should support dict-style access."""
+        store = MemoryResultStore()
+        store["scan-1"] = _result("scan-1")
+
+        assert store["scan-1"]["job_id"] == "scan-1"
+        with pytest.raises(KeyError):
+            store["missing"]
+        assert store.delete("scan-1") is True
+        assert "scan-1" not in store
+
+
+class TestSQLiteResultStore:
+    """Test the on-disk tier."""
+
+    def test_disk_cap_drops_oldest(self, temp_dir):
+        """Stored JSON beyond max_bytes should evict the oldest results."""
+        size = len(json.dumps(_result("scan-0", findings=5), separators=(",", ":")))
+        store = SQLiteResultStore(temp_dir / "results.db", max_bytes=size * 3)
+        for i in range(5):
+            store.put(f"scan-{i}", _result(f"scan-{i}", findings=5))
+
+        assert sorted(store.keys()) == ["scan-2", "scan-3", "scan-4"]
+        assert store.disk_bytes == size * 3
+        assert store.metrics.evictions == 2
+
+        store.close()
+        reopened = SQLiteResultStore(temp_dir / "results.db", max_bytes=size * 3)
+        assert len(reopened) == 3
+        assert reopened.disk_bytes == size * 3
+
+    def test_delete_updates_size(self, temp_dir):
+        """Replaced and deleted results should no longer count toward the cap."""
+        store = SQLiteResultStore(temp_dir / "results.db")
+        store.put("scan-1", _result("scan-1", findings=5))
+        store.put("scan-1", _result("scan-1"))
+        assert store.disk_bytes == len(json.dumps(_result("scan-1"), separators=(",", ":")))
+
+        assert store.delete("scan-1") is True
+        assert store.disk_bytes == 0
+
+
+def test_result_store_is_abstract():
+    """The base store should not be instantiable."""
+    with pytest.raises(TypeError):
+        ResultStore()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_disk_tier_is_opt_in(sample_engagement, temp_dir):
+    """The default coordinator store should not create a database."""
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+    assert coordinator.scan_results.spill is None
+
+    spilling = AgentCoordinator(
+        sample_engagement,
+        str(temp_dir / "audit.log"),
+        result_store_path=str(temp_dir / "results.db"),
+    )
+    assert spilling.scan_results.spill.path == temp_dir / "results.db"
+    assert not (temp_dir / "scan_results.db").exists()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_results_fall_through_to_disk(sample_engagement, sample_agent, temp_dir):
+    """Coordinator results evicted from memory should still be retrievable."""
+    store = MemoryResultStore(max_entries=1, spill=SQLiteResultStore(temp_dir / "results.db"))
+    coordinator = AgentCoordinator(
+        sample_engagement, str(temp_dir / "audit.log"), result_store=store
+    )
+    await coordinator.register_agent(sample_agent)
+
+    for i in range(3):
+        await coordinator.execute_coordinated_scan(
+            agent_id=sample_agent.agent_id,
+            scan_id=f"scan-{i}",
+            method="network-scanning",
+            target={"ip": "192.168.1.50"},
+        )
+
+    assert coordinator.get_scan_result("scan-0")["job_id"] == "scan-0"
+    assert (await coordinator.aget_scan_result("scan-1"))["job_id"] == "scan-1"
+    assert await coordinator.aget_scan_result("missing") is None
+    assert store.metrics.spills >= 2
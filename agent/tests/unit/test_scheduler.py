@@ -0,0 +1,315 @@
+"""Unit tests for ScanScheduler."""
+
+import asyncio
+
+import pytest
+
+from kynee_agent.core import Agent
+from kynee_agent.core import AgentCoordinator
+from kynee_agent.core.scheduler import JOB_COMPLETED
+
+
+class SlowAgent(Agent):
+    """Agent whose scans take a configurable time and record concurrency."""
+
+    def __init__(self, agent_id, delay=0.01):
+        super().__init__(agent_id=agent_id)
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.scans = []
+
+    async def execute_scan(self, job):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        self.scans.append(job["job_id"])
+        return {"job_id": job["job_id"], "status": "completed", "findings": []}
+
+
+async def _coordinator(engagement, temp_dir, agents, **kwargs):
+    coordinator = AgentCoordinator(engagement, str(temp_dir / "audit.log"), **kwargs)
+    for agent in agents:
+        await coordinator.register_agent(agent)
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_submitted_jobs_run_on_idle_agents(sample_engagement, temp_dir):
+    """Jobs should spread across agents within the per-agent cap."""
+    sample_engagement.rate_limits["network-scanning"] = 1000
+    agents = [SlowAgent(f"agent-{i}") for i in range(3)]
+    coordinator = await _coordinator(sample_engagement, temp_dir, agents)
+    await coordinator.start()
+
+    jobs = [
+        await coordinator.submit_scan(f"scan-{i}", "network-scanning", {"ip": "192.168.1.50"})
+        for i in range(9)
+    ]
+    results = await asyncio.gather(*jobs)
+
+    assert [r["job_id"] for r in results] == [f"scan-{i}" for i in range(9)]
+    assert all(job.state == JOB_COMPLETED for job in jobs)
+    assert all(agent.max_running == 1 for agent in agents)
+    assert sum(len(agent.scans) for agent in agents) == 9
+    assert all(agent.scans for agent in agents)
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency_cap(sample_engagement, temp_dir):
+    """No more than max_concurrent_scans should run at once."""
+    sample_engagement.rate_limits["network-scanning"] = 1000
+    agents = [SlowAgent(f"agent-{i}") for i in range(4)]
+    coordinator = await _coordinator(
+        sample_engagement, temp_dir, agents, max_concurrent_scans=2, per_agent_concurrency=2
+    )
+    await coordinator.start()
+
+    jobs = [
+        await coordinator.submit_scan(f"scan-{i}", "network-scanning", {"ip": "192.168.1.50"})
+        for i in range(6)
+    ]
+    await asyncio.sleep(0.001)
+    assert coordinator.scheduler.active_jobs == 2
+    await asyncio.gather(*jobs)
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_priority_order(sample_engagement, temp_dir):
+    """Lower priority values should be dispatched first."""
+    sample_engagement.rate_limits["network-scanning"] = 1000
+    agent = SlowAgent("agent-1")
+    coordinator = await _coordinator(sample_engagement, temp_dir, [agent])
+
+    jobs = [
+        await coordinator.submit_scan("low", "network-scanning", {"ip": "192.168.1.1"}, priority=5),
+        await coordinator.submit_scan(
+            "high", "network-scanning", {"ip": "192.168.1.2"}, priority=0
+        ),
+        await coordinator.submit_scan("mid", "network-scanning", {"ip": "192.168.1.3"}, priority=1),
+    ]
+    await coordinator.start()
+    await asyncio.gather(*jobs)
+
+    assert agent.scans == ["high", "mid", "low"]
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_fair_sharing_across_engagements(sample_engagement, temp_dir):
+    """Equal-priority engagements should be served alternately."""
+    sample_engagement.rate_limits["network-scanning"] = 1000
+    agent = SlowAgent("agent-1", delay=0)
+    coordinator = await _coordinator(sample_engagement, temp_dir, [agent])
+
+    jobs = []
+    for i in range(3):
+        jobs.append(
+            await coordinator.submit_scan(
+                f"a-{i}", "network-scanning", {"ip": "192.168.1.1"}, engagement_id="a"
+            )
+        )
+    for i in range(3):
+        jobs.append(
+            await coordinator.submit_scan(
+                f"b-{i}", "network-scanning", {"ip": "192.168.1.1"}, engagement_id="b"
+            )
+        )
+    await coordinator.start()
+    await asyncio.gather(*jobs)
+
+    assert agent.scans == ["a-0", "b-0", "a-1", "b-1", "a-2", "b-2"]
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_cancellation(sample_engagement, temp_dir):
+    """Timed-out and cancelled jobs should settle and be audited."""
+    sample_engagement.rate_limits["network-scanning"] = 1000
+    agent = SlowAgent("agent-1", delay=1)
+    coordinator = await _coordinator(sample_engagement, temp_dir, [agent])
+    await coordinator.start()
+
+    slow = await coordinator.submit_scan(
+        "slow", "network-scanning", {"ip": "192.168.1.1"}, timeout=0.01
+    )
+    queued = await coordinator.submit_scan("queued", "network-scanning", {"ip": "192.168.1.1"})
+
+    with pytest.raises(asyncio.TimeoutError):
+        await slow
+    assert coordinator.cancel_scan("queued") is True
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    await coordinator.stop()
+    aborted = await coordinator.aget_audit_entries(event_type="scan_aborted")
+    assert aborted[0]["details"]["scan_id"] == "slow"
+    assert aborted[0]["result"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_jobs_wait_instead_of_failing(sample_engagement, temp_dir):
+    """Jobs beyond the RoE limit should stay queued, not fail."""
+    sample_engagement.rate_limits["network-scanning"] = 2
+    agent = SlowAgent("agent-1", delay=0)
+    coordinator = await _coordinator(sample_engagement, temp_dir, [agent])
+    await coordinator.start()
+
+    jobs = [
+        await coordinator.submit_scan(f"scan-{i}", "network-scanning", {"ip": "192.168.1.1"})
+        for i in range(3)
+    ]
+    await asyncio.gather(jobs[0], jobs[1])
+    await asyncio.sleep(0.01)
+
+    assert not jobs[2].future.done()
+    assert coordinator.scheduler.queue_depth == 1
+    await coordinator.stop()
+    assert jobs[2].future.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_taken_at_dispatch(sample_engagement, temp_dir):
+    """Idle agents beyond the RoE limit should not start scans that then fail."""
+    sample_engagement.rate_limits["network-scanning"] = 2
+    agents = [SlowAgent(f"agent-{i}", delay=0) for i in range(4)]
+    coordinator = await _coordinator(sample_engagement, temp_dir, agents)
+    await coordinator.start()
+
+    jobs = [
+        await coordinator.submit_scan(f"scan-{i}", "network-scanning", {"ip": "192.168.1.1"})
+        for i in range(4)
+    ]
+    await asyncio.gather(jobs[0], jobs[1])
+    await asyncio.sleep(0.01)
+
+    assert coordinator.scheduler.queue_depth == 2
+    assert await coordinator.aget_audit_entries(event_type="scan_failed") == []
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_job_is_skipped(sample_engagement, temp_dir):
+    """A cancelled job should leave the queue without blocking the ones behind it."""
+    sample_engagement.rate_limits["network-scanning"] = 1000
+    agent = SlowAgent("agent-1", delay=0.02)
+    coordinator = await _coordinator(sample_engagement, temp_dir, [agent])
+    await coordinator.start()
+
+    jobs = [
+        await coordinator.submit_scan(f"scan-{i}", "network-scanning", {"ip": "192.168.1.1"})
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    assert coordinator.cancel_scan("scan-1") is True
+    assert coordinator.scheduler.queue_depth == 1
+
+    await asyncio.gather(jobs[0], jobs[2])
+    assert agent.scans == ["scan-0", "scan-2"]
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_survives_errors(sample_engagement, temp_dir, monkeypatch):
+    """An exception while dispatching should be logged and dispatch retried."""
+    monkeypatch.setattr("kynee_agent.core.scheduler._DISPATCH_RETRY_SECONDS", 0.01)
+    sample_engagement.rate_limits["network-scanning"] = 1000
+    coordinator = await _coordinator(sample_engagement, temp_dir, [SlowAgent("agent-1")])
+    select_agent = coordinator.select_agent
+    failures = [RuntimeError("selector unavailable")]
+
+    def flaky_select_agent(target, candidates=None):
+        if failures:
+            raise failures.pop()
+        return select_agent(target, candidates=candidates)
+
+    monkeypatch.setattr(coordinator, "select_agent", flaky_select_agent)
+    await coordinator.start()
+
+    job = await coordinator.submit_scan("scan-1", "network-scanning", {"ip": "192.168.1.1"})
+    result = await asyncio.wait_for(job, 1)
+
+    assert result["job_id"] == "scan-1"
+    assert coordinator.scheduler.running
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_pinned_job_to_unknown_agent_fails(sample_engagement, temp_dir):
+    """A job pinned to an unregistered agent should fail."""
+    coordinator = await _coordinator(sample_engagement, temp_dir, [SlowAgent("agent-1")])
+    await coordinator.start()
+
+    job = await coordinator.submit_scan(
+        "scan-1", "network-scanning", {"ip": "192.168.1.1"}, agent_id="missing"
+    )
+    with pytest.raises(ValueError, match="not registered"):
+        await job
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_blocked_jobs_are_not_rescanned(sample_engagement, temp_dir, monkeypatch):
+    """Rate-limited jobs should cost one check per round and share one retry timer."""
+    sample_engagement.rate_limits["network-scanning"] = 1
+    coordinator = await _coordinator(sample_engagement, temp_dir, [SlowAgent("agent-1", delay=0)])
+    loop = asyncio.get_running_loop()
+    timers = []
+
+    def call_later(delay, callback, *args, **kwargs):
+        timers.append(loop.__class__.call_later(loop, delay, callback, *args, **kwargs))
+        return timers[-1]
+
+    monkeypatch.setattr(loop, "call_later", call_later)
+    engine = coordinator.policy_engine
+    checks = []
+    rate_limit_delay = engine.rate_limit_delay
+    monkeypatch.setattr(
+        engine, "rate_limit_delay", lambda method: checks.append(method) or rate_limit_delay(method)
+    )
+    await coordinator.start()
+
+    jobs = [
+        await coordinator.submit_scan(f"scan-{i}", "network-scanning", {"ip": "192.168.1.1"})
+        for i in range(500)
+    ]
+    await jobs[0]
+    checks.clear()
+    for _ in range(5):
+        coordinator.scheduler.notify()
+        await asyncio.sleep(0)
+
+    assert len(checks) <= 5
+    assert sum(not timer.cancelled() for timer in timers) == 1
+    assert coordinator.scheduler.queue_depth == 499
+    await coordinator.stop()
+    assert all(timer.cancelled() for timer in timers)
+
+
+@pytest.mark.asyncio
+async def test_slot_released_when_abort_audit_fails(sample_engagement, temp_dir, monkeypatch):
+    """A failure while auditing a timed-out scan should not leak the agent's slot."""
+    sample_engagement.rate_limits["network-scanning"] = 1000
+    agent = SlowAgent("agent-1", delay=1)
+    coordinator = await _coordinator(sample_engagement, temp_dir, [agent])
+    await coordinator.start()
+
+    async def failing_audit(job, agent_id, reason):
+        raise OSError("audit disk full")
+
+    monkeypatch.setattr(coordinator.scheduler, "_audit_aborted", failing_audit)
+    slow = await coordinator.submit_scan(
+        "slow", "network-scanning", {"ip": "192.168.1.1"}, timeout=0.01
+    )
+    with pytest.raises(asyncio.TimeoutError):
+        await slow
+    await asyncio.sleep(0.01)
+
+    assert coordinator.scheduler.running_per_agent == {}
+    assert coordinator.scheduler.active_jobs == 0
+    await coordinator.stop()
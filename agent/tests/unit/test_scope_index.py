@@ -0,0 +1,141 @@
+"""Unit tests for compiled scope indexes."""
+
+import ipaddress
+
+from kynee_agent.policy.engine import PolicyEngine
+from kynee_agent.policy.scope_index import (
+    HostnameIndex,
+    IPRangeIndex,
+    MacAddressIndex,
+    mac_to_int,
+)
+
+
+class TestIPRangeIndex:
+    """Test CIDR interval table lookups."""
+
+    def test_ipv4_membership(self):
+        """Addresses inside a range should match, outside should not."""
+        index = IPRangeIndex(["192.168.1.0/24"])
+        assert "192.168.1.0" in index
+        assert "192.168.1.255" in index
+        assert "192.168.2.0" not in index
+        assert "192.168.0.255" not in index
+
+    def test_ipv6_membership(self):
+        """IPv6 ranges should be indexed separately from IPv4."""
+        index = IPRangeIndex(["2001:db8::/32", "10.0.0.0/8"])
+        assert "2001:db8::1" in index
+        assert "2001:db9::1" not in index
+        assert "10.1.2.3" in index
+        # Same integer value as 10.0.0.1 but a different address family
+        assert ipaddress.IPv6Address(int(ipaddress.IPv4Address("10.0.0.1"))) not in index
+
+    def test_overlapping_ranges_merged(self):
+        """Overlapping and adjacent ranges should collapse into one interval."""
+        index = IPRangeIndex(["10.0.0.0/8", "10.1.0.0/16", "11.0.0.0/8"])
+        starts, ends = index.intervals4
+        assert len(starts) == 1
+        assert starts[0] == int(ipaddress.IPv4Address("10.0.0.0"))
+        assert ends[0] == int(ipaddress.IPv4Address("11.255.255.255"))
+        assert len(index) == 3
+
+    def test_host_bits_set(self):
+        """Non-strict CIDRs should be accepted like ip_network(strict=False)."""
+        index = IPRangeIndex(["192.168.1.77/24", "172.16.0.5"])
+        assert "192.168.1.1" in index
+        assert "172.16.0.5" in index
+        assert "172.16.0.6" not in index
+
+    def test_invalid_entries_skipped(self):
+        """Invalid CIDRs should be skipped rather than poisoning the index."""
+        index = IPRangeIndex(["not-a-cidr", "192.168.1.0/24"])
+        assert len(index) == 1
+        assert "192.168.1.10" in index
+
+    def test_invalid_address_not_contained(self):
+        """Unparseable addresses should never match."""
+        index = IPRangeIndex(["0.0.0.0/0"])
+        assert "not-an-ip" not in index
+        assert None not in index
+
+    def test_empty_index(self):
+        """Empty index should contain nothing."""
+        index = IPRangeIndex([])
+        assert len(index) == 0
+        assert "1.2.3.4" not in index
+
+
+class TestHostnameIndex:
+    """Test hostname and wildcard suffix lookups."""
+
+    def test_exact_match_case_insensitive(self):
+        """Hostnames should match regardless of case or trailing dot."""
+        index = HostnameIndex(["Target.Local"])
+        assert "target.local" in index
+        assert "TARGET.LOCAL." in index
+        assert "other.local" not in index
+
+    def test_wildcard_suffix(self):
+        """Wildcards should match any deeper subdomain, not the bare suffix."""
+        index = HostnameIndex(["*.corp.example"])
+        assert "a.corp.example" in index
+        assert "a.b.corp.example" in index
+        assert "corp.example" not in index
+        assert "a.corp.example.net" not in index
+        assert "acorp.example" not in index
+
+    def test_mixed_exact_and_wildcard(self):
+        """Exact and wildcard entries should coexist."""
+        index = HostnameIndex(["corp.example", "*.corp.example", "*.lab.test"])
+        assert "corp.example" in index
+        assert "www.corp.example" in index
+        assert "db.lab.test" in index
+        assert len(index) == 3
+
+
+class TestMacAddressIndex:
+    """Test MAC address normalization."""
+
+    def test_mac_notations(self):
+        """Colon, dash, dot and bare forms should all normalize."""
+        expected = 0xAABBCCDDEEFF
+        assert mac_to_int("aa:bb:cc:dd:ee:ff") == expected
+        assert mac_to_int("AA-BB-CC-DD-EE-FF") == expected
+        assert mac_to_int("aabb.ccdd.eeff") == expected
+        assert mac_to_int("aabbccddeeff") == expected
+        assert mac_to_int("aa:bb:cc") is None
+        assert mac_to_int("zz:bb:cc:dd:ee:ff") is None
+
+    def test_membership_any_notation(self):
+        """Lookups should ignore notation differences."""
+        index = MacAddressIndex(["aa:bb:cc:dd:ee:ff", "bogus"])
+        assert len(index) == 1
+        assert "AA-BB-CC-DD-EE-FF" in index
+        assert "aa:bb:cc:dd:ee:00" not in index
+
+
+class TestPolicyEngineCompiledScope:
+    """Test PolicyEngine use of the compiled scope indexes."""
+
+    def test_scope_compiled_on_init(self, sample_engagement):
+        """Engine should compile the scope once at construction."""
+        engine = PolicyEngine(sample_engagement)
+        assert len(engine._ip_index) == len(sample_engagement.scope.ip_ranges)
+
+    def test_compile_scope_picks_up_changes(self, sample_engagement):
+        """compile_scope() should refresh the index after scope edits."""
+        engine = PolicyEngine(sample_engagement)
+        sample_engagement.scope.ip_ranges.append("172.16.0.0/12")
+        engine.compile_scope()
+
+        assert engine.validate_target_in_scope(ip_address="172.16.5.5") is True
+
+    def test_hostname_wildcard_and_mac_normalized(self, sample_engagement):
+        """Engine should use normalized hostname and MAC lookups."""
+        sample_engagement.scope.hostnames.append("*.corp.example")
+        engine = PolicyEngine(sample_engagement)
+
+        assert engine.validate_target_in_scope(hostname="Target.LOCAL") is True
+        assert engine.validate_target_in_scope(hostname="srv1.corp.example") is True
+        assert engine.validate_target_in_scope(mac_address="AA-BB-CC-DD-EE-FF") is True
@@ -0,0 +1,149 @@
+"""Unit tests for agent selection strategies."""
+
+import pytest
+
+from kynee_agent.core import Agent, AgentCoordinator
+from kynee_agent.core.selection import AgentSelector
+from kynee_agent.core.selection import ConsistentHashSelector
+from kynee_agent.core.selection import LeastOutstandingSelector
+from kynee_agent.core.selection import LoadWeightedSelector
+
+
+class LoadedAgent(Agent):
+    """Agent reporting a fixed host load."""
+
+    def __init__(self, cpu_load: float, memory_percent: float, **kwargs):
+        super().__init__(**kwargs)
+        self.cpu_load = cpu_load
+        self.memory_percent = memory_percent
+        self.status_calls = 0
+
+    def get_status(self):
+        self.status_calls += 1
+        return {"cpu_load": self.cpu_load, "memory_percent": self.memory_percent}
+
+
+def _fleet(count: int) -> dict[str, Agent]:
+    return {f"pi-{i}": Agent(agent_id=f"pi-{i}") for i in range(count)}
+
+
+def test_least_outstanding_picks_idlest_agent():
+    """The agent with the fewest outstanding scans should be chosen."""
+    agents = _fleet(3)
+    selector = LeastOutstandingSelector()
+
+    assert selector.select(agents, {}, {"pi-0": 2, "pi-1": 1, "pi-2": 3}) == "pi-1"
+    assert selector.select(agents, {}, {}) == "pi-0"
+
+
+def test_load_weighted_prefers_quiet_host():
+    """Host CPU and memory load should outweigh an equal job count."""
+    agents = {
+        "busy": LoadedAgent(cpu_load=2.0, memory_percent=90.0, agent_id="busy"),
+        "quiet": LoadedAgent(cpu_load=0.1, memory_percent=20.0, agent_id="quiet"),
+    }
+    selector = LoadWeightedSelector()
+
+    assert selector.select(agents, {}, {}) == "quiet"
+    # Enough outstanding work on the quiet host tips the balance
+    assert selector.select(agents, {}, {"quiet": 5}) == "busy"
+
+
+def test_load_weighted_caches_status():
+    """Agent statuses should be reused within the TTL."""
+    now = [0.0]
+    agent = LoadedAgent(cpu_load=0.5, memory_percent=50.0, agent_id="pi")
+    selector = LoadWeightedSelector(status_ttl=5.0, clock=lambda: now[0])
+
+    selector.select({"pi": agent}, {}, {})
+    selector.select({"pi": agent}, {}, {})
+    assert agent.status_calls == 1
+
+    now[0] = 6.0
+    selector.select({"pi": agent}, {}, {})
+    assert agent.status_calls == 2
+
+
+def test_consistent_hash_keeps_subnet_on_one_agent():
+    """Targets in one subnet should map to the same agent."""
+    agents = _fleet(4)
+    selector = ConsistentHashSelector()
+
+    chosen = {selector.select(agents, {"ip": f"10.0.5.{i}"}, {}) for i in range(1, 50)}
+    assert len(chosen) == 1
+
+
+def test_consistent_hash_moves_few_subnets_when_agent_leaves():
+    """Removing an agent should only remap the subnets it owned."""
+    agents = _fleet(5)
+    selector = ConsistentHashSelector()
+    targets = [{"ip": f"10.{i // 256}.{i % 256}.1"} for i in range(500)]
+
+    before = [selector.select(agents, t, {}) for t in targets]
+    del agents["pi-2"]
+    after = [selector.select(agents, t, {}) for t in targets]
+
+    moved = [b for b, a in zip(before, after) if b != a]
+    assert moved and all(agent_id == "pi-2" for agent_id in moved)
+
+
+def test_consistent_hash_spreads_and_bounds_load():
+    """Subnets should spread across the fleet and overloaded agents be skipped."""
+    agents = _fleet(4)
+    selector = ConsistentHashSelector()
+    targets = [{"ip": f"10.{i // 256}.{i % 256}.1"} for i in range(400)]
+
+    outstanding: dict[str, int] = {}
+    for target in targets:
+        agent_id = selector.select(agents, target, outstanding)
+        outstanding[agent_id] = outstanding.get(agent_id, 0) + 1
+
+    assert set(outstanding) == set(agents)
+    assert max(outstanding.values()) <= 1.25 * 400 / 4 + 1
+
+
+def test_consistent_hash_falls_back_without_ip():
+    """Targets without an IP address should use the fallback strategy."""
+    agents = _fleet(2)
+    selector = ConsistentHashSelector()
+
+    assert selector.select(agents, {"ssid": "corp-wifi"}, {"pi-0": 1}) == "pi-1"
+
+
+@pytest.mark.asyncio
+async def test_coordinator_selects_agent_when_unspecified(sample_engagement, temp_dir):
+    """execute_coordinated_scan should accept any agent."""
+    coordinator = AgentCoordinator(
+        sample_engagement,
+        str(temp_dir / "audit.log"),
+        agent_selector=ConsistentHashSelector(),
+    )
+    for agent in _fleet(3).values():
+        await coordinator.register_agent(agent)
+
+    result = await coordinator.execute_coordinated_scan(
+        agent_id=None,
+        scan_id="scan-001",
+        method="network-scanning",
+        target={"ip": "192.168.1.50"},
+    )
+
+    assert result["job_id"] == "scan-001"
+    assert coordinator.agent_load() == {}
+    started = await coordinator.aget_audit_entries(event_type="scan_started")
+    assert started[0]["actor"] == coordinator.select_agent({"ip": "192.168.1.60"})
+
+
+@pytest.mark.asyncio
+async def test_coordinator_select_agent_without_agents(sample_engagement, temp_dir):
+    """Selecting from an empty fleet should fail clearly."""
+    coordinator = AgentCoordinator(sample_engagement, str(temp_dir / "audit.log"))
+
+    with pytest.raises(ValueError, match="No agents registered"):
+        coordinator.select_agent({"ip": "192.168.1.50"})
+
+
+def test_selector_is_abstract():
+    """Strategies must implement select; the base class is not instantiable."""
+    with pytest.raises(TypeError):
+        AgentSelector()
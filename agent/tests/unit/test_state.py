@@ -0,0 +1,269 @@
+"""Unit tests for the persistent agent state store."""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from kynee_agent.cli.main import main
+from kynee_agent.core import Agent, AgentCoordinator, AgentStateStore
+from kynee_agent.core.state import read_status
+from kynee_agent.policy.rate_limiter import SlidingWindowRateLimiter
+
+
+@pytest.fixture
+def state_path(temp_dir):
+    return temp_dir / "state.db"
+
+
+def _job(job_id):
+    return {"job_id": job_id, "method": "network-scanning", "target": {"ip": "192.168.1.50"}}
+
+
+async def _start_registered(agent, engagement, temp_dir):
+    """Register an agent with a started coordinator, then start it."""
+    coordinator = AgentCoordinator(engagement, str(temp_dir / "audit.log"))
+    await coordinator.start()
+    await coordinator.register_agent(agent)
+    await agent.start()
+    return coordinator
+
+
+def test_identity_survives_restart(state_path):
+    """A restarted agent should keep its ID and creation time."""
+    first = Agent(state_store=AgentStateStore(state_path))
+    second = Agent(state_store=AgentStateStore(state_path))
+
+    assert second.agent_id == first.agent_id
+    assert second.created_at == first.created_at
+
+
+def test_explicit_agent_id_replaces_stored_identity(state_path):
+    """Passing a different agent ID should re-key the store."""
+    Agent(agent_id="pi-001", state_store=AgentStateStore(state_path))
+    agent = Agent(agent_id="pi-002", state_store=AgentStateStore(state_path))
+
+    assert AgentStateStore(state_path).identity()["agent_id"] == agent.agent_id == "pi-002"
+
+
+@pytest.mark.asyncio
+async def test_interrupted_job_is_restored_on_start(sample_engagement, temp_dir, state_path):
+    """Jobs cancelled mid-scan should be pending after a restart."""
+
+    class SlowAgent(Agent):
+        async def stream_scan(self, job):
+            await asyncio.sleep(10)
+            yield  # pragma: no cover
+
+    agent = SlowAgent(state_store=AgentStateStore(state_path))
+    task = asyncio.ensure_future(agent.execute_scan(_job("job-001")))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    store = AgentStateStore(state_path)
+    restarted = Agent(state_store=store)
+    coordinator = await _start_registered(restarted, sample_engagement, temp_dir)
+    assert restarted.pending_jobs == [_job("job-001")]
+
+    # Restored jobs are re-run in the background, through the coordinator
+    await restarted._resume_task
+    assert restarted.pending_jobs == []
+    assert store.pending_jobs() == []
+    assert store.counters()["scans_completed"] == 1
+    started = await coordinator.aget_audit_entries(event_type="scan_started")
+    assert [entry["details"]["scan_id"] for entry in started] == ["job-001"]
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_restored_job_after_engagement_window_is_not_run(
+    sample_engagement, temp_dir, state_path
+):
+    """A job restored once the engagement has ended should be rejected and audited."""
+    ran = []
+
+    class RecordingAgent(Agent):
+        async def stream_scan(self, job):
+            ran.append(job["job_id"])
+            return
+            yield  # pragma: no cover
+
+    store = AgentStateStore(state_path)
+    store.enqueue_job(_job("job-001"))
+    ended = sample_engagement.model_copy(
+        update={
+            "start_time": datetime.utcnow() - timedelta(days=2),
+            "end_time": datetime.utcnow() - timedelta(days=1),
+        }
+    )
+
+    agent = RecordingAgent(state_store=store)
+    coordinator = await _start_registered(agent, ended, temp_dir)
+    await agent._resume_task
+
+    assert ran == []
+    assert store.pending_jobs() == []
+    assert store.counters() == {"scans_failed": 1}
+    failed = await coordinator.aget_audit_entries(event_type="scan_failed")
+    assert [entry["details"]["scan_id"] for entry in failed] == ["job-001"]
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_restored_jobs_expire_without_coordinator(state_path):
+    """An unregistered agent cannot validate restored jobs, so it must not run them."""
+    store = AgentStateStore(state_path)
+    store.enqueue_job(_job("job-001"))
+
+    agent = Agent(state_store=store)
+    await agent.start()
+    await agent._resume_task
+
+    assert store.pending_jobs() == []
+    assert store.counters() == {"scans_failed": 1}
+    await agent.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_leaves_unfinished_restored_jobs_queued(sample_engagement, temp_dir, state_path):
+    """Stopping during re-dispatch should keep the remaining jobs for the next start."""
+
+    class SlowAgent(Agent):
+        async def stream_scan(self, job):
+            await asyncio.sleep(10)
+            yield  # pragma: no cover
+
+    store = AgentStateStore(state_path)
+    store.enqueue_job(_job("job-001"))
+    store.enqueue_job(_job("job-002"))
+
+    agent = SlowAgent(state_store=store)
+    coordinator = await _start_registered(agent, sample_engagement, temp_dir)
+    await asyncio.sleep(0.01)
+    await agent.stop()
+    await coordinator.stop()
+
+    assert [job["job_id"] for job in store.pending_jobs()] == ["job-001", "job-002"]
+
+
+@pytest.mark.asyncio
+async def test_uptime_counts_from_start(state_path):
+    """Uptime should restart with the daemon, not count from agent creation."""
+    Agent(state_store=AgentStateStore(state_path))
+    agent = Agent(state_store=AgentStateStore(state_path))
+    agent.created_at = agent.created_at.replace(year=2000)
+    assert agent.get_status()["uptime_seconds"] == 0.0
+
+    await agent.start()
+    assert 0.0 <= agent.get_status()["uptime_seconds"] < 60
+    await agent.stop()
+
+
+@pytest.mark.asyncio
+async def test_finished_scans_update_counters(state_path):
+    """Completed and failed scans should leave the queue and be counted."""
+    store = AgentStateStore(state_path)
+
+    class FailingAgent(Agent):
+        async def stream_scan(self, job):
+            raise RuntimeError("collector crashed")
+            yield  # pragma: no cover
+
+    await Agent(state_store=store).execute_scan({"job_id": "job-001"})
+    with pytest.raises(RuntimeError):
+        await FailingAgent(state_store=store).execute_scan({"job_id": "job-002"})
+
+    assert store.pending_jobs() == []
+    counters = store.counters()
+    assert counters["scans_completed"] == 1
+    assert counters["scans_failed"] == 1
+    assert counters["findings"] == 0
+
+
+def test_rate_limits_survive_restart(state_path):
+    """Grants inside the window should be restored into a fresh limiter."""
+    now = [1000.0]
+    limiter = SlidingWindowRateLimiter(window_seconds=60, clock=lambda: now[0])
+    key = ("network-scanning", "pi-001", "10.0.0.0/24")
+    for _ in range(3):
+        assert limiter.try_acquire(key, 3)
+
+    store = AgentStateStore(state_path)
+    assert store.save_rate_limits(limiter) == 3
+
+    restored = SlidingWindowRateLimiter(window_seconds=60, clock=lambda: 5.0)
+    assert store.restore_rate_limits(restored) == 3
+    assert not restored.try_acquire(key, 3)
+    assert restored.time_until_available(key, 3) == pytest.approx(60, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_read_status_without_agent(state_path):
+    """Status should come from the store, including daemon liveness."""
+    store = AgentStateStore(state_path)
+    agent = Agent(agent_id="pi-001", state_store=store)
+    await agent.start()
+
+    status = read_status(state_path)
+    assert status["agent_id"] == "pi-001"
+    assert status["state"] == "running"
+    assert status["pid"] == os.getpid()
+    assert status["daemon_alive"] is True
+
+    await agent.stop()
+    status = read_status(state_path)
+    assert status["state"] == "stopped"
+    assert status["daemon_alive"] is False
+    assert status["uptime_seconds"] == 0.0
+
+
+def test_read_status_missing_store(state_path):
+    """A missing database should report no state and not be created."""
+    assert read_status(state_path) is None
+    assert not state_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_status_command_reads_state_file(state_path):
+    """'kynee-agent status' should succeed from stored state alone."""
+    Agent(agent_id="pi-001", state_store=AgentStateStore(state_path))
+
+    assert await main(["status", "--state-file", str(state_path)]) == 0
+
+
+@pytest.mark.asyncio
+async def test_coordinator_persists_rate_limits(sample_engagement, temp_dir, state_path):
+    """A restarted coordinator should not reset RoE rate limits."""
+    first = AgentCoordinator(
+        sample_engagement, str(temp_dir / "audit.log"), state_store=AgentStateStore(state_path)
+    )
+    await first.start()
+    first.policy_engine.rate_limiter.try_acquire(("network-scanning", None, None), 10)
+    await first.stop()
+
+    second = AgentCoordinator(
+        sample_engagement, str(temp_dir / "audit2.log"), state_store=AgentStateStore(state_path)
+    )
+    await second.start()
+    assert second.policy_engine.rate_limiter.count(("network-scanning", None, None)) == 1
+    await second.stop()
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_saved_as_taken(sample_engagement, temp_dir, state_path):
+    """Grants should be on disk while running, so a crash does not reset RoE windows."""
+    coordinator = AgentCoordinator(
+        sample_engagement, str(temp_dir / "audit.log"), state_store=AgentStateStore(state_path)
+    )
+    await coordinator.start()
+    coordinator.policy_engine.check_rate_limit("network-scanning")
+    coordinator.policy_engine.check_rate_limit("network-scanning")
+    await asyncio.sleep(0.05)
+
+    # No stop(): read the store as a restarted daemon would after a crash
+    restored = SlidingWindowRateLimiter()
+    assert AgentStateStore(state_path).restore_rate_limits(restored) == 2
+    await coordinator.stop()
@@ -1,16 +1,57 @@
 """FastAPI application factory."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import structlog
 
 from kynee_console_backend import __version__
+from kynee_console_backend.core.live import LiveEventBroker
+from kynee_console_backend.core.metrics import AgentMetricsStore
+from kynee_console_backend.core.status import AgentStatusTable
+from kynee_console_backend.core.status import StatusWriter
+from kynee_console_backend.db import create_db_engine
+from kynee_console_backend.db import create_session_factory
+from kynee_console_backend.db import init_db
+from kynee_console_backend.db import upsert_agent_statuses
+from kynee_console_backend.db.session import is_sqlite
+from kynee_console_backend.routers import agents
+from kynee_console_backend.routers import findings
+from kynee_console_backend.routers import live
+from kynee_console_backend.routers import metrics
 
 logger = structlog.get_logger(__name__)
 
 
-def create_app() -> FastAPI:
-    """Create and configure FastAPI application."""
+def create_app(
+    database_url: Optional[str] = None,
+    create_tables: Optional[bool] = None,
+) -> FastAPI:
+    """
+    Create and configure FastAPI application.
+
+    Args:
+        database_url: SQLAlchemy database URL (default: ``DATABASE_URL``)
+        create_tables: Create missing tables at startup (default: only for
+            SQLite; other databases are managed with ``alembic upgrade head``)
+    """
+    if create_tables is None:
+        create_tables = is_sqlite(database_url)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        if create_tables:
+            await init_db(app.state.db_engine)
+        await app.state.status_writer.start()
+        yield
+        # Persist the last heartbeats, then close pooled connections
+        await app.state.status_writer.stop()
+        await app.state.db_engine.dispose()
+
     app = FastAPI(
         title="KYNEĒ Console API",
         description="Backend API for KYNEĒ penetration testing platform",
@@ -18,6 +59,7 @@ def create_app() -> FastAPI:
         docs_url="/api/docs",
         redoc_url="/api/redoc",
         openapi_url="/api/openapi.json",
+        lifespan=lifespan,
     )
 
     # CORS middleware
@@ -38,11 +80,31 @@ def create_app() -> FastAPI:
             "version": __version__,
         }
 
+    # Agent metrics (Prometheus scrape target)
+    app.state.agent_metrics = AgentMetricsStore()
+    app.include_router(metrics.router)
+
+    # Database: one pooled engine per worker, shared by all requests
+    app.state.db_engine = create_db_engine(database_url)
+    app.state.db_sessions = create_session_factory(app.state.db_engine)
+
+    # Agent heartbeats: served from memory, written behind in batches
+    app.state.agent_status = AgentStatusTable()
+    app.state.status_writer = StatusWriter(
+        app.state.agent_status, partial(upsert_agent_statuses, app.state.db_engine)
+    )
+
+    # Live engagement events, pushed over WebSocket and SSE
+    app.state.live_events = LiveEventBroker()
+
+    # API v1 routes
+    app.include_router(agents.router, prefix="/api/v1")
+    app.include_router(findings.router)
+    app.include_router(live.router)
+
     # API v1 routes (to be added)
-    # from kynee_console_backend.routers import agents, engagements, findings
-    # app.include_router(agents.router, prefix="/api/v1", tags=["agents"])
+    # from kynee_console_backend.routers import engagements
     # app.include_router(engagements.router, prefix="/api/v1", tags=["engagements"])
-    # app.include_router(findings.router, prefix="/api/v1", tags=["findings"])
 
     logger.info("app_created", version=__version__)
 
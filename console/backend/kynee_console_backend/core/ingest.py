@@ -0,0 +1,461 @@
+"""Streaming decoding and validation for batch findings ingestion.
+
+A batch is a stream of finding records, either NDJSON (one JSON object per
+line) or msgpack (a sequence of maps, or one array of maps), optionally
+compressed with gzip or zstd. The body is decompressed, split and validated
+chunk by chunk as it arrives, so memory holds validated findings rather
+than the raw request.
+"""
+
+import json
+import uuid
+import zlib
+from collections import deque
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import ValidationError
+
+from kynee_console_backend.schemas.finding import FindingBatchItem
+from kynee_console_backend.schemas.finding import FindingCreate
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+MAX_BATCH_ITEMS = 10_000
+# Limits on decompressed data, so a small compressed body cannot expand without bound
+MAX_BATCH_BYTES = 64 * 1024 * 1024
+MAX_RECORD_BYTES = 1024 * 1024
+
+_DECOMPRESS_CHUNK = 256 * 1024
+
+_ZSTD_MAGIC = 0xFD2FB528
+_ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+
+class BatchDecodeError(ValueError):
+    """The batch body cannot be decoded (HTTP 400)."""
+
+    status_code = 400
+
+
+class UnsupportedBatchFormatError(BatchDecodeError):
+    """Content type or encoding is not supported (HTTP 415)."""
+
+    status_code = 415
+
+
+class BatchTooLargeError(BatchDecodeError):
+    """The batch exceeds its item or size limits (HTTP 413)."""
+
+    status_code = 413
+
+
+@dataclass
+class RecordError:
+    """A record that could not be decoded; only that item is rejected."""
+
+    message: str
+
+
+@dataclass
+class ValidatedBatch:
+    """Database rows for accepted findings and a result for every record."""
+
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    results: list[FindingBatchItem] = field(default_factory=list)
+
+    @property
+    def accepted(self) -> int:
+        """Number of accepted records."""
+        return len(self.rows)
+
+    @property
+    def rejected(self) -> int:
+        """Number of rejected records."""
+        return len(self.results) - len(self.rows)
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """Bare media type of a Content-Type header, lowercased."""
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+async def iter_records(
+    chunks: AsyncIterable[bytes],
+    content_type: Optional[str],
+    content_encoding: Optional[str] = None,
+    max_items: int = MAX_BATCH_ITEMS,
+    max_bytes: int = MAX_BATCH_BYTES,
+) -> AsyncIterator[Any]:
+    """
+    Decode a batch body into records as its chunks arrive.
+
+    Args:
+        chunks: Raw request body chunks
+        content_type: Content-Type header (NDJSON or msgpack)
+        content_encoding: Content-Encoding header (identity, gzip or zstd)
+        max_items: Maximum records per batch
+        max_bytes: Maximum decompressed bytes per batch
+
+    Yields:
+        Decoded records, or ``RecordError`` for NDJSON lines that are not JSON
+
+    Raises:
+        UnsupportedBatchFormatError: Unknown content type or encoding, or
+            its optional decoder is not installed
+        BatchTooLargeError: Batch exceeds ``max_items`` or ``max_bytes``
+        BatchDecodeError: Body is corrupt and cannot be resynchronised
+    """
+    decoder = _BatchDecoder(
+        _decompressor(content_encoding), _parser(media_type(content_type)), max_items, max_bytes
+    )
+    async for chunk in chunks:
+        for record in decoder.feed(chunk):
+            yield record
+    for record in decoder.close():
+        yield record
+
+
+async def validate_records(records: AsyncIterable[Any]) -> ValidatedBatch:
+    """
+    Validate records against ``FindingCreate`` as they are decoded.
+
+    Accepted records become database rows with a new ``finding_id``;
+    rejected ones keep their position and the reasons they failed.
+    """
+    batch = ValidatedBatch()
+    now = datetime.utcnow()
+    index = 0
+    async for record in records:
+        if isinstance(record, RecordError):
+            batch.results.append(
+                FindingBatchItem(index=index, status="rejected", errors=[record.message])
+            )
+        else:
+            try:
+                finding = FindingCreate.model_validate(record)
+            except ValidationError as e:
+                batch.results.append(
+                    FindingBatchItem(index=index, status="rejected", errors=_format_errors(e))
+                )
+            else:
+                finding_id = str(uuid.uuid4())
+                batch.rows.append(
+                    {
+                        **finding.model_dump(mode="json"),
+                        "finding_id": finding_id,
+                        "status": "new",
+                        "created_at": now,
+                    }
+                )
+                batch.results.append(
+                    FindingBatchItem(index=index, status="accepted", finding_id=finding_id)
+                )
+        index += 1
+    return batch
+
+
+def _format_errors(error: ValidationError) -> list[str]:
+    """Readable ``field: message`` strings for a validation error."""
+    return [
+        f"{'.'.join(str(part) for part in detail['loc']) or 'record'}: {detail['msg']}"
+        for detail in error.errors()
+    ]
+
+
+def _decompressor(content_encoding: Optional[str]) -> Any:
+    """Incremental decompressor: ``decompress(chunk)`` yields output, ``b""`` ends the body."""
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding in ("", "identity"):
+        return lambda chunk: (chunk,) if chunk else ()
+    if encoding in ("gzip", "x-gzip"):
+        return _GzipDecompressor()
+    if encoding == "zstd":
+        if zstandard is None:
+            raise UnsupportedBatchFormatError("zstd encoding requires the 'zstandard' package")
+        return _ZstdDecompressor()
+    raise UnsupportedBatchFormatError(f"Unsupported Content-Encoding: {content_encoding}")
+
+
+def _parser(content_type: str) -> Any:
+    """Incremental record parser for a media type."""
+    if content_type in NDJSON_TYPES:
+        return _NDJSONParser()
+    if content_type in MSGPACK_TYPES:
+        if msgpack is None:
+            raise UnsupportedBatchFormatError("msgpack batches require the 'msgpack' package")
+        return _MsgpackParser()
+    raise UnsupportedBatchFormatError(f"Unsupported Content-Type: {content_type or 'none'}")
+
+
+class _BatchDecoder:
+    """Decompresses and parses body chunks, enforcing batch limits."""
+
+    def __init__(self, decompress: Any, parser: Any, max_items: int, max_bytes: int):
+        self._decompress = decompress
+        self._parser = parser
+        self._max_items = max_items
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._items = 0
+
+    def feed(self, chunk: bytes) -> Iterator[Any]:
+        for data in self._decompress(chunk):
+            self._bytes += len(data)
+            if self._bytes > self._max_bytes:
+                raise BatchTooLargeError(f"Batch exceeds {self._max_bytes} decompressed bytes")
+            yield from self._count(self._parser.feed(data))
+
+    def close(self) -> Iterator[Any]:
+        # An empty chunk tells the decompressor the body has ended
+        yield from self.feed(b"")
+        yield from self._count(self._parser.close())
+
+    def _count(self, records: Iterator[Any]) -> Iterator[Any]:
+        for record in records:
+            self._items += 1
+            if self._items > self._max_items:
+                raise BatchTooLargeError(f"Batch exceeds {self._max_items} records")
+            yield record
+
+
+class _GzipDecompressor:
+    """Streaming gzip decompression, including concatenated members."""
+
+    def __init__(self) -> None:
+        self._obj = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        self._started = False
+
+    def __call__(self, chunk: bytes) -> Iterator[bytes]:
+        if not chunk:
+            if self._started and not self._obj.eof:
+                raise BatchDecodeError("Truncated gzip stream")
+            return
+        self._started = True
+        try:
+            data = chunk
+            while data:
+                # Bounded output per call keeps a compression bomb from expanding at once
+                out = self._obj.decompress(data, _DECOMPRESS_CHUNK)
+                if out:
+                    yield out
+                data = self._obj.unconsumed_tail
+                if self._obj.eof and self._obj.unused_data:
+                    data = self._obj.unused_data
+                    self._obj = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        except zlib.error as e:
+            raise BatchDecodeError(f"Invalid gzip stream: {e}") from e
+
+
+class _ZstdDecompressor:
+    """
+    Streaming zstd decompression, including concatenated frames.
+
+    zstandard's ``decompressobj`` returns all output of a chunk at once, so
+    the pull-based ``stream_reader`` is used instead, fed from the body as
+    it arrives; reads are bounded like the gzip path.
+    """
+
+    def __init__(self) -> None:
+        self._source = _PushSource()
+        self._reader = zstandard.ZstdDecompressor().stream_reader(
+            self._source, read_across_frames=True
+        )
+        self._frames = _ZstdFrameTracker()
+
+    def __call__(self, chunk: bytes) -> Iterator[bytes]:
+        if not chunk:
+            if not self._frames.complete:
+                raise BatchDecodeError("Truncated zstd stream")
+            self._source.close()
+            # Flush whatever the decompressor still holds
+            yield from self._read(self._reader.read)
+            return
+        self._frames.feed(chunk)
+        self._source.append(chunk)
+        yield from self._read(self._reader.read1)
+
+    @staticmethod
+    def _read(read: Any) -> Iterator[bytes]:
+        try:
+            while True:
+                out = read(_DECOMPRESS_CHUNK)
+                if not out:
+                    return
+                yield out
+        except _NeedInput:
+            return
+        except zstandard.ZstdError as e:
+            raise BatchDecodeError(f"Invalid zstd stream: {e}") from e
+
+
+class _NeedInput(Exception):
+    """The zstd reader has consumed every chunk received so far."""
+
+
+class _PushSource:
+    """File-like source for ``stream_reader`` that is fed body chunks as they arrive."""
+
+    def __init__(self) -> None:
+        self._chunks: deque[bytes] = deque()
+        self._closed = False
+
+    def append(self, chunk: bytes) -> None:
+        self._chunks.append(chunk)
+
+    def close(self) -> None:
+        self._closed = True
+
+    def read(self, size: int = -1) -> bytes:
+        if self._chunks:
+            return self._chunks.popleft()
+        if self._closed:
+            return b""
+        # Returning b"" would end the reader's input for good; wait for the next chunk
+        raise _NeedInput
+
+
+class _ZstdFrameTracker:
+    """
+    Follows frame and block headers of a zstd stream to tell whether it ends
+    on a frame boundary; the decompressor does not report a truncated frame.
+    """
+
+    def __init__(self) -> None:
+        self._state = "magic"
+        self._want = 4
+        self._skip = 0
+        self._field = bytearray()
+        self._checksum = False
+
+    @property
+    def complete(self) -> bool:
+        return self._state == "magic" and not self._field and not self._skip
+
+    def feed(self, data: bytes) -> None:
+        pos = 0
+        while pos < len(data):
+            if self._skip:
+                step = min(self._skip, len(data) - pos)
+                self._skip -= step
+                pos += step
+                continue
+            step = min(self._want - len(self._field), len(data) - pos)
+            self._field += data[pos : pos + step]
+            pos += step
+            if len(self._field) == self._want:
+                value = int.from_bytes(self._field, "little")
+                self._field.clear()
+                self._advance(value)
+
+    def _advance(self, value: int) -> None:
+        """Move past a complete header field."""
+        if self._state == "magic":
+            if value == _ZSTD_MAGIC:
+                self._state, self._want = "frame_header", 1
+            elif value & 0xFFFFFFF0 == _ZSTD_SKIPPABLE_MAGIC:
+                self._state, self._want = "skippable", 4
+            else:
+                raise BatchDecodeError("Invalid zstd stream: unknown frame magic")
+        elif self._state == "frame_header":
+            fcs_flag, single_segment = value >> 6, value >> 5 & 1
+            self._checksum = bool(value >> 2 & 1)
+            self._skip = (
+                (0 if single_segment else 1)
+                + (0, 1, 2, 4)[value & 3]
+                + (single_segment, 2, 4, 8)[fcs_flag]
+            )
+            self._state, self._want = "block", 3
+        elif self._state == "block":
+            last, block_type, size = value & 1, value >> 1 & 3, value >> 3
+            if block_type == 3:
+                raise BatchDecodeError("Invalid zstd stream: reserved block type")
+            # RLE blocks store their one repeated byte
+            self._skip = 1 if block_type == 1 else size
+            if last and self._checksum:
+                self._state, self._want = "checksum", 4
+            elif last:
+                self._state, self._want = "magic", 4
+        elif self._state == "skippable":
+            self._skip = value
+            self._state, self._want = "magic", 4
+        else:  # checksum
+            self._state, self._want = "magic", 4
+
+
+class _NDJSONParser:
+    """Splits an NDJSON stream into records; a bad line rejects only that record."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> Iterator[Any]:
+        self._buffer.extend(data)
+        start = 0
+        while True:
+            end = self._buffer.find(b"\n", start)
+            if end < 0:
+                break
+            line = bytes(self._buffer[start:end])
+            start = end + 1
+            if line.strip():
+                yield _decode_line(line)
+        del self._buffer[:start]
+        if len(self._buffer) > MAX_RECORD_BYTES:
+            raise BatchTooLargeError(f"Record exceeds {MAX_RECORD_BYTES} bytes")
+
+    def close(self) -> Iterator[Any]:
+        line = bytes(self._buffer)
+        self._buffer.clear()
+        if line.strip():
+            yield _decode_line(line)
+
+
+def _decode_line(line: bytes) -> Any:
+    """One NDJSON record, or a ``RecordError``."""
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return RecordError(f"Invalid JSON: {e}")
+
+
+class _MsgpackParser:
+    """Unpacks a stream of msgpack maps (a top-level array is flattened)."""
+
+    def __init__(self) -> None:
+        # Sized for a whole batch, since a batch may be sent as one array
+        self._unpacker = msgpack.Unpacker(
+            raw=False, max_buffer_size=MAX_BATCH_BYTES, strict_map_key=False
+        )
+
+    def feed(self, data: bytes) -> Iterator[Any]:
+        try:
+            self._unpacker.feed(data)
+            for obj in self._unpacker:
+                if isinstance(obj, list):
+                    yield from obj
+                else:
+                    yield obj
+        except msgpack.BufferFull as e:
+            raise BatchTooLargeError(f"Batch exceeds {MAX_BATCH_BYTES} bytes") from e
+        except (msgpack.UnpackException, ValueError) as e:
+            raise BatchDecodeError(f"Invalid msgpack stream: {e}") from e
+
+    def close(self) -> Iterator[Any]:
+        return iter(())
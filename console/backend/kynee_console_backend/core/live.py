@@ -0,0 +1,268 @@
+"""Per-engagement fan-out of live events to WebSocket and SSE subscribers.
+
+Publishing never waits on a subscriber. Each subscriber has a bounded
+buffer: state updates with the same coalescing key replace each other
+while they are still pending, and a subscriber whose buffer fills up is
+dropped rather than allowed to hold memory or delay anyone else. A
+dropped client reconnects and catches up from the listing endpoints.
+
+Everything here runs on the event loop; ``publish`` must not be called
+from another thread.
+"""
+
+import asyncio
+import itertools
+from collections import Counter
+from collections.abc import Hashable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Optional
+
+import structlog
+
+from kynee_console_backend.schemas.agent import AgentHeartbeat
+
+logger = structlog.get_logger(__name__)
+
+MAX_PENDING_EVENTS = 256
+# Findings listed in one ``findings.created`` event; the rest are counted only
+MAX_EVENT_FINDINGS = 100
+
+
+@dataclass(frozen=True)
+class LiveEvent:
+    """One event for the subscribers of an engagement."""
+
+    type: str
+    engagement_id: str
+    data: dict[str, Any] = field(default_factory=dict)
+    # Pending events with the same key are coalesced; the newest one wins
+    key: Optional[str] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-ready form sent to clients."""
+        return {"type": self.type, "engagement_id": self.engagement_id, "data": self.data}
+
+
+class Subscription:
+    """Bounded buffer of events for one connected client."""
+
+    def __init__(self, engagement_id: str, max_pending: int = MAX_PENDING_EVENTS):
+        """
+        Initialize subscription.
+
+        Args:
+            engagement_id: Engagement whose events are delivered
+            max_pending: Undelivered events allowed before the client is dropped
+        """
+        self.engagement_id = engagement_id
+        self.max_pending = max_pending
+        self.dropped = False
+        self._pending: dict[Hashable, LiveEvent] = {}
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+
+    def put(self, event: LiveEvent) -> bool:
+        """
+        Buffer an event without waiting.
+
+        Returns:
+            False if the subscriber is (now) dropped
+        """
+        if self.dropped:
+            return False
+        if event.key is not None and event.key in self._pending:
+            # Coalesce, moving the update to where the newest one belongs
+            event = _coalesce(self._pending.pop(event.key), event)
+        elif len(self._pending) >= self.max_pending:
+            self.drop()
+            return False
+        self._pending[event.key if event.key is not None else next(self._sequence)] = event
+        self._ready.set()
+        return True
+
+    def drop(self) -> None:
+        """Discard pending events and end delivery."""
+        self.dropped = True
+        self._pending.clear()
+        self._ready.set()
+
+    async def get(self) -> list[LiveEvent]:
+        """
+        Wait for events and take everything pending, so a burst goes out in one write.
+
+        Returns:
+            Pending events in order, or an empty list once the subscriber is dropped
+        """
+        while not self._pending and not self.dropped:
+            self._ready.clear()
+            await self._ready.wait()
+        events = list(self._pending.values())
+        self._pending.clear()
+        return events
+
+
+class LiveEventBroker:
+    """Routes published events to the subscribers of their engagement."""
+
+    def __init__(self, max_pending: int = MAX_PENDING_EVENTS):
+        """
+        Initialize broker.
+
+        Args:
+            max_pending: Buffer size of each new subscription
+        """
+        self.max_pending = max_pending
+        self._subscriptions: dict[str, set[Subscription]] = {}
+
+    def __len__(self) -> int:
+        """Number of connected subscribers."""
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def has_subscribers(self, engagement_id: str) -> bool:
+        """Whether anyone is watching an engagement."""
+        return engagement_id in self._subscriptions
+
+    def subscribe(self, engagement_id: str) -> Subscription:
+        """Register a subscriber for an engagement's events."""
+        subscription = Subscription(engagement_id, self.max_pending)
+        self._subscriptions.setdefault(engagement_id, set()).add(subscription)
+        logger.debug("live_subscribed", engagement_id=engagement_id)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber; safe to call more than once."""
+        subscriptions = self._subscriptions.get(subscription.engagement_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.engagement_id]
+
+    def publish(self, event: LiveEvent) -> int:
+        """
+        Buffer an event for every subscriber of its engagement.
+
+        Returns:
+            Number of subscribers that received it
+        """
+        subscriptions = self._subscriptions.get(event.engagement_id)
+        if not subscriptions:
+            return 0
+        delivered = 0
+        for subscription in list(subscriptions):
+            if subscription.put(event):
+                delivered += 1
+            else:
+                self.unsubscribe(subscription)
+                logger.warning(
+                    "live_subscriber_dropped",
+                    engagement_id=event.engagement_id,
+                    max_pending=subscription.max_pending,
+                )
+        return delivered
+
+
+def _coalesce(pending: LiveEvent, event: LiveEvent) -> LiveEvent:
+    """
+    The newest of two keyed events, spanning both.
+
+    A ``previous_status`` is taken from the pending event, so a coalesced
+    ``agent.status`` reports the state the client last saw, not one it
+    never received.
+    """
+    if "previous_status" in pending.data and "previous_status" in event.data:
+        return replace(
+            event, data={**event.data, "previous_status": pending.data["previous_status"]}
+        )
+    return event
+
+
+def heartbeat_events(
+    previous: Optional[AgentHeartbeat], current: AgentHeartbeat
+) -> list[LiveEvent]:
+    """
+    Events for the transitions between an agent's last two heartbeats.
+
+    A change of state gives ``agent.status`` (coalesced per agent); a job
+    that disappears from ``current_job`` gives ``scan.completed``.
+    """
+    events = []
+    previous_job = previous.current_job if previous else None
+    if previous_job is not None and previous_job.job_id is not None:
+        current_job = current.current_job
+        engagement_id = previous.engagement_id or current.engagement_id
+        if engagement_id and (current_job is None or current_job.job_id != previous_job.job_id):
+            events.append(
+                LiveEvent(
+                    "scan.completed",
+                    engagement_id,
+                    {
+                        "agent_id": current.agent_id,
+                        "job_id": previous_job.job_id,
+                        "job_type": previous_job.job_type,
+                        "status": current.status.value,
+                    },
+                )
+            )
+
+    if current.engagement_id and (previous is None or previous.status != current.status):
+        events.append(
+            LiveEvent(
+                "agent.status",
+                current.engagement_id,
+                {
+                    "agent_id": current.agent_id,
+                    "status": current.status.value,
+                    "previous_status": previous.status.value if previous else None,
+                    "timestamp": current.timestamp.isoformat(),
+                },
+                key=f"agent.status:{current.agent_id}",
+            )
+        )
+    return events
+
+
+def findings_events(rows: Iterable[dict[str, Any]]) -> list[LiveEvent]:
+    """
+    One ``findings.created`` event per engagement for a batch of inserted findings.
+
+    Each event counts the findings by severity and lists the first
+    ``MAX_EVENT_FINDINGS`` of them; clients page the rest from the listing.
+    """
+    by_engagement: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        by_engagement.setdefault(row["engagement_id"], []).append(row)
+
+    events = []
+    for engagement_id, engagement_rows in by_engagement.items():
+        events.append(
+            LiveEvent(
+                "findings.created",
+                engagement_id,
+                {
+                    "count": len(engagement_rows),
+                    "severity": dict(Counter(row["severity"] for row in engagement_rows)),
+                    "findings": [
+                        _finding_summary(row) for row in engagement_rows[:MAX_EVENT_FINDINGS]
+                    ],
+                },
+            )
+        )
+    return events
+
+
+def _finding_summary(row: dict[str, Any]) -> dict[str, Any]:
+    """Fields of a finding row included in live events."""
+    created_at = row.get("created_at")
+    return {
+        "finding_id": row["finding_id"],
+        "agent_id": row["agent_id"],
+        "title": row["title"],
+        "severity": row["severity"],
+        "category": row.get("category"),
+        "created_at": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+    }
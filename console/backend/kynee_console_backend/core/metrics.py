@@ -0,0 +1,116 @@
+"""Agent metrics aggregation and Prometheus text rendering."""
+
+import threading
+import time
+from typing import Any
+
+# Snapshots older than this are dropped from the exposition
+STALE_AFTER_SECONDS = 300.0
+
+
+class AgentMetricsStore:
+    """
+    Latest metrics snapshot reported by each agent.
+
+    Agents push the snapshot produced by their metrics registry; the console
+    re-exports every agent's series with an ``agent_id`` label so one scrape
+    covers the fleet.
+    """
+
+    def __init__(self, stale_after: float = STALE_AFTER_SECONDS):
+        """
+        Initialize store.
+
+        Args:
+            stale_after: Seconds before an agent's snapshot stops being exported
+        """
+        self.stale_after = stale_after
+        self._snapshots: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, agent_id: str, snapshot: dict[str, Any]) -> None:
+        """Replace an agent's snapshot."""
+        with self._lock:
+            self._snapshots[agent_id] = (time.monotonic(), snapshot)
+
+    def snapshots(self) -> dict[str, dict[str, Any]]:
+        """Fresh snapshots by agent ID."""
+        cutoff = time.monotonic() - self.stale_after
+        with self._lock:
+            for agent_id in [a for a, (at, _) in self._snapshots.items() if at < cutoff]:
+                del self._snapshots[agent_id]
+            return {agent_id: snapshot for agent_id, (_, snapshot) in self._snapshots.items()}
+
+    def render(self) -> str:
+        """All agents' metrics in the Prometheus text exposition format."""
+        snapshots = self.snapshots()
+
+        # Group samples by metric family so HELP/TYPE appear once per name
+        families: dict[str, dict[str, Any]] = {}
+        for agent_id, snapshot in sorted(snapshots.items()):
+            for metric in snapshot.get("metrics", []):
+                family = families.setdefault(
+                    metric["name"],
+                    {
+                        "type": metric.get("type", "untyped"),
+                        "help": metric.get("help", ""),
+                        "buckets": metric.get("buckets", []),
+                        "samples": [],
+                    },
+                )
+                for sample in metric.get("samples", []):
+                    labels = {"agent_id": agent_id, **sample.get("labels", {})}
+                    family["samples"].append({**sample, "labels": labels})
+
+        lines = [
+            "# HELP kynee_console_agents_reporting Agents with a fresh metrics snapshot",
+            "# TYPE kynee_console_agents_reporting gauge",
+            f"kynee_console_agents_reporting {len(snapshots)}",
+        ]
+        for name, family in families.items():
+            lines.append(f"# HELP {name} {_escape_help(family['help'])}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            for sample in family["samples"]:
+                lines.extend(_render_sample(name, family, sample))
+        return "\n".join(lines) + "\n"
+
+
+def _render_sample(name: str, family: dict[str, Any], sample: dict[str, Any]) -> list[str]:
+    """Exposition lines for one sample."""
+    labels = sample["labels"]
+    if family["type"] != "histogram":
+        return [f"{name}{_format_labels(labels)} {_format_value(sample.get('value', 0))}"]
+
+    lines = []
+    cumulative = 0
+    bounds = [*family["buckets"], float("inf")]
+    for bound, count in zip(bounds, sample.get("counts", [])):
+        cumulative += count
+        le = "+Inf" if bound == float("inf") else _format_value(bound)
+        lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {cumulative}")
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(sample.get('sum', 0))}")
+    lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return lines
+
+
+def _format_labels(labels: dict[str, Any]) -> str:
+    """Prometheus label set, e.g. ``{agent_id="pi-1"}``."""
+    pairs = ",".join(
+        f'{key}="{_escape(str(value))}"' for key, value in labels.items() if value != ""
+    )
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    """Escape HELP text (backslashes and newlines)."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Number without a trailing ``.0`` for integral values."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,80 @@
+"""Cursor and field-selection helpers for listing endpoints.
+
+Listings use keyset pagination: a cursor holds the sort key of the last
+row of a page, and the next page starts strictly after it. Unlike OFFSET,
+the database seeks straight to that position through an index, so every
+page costs the same however deep it is.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from datetime import timezone
+from typing import Any, Optional
+
+
+class InvalidCursorError(ValueError):
+    """A pagination cursor is malformed or does not match the listing."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a row's sort key values."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> list[Any]:
+    """
+    Sort key values from a cursor.
+
+    Args:
+        cursor: Cursor from a previous page
+        types: Python type of each sort key column
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise InvalidCursorError("Invalid cursor")
+    try:
+        return [
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, payload)
+        ]
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> list[str]:
+    """
+    Requested response fields, in ``allowed`` order.
+
+    Args:
+        fields: Comma-separated field names (None or empty = all fields)
+        allowed: Selectable fields
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not fields:
+        return list(allowed)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [name for name in allowed if name in requested]
+
+
+def as_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC datetime (as stored) for a possibly timezone-aware filter value."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,191 @@
+"""In-memory agent status table with write-behind persistence.
+
+Heartbeats land in ``AgentStatusTable``; nothing touches the database on
+the request path. ``StatusWriter`` periodically drains the agents whose
+status changed and persists them in one batched upsert, so database writes
+scale with the flush interval rather than with fleet size times heartbeat
+rate.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+import structlog
+
+from kynee_console_backend.core.pagination import as_utc_naive
+from kynee_console_backend.schemas.agent import AgentHeartbeat
+
+logger = structlog.get_logger(__name__)
+
+# An agent silent for this long is reported offline
+OFFLINE_AFTER_SECONDS = 90.0
+FLUSH_INTERVAL_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class AgentStatusEntry:
+    """Latest heartbeat of one agent; replaced, never mutated."""
+
+    heartbeat: AgentHeartbeat
+    received_at: datetime
+    received_monotonic: float
+
+    @property
+    def agent_id(self) -> str:
+        """Agent this entry belongs to."""
+        return self.heartbeat.agent_id
+
+    def status(self, offline_after: float = OFFLINE_AFTER_SECONDS) -> str:
+        """Reported state, or ``offline`` if the agent has gone quiet."""
+        if time.monotonic() - self.received_monotonic > offline_after:
+            return "offline"
+        return self.heartbeat.status.value
+
+    def as_row(self) -> dict[str, Any]:
+        """Column values for the agents table."""
+        system = self.heartbeat.system
+        interfaces = self.heartbeat.network.interfaces if self.heartbeat.network else []
+        ip_address = next((i.ip_address for i in interfaces if i.ip_address), None)
+        return {
+            "agent_id": self.agent_id,
+            "hostname": system.hostname if system else None,
+            "ip_address": ip_address,
+            "status": self.heartbeat.status.value,
+            "last_heartbeat": self.received_at,
+        }
+
+
+class AgentStatusTable:
+    """
+    Latest status of every agent, held in memory.
+
+    Readers take no lock: entries are immutable and each update swaps in a
+    new one with a single dict assignment, so a reader always sees a whole
+    entry. Writers serialise on a lock and record which agents changed
+    since the last ``drain``.
+    """
+
+    def __init__(self, offline_after: float = OFFLINE_AFTER_SECONDS):
+        """
+        Initialize status table.
+
+        Args:
+            offline_after: Seconds without a heartbeat before an agent is offline
+        """
+        self.offline_after = offline_after
+        self._entries: dict[str, AgentStatusEntry] = {}
+        self._dirty: dict[str, AgentStatusEntry] = {}
+        self._lock = threading.Lock()
+
+    def update(self, heartbeat: AgentHeartbeat) -> bool:
+        """
+        Record a heartbeat.
+
+        Timestamps are compared as naive UTC (naive ones taken to be UTC),
+        so an agent may mix offset and naive timestamps.
+
+        Returns:
+            False if it was older than the agent's latest one and was ignored
+        """
+        entry = AgentStatusEntry(heartbeat, datetime.utcnow(), time.monotonic())
+        sent_at = as_utc_naive(heartbeat.timestamp)
+        with self._lock:
+            current = self._entries.get(heartbeat.agent_id)
+            if current is not None and sent_at < as_utc_naive(current.heartbeat.timestamp):
+                return False
+            self._entries[heartbeat.agent_id] = entry
+            self._dirty[heartbeat.agent_id] = entry
+        return True
+
+    def get(self, agent_id: str) -> Optional[AgentStatusEntry]:
+        """Latest entry for an agent (lock-free)."""
+        return self._entries.get(agent_id)
+
+    def __len__(self) -> int:
+        """Number of agents with a status."""
+        return len(self._entries)
+
+    def drain(self) -> list[AgentStatusEntry]:
+        """Take the entries changed since the last drain."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        return list(dirty.values())
+
+    def requeue(self, entries: list[AgentStatusEntry]) -> None:
+        """Mark entries dirty again after a failed flush, unless superseded."""
+        with self._lock:
+            for entry in entries:
+                if self._entries.get(entry.agent_id) is entry:
+                    self._dirty.setdefault(entry.agent_id, entry)
+
+
+class StatusWriter:
+    """Periodically persists changed agent statuses in one batch."""
+
+    def __init__(
+        self,
+        table: AgentStatusTable,
+        persist: Callable[[list[dict[str, Any]]], Awaitable[int]],
+        interval: float = FLUSH_INTERVAL_SECONDS,
+    ):
+        """
+        Initialize status writer.
+
+        Args:
+            table: Status table to drain
+            persist: Coroutine writing agent rows in one batch
+            interval: Seconds between flushes
+        """
+        self.table = table
+        self.persist = persist
+        self.interval = interval
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        """Start flushing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Persist every changed status now.
+
+        Returns:
+            Number of agents written
+        """
+        entries = self.table.drain()
+        if not entries:
+            return 0
+        try:
+            written = await self.persist([entry.as_row() for entry in entries])
+        except Exception:
+            self.table.requeue(entries)
+            raise
+        logger.debug("agent_statuses_flushed", agents=written)
+        return written
+
+    async def _run(self) -> None:
+        """Flush every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("agent_status_flush_failed", error=str(e))
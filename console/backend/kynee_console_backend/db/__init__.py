@@ -1 +1,21 @@
 """Database configuration and session management."""
+
+from .agents import AgentFilters, get_agent, list_agents, upsert_agent_statuses
+from .findings import FindingFilters, bulk_insert_findings, list_findings
+from .pagination import count_rows
+from .session import create_db_engine, create_session_factory, get_session, init_db
+
+__all__ = [
+    "AgentFilters",
+    "FindingFilters",
+    "bulk_insert_findings",
+    "count_rows",
+    "create_db_engine",
+    "create_session_factory",
+    "get_agent",
+    "get_session",
+    "init_db",
+    "list_agents",
+    "list_findings",
+    "upsert_agent_statuses",
+]
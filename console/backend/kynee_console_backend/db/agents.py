@@ -0,0 +1,104 @@
+"""Agent persistence and listing."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Select
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from kynee_console_backend.db.pagination import keyset_page
+from kynee_console_backend.models import Agent
+
+AGENT_FIELDS = (
+    "agent_id",
+    "hostname",
+    "ip_address",
+    "status",
+    "enrolled_at",
+    "last_heartbeat",
+)
+
+
+@dataclass
+class AgentFilters:
+    """Server-side filters for agent listings (None = no filter)."""
+
+    status: Optional[str] = None
+    seen_since: Optional[datetime] = None
+
+    def select(self) -> Select[Any]:
+        """Select of agents matching the filters."""
+        stmt = select(Agent)
+        if self.status is not None:
+            stmt = stmt.where(Agent.status == self.status)
+        if self.seen_since is not None:
+            stmt = stmt.where(Agent.last_heartbeat >= self.seen_since)
+        return stmt
+
+
+async def list_agents(
+    session: AsyncSession,
+    filters: AgentFilters,
+    fields: Sequence[str] = AGENT_FIELDS,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """
+    One page of agents in ``agent_id`` order.
+
+    Returns:
+        Agents with the requested fields, and the next page's cursor
+    """
+    return await keyset_page(
+        session,
+        filters.select(),
+        [getattr(Agent, name) for name in fields],
+        [Agent.agent_id],
+        limit,
+        cursor,
+    )
+
+
+async def upsert_agent_statuses(engine: AsyncEngine, rows: list[dict[str, Any]]) -> int:
+    """
+    Write agent statuses in one transaction with a single batched upsert.
+
+    Unknown agents are inserted; known ones get their status and heartbeat
+    time updated, keeping hostname and address when a heartbeat omits them.
+
+    Args:
+        engine: Database engine
+        rows: ``agent_id``, ``hostname``, ``ip_address``, ``status`` and
+            ``last_heartbeat`` per agent
+
+    Returns:
+        Number of agents written
+    """
+    if not rows:
+        return 0
+    dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(Agent)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Agent.agent_id],
+        set_={
+            "status": stmt.excluded.status,
+            "last_heartbeat": stmt.excluded.last_heartbeat,
+            "hostname": func.coalesce(stmt.excluded.hostname, Agent.hostname),
+            "ip_address": func.coalesce(stmt.excluded.ip_address, Agent.ip_address),
+        },
+    )
+    async with engine.begin() as conn:
+        await conn.execute(stmt, rows)
+    return len(rows)
+
+
+async def get_agent(session: AsyncSession, agent_id: str) -> Optional[Agent]:
+    """Stored agent, or None."""
+    return await session.get(Agent, agent_id)
@@ -0,0 +1,109 @@
+"""Finding persistence and listing."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Select
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from kynee_console_backend.db.pagination import keyset_page
+from kynee_console_backend.models import Finding
+
+FINDING_FIELDS = (
+    "finding_id",
+    "engagement_id",
+    "agent_id",
+    "title",
+    "description",
+    "category",
+    "severity",
+    "tool",
+    "status",
+    "created_at",
+)
+
+# Built once; SQLAlchemy caches its compiled form and asyncpg prepares it per connection
+_INSERT_FINDINGS = insert(Finding)
+
+
+async def bulk_insert_findings(engine: AsyncEngine, rows: list[dict[str, Any]]) -> int:
+    """
+    Insert findings in one transaction with a single multi-row INSERT.
+
+    Args:
+        engine: Database engine
+        rows: Column values per finding (see ``core.ingest.validate_records``)
+
+    Returns:
+        Number of findings inserted
+    """
+    if not rows:
+        return 0
+    async with engine.begin() as conn:
+        # executemany: batched into multi-row VALUES where the driver supports it
+        await conn.execute(_INSERT_FINDINGS, rows)
+    return len(rows)
+
+
+@dataclass
+class FindingFilters:
+    """Server-side filters for finding listings (None = no filter)."""
+
+    engagement_id: Optional[str] = None
+    agent_id: Optional[str] = None
+    severity: Optional[list[str]] = None
+    category: Optional[str] = None
+    status: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+    def select(self) -> Select[Any]:
+        """Select of findings matching the filters."""
+        stmt = select(Finding)
+        if self.engagement_id is not None:
+            stmt = stmt.where(Finding.engagement_id == self.engagement_id)
+        if self.agent_id is not None:
+            stmt = stmt.where(Finding.agent_id == self.agent_id)
+        if self.severity:
+            stmt = stmt.where(Finding.severity.in_(self.severity))
+        if self.category is not None:
+            stmt = stmt.where(Finding.category == self.category)
+        if self.status is not None:
+            stmt = stmt.where(Finding.status == self.status)
+        if self.since is not None:
+            stmt = stmt.where(Finding.created_at >= self.since)
+        if self.until is not None:
+            stmt = stmt.where(Finding.created_at < self.until)
+        return stmt
+
+
+async def list_findings(
+    session: AsyncSession,
+    filters: FindingFilters,
+    fields: Sequence[str] = FINDING_FIELDS,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """
+    One page of findings, newest first.
+
+    Pages are keyed on ``(created_at, finding_id)``, which the
+    ``ix_findings_*_created`` indexes serve in order.
+
+    Returns:
+        Findings with the requested fields, and the next page's cursor
+    """
+    return await keyset_page(
+        session,
+        filters.select(),
+        [getattr(Finding, name) for name in fields],
+        [Finding.created_at, Finding.finding_id],
+        limit,
+        cursor,
+        descending=True,
+    )
@@ -0,0 +1,83 @@
+"""Keyset pagination and bounded counting for SQLAlchemy selects."""
+
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from sqlalchemy import Select
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from kynee_console_backend.core.pagination import decode_cursor
+from kynee_console_backend.core.pagination import encode_cursor
+
+# Estimated counts stop at this many rows, bounding their cost
+COUNT_ESTIMATE_CAP = 10_000
+
+
+async def keyset_page(
+    session: AsyncSession,
+    stmt: Select[Any],
+    columns: Sequence[ColumnElement[Any]],
+    keys: Sequence[ColumnElement[Any]],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of ``stmt`` ordered by ``keys``.
+
+    Args:
+        session: Database session
+        stmt: Filtered select (columns are replaced by ``columns``)
+        columns: Columns returned for each row
+        keys: Unique sort key; an index on these columns makes every page a seek
+        limit: Rows per page
+        cursor: Cursor from the previous page
+        descending: Sort newest/largest first
+
+    Returns:
+        Rows as dicts of ``columns``, and the next page's cursor (None on the last page)
+
+    Raises:
+        InvalidCursorError: If ``cursor`` cannot be decoded
+    """
+    selected = [*columns, *(key for key in keys if key.key not in {c.key for c in columns})]
+    stmt = stmt.with_only_columns(*selected)
+    if cursor:
+        after = decode_cursor(cursor, [key.type.python_type for key in keys])
+        position = tuple_(*keys)
+        stmt = stmt.where(position < tuple_(*after) if descending else position > tuple_(*after))
+    stmt = stmt.order_by(*(key.desc() if descending else key.asc() for key in keys))
+
+    # One extra row tells whether another page exists
+    rows = (await session.execute(stmt.limit(limit + 1))).mappings().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][key.key] for key in keys])
+    return [{column.key: row[column.key] for column in columns} for row in rows], next_cursor
+
+
+async def count_rows(session: AsyncSession, stmt: Select[Any], exact: bool) -> tuple[int, bool]:
+    """
+    Count the rows matched by ``stmt``.
+
+    Exact counts scan every match. Estimates stop at ``COUNT_ESTIMATE_CAP``
+    rows, so they cost at most one bounded index range scan.
+
+    Returns:
+        The count, and whether it is exact
+    """
+    stmt = stmt.with_only_columns(*stmt.selected_columns[:1]).order_by(None)
+    if exact:
+        total = await session.scalar(select(func.count()).select_from(stmt.subquery()))
+        return total or 0, True
+
+    capped = stmt.limit(COUNT_ESTIMATE_CAP + 1).subquery()
+    total = await session.scalar(select(func.count()).select_from(capped)) or 0
+    if total > COUNT_ESTIMATE_CAP:
+        return COUNT_ESTIMATE_CAP, False
+    return total, True
@@ -0,0 +1,111 @@
+"""Async database engine and session management.
+
+One pooled ``AsyncEngine`` is created per process (per uvicorn worker) and
+shared by all requests, so routers never pay for connection setup. SQLite
+(via aiosqlite) serves local development and tests; the schema is
+Postgres-compatible, and production databases are created and upgraded
+with the Alembic migrations in ``migrations/``.
+"""
+
+import os
+from collections.abc import AsyncIterator
+from typing import Any, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from kynee_console_backend.models import Base
+
+DEFAULT_DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///kynee.db")
+
+# Pool sizing per worker process (Postgres); SQLite uses its own pooling
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+POOL_RECYCLE_SECONDS = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+
+# Async drivers for plain database URLs
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: Optional[str] = None) -> str:
+    """
+    Database URL with an async driver (``sqlite://`` -> ``sqlite+aiosqlite://``).
+
+    Args:
+        url: SQLAlchemy database URL (default: ``DATABASE_URL``)
+    """
+    parsed = make_url(url or DEFAULT_DATABASE_URL)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is not None:
+        parsed = parsed.set(drivername=driver)
+    return parsed.render_as_string(hide_password=False)
+
+
+def is_sqlite(url: Optional[str] = None) -> bool:
+    """Whether a database URL points at SQLite."""
+    return make_url(url or DEFAULT_DATABASE_URL).get_backend_name() == "sqlite"
+
+
+def create_db_engine(url: Optional[str] = None, echo: bool = False) -> AsyncEngine:
+    """
+    Create the pooled async database engine.
+
+    Args:
+        url: SQLAlchemy database URL (default: ``DATABASE_URL``)
+        echo: Log SQL statements
+    """
+    url = async_database_url(url)
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        options: dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases are per connection, so share a single one
+            options["poolclass"] = StaticPool
+        engine = create_async_engine(url, echo=echo, **options)
+        event.listen(engine.sync_engine, "connect", _configure_sqlite)
+        return engine
+
+    return create_async_engine(
+        url,
+        echo=echo,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_recycle=POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+    )
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to ``engine``."""
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def init_db(engine: AsyncEngine) -> None:
+    """Create missing tables (local SQLite; use migrations elsewhere)."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def get_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency yielding a session from the app's pool."""
+    async with request.app.state.db_sessions() as session:
+        yield session
+
+
+def _configure_sqlite(dbapi_connection: Any, _record: Any) -> None:
+    """WAL journaling so readers do not block the ingestion writer."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
@@ -1,18 +1,37 @@
 """Main entry point for console backend."""
 
+import os
+
+import structlog
 import uvicorn
 
-from kynee_console_backend.app import create_app
+logger = structlog.get_logger(__name__)
 
 
 def main() -> None:
-    """Run the console backend."""
-    app = create_app()
+    """
+    Run the console backend in a single worker process.
 
+    Agent heartbeat status, the live event broker and agent metrics live in
+    process memory: with several workers each would see only the heartbeats,
+    findings and subscribers that reached it. ``WEB_CONCURRENCY`` above 1 is
+    therefore ignored with a warning until that state is shared between
+    processes. The worker keeps one pooled database engine.
+    """
+    requested = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    if requested != 1:
+        logger.warning(
+            "web_concurrency_ignored",
+            requested=requested,
+            workers=1,
+            reason="agent status, live events and metrics are held per process",
+        )
     uvicorn.run(
-        app,
+        "kynee_console_backend.app:create_app",
+        factory=True,
         host="0.0.0.0",
         port=8000,
+        workers=1,
         log_level="info",
     )
 
@@ -1 +1,11 @@
 """Database models (SQLAlchemy)."""
+
+from .agent import Agent
+from .base import Base
+from .finding import Finding
+
+__all__ = [
+    "Agent",
+    "Base",
+    "Finding",
+]
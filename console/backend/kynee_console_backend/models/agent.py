@@ -0,0 +1,29 @@
+"""Agent table."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime
+from sqlalchemy import Index
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from kynee_console_backend.models.base import Base
+
+
+class Agent(Base):
+    """An enrolled agent."""
+
+    __tablename__ = "agents"
+    __table_args__ = (
+        # Status-filtered listings page in agent_id order
+        Index("ix_agents_status", "status", "agent_id"),
+    )
+
+    agent_id: Mapped[str] = mapped_column(String, primary_key=True)
+    hostname: Mapped[Optional[str]] = mapped_column(String)
+    ip_address: Mapped[Optional[str]] = mapped_column(String(45))
+    status: Mapped[str] = mapped_column(String(16), default="unknown")
+    enrolled_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    last_heartbeat: Mapped[Optional[datetime]] = mapped_column(DateTime, index=True)
@@ -0,0 +1,7 @@
+"""Declarative base for console database models."""
+
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Base(DeclarativeBase):
+    """Base class for all console tables."""
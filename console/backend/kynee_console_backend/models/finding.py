@@ -0,0 +1,49 @@
+"""Finding table."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy import Index
+from sqlalchemy import String
+from sqlalchemy import Text
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from kynee_console_backend.models.base import Base
+
+
+class Finding(Base):
+    """A finding reported by an agent."""
+
+    __tablename__ = "findings"
+    __table_args__ = (
+        # Listings page newest first on (created_at, finding_id); these indexes
+        # hold that key after each filter prefix so every page is an index seek
+        Index("ix_findings_created_at", "created_at", "finding_id"),
+        Index(
+            "ix_findings_engagement_created",
+            "engagement_id",
+            "created_at",
+            "finding_id",
+            # Covers the summary columns, so engagement pages skip the table (Postgres)
+            postgresql_include=["agent_id", "title", "category", "severity", "status"],
+        ),
+        Index(
+            "ix_findings_engagement_severity",
+            "engagement_id",
+            "severity",
+            "created_at",
+            "finding_id",
+        ),
+    )
+
+    finding_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    engagement_id: Mapped[str] = mapped_column(String)
+    agent_id: Mapped[str] = mapped_column(String, index=True)
+    title: Mapped[str] = mapped_column(String)
+    description: Mapped[str] = mapped_column(Text)
+    category: Mapped[str] = mapped_column(String)
+    severity: Mapped[str] = mapped_column(String(16), index=True)
+    tool: Mapped[str] = mapped_column(String)
+    status: Mapped[str] = mapped_column(String(16), default="new")
+    created_at: Mapped[datetime] = mapped_column(DateTime)
@@ -1,18 +1,60 @@
 """Agent management routes."""
 
+from datetime import datetime
+from typing import Optional
+
 from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Query
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
+from kynee_console_backend.core.live import heartbeat_events
+from kynee_console_backend.core.pagination import InvalidCursorError
+from kynee_console_backend.core.pagination import as_utc_naive
+from kynee_console_backend.core.pagination import parse_fields
+from kynee_console_backend.db import AgentFilters
+from kynee_console_backend.db import count_rows
+from kynee_console_backend.db import get_agent as fetch_agent
+from kynee_console_backend.db import get_session
+from kynee_console_backend.db import list_agents as fetch_agents
+from kynee_console_backend.db.agents import AGENT_FIELDS
+from kynee_console_backend.schemas.agent import AgentHeartbeat
+from kynee_console_backend.schemas.agent import AgentResponse
+from kynee_console_backend.schemas.page import CountMode
+from kynee_console_backend.schemas.page import Page
+
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
 
-@router.get("")
-async def list_agents():
-    """List all enrolled agents."""
-    # TODO: Implement
-    return {"agents": []}
+@router.get("", response_model=Page)
+async def list_agents(
+    status: Optional[str] = None,
+    seen_since: Optional[datetime] = Query(None, description="Heartbeat at or after"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    count: CountMode = "none",
+    session: AsyncSession = Depends(get_session),
+):
+    """List enrolled agents in agent_id order, one keyset page at a time."""
+    filters = AgentFilters(status=status, seen_since=as_utc_naive(seen_since))
+    try:
+        selected = parse_fields(fields, AGENT_FIELDS)
+        items, next_cursor = await fetch_agents(session, filters, selected, limit, cursor)
+    except (InvalidCursorError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    page = Page(items=items, next_cursor=next_cursor)
+    if count != "none":
+        page.count, page.count_exact = await count_rows(
+            session, filters.select(), exact=count == "exact"
+        )
+    return page
 
 
 @router.post("/enroll")
@@ -23,8 +65,50 @@ async def enroll_agent(agent_id: str):
     return {"agent_id": agent_id, "status": "pending"}
 
 
-@router.get("/{agent_id}")
-async def get_agent(agent_id: str):
-    """Get agent details."""
-    # TODO: Implement
-    return {"agent_id": agent_id, "status": "unknown"}
+@router.post("/{agent_id}/heartbeat", status_code=202)
+async def report_heartbeat(agent_id: str, heartbeat: AgentHeartbeat, request: Request):
+    """
+    Accept an agent heartbeat (``agent-status.schema.json``).
+
+    The heartbeat only updates the in-memory status table; changed
+    statuses reach the database in the next write-behind flush. State
+    changes and finished jobs are pushed to live subscribers.
+    """
+    if heartbeat.agent_id != agent_id:
+        raise HTTPException(status_code=400, detail="agent_id does not match the URL")
+    table = request.app.state.agent_status
+    previous = table.get(agent_id)
+    accepted = table.update(heartbeat)
+    if accepted:
+        for event in heartbeat_events(previous.heartbeat if previous else None, heartbeat):
+            request.app.state.live_events.publish(event)
+    return {"agent_id": agent_id, "status": "accepted" if accepted else "stale"}
+
+
+@router.get("/{agent_id}", response_model=AgentResponse)
+async def get_agent(
+    agent_id: str,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+):
+    """Get agent details, from the status table when the agent has heartbeated."""
+    table = request.app.state.agent_status
+    entry = table.get(agent_id)
+    if entry is not None:
+        return AgentResponse(
+            agent_id=agent_id,
+            status=entry.status(table.offline_after),
+            last_heartbeat=entry.received_at,
+            heartbeat=entry.heartbeat,
+        )
+
+    # No heartbeat since this process started: fall back to the stored row
+    agent = await fetch_agent(session, agent_id)
+    if agent is None:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    return AgentResponse(
+        agent_id=agent.agent_id,
+        status=agent.status,
+        enrolled_at=agent.enrolled_at,
+        last_heartbeat=agent.last_heartbeat,
+    )
@@ -0,0 +1,114 @@
+"""Finding routes."""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Query
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from kynee_console_backend.core.ingest import BatchDecodeError
+from kynee_console_backend.core.ingest import iter_records
+from kynee_console_backend.core.ingest import validate_records
+from kynee_console_backend.core.live import findings_events
+from kynee_console_backend.core.pagination import InvalidCursorError
+from kynee_console_backend.core.pagination import as_utc_naive
+from kynee_console_backend.core.pagination import parse_fields
+from kynee_console_backend.db import FindingFilters
+from kynee_console_backend.db import bulk_insert_findings
+from kynee_console_backend.db import count_rows
+from kynee_console_backend.db import get_session
+from kynee_console_backend.db import list_findings
+from kynee_console_backend.db.findings import FINDING_FIELDS
+from kynee_console_backend.schemas.finding import FindingBatchResponse
+from kynee_console_backend.schemas.finding import SeverityLevel
+from kynee_console_backend.schemas.page import CountMode
+from kynee_console_backend.schemas.page import Page
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api/v1", tags=["findings"])
+
+
+@router.get("/findings", response_model=Page)
+async def get_findings(
+    engagement_id: Optional[str] = None,
+    agent_id: Optional[str] = None,
+    severity: Optional[list[SeverityLevel]] = Query(None),
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Created at or after"),
+    until: Optional[datetime] = Query(None, description="Created before"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    count: CountMode = "none",
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    List findings, newest first, one keyset page at a time.
+
+    Follow ``next_cursor`` for further pages; each page costs the same
+    regardless of depth.
+    """
+    filters = FindingFilters(
+        engagement_id=engagement_id,
+        agent_id=agent_id,
+        severity=[level.value for level in severity] if severity else None,
+        category=category,
+        status=status,
+        since=as_utc_naive(since),
+        until=as_utc_naive(until),
+    )
+    try:
+        selected = parse_fields(fields, FINDING_FIELDS)
+        items, next_cursor = await list_findings(session, filters, selected, limit, cursor)
+    except (InvalidCursorError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    page = Page(items=items, next_cursor=next_cursor)
+    if count != "none":
+        page.count, page.count_exact = await count_rows(
+            session, filters.select(), exact=count == "exact"
+        )
+    return page
+
+
+@router.post("/findings:batch", response_model=FindingBatchResponse)
+async def ingest_findings_batch(request: Request):
+    """
+    Ingest a batch of findings.
+
+    The body is NDJSON (``application/x-ndjson``) or msgpack
+    (``application/msgpack``) ``FindingCreate`` records, optionally with
+    ``Content-Encoding: gzip`` or ``zstd``. Records are validated as the
+    body streams in; valid ones are written in one bulk insert and every
+    record gets an accepted/rejected result at its batch index. Live
+    subscribers get one ``findings.created`` event per engagement.
+    """
+    try:
+        batch = await validate_records(
+            iter_records(
+                request.stream(),
+                request.headers.get("content-type"),
+                request.headers.get("content-encoding"),
+            )
+        )
+    except BatchDecodeError as e:
+        logger.warning("findings_batch_rejected", error=str(e))
+        raise HTTPException(status_code=e.status_code, detail=str(e)) from e
+
+    await bulk_insert_findings(request.app.state.db_engine, batch.rows)
+    live_events = request.app.state.live_events
+    if live_events:
+        for event in findings_events(batch.rows):
+            live_events.publish(event)
+
+    logger.info("findings_batch_ingested", accepted=batch.accepted, rejected=batch.rejected)
+    return FindingBatchResponse(
+        accepted=batch.accepted, rejected=batch.rejected, results=batch.results
+    )
@@ -0,0 +1,143 @@
+"""Live engagement events over WebSocket and Server-Sent Events."""
+
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi import Request
+from fastapi import WebSocket
+from fastapi.responses import StreamingResponse
+import structlog
+
+from kynee_console_backend.core.live import LiveEvent
+from kynee_console_backend.core.live import Subscription
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api/v1/engagements", tags=["live"])
+
+# A send that takes longer marks the client as a slow consumer
+SEND_TIMEOUT_SECONDS = 10.0
+SSE_KEEPALIVE_SECONDS = 15.0
+# "Try again later": the client fell behind and should reconnect
+WS_CLOSE_SLOW_CONSUMER = 1013
+
+
+@router.get("/{engagement_id}/events")
+async def stream_events(engagement_id: str, request: Request):
+    """
+    Stream an engagement's live events as Server-Sent Events.
+
+    Each event is sent with its type as the SSE ``event`` field. A client
+    that falls behind receives a final ``dropped`` event and should
+    reconnect.
+    """
+    broker = request.app.state.live_events
+
+    async def stream() -> AsyncIterator[str]:
+        # Subscribed only once the body is being sent: a response that never
+        # starts streaming would otherwise leave its subscription behind
+        subscription = broker.subscribe(engagement_id)
+        try:
+            async for chunk in sse_stream(subscription):
+                yield chunk
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{engagement_id}/ws")
+async def websocket_events(websocket: WebSocket, engagement_id: str):
+    """
+    Push an engagement's live events over a WebSocket.
+
+    Each message is ``{"events": [...]}`` holding every event buffered
+    since the previous message. A client that falls behind is closed with
+    code 1013 and should reconnect.
+    """
+    broker = websocket.app.state.live_events
+    # Subscribe before accepting, so nothing published after the handshake is missed
+    subscription = broker.subscribe(engagement_id)
+    await websocket.accept()
+
+    sender = asyncio.create_task(_send_events(websocket, subscription))
+    receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        broker.unsubscribe(subscription)
+
+    if _dropped(sender):
+        logger.warning("live_websocket_dropped", engagement_id=engagement_id)
+        # The client may be too slow to complete the closing handshake as well
+        with contextlib.suppress(asyncio.TimeoutError, RuntimeError):
+            await asyncio.wait_for(
+                websocket.close(code=WS_CLOSE_SLOW_CONSUMER, reason="Slow consumer"),
+                SEND_TIMEOUT_SECONDS,
+            )
+
+
+async def sse_stream(
+    subscription: Subscription, keepalive: float = SSE_KEEPALIVE_SECONDS
+) -> AsyncIterator[str]:
+    """SSE chunks for a subscription: one chunk per burst of events."""
+    while True:
+        try:
+            events = await asyncio.wait_for(subscription.get(), keepalive)
+        except asyncio.TimeoutError:
+            # Keeps proxies from closing the stream and surfaces dead clients
+            yield ": keepalive\n\n"
+            continue
+        if not events:
+            yield "event: dropped\ndata: {}\n\n"
+            return
+        yield "".join(_sse_message(event) for event in events)
+
+
+def _sse_message(event: LiveEvent) -> str:
+    """One event in SSE wire format."""
+    return f"event: {event.type}\ndata: {json.dumps(event.as_dict())}\n\n"
+
+
+async def _send_events(websocket: WebSocket, subscription: Subscription) -> bool:
+    """
+    Forward events until the subscription is dropped.
+
+    Returns:
+        True if the client was dropped as a slow consumer
+    """
+    while True:
+        events = await subscription.get()
+        if not events:
+            return True
+        message = json.dumps({"events": [event.as_dict() for event in events]})
+        try:
+            await asyncio.wait_for(websocket.send_text(message), SEND_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            subscription.drop()
+            return True
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Read (and ignore) client messages until it disconnects."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+def _dropped(sender: "asyncio.Task[bool]") -> bool:
+    """Whether the sender stopped because the client was a slow consumer."""
+    if not sender.done() or sender.cancelled():
+        return False
+    if sender.exception() is not None:
+        # Sending failed because the client went away; nothing left to close
+        return False
+    return sender.result()
@@ -0,0 +1,38 @@
+"""Metrics routes: agent snapshot ingestion and Prometheus exposition."""
+
+from fastapi import APIRouter
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+import structlog
+
+from kynee_console_backend.schemas.metrics import MetricsSnapshot
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.post("/api/v1/agents/{agent_id}/metrics", status_code=202)
+async def report_metrics(agent_id: str, snapshot: MetricsSnapshot, request: Request):
+    """
+    Accept an agent's metrics snapshot (``kynee-agent`` registry format).
+
+    Snapshots are validated here (422 if malformed), so one bad push cannot
+    break ``/metrics`` for the whole fleet.
+    """
+    request.app.state.agent_metrics.update(
+        agent_id, snapshot.model_dump(mode="json", exclude_none=True)
+    )
+    logger.debug("agent_metrics_received", agent_id=agent_id)
+    return {"agent_id": agent_id, "status": "accepted"}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics(request: Request):
+    """Fleet metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        request.app.state.agent_metrics.render(),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
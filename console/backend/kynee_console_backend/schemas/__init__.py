@@ -1,11 +1,20 @@
 """Pydantic schemas for request/response validation."""
 
-from .agent import AgentCreate, AgentResponse
-from .finding import FindingCreate, FindingResponse
+from .agent import AgentCreate, AgentHeartbeat, AgentResponse, AgentState
+from .finding import FindingBatchItem, FindingBatchResponse, FindingCreate, FindingResponse
+from .metrics import MetricsSnapshot
+from .page import CountMode, Page
 
 __all__ = [
     "AgentCreate",
+    "AgentHeartbeat",
     "AgentResponse",
+    "AgentState",
+    "CountMode",
+    "FindingBatchItem",
+    "FindingBatchResponse",
     "FindingCreate",
     "FindingResponse",
+    "MetricsSnapshot",
+    "Page",
 ]
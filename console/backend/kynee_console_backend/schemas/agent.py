@@ -1,9 +1,21 @@
 """Agent schemas."""
 
 from datetime import datetime
+from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class AgentState(str, Enum):
+    """Agent states reported in heartbeats."""
+
+    ONLINE = "online"
+    OFFLINE = "offline"
+    IDLE = "idle"
+    SCANNING = "scanning"
+    TRANSMITTING = "transmitting"
+    ERROR = "error"
 
 
 class AgentCreate(BaseModel):
@@ -14,6 +26,81 @@ class AgentCreate(BaseModel):
     ip_address: Optional[str] = None
 
 
+class SystemStatus(BaseModel):
+    """Host health reported in a heartbeat."""
+
+    hostname: Optional[str] = None
+    os: Optional[str] = None
+    kernel: Optional[str] = None
+    uptime_seconds: Optional[int] = Field(default=None, ge=0)
+    cpu_percent: Optional[float] = Field(default=None, ge=0, le=100)
+    memory_percent: Optional[float] = Field(default=None, ge=0, le=100)
+    disk_percent: Optional[float] = Field(default=None, ge=0, le=100)
+    temperature_celsius: Optional[float] = None
+
+
+class NetworkInterface(BaseModel):
+    """One network interface of an agent."""
+
+    name: Optional[str] = None
+    ip_address: Optional[str] = None
+    mac_address: Optional[str] = None
+    status: Optional[str] = Field(default=None, pattern="^(up|down)$")
+
+
+class NetworkStatus(BaseModel):
+    """Network state reported in a heartbeat."""
+
+    interfaces: list[NetworkInterface] = Field(default_factory=list)
+    vpn_connected: Optional[bool] = None
+    vpn_endpoint: Optional[str] = None
+
+
+class HardwareStatus(BaseModel):
+    """Hardware reported in a heartbeat."""
+
+    model: Optional[str] = None
+    wifi_adapter: Optional[str] = None
+    bluetooth_adapter: Optional[str] = None
+    flipper_connected: Optional[bool] = None
+    power_source: Optional[str] = Field(default=None, pattern="^(usb|battery|unknown)$")
+    battery_percent: Optional[float] = Field(default=None, ge=0, le=100)
+
+
+class CurrentJob(BaseModel):
+    """Job an agent is running."""
+
+    job_id: Optional[str] = None
+    job_type: Optional[str] = None
+    started_at: Optional[datetime] = None
+    progress_percent: Optional[float] = Field(default=None, ge=0, le=100)
+
+
+class LastError(BaseModel):
+    """Most recent error an agent hit."""
+
+    timestamp: Optional[datetime] = None
+    error_type: Optional[str] = None
+    message: Optional[str] = None
+
+
+class AgentHeartbeat(BaseModel):
+    """Agent heartbeat (``schemas/agent-status.schema.json``)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    agent_id: str
+    timestamp: datetime
+    status: AgentState
+    engagement_id: Optional[str] = None
+    system: Optional[SystemStatus] = None
+    network: Optional[NetworkStatus] = None
+    hardware: Optional[HardwareStatus] = None
+    current_job: Optional[CurrentJob] = None
+    last_error: Optional[LastError] = None
+    version: str = Field(pattern=r"^\d+\.\d+\.\d+$")
+
+
 class AgentResponse(BaseModel):
     """Response schema for agent info."""
 
@@ -21,3 +108,6 @@ class AgentResponse(BaseModel):
     status: str = "unknown"
     enrolled_at: Optional[datetime] = None
     last_heartbeat: Optional[datetime] = None
+    heartbeat: Optional[AgentHeartbeat] = Field(
+        default=None, description="Latest heartbeat received by this console process"
+    )
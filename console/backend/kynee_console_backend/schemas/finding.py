@@ -39,3 +39,20 @@ class FindingResponse(BaseModel):
     severity: str
     status: str = "new"
     created_at: datetime
+
+
+class FindingBatchItem(BaseModel):
+    """Outcome for one record of a batch, by its position in the batch."""
+
+    index: int
+    status: str = Field(description="'accepted' or 'rejected'")
+    finding_id: Optional[str] = None
+    errors: list[str] = Field(default_factory=list)
+
+
+class FindingBatchResponse(BaseModel):
+    """Response schema for batch findings ingestion."""
+
+    accepted: int
+    rejected: int
+    results: list[FindingBatchItem]
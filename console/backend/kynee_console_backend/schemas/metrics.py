@@ -0,0 +1,63 @@
+"""Agent metrics snapshot schemas (``kynee-agent`` registry format)."""
+
+from enum import Enum
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, Field, StringConstraints, model_validator
+
+# Prometheus metric and label names; anything else could break the exposition
+METRIC_NAME_PATTERN = r"^[a-zA-Z_:][a-zA-Z0-9_:]*$"
+LABEL_NAME_PATTERN = r"^[a-zA-Z_][a-zA-Z0-9_]*$"
+
+LabelName = Annotated[str, StringConstraints(pattern=LABEL_NAME_PATTERN)]
+
+
+class MetricType(str, Enum):
+    """Metric families an agent registry reports."""
+
+    COUNTER = "counter"
+    GAUGE = "gauge"
+    HISTOGRAM = "histogram"
+    UNTYPED = "untyped"
+
+
+class MetricSample(BaseModel):
+    """One labelled series: ``value``, or ``counts`` and ``sum`` for histograms."""
+
+    labels: dict[LabelName, str] = Field(default_factory=dict)
+    value: Optional[float] = Field(default=None, allow_inf_nan=False)
+    counts: Optional[list[int]] = None
+    sum: Optional[float] = Field(default=None, allow_inf_nan=False)
+
+
+class MetricFamily(BaseModel):
+    """One metric and its samples."""
+
+    name: str = Field(pattern=METRIC_NAME_PATTERN)
+    type: MetricType = MetricType.UNTYPED
+    help: str = ""
+    buckets: list[Annotated[float, Field(allow_inf_nan=False)]] = Field(default_factory=list)
+    samples: list[MetricSample] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def check_samples(self) -> "MetricFamily":
+        """Histogram samples need a count per bucket (plus +Inf); others need a value."""
+        for sample in self.samples:
+            if self.type == MetricType.HISTOGRAM:
+                if sample.counts is None or len(sample.counts) != len(self.buckets) + 1:
+                    raise ValueError(
+                        f"{self.name}: histogram samples need {len(self.buckets) + 1} counts"
+                    )
+                if any(count < 0 for count in sample.counts):
+                    raise ValueError(f"{self.name}: histogram counts must not be negative")
+            elif sample.value is None:
+                raise ValueError(f"{self.name}: samples need a value")
+        return self
+
+
+class MetricsSnapshot(BaseModel):
+    """Snapshot pushed by an agent's metrics registry."""
+
+    started_at: Optional[float] = None
+    timestamp: Optional[float] = None
+    metrics: list[MetricFamily] = Field(default_factory=list)
@@ -0,0 +1,21 @@
+"""Paginated listing schemas."""
+
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# none: skip counting; exact: count every match; estimate: count up to a cap
+CountMode = Literal["none", "exact", "estimate"]
+
+
+class Page(BaseModel):
+    """One page of a keyset-paginated listing."""
+
+    items: list[dict[str, Any]]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Pass as ?cursor= for the next page; null on the last page"
+    )
+    count: Optional[int] = Field(default=None, description="Matching rows (if requested)")
+    count_exact: Optional[bool] = Field(
+        default=None, description="False when an estimate reached its cap"
+    )
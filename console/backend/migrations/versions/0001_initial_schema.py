@@ -0,0 +1,52 @@
+"""Initial schema: agents and findings.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "agents",
+        sa.Column("agent_id", sa.String(), primary_key=True),
+        sa.Column("hostname", sa.String(), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("enrolled_at", sa.DateTime(), nullable=True),
+        sa.Column("last_heartbeat", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_agents_status", "agents", ["status"])
+    op.create_index("ix_agents_last_heartbeat", "agents", ["last_heartbeat"])
+
+    op.create_table(
+        "findings",
+        sa.Column("finding_id", sa.String(length=36), primary_key=True),
+        sa.Column("engagement_id", sa.String(), nullable=False),
+        sa.Column("agent_id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("severity", sa.String(length=16), nullable=False),
+        sa.Column("tool", sa.String(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_findings_agent_id", "findings", ["agent_id"])
+    op.create_index("ix_findings_severity", "findings", ["severity"])
+    op.create_index("ix_findings_created_at", "findings", ["created_at"])
+    op.create_index("ix_findings_engagement_created", "findings", ["engagement_id", "created_at"])
+    op.create_index("ix_findings_engagement_severity", "findings", ["engagement_id", "severity"])
+
+
+def downgrade() -> None:
+    op.drop_table("findings")
+    op.drop_table("agents")
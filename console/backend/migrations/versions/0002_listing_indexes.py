@@ -0,0 +1,50 @@
+"""Keyset listing indexes for findings and agents.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_findings_created_at", table_name="findings")
+    op.create_index("ix_findings_created_at", "findings", ["created_at", "finding_id"])
+
+    op.drop_index("ix_findings_engagement_created", table_name="findings")
+    op.create_index(
+        "ix_findings_engagement_created",
+        "findings",
+        ["engagement_id", "created_at", "finding_id"],
+        postgresql_include=["agent_id", "title", "category", "severity", "status"],
+    )
+
+    op.drop_index("ix_findings_engagement_severity", table_name="findings")
+    op.create_index(
+        "ix_findings_engagement_severity",
+        "findings",
+        ["engagement_id", "severity", "created_at", "finding_id"],
+    )
+
+    op.drop_index("ix_agents_status", table_name="agents")
+    op.create_index("ix_agents_status", "agents", ["status", "agent_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_agents_status", table_name="agents")
+    op.create_index("ix_agents_status", "agents", ["status"])
+
+    op.drop_index("ix_findings_engagement_severity", table_name="findings")
+    op.create_index("ix_findings_engagement_severity", "findings", ["engagement_id", "severity"])
+
+    op.drop_index("ix_findings_engagement_created", table_name="findings")
+    op.create_index("ix_findings_engagement_created", "findings", ["engagement_id", "created_at"])
+
+    op.drop_index("ix_findings_created_at", table_name="findings")
+    op.create_index("ix_findings_created_at", "findings", ["created_at"])
@@ -0,0 +1,6 @@
+"""Pytest configuration for console backend tests."""
+
+import os
+
+# Keep tests off the on-disk default database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
@@ -0,0 +1,54 @@
+"""Tests for the database layer and migrations."""
+
+import asyncio
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect
+
+from kynee_console_backend.db import create_db_engine
+from kynee_console_backend.db.session import async_database_url
+from kynee_console_backend.models import Base
+
+
+def test_async_database_url_adds_driver():
+    """Plain URLs should be mapped to their async drivers."""
+    assert async_database_url("sqlite:///kynee.db") == "sqlite+aiosqlite:///kynee.db"
+    assert (
+        async_database_url("postgresql://u:p@db:5432/kynee")
+        == "postgresql+asyncpg://u:p@db:5432/kynee"
+    )
+    assert async_database_url("sqlite+aiosqlite://") == "sqlite+aiosqlite://"
+
+
+def test_migrations_match_models(tmp_path):
+    """Upgrading to head should produce exactly the models' schema and indexes."""
+    url = f"sqlite:///{tmp_path / 'kynee.db'}"
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+    async def inspect_schema():
+        engine = create_db_engine(url)
+        async with engine.connect() as conn:
+
+            def check(sync_conn):
+                diff = compare_metadata(MigrationContext.configure(sync_conn), Base.metadata)
+                indexes = {i["name"] for i in inspect(sync_conn).get_indexes("findings")}
+                return diff, indexes
+
+            result = await conn.run_sync(check)
+        await engine.dispose()
+        return result
+
+    diff, indexes = asyncio.run(inspect_schema())
+    assert diff == []
+    assert {
+        "ix_findings_agent_id",
+        "ix_findings_severity",
+        "ix_findings_created_at",
+    } <= indexes
+    # Engagement lookups use the composite indexes it prefixes
+    assert "ix_findings_engagement_id" not in indexes
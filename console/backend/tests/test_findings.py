@@ -0,0 +1,76 @@
+"""Tests for the batch findings ingestion endpoint."""
+
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlalchemy import select
+
+from kynee_console_backend.app import create_app
+from kynee_console_backend.models import Finding
+
+FINDING = {
+    "engagement_id": "eng-001",
+    "agent_id": "pi-001",
+    "title": "Open SSH port",
+    "description": "SSH is reachable from the guest network",
+    "category": "network",
+    "severity": "high",
+    "tool": "nmap",
+}
+
+
+def _count(client: TestClient) -> int:
+    """Stored findings, queried on the app's event loop."""
+
+    async def count() -> int:
+        async with client.app.state.db_sessions() as session:
+            return await session.scalar(select(func.count()).select_from(Finding))
+
+    return client.portal.call(count)
+
+
+def test_batch_ingestion_inserts_valid_findings():
+    """Accepted findings are stored; rejected ones are reported per item."""
+    app = create_app("sqlite://")
+    records = [FINDING] * 1000 + [{**FINDING, "tool": None}]
+    body = gzip.compress(b"\n".join(json.dumps(r).encode() for r in records))
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/findings:batch",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"},
+        )
+        count = _count(client)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["accepted"] == 1000
+    assert data["rejected"] == 1
+    assert data["results"][1000]["status"] == "rejected"
+    assert data["results"][1000]["errors"]
+    assert count == 1000
+
+
+def test_batch_ingestion_rejects_unsupported_content_type():
+    """Plain JSON bodies should be refused with 415."""
+    with TestClient(create_app("sqlite://")) as client:
+        response = client.post("/api/v1/findings:batch", json=[FINDING])
+
+        assert response.status_code == 415
+        assert _count(client) == 0
+
+
+def test_batch_ingestion_rejects_corrupt_body():
+    """A corrupt compressed body should fail the batch with 400 and store nothing."""
+    with TestClient(create_app("sqlite://")) as client:
+        response = client.post(
+            "/api/v1/findings:batch",
+            content=b"not gzip at all",
+            headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 400
+        assert _count(client) == 0
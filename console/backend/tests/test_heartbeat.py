@@ -0,0 +1,144 @@
+"""Tests for heartbeat ingestion and the agent status table."""
+
+import asyncio
+from datetime import datetime
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+import pytest
+
+from kynee_console_backend.app import create_app
+from kynee_console_backend.core.status import AgentStatusTable
+from kynee_console_backend.core.status import StatusWriter
+from kynee_console_backend.db import get_agent
+from kynee_console_backend.schemas.agent import AgentHeartbeat
+
+AGENT_ID = "8b2f9c1e-3c4d-4f6a-9b7e-2a1d5c6e7f80"
+
+
+def _heartbeat(status="scanning", at=None, **extra):
+    return {
+        "agent_id": AGENT_ID,
+        "timestamp": (at or datetime(2026, 10, 17, 12, 0)).isoformat() + "Z",
+        "status": status,
+        "version": "0.1.0",
+        "system": {"hostname": "pi-lab-1", "cpu_percent": 12.5},
+        **extra,
+    }
+
+
+def test_table_ignores_out_of_order_heartbeats():
+    """An older heartbeat must not replace a newer one."""
+    table = AgentStatusTable()
+    newer = AgentHeartbeat.model_validate(_heartbeat("idle", datetime(2026, 10, 17, 12, 1)))
+    older = AgentHeartbeat.model_validate(_heartbeat("scanning"))
+
+    assert table.update(newer)
+    assert not table.update(older)
+    assert table.get(AGENT_ID).status() == "idle"
+
+
+def test_table_compares_offset_and_naive_timestamps():
+    """Mixing offset and naive timestamps should compare as UTC, not raise."""
+    table = AgentStatusTable()
+    aware = AgentHeartbeat.model_validate(_heartbeat("idle", datetime(2026, 10, 17, 12, 1)))
+    naive = AgentHeartbeat.model_validate(
+        {**_heartbeat("scanning"), "timestamp": "2026-10-17T12:02:00"}
+    )
+    stale = AgentHeartbeat.model_validate(
+        {**_heartbeat("error"), "timestamp": "2026-10-17T13:00:00+02:00"}
+    )
+
+    assert table.update(aware)
+    assert table.update(naive)
+    assert not table.update(stale)
+    assert table.get(AGENT_ID).status() == "scanning"
+
+
+def test_heartbeat_endpoint_accepts_mixed_timestamps():
+    """A naive heartbeat after an offset one should be accepted, not fail with 500."""
+    with TestClient(create_app()) as client:
+        first = client.post(f"/api/v1/agents/{AGENT_ID}/heartbeat", json=_heartbeat())
+        second = client.post(
+            f"/api/v1/agents/{AGENT_ID}/heartbeat",
+            json={**_heartbeat("idle"), "timestamp": "2026-10-17T12:05:00"},
+        )
+
+    assert first.status_code < 300
+    assert second.status_code < 300
+
+
+def test_table_reports_silent_agents_offline():
+    """Agents past the offline threshold are reported offline."""
+    table = AgentStatusTable(offline_after=-1)
+    table.update(AgentHeartbeat.model_validate(_heartbeat()))
+
+    assert table.get(AGENT_ID).status(table.offline_after) == "offline"
+
+
+def test_writer_batches_and_requeues_on_failure():
+    """Many heartbeats collapse into one row per agent; failed flushes are retried."""
+    table = AgentStatusTable()
+    batches = []
+    fail = [True]
+
+    async def persist(rows):
+        if fail[0]:
+            fail[0] = False
+            raise RuntimeError("database unavailable")
+        batches.append(rows)
+        return len(rows)
+
+    for second in range(10):
+        at = datetime(2026, 10, 17, 12, 0) + timedelta(seconds=second)
+        table.update(AgentHeartbeat.model_validate(_heartbeat(at=at)))
+    writer = StatusWriter(table, persist)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(writer.flush())
+    assert asyncio.run(writer.flush()) == 1
+    assert asyncio.run(writer.flush()) == 0
+    assert batches[0][0]["hostname"] == "pi-lab-1"
+
+
+def test_heartbeat_endpoint_serves_status_from_memory():
+    """Heartbeats are visible immediately and persisted on shutdown."""
+    app = create_app("sqlite://")
+    with TestClient(app) as client:
+        response = client.post(f"/api/v1/agents/{AGENT_ID}/heartbeat", json=_heartbeat())
+        assert response.status_code == 202
+
+        agent = client.get(f"/api/v1/agents/{AGENT_ID}").json()
+        assert agent["status"] == "scanning"
+        assert agent["heartbeat"]["system"]["hostname"] == "pi-lab-1"
+
+        assert client.get("/api/v1/agents/unknown").status_code == 404
+        mismatch = client.post("/api/v1/agents/other/heartbeat", json=_heartbeat())
+        assert mismatch.status_code == 400
+        invalid = client.post(f"/api/v1/agents/{AGENT_ID}/heartbeat", json=_heartbeat("asleep"))
+        assert invalid.status_code == 422
+
+        # Shutdown flushes the status table; check the row on the app's loop first
+        async def stored():
+            await app.state.status_writer.flush()
+            async with app.state.db_sessions() as session:
+                return await get_agent(session, AGENT_ID)
+
+        row = client.portal.call(stored)
+
+    assert row.status == "scanning"
+    assert row.hostname == "pi-lab-1"
+
+
+def test_main_runs_a_single_worker(monkeypatch):
+    """Per-process status means the server must not fork extra workers."""
+    pytest.importorskip("uvicorn")
+    from kynee_console_backend import main as entry_point
+
+    calls = []
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    monkeypatch.setattr(entry_point.uvicorn, "run", lambda *args, **kwargs: calls.append(kwargs))
+
+    entry_point.main()
+
+    assert calls[0]["workers"] == 1
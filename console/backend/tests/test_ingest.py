@@ -0,0 +1,145 @@
+"""Tests for batch findings decoding and validation."""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from kynee_console_backend.core.ingest import BatchDecodeError
+from kynee_console_backend.core.ingest import BatchTooLargeError
+from kynee_console_backend.core.ingest import UnsupportedBatchFormatError
+from kynee_console_backend.core.ingest import iter_records
+from kynee_console_backend.core.ingest import validate_records
+
+FINDING = {
+    "engagement_id": "eng-001",
+    "agent_id": "pi-001",
+    "title": "Open SSH port",
+    "description": "SSH is reachable from the guest network",
+    "category": "network",
+    "severity": "medium",
+    "tool": "nmap",
+}
+
+
+def _ingest(body, content_type="application/x-ndjson", encoding=None, chunk_size=7, **limits):
+    """Validate a body delivered in small chunks."""
+
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]
+
+    return asyncio.run(validate_records(iter_records(chunks(), content_type, encoding, **limits)))
+
+
+def _ndjson(records):
+    return b"".join(json.dumps(r).encode() + b"\n" for r in records)
+
+
+def test_ndjson_batch_reports_each_record():
+    """Valid records are accepted and invalid ones rejected at their index."""
+    body = (
+        _ndjson([FINDING, {**FINDING, "severity": "urgent"}])
+        + b"{not json\n"
+        + json.dumps(FINDING).encode()
+    )
+
+    batch = _ingest(body)
+
+    assert [r.status for r in batch.results] == ["accepted", "rejected", "rejected", "accepted"]
+    assert [r.index for r in batch.results] == [0, 1, 2, 3]
+    assert batch.results[1].errors[0].startswith("severity:")
+    assert batch.results[2].errors[0].startswith("Invalid JSON")
+    assert batch.accepted == 2 and batch.rejected == 2
+    assert batch.rows[0]["severity"] == "medium"
+    assert batch.rows[0]["finding_id"] == batch.results[0].finding_id
+
+
+def test_gzip_batch_with_concatenated_members():
+    """gzip bodies, including appended members, should decode incrementally."""
+    body = gzip.compress(_ndjson([FINDING] * 3)) + gzip.compress(_ndjson([FINDING]))
+
+    batch = _ingest(body, encoding="gzip")
+
+    assert batch.accepted == 4
+
+
+def test_truncated_gzip_is_rejected():
+    """A cut-off gzip body should fail the batch."""
+    body = gzip.compress(_ndjson([FINDING] * 10))[:-12]
+
+    with pytest.raises(BatchDecodeError):
+        _ingest(body, encoding="gzip")
+
+
+def test_batch_limits():
+    """Item and decompressed size limits should reject the batch."""
+    body = _ndjson([FINDING] * 5)
+
+    with pytest.raises(BatchTooLargeError):
+        _ingest(body, max_items=4)
+    with pytest.raises(BatchTooLargeError):
+        _ingest(gzip.compress(body), encoding="gzip", max_bytes=100)
+
+
+def test_unsupported_formats():
+    """Unknown content types and encodings should be refused."""
+    with pytest.raises(UnsupportedBatchFormatError):
+        _ingest(b"{}", content_type="text/csv")
+    with pytest.raises(UnsupportedBatchFormatError):
+        _ingest(b"{}", encoding="br")
+
+
+def test_msgpack_batch():
+    """msgpack maps, streamed or as one array, should be accepted."""
+    msgpack = pytest.importorskip("msgpack")
+    streamed = b"".join(msgpack.packb(FINDING) for _ in range(3))
+    array = msgpack.packb([FINDING, {"title": "incomplete"}])
+
+    assert _ingest(streamed, content_type="application/msgpack").accepted == 3
+    batch = _ingest(array, content_type="application/msgpack")
+    assert [r.status for r in batch.results] == ["accepted", "rejected"]
+
+
+def test_zstd_batch():
+    """zstd bodies should decode incrementally."""
+    zstandard = pytest.importorskip("zstandard")
+    body = zstandard.ZstdCompressor().compress(_ndjson([FINDING] * 3))
+
+    assert _ingest(body, encoding="zstd").accepted == 3
+
+
+def test_zstd_frames_and_truncation():
+    """Concatenated, checksummed and skippable frames decode; a cut-off frame fails."""
+    zstandard = pytest.importorskip("zstandard")
+    checksummed = zstandard.ZstdCompressor(write_checksum=True)
+    skippable = (0x184D2A53).to_bytes(4, "little") + (3).to_bytes(4, "little") + b"abc"
+    body = (
+        zstandard.ZstdCompressor().compress(_ndjson([FINDING] * 3))
+        + skippable
+        + checksummed.compress(_ndjson([FINDING] * 2))
+    )
+
+    assert _ingest(body, encoding="zstd", chunk_size=5).accepted == 5
+    assert _ingest(body, encoding="zstd", chunk_size=len(body)).accepted == 5
+    for cut in (1, 4, 30):
+        with pytest.raises(BatchDecodeError):
+            _ingest(body[:-cut], encoding="zstd")
+
+
+def test_zstd_output_is_bounded_per_read():
+    """A highly compressible zstd body should expand in bounded pieces."""
+    zstandard = pytest.importorskip("zstandard")
+    from kynee_console_backend.core.ingest import _DECOMPRESS_CHUNK
+    from kynee_console_backend.core.ingest import _ZstdDecompressor
+
+    data = b" " * (8 * _DECOMPRESS_CHUNK) + _ndjson([FINDING])
+    decompress = _ZstdDecompressor()
+
+    pieces = [*decompress(zstandard.ZstdCompressor().compress(data)), *decompress(b"")]
+
+    assert b"".join(pieces) == data
+    assert max(len(piece) for piece in pieces) <= _DECOMPRESS_CHUNK
+    with pytest.raises(BatchTooLargeError):
+        _ingest(zstandard.ZstdCompressor().compress(data), encoding="zstd", max_bytes=1024)
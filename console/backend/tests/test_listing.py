@@ -0,0 +1,113 @@
+"""Tests for the keyset-paginated listing endpoints."""
+
+from datetime import datetime
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import insert
+
+from kynee_console_backend.app import create_app
+from kynee_console_backend.models import Agent
+from kynee_console_backend.models import Finding
+
+START = datetime(2026, 10, 1)
+SEVERITIES = ["low", "medium", "high"]
+
+
+@pytest.fixture
+def client():
+    """Client for an app with 30 findings across two engagements and 5 agents."""
+    app = create_app("sqlite://")
+    with TestClient(app) as client:
+
+        async def seed():
+            async with app.state.db_engine.begin() as conn:
+                await conn.execute(
+                    insert(Finding),
+                    [
+                        {
+                            "finding_id": f"f-{i:03d}",
+                            "engagement_id": f"eng-{i % 2}",
+                            "agent_id": "pi-001",
+                            "title": f"Finding {i}",
+                            "description": "details",
+                            "category": "network",
+                            "severity": SEVERITIES[i % 3],
+                            "tool": "nmap",
+                            "status": "new",
+                            # Pairs share a timestamp, so the finding_id tie-break matters
+                            "created_at": START + timedelta(minutes=i // 2),
+                        }
+                        for i in range(30)
+                    ],
+                )
+                await conn.execute(
+                    insert(Agent),
+                    [
+                        {"agent_id": f"pi-{i:03d}", "status": "online" if i % 2 else "offline"}
+                        for i in range(5)
+                    ],
+                )
+
+        client.portal.call(seed)
+        yield client
+
+
+def _all_pages(client, url, **params):
+    """Follow next_cursor to the end, returning every item."""
+    items = []
+    cursor = None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        page = client.get(url, params=query).json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_findings_pages_cover_all_rows_newest_first(client):
+    """Walking the cursor should visit every finding once, newest first."""
+    items = _all_pages(client, "/api/v1/findings", limit=7)
+
+    ids = [item["finding_id"] for item in items]
+    assert len(ids) == len(set(ids)) == 30
+    assert items == sorted(items, key=lambda i: (i["created_at"], i["finding_id"]), reverse=True)
+
+
+def test_findings_filters_and_sparse_fields(client):
+    """Filters apply server-side and only requested fields are returned."""
+    response = client.get(
+        "/api/v1/findings",
+        params={
+            "engagement_id": "eng-0",
+            "severity": ["high", "low"],
+            "since": "2026-10-01T00:05:00Z",
+            "fields": "finding_id,severity",
+            "count": "exact",
+        },
+    )
+
+    page = response.json()
+    assert response.status_code == 200
+    assert all(set(item) == {"finding_id", "severity"} for item in page["items"])
+    assert all(item["severity"] in ("high", "low") for item in page["items"])
+    assert page["count"] == len(page["items"])
+    assert page["count_exact"] is True
+
+
+def test_findings_rejects_bad_cursor_and_fields(client):
+    """Malformed cursors and unknown fields should be 400s."""
+    assert client.get("/api/v1/findings", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/api/v1/findings", params={"fields": "secret"}).status_code == 400
+
+
+def test_agents_listing(client):
+    """Agents page in agent_id order and filter by status."""
+    items = _all_pages(client, "/api/v1/agents", limit=2)
+    assert [a["agent_id"] for a in items] == [f"pi-{i:03d}" for i in range(5)]
+
+    page = client.get("/api/v1/agents", params={"status": "online", "count": "estimate"}).json()
+    assert [a["agent_id"] for a in page["items"]] == ["pi-001", "pi-003"]
+    assert page["count"] == 2
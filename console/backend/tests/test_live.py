@@ -0,0 +1,179 @@
+"""Tests for live engagement events."""
+
+import asyncio
+import contextlib
+import json
+
+from fastapi.testclient import TestClient
+
+from kynee_console_backend.app import create_app
+from kynee_console_backend.core.live import LiveEvent
+from kynee_console_backend.core.live import LiveEventBroker
+from kynee_console_backend.core.live import Subscription
+from kynee_console_backend.core.live import heartbeat_events
+from kynee_console_backend.routers.live import sse_stream
+from kynee_console_backend.routers.live import stream_events
+from kynee_console_backend.schemas.agent import AgentHeartbeat
+
+AGENT_ID = "pi-001"
+
+
+def _heartbeat(status, job_id=None, timestamp="2026-10-17T12:00:00Z"):
+    return {
+        "agent_id": AGENT_ID,
+        "timestamp": timestamp,
+        "status": status,
+        "engagement_id": "eng-001",
+        "current_job": {"job_id": job_id, "job_type": "network_scan"} if job_id else None,
+        "version": "0.1.0",
+    }
+
+
+def test_subscription_coalesces_keyed_events():
+    """Pending updates with the same key collapse to the newest one."""
+    subscription = Subscription("eng-001")
+    for status in ("idle", "scanning", "transmitting"):
+        subscription.put(LiveEvent("agent.status", "eng-001", {"status": status}, key="a"))
+    subscription.put(LiveEvent("findings.created", "eng-001", {"count": 1}))
+    subscription.put(LiveEvent("findings.created", "eng-001", {"count": 2}))
+
+    events = asyncio.run(subscription.get())
+
+    assert [event.data for event in events] == [
+        {"status": "transmitting"},
+        {"count": 1},
+        {"count": 2},
+    ]
+
+
+def test_coalesced_status_keeps_oldest_previous_status():
+    """A collapsed run of transitions reports where it started."""
+    subscription = Subscription("eng-001")
+    for previous, status in (("idle", "scanning"), ("scanning", "transmitting")):
+        subscription.put(
+            LiveEvent(
+                "agent.status",
+                "eng-001",
+                {"status": status, "previous_status": previous},
+                key="agent.status:pi-001",
+            )
+        )
+
+    [event] = asyncio.run(subscription.get())
+
+    assert event.data == {"status": "transmitting", "previous_status": "idle"}
+
+
+def test_sse_subscribes_only_while_streaming():
+    """An SSE response that is never iterated should not leave a subscriber."""
+    app = create_app("sqlite://")
+    broker = app.state.live_events
+    request = type("FakeRequest", (), {"app": app})()
+
+    async def open_and_discard():
+        response = await stream_events("eng-001", request)
+        assert len(broker) == 0
+        body = response.body_iterator
+        task = asyncio.ensure_future(anext(body))
+        await asyncio.sleep(0)
+        subscribed = len(broker)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        return subscribed
+
+    assert asyncio.run(open_and_discard()) == 1
+    assert len(broker) == 0
+
+
+def test_broker_drops_slow_consumers_without_blocking():
+    """A full buffer drops that subscriber only; publishing never waits."""
+    broker = LiveEventBroker(max_pending=3)
+    slow = broker.subscribe("eng-001")
+    other = broker.subscribe("eng-002")
+
+    delivered = [broker.publish(LiveEvent("findings.created", "eng-001")) for _ in range(5)]
+
+    assert delivered == [1, 1, 1, 0, 0]
+    assert slow.dropped and not other.dropped
+    assert not broker.has_subscribers("eng-001")
+    assert asyncio.run(slow.get()) == []
+    assert len(broker) == 1
+
+
+def test_heartbeat_events_report_transitions():
+    """State changes and finished jobs become events; repeats do not."""
+    scanning = AgentHeartbeat.model_validate(_heartbeat("scanning", job_id="job-1"))
+    idle = AgentHeartbeat.model_validate(_heartbeat("idle"))
+
+    assert [event.type for event in heartbeat_events(None, scanning)] == ["agent.status"]
+    assert heartbeat_events(scanning, scanning) == []
+    events = heartbeat_events(scanning, idle)
+    assert [event.type for event in events] == ["scan.completed", "agent.status"]
+    assert events[0].data["job_id"] == "job-1"
+    assert events[1].data["previous_status"] == "scanning"
+
+
+def test_sse_stream_sends_bursts_and_drop_notice():
+    """A burst is written as one chunk; a dropped subscriber gets a final event."""
+    subscription = Subscription("eng-001", max_pending=2)
+
+    async def collect():
+        subscription.put(LiveEvent("findings.created", "eng-001", {"count": 1}))
+        subscription.put(LiveEvent("findings.created", "eng-001", {"count": 2}))
+        stream = sse_stream(subscription, keepalive=0.01)
+        burst = await anext(stream)
+        keepalive = await anext(stream)
+        for _ in range(3):
+            subscription.put(LiveEvent("findings.created", "eng-001"))
+        return burst, keepalive, [chunk async for chunk in stream]
+
+    burst, keepalive, rest = asyncio.run(collect())
+
+    assert burst.count("event: findings.created\n") == 2
+    assert json.loads(burst.split("data: ")[1].split("\n")[0])["data"] == {"count": 1}
+    assert keepalive == ": keepalive\n\n"
+    assert rest == ["event: dropped\ndata: {}\n\n"]
+
+
+def test_websocket_pushes_heartbeat_transitions_and_findings():
+    """Subscribers of an engagement see its agent transitions and new findings."""
+    app = create_app("sqlite://")
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/v1/engagements/eng-001/ws") as websocket:
+            client.post(
+                f"/api/v1/agents/{AGENT_ID}/heartbeat", json=_heartbeat("scanning", "job-1")
+            )
+            first = websocket.receive_json()["events"]
+
+            client.post(
+                f"/api/v1/agents/{AGENT_ID}/heartbeat",
+                json=_heartbeat("idle", timestamp="2026-10-17T12:00:30Z"),
+            )
+            finished = websocket.receive_json()["events"]
+
+            finding = {
+                "engagement_id": "eng-001",
+                "agent_id": AGENT_ID,
+                "title": "Open SSH port",
+                "description": "SSH is reachable from the guest network",
+                "category": "network",
+                "severity": "high",
+                "tool": "nmap",
+            }
+            other = {**finding, "engagement_id": "eng-002"}
+            client.post(
+                "/api/v1/findings:batch",
+                content="\n".join(json.dumps(r) for r in (finding, other, finding)),
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            created = websocket.receive_json()["events"]
+
+        assert len(app.state.live_events) == 0
+
+    assert first[0]["data"]["status"] == "scanning"
+    assert [event["type"] for event in finished] == ["scan.completed", "agent.status"]
+    assert len(created) == 1
+    assert created[0]["type"] == "findings.created"
+    assert created[0]["data"]["count"] == 2
+    assert created[0]["data"]["severity"] == {"high": 2}
@@ -0,0 +1,114 @@
+"""Tests for agent metrics ingestion and Prometheus exposition."""
+
+from fastapi.testclient import TestClient
+
+from kynee_console_backend.app import create_app
+from kynee_console_backend.core.metrics import AgentMetricsStore
+
+SNAPSHOT = {
+    "started_at": 0.0,
+    "timestamp": 10.0,
+    "metrics": [
+        {
+            "name": "kynee_scans_total",
+            "type": "counter",
+            "help": "Coordinated scans finished",
+            "samples": [{"labels": {"status": "success"}, "value": 3}],
+        },
+        {
+            "name": "kynee_policy_validation_seconds",
+            "type": "histogram",
+            "help": "Policy validation latency",
+            "buckets": [0.001, 0.01],
+            "samples": [{"labels": {}, "counts": [2, 1, 0], "sum": 0.004}],
+        },
+    ],
+}
+
+
+def test_store_labels_series_by_agent():
+    """Each agent's series should carry its agent_id, with one HELP per family."""
+    store = AgentMetricsStore()
+    store.update("pi-1", SNAPSHOT)
+    store.update("pi-2", SNAPSHOT)
+
+    text = store.render()
+
+    assert text.count("# TYPE kynee_scans_total counter") == 1
+    assert 'kynee_scans_total{agent_id="pi-1",status="success"} 3' in text
+    assert 'kynee_scans_total{agent_id="pi-2",status="success"} 3' in text
+    assert 'kynee_policy_validation_seconds_bucket{agent_id="pi-1",le="0.01"} 3' in text
+    assert 'kynee_policy_validation_seconds_count{agent_id="pi-1"} 3' in text
+    assert "kynee_console_agents_reporting 2" in text
+
+
+def test_store_drops_stale_snapshots():
+    """Agents that stop reporting should disappear from the exposition."""
+    store = AgentMetricsStore(stale_after=-1)
+    store.update("pi-1", SNAPSHOT)
+
+    assert store.snapshots() == {}
+
+
+def test_metrics_endpoint():
+    """Pushed snapshots should be served on /metrics."""
+    client = TestClient(create_app())
+
+    response = client.post("/api/v1/agents/pi-1/metrics", json=SNAPSHOT)
+    assert response.status_code == 202
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'kynee_scans_total{agent_id="pi-1",status="success"} 3' in response.text
+
+
+def test_malformed_snapshot_is_rejected():
+    """Bad snapshots should get a 422 and leave /metrics working for the fleet."""
+    client = TestClient(create_app())
+    assert client.post("/api/v1/agents/pi-1/metrics", json=SNAPSHOT).status_code == 202
+
+    bad_value = {"metrics": [{"type": "counter", "samples": [{"value": "abc"}]}]}
+    injected_name = {
+        "metrics": [
+            {
+                "name": 'up{job="x"} 1\nkynee_fake',
+                "type": "gauge",
+                "samples": [{"value": 1}],
+            }
+        ]
+    }
+    short_histogram = {
+        "metrics": [
+            {
+                "name": "kynee_latency_seconds",
+                "type": "histogram",
+                "buckets": [0.1],
+                "samples": [{"counts": [1], "sum": 0.05}],
+            }
+        ]
+    }
+    bad_label = {
+        "metrics": [
+            {"name": "kynee_up", "type": "gauge", "samples": [{"labels": {"a b": "x"}, "value": 1}]}
+        ]
+    }
+    for snapshot in (bad_value, injected_name, short_histogram, bad_label):
+        response = client.post("/api/v1/agents/pi-2/metrics", json=snapshot)
+        assert response.status_code == 422
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "kynee_console_agents_reporting 1" in response.text
+    assert "kynee_fake" not in response.text
+
+
+def test_help_text_is_escaped():
+    """A newline in HELP text should not start a new exposition line."""
+    store = AgentMetricsStore()
+    store.update(
+        "pi-1",
+        {"metrics": [{"name": "kynee_up", "type": "gauge", "help": "a\nb", "samples": []}]},
+    )
+
+    assert "# HELP kynee_up a\\nb\n" in store.render()
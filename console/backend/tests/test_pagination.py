@@ -0,0 +1,48 @@
+"""Tests for cursor and field-selection helpers."""
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+import pytest
+
+from kynee_console_backend.core.pagination import InvalidCursorError
+from kynee_console_backend.core.pagination import as_utc_naive
+from kynee_console_backend.core.pagination import decode_cursor
+from kynee_console_backend.core.pagination import encode_cursor
+from kynee_console_backend.core.pagination import parse_fields
+
+
+def test_cursor_round_trip():
+    """Cursors should restore the sort key with its types."""
+    created = datetime(2026, 10, 17, 12, 30, 5, 123456)
+
+    cursor = encode_cursor([created, "f-001"])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, [datetime, str]) == [created, "f-001"]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor(["a"]), encode_cursor(["x", "y"])])
+def test_invalid_cursor(cursor):
+    """Garbage or mismatched cursors should be rejected."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, [datetime, str])
+
+
+def test_parse_fields():
+    """Field selection keeps schema order and rejects unknown names."""
+    allowed = ("finding_id", "title", "severity")
+
+    assert parse_fields(None, allowed) == list(allowed)
+    assert parse_fields("severity, finding_id", allowed) == ["finding_id", "severity"]
+    with pytest.raises(ValueError, match="password"):
+        parse_fields("title,password", allowed)
+
+
+def test_as_utc_naive():
+    """Aware filter values are converted to naive UTC, as stored."""
+    aware = datetime(2026, 10, 17, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+
+    assert as_utc_naive(aware) == datetime(2026, 10, 17, 12, 0)
+    assert as_utc_naive(None) is None